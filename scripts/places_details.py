@@ -11,6 +11,7 @@ from pathlib import Path
 import pandas as pd
 
 from apprscan.places_api import fetch_place_details, get_api_key
+from apprscan.places_cache import DEFAULT_PLACES_CACHE_PATH, DEFAULT_PLACES_TTL_S, PlacesCache
 
 
 def _missing(val: object) -> bool:
@@ -46,6 +47,10 @@ def _load_master(path: Path, sheet: str) -> pd.DataFrame:
     raise ValueError("Unsupported master format (use xlsx/csv/parquet).")
 
 
+def _saved(cache: PlacesCache | None) -> int:
+    return cache.stats()["places_calls_saved"] if cache is not None else 0
+
+
 def _require_api_key() -> None:
     try:
         get_api_key()
@@ -65,6 +70,14 @@ def main() -> int:
     parser.add_argument("--all-rows", action="store_true", help="Fetch all rows (not just missing website.url).")
     parser.add_argument("--update-domains", default="", help="Optional domains.csv to update.")
     parser.add_argument("--domains-out", default="", help="Output path for updated domains CSV.")
+    parser.add_argument(
+        "--cache-db",
+        default=str(DEFAULT_PLACES_CACHE_PATH),
+        help="Places details cache shared with the companion service (empty disables).",
+    )
+    parser.add_argument(
+        "--cache-ttl-s", type=float, default=DEFAULT_PLACES_TTL_S, help="Cache entry lifetime."
+    )
     args = parser.parse_args()
 
     _require_api_key()
@@ -82,15 +95,19 @@ def main() -> int:
 
     if args.limit:
         target = target.head(args.limit)
+    cache = PlacesCache(Path(args.cache_db), ttl_s=args.cache_ttl_s) if args.cache_db else None
+    if cache is not None:
+        cache.purge()
 
     rows: list[dict[str, str]] = []
     for _, row in target.iterrows():
         place_id = str(row.get("business_id") or "").strip()
         if not place_id:
             continue
+        saved_before = _saved(cache)
         name = str(row.get("name") or "")
         try:
-            details = fetch_place_details(place_id)
+            details = fetch_place_details(place_id, cache=cache)
             website = str(details.get("website") or "")
             rows.append(
                 {
@@ -113,7 +130,8 @@ def main() -> int:
                     "reason": str(exc),
                 }
             )
-        if args.sleep_s:
+        # Cache hits cost no quota, so only real API calls are throttled.
+        if args.sleep_s and _saved(cache) == saved_before:
             time.sleep(args.sleep_s)
 
     out_path = Path(args.out)
@@ -121,6 +139,12 @@ def main() -> int:
     out_df = pd.DataFrame(rows)
     out_df.to_csv(out_path, index=False)
     print(f"Wrote websites: {out_path} ({len(out_df)} rows)")
+    if cache is not None:
+        stats = cache.stats()
+        print(
+            f"Places cache: {stats['places_calls_saved']} API calls saved, "
+            f"{stats['place_details']['misses']} made ({args.cache_db})"
+        )
 
     if args.update_domains:
         domains_path = Path(args.update_domains)
@@ -14,6 +14,7 @@ import requests
 
 from . import __version__
 from .hiring_scan import PROMPT_VERSION, _load_env_file, evaluate_html
+from .ollama_client import parse_hosts, parse_model_tiers
 from .output_contract import validate_hiring_signal_rows
 
 
@@ -40,24 +41,26 @@ def _default_env_file(env_file: Path | None) -> Path | None:
 
 def check_ollama(env_file: Path | None) -> List[str]:
     env = _resolve_env(env_file)
-    host = env.get("OLLAMA_URL") or env.get("OLLAMA_HOST") or "http://127.0.0.1:11434"
-    if "ollama:11434" in host:
-        host = "http://127.0.0.1:11434"
-    model = env.get("MODEL_NAME") or env.get("OLLAMA_MODEL") or ""
+    hosts = parse_hosts(env.get("OLLAMA_URL") or env.get("OLLAMA_HOST") or "http://127.0.0.1:11434")
+    models = parse_model_tiers(env.get("MODEL_NAME") or env.get("OLLAMA_MODEL") or "")
     errors: List[str] = []
-    if not model:
+    if not models:
         errors.append("OLLAMA_MODEL not set")
-    try:
-        resp = requests.get(host.rstrip("/") + "/api/tags", timeout=5)
-        if resp.status_code >= 400:
-            errors.append(f"Ollama unreachable (HTTP {resp.status_code})")
-        else:
+    # Every host in a pool must serve every cascade tier.
+    for host in hosts:
+        prefix = f"{host}: " if len(hosts) > 1 else ""
+        try:
+            resp = requests.get(host.rstrip("/") + "/api/tags", timeout=5)
+            if resp.status_code >= 400:
+                errors.append(f"{prefix}Ollama unreachable (HTTP {resp.status_code})")
+                continue
             payload = resp.json()
             names = [m.get("name") for m in payload.get("models", []) if isinstance(m, dict)]
-            if model and model not in names:
-                errors.append(f"Ollama model not found: {model}")
-    except Exception as exc:
-        errors.append(f"Ollama unreachable: {exc}")
+            for model in models:
+                if model not in names:
+                    errors.append(f"{prefix}Ollama model not found: {model}")
+        except Exception as exc:
+            errors.append(f"{prefix}Ollama unreachable: {exc}")
     return errors
 
 
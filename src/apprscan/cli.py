@@ -92,6 +92,17 @@ def add_map_parser(subparsers: argparse._SubParsersAction) -> argparse.ArgumentP
 
 
 def add_scan_parser(subparsers: argparse._SubParsersAction) -> argparse.ArgumentParser:
+    from .hiring_scan import (
+        CLASSIFIER_HELP,
+        DEFAULT_ESCALATE_BELOW,
+        DEFAULT_PROMPT_TOKENS,
+        DEFAULT_RETRIES,
+        ESCALATE_BELOW_HELP,
+        KEEP_ALIVE_HELP,
+        PROMPT_TOKENS_HELP,
+        RETRIES_HELP,
+    )
+
     p = subparsers.add_parser(
         "scan",
         help="LLM-assisted hiring signal scan (Ollama).",
@@ -104,6 +115,12 @@ def add_scan_parser(subparsers: argparse._SubParsersAction) -> argparse.Argument
     p.add_argument("--max-distance-km", type=float, default=1.0, help="Distance threshold in km.")
     p.add_argument("--limit", type=int, default=10, help="Max companies to process.")
     p.add_argument("--max-urls", type=int, default=2, help="Max URLs to check per company.")
+    p.add_argument(
+        "--url-stats",
+        type=str,
+        default="out/url_stats.json",
+        help="Candidate URL hit statistics (learned ordering); empty to disable.",
+    )
     p.add_argument("--sleep-s", type=float, default=1.0, help="Sleep between HTTP fetches.")
     p.add_argument("--out", type=str, default="out/hiring_signal_lahti.csv", help="Output file.")
     p.add_argument("--format", type=str, default="csv", choices=["csv", "jsonl"], help="Output format.")
@@ -116,16 +133,87 @@ def add_scan_parser(subparsers: argparse._SubParsersAction) -> argparse.Argument
     )
     p.add_argument("--robots-allowlist", type=str, default="", help="Optional allowlist file for robots override.")
     p.add_argument("--env-file", type=str, default="", help="Optional .env path (defaults to repo .env).")
-    p.add_argument("--ollama-host", type=str, default="", help="Ollama host (override).")
-    p.add_argument("--ollama-model", type=str, default="", help="Ollama model (override).")
+    p.add_argument(
+        "--ollama-host",
+        type=str,
+        default="",
+        help="Ollama host, or comma-separated hosts for a load-balanced pool (override).",
+    )
+    p.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Domains scanned in parallel (default: one per Ollama host).",
+    )
+    p.add_argument(
+        "--ollama-model",
+        type=str,
+        default="",
+        help="Ollama model, or comma-separated cascade tiers small,large (override).",
+    )
+    p.add_argument(
+        "--escalate-below",
+        type=float,
+        default=DEFAULT_ESCALATE_BELOW,
+        help=ESCALATE_BELOW_HELP,
+    )
     p.add_argument("--ollama-options", type=str, default="", help="JSON options for Ollama (override).")
+    p.add_argument(
+        "--ollama-keep-alive",
+        type=str,
+        default="",
+        help=KEEP_ALIVE_HELP,
+    )
+    p.add_argument("--llm-retries", type=int, default=DEFAULT_RETRIES, help=RETRIES_HELP)
     p.add_argument("--no-llm", action="store_true", help="Skip LLM and use heuristics only.")
+    p.add_argument(
+        "--classifier",
+        type=str,
+        default="",
+        help=CLASSIFIER_HELP,
+    )
+    p.add_argument(
+        "--prompt-tokens",
+        type=int,
+        default=DEFAULT_PROMPT_TOKENS,
+        help=PROMPT_TOKENS_HELP,
+    )
     p.add_argument("--deterministic", action="store_true", help="Set deterministic LLM options (temp=0).")
     p.add_argument("--run-id", type=str, default="", help="Optional run identifier for outputs.")
     p.set_defaults(func=scan_command)
     return p
 
 
+def add_train_classifier_parser(subparsers: argparse._SubParsersAction) -> argparse.ArgumentParser:
+    p = subparsers.add_parser(
+        "train-classifier",
+        help="Train the local pre-LLM hiring classifier (NumPy).",
+        description=(
+            "Train a hashed n-gram logistic regression from fixtures, golden texts "
+            "and past scan verdicts."
+        ),
+    )
+    p.add_argument(
+        "--fixtures", type=str, default="tests/fixtures/hiring_signal", help="Fixtures directory."
+    )
+    p.add_argument(
+        "--verdicts", type=str, nargs="*", default=[], help="Past scan outputs (csv/jsonl)."
+    )
+    p.add_argument(
+        "--out", type=str, default="out/hiring_classifier.npz", help="Model output path."
+    )
+    p.add_argument("--epochs", type=int, default=300, help="Gradient descent epochs.")
+    p.add_argument("--l2", type=float, default=1e-3, help="L2 regularisation.")
+    p.add_argument(
+        "--yes-threshold", type=float, default=0.8, help="P(yes) at or above this resolves to yes."
+    )
+    p.add_argument(
+        "--no-threshold", type=float, default=0.2, help="P(yes) at or below this resolves to no."
+    )
+    p.set_defaults(func=train_classifier_command)
+    return p
+
+
 def add_check_parser(subparsers: argparse._SubParsersAction) -> argparse.ArgumentParser:
     p = subparsers.add_parser(
         "check",
@@ -212,8 +300,60 @@ def build_parser() -> argparse.ArgumentParser:
     jobs_parser.add_argument(
         "--max-pages-per-domain", type=int, default=30, help="Maksimi sivut per domain (guardrail)."
     )
+    jobs_parser.add_argument(
+        "--max-seconds-per-domain",
+        type=float,
+        default=120.0,
+        help="Aikabudjetti sekunteina per domain (0 = ei rajaa).",
+    )
     jobs_parser.add_argument("--rate-limit", type=float, default=1.0, help="Pyyntoja per sekunti / domain.")
-    jobs_parser.add_argument("--debug-html", action="store_true", help="Tallenna raaka HTML out/jobs/raw/.")
+    jobs_parser.add_argument(
+        "--debug-html",
+        action="store_true",
+        help="Tallenna raa'at vastaukset sivuarkistoon <out>/raw/.",
+    )
+    jobs_parser.add_argument(
+        "--archive",
+        type=str,
+        default=None,
+        help="Tallenna kaikki vastaukset sivuarkistoon (hakemisto).",
+    )
+    jobs_parser.add_argument(
+        "--replay",
+        type=str,
+        default=None,
+        help="Aja discovery, ATS-tunnistus ja extraktio sivuarkistosta ilman verkkoa.",
+    )
+    jobs_parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=0,
+        help="HTML-parsinta prosessipoolissa (0 = samassa prosessissa).",
+    )
+    jobs_parser.add_argument(
+        "--html-parser",
+        type=str,
+        default="html.parser",
+        choices=["html.parser", "lxml"],
+        help="BeautifulSoup-parseri (lxml vaatii lxml-paketin).",
+    )
+    jobs_parser.add_argument(
+        "--skip-unchanged",
+        action="store_true",
+        help=(
+            "Ohita sitemap-URLit, joiden lastmod ei ole muuttunut edellisesta ajosta; "
+            "niiden aiemmat ilmoitukset siirretaan tahan ajoon (out/jobs/sitemap_state.json)."
+        ),
+    )
+    jobs_parser.add_argument(
+        "--url-stats",
+        type=str,
+        default="out/url_stats.json",
+        help=(
+            "Ura-polkujen osumatilastot (jarjestaa polut osumatodennakoisyyden mukaan); "
+            "tyhja = pois."
+        ),
+    )
     jobs_parser.add_argument(
         "--only-shortlist",
         action="store_true",
@@ -256,12 +396,30 @@ def build_parser() -> argparse.ArgumentParser:
         "--domains",
         type=str,
         default=None,
-        help="Olemassa oleva domains CSV validointia varten (business_id,domain). Oletus: --out tiedosto.",
+        help=(
+            "Olemassa oleva domains CSV validointia varten (business_id,domain). "
+            "Oletus: --out tiedosto."
+        ),
+    )
+    domains_parser.add_argument(
+        "--workers",
+        type=int,
+        default=16,
+        help="Rinnakkaiset haut (--suggest/--validate), max 2 per host.",
+    )
+    domains_parser.add_argument(
+        "--head-only",
+        action="store_true",
+        help=(
+            "Validoi pelkalla HEADilla: ei GET-pyyntoa HTML-sivuille, joten evastemuureja "
+            "(consent_gate) ei tunnisteta."
+        ),
     )
     domains_parser.set_defaults(func=domains_command)
 
     add_watch_parser(subparsers)
     add_scan_parser(subparsers)
+    add_train_classifier_parser(subparsers)
     add_check_parser(subparsers)
     add_serve_parser(subparsers)
 
@@ -377,6 +535,8 @@ def build_parser() -> argparse.ArgumentParser:
 
 def jobs_command(args: argparse.Namespace) -> int:
     from .jobs import pipeline
+    from .jobs.parsing import PageParser
+    from .domain_groups import load_redirects
 
     companies_path = Path(args.companies)
     if not companies_path.exists():
@@ -390,17 +550,34 @@ def jobs_command(args: argparse.Namespace) -> int:
     out_dir = Path(args.out)
     out_dir.mkdir(parents=True, exist_ok=True)
     raw_dir = out_dir / "raw" if args.debug_html else None
+    replay_dir = Path(args.replay) if args.replay else None
+    if replay_dir is not None and not (replay_dir / "index.jsonl").exists():
+        print(f"Replay archive not found: {replay_dir}")
+        return 1
 
-    jobs_df, stats_df, activity_df = pipeline.crawl_jobs_pipeline(
-        companies_df,
-        domain_map,
-        suggested_map=suggested_map,
-        max_domains=args.max_domains,
-        max_pages_per_domain=args.max_pages_per_domain,
-        req_per_second=args.rate_limit,
-        debug_html=args.debug_html,
-        out_raw_dir=raw_dir,
-    )
+    try:
+        page_parser = PageParser(workers=args.parse_workers, backend=args.html_parser)
+    except ValueError as exc:
+        print(exc)
+        return 1
+    with page_parser:
+        jobs_df, stats_df, activity_df = pipeline.crawl_jobs_pipeline(
+            companies_df,
+            domain_map,
+            suggested_map=suggested_map,
+            max_domains=args.max_domains,
+            max_pages_per_domain=args.max_pages_per_domain,
+            max_seconds_per_domain=args.max_seconds_per_domain,
+            req_per_second=args.rate_limit,
+            debug_html=args.debug_html,
+            out_raw_dir=raw_dir,
+            sitemap_state_path=out_dir / "sitemap_state.json" if args.skip_unchanged else None,
+            page_parser=page_parser,
+            archive_dir=Path(args.archive) if args.archive else None,
+            replay_dir=replay_dir,
+            url_stats_path=Path(args.url_stats) if args.url_stats else None,
+            redirects=load_redirects(Path(args.domains)) if args.domains else None,
+        )
 
     known_path = Path(args.known_jobs) if args.known_jobs else out_dir / "known_jobs.parquet"
     jobs_df, new_jobs = pipeline.apply_diff(jobs_df, known_path)
@@ -416,6 +593,7 @@ def jobs_command(args: argparse.Namespace) -> int:
     activity_df.to_excel(activity_out, index=False)
 
     print(f"Jobs found: {len(jobs_df)} (new: {len(new_jobs)}); domains: {len(domain_map) or 0}; output: {out_dir}")
+    print(page_parser.summary())
     return 0
 
 
@@ -464,9 +642,13 @@ def domains_command(args: argparse.Namespace) -> int:
         from .domains_discovery import suggest_domains
 
         max_companies = int(getattr(args, "max_companies", 200) or 200)
-        suggestions_df = suggest_domains(out_df, max_companies=max_companies)
         suggested_path = out_path.with_name("domains_suggested.csv")
-        suggestions_df.to_csv(suggested_path, index=False)
+        suggestions_df = suggest_domains(
+            out_df,
+            max_companies=max_companies,
+            max_workers=int(getattr(args, "workers", 16) or 16),
+            out_path=suggested_path,
+        )
         print(f"Domain suggestions written: {suggested_path} ({len(suggestions_df)} rows)")
 
     if getattr(args, "validate", False):
@@ -477,9 +659,13 @@ def domains_command(args: argparse.Namespace) -> int:
             domains_df = pd.read_csv(domains_path)
         else:
             domains_df = out_df
-        validated_df = validate_domains(domains_df)
         validated_path = out_path.with_name("domains_validated.csv")
-        validated_df.to_csv(validated_path, index=False)
+        validated_df = validate_domains(
+            domains_df,
+            max_workers=int(getattr(args, "workers", 16) or 16),
+            out_path=validated_path,
+            check_consent=not getattr(args, "head_only", False),
+        )
         print(f"Domain validation written: {validated_path} ({len(validated_df)} rows)")
 
     return 0
@@ -646,6 +832,26 @@ def scan_command(args: argparse.Namespace) -> int:
     return run_scan(config)
 
 
+def train_classifier_command(args: argparse.Namespace) -> int:
+    from .text_classifier import HiringClassifier, load_fixture_examples, load_verdict_examples
+
+    examples = load_fixture_examples(Path(args.fixtures))
+    examples += load_verdict_examples(Path(p) for p in args.verdicts)
+    if len({ex.label for ex in examples}) < 2:
+        print("Need both yes and no examples to train.")
+        return 1
+    model = HiringClassifier(yes_threshold=args.yes_threshold, no_threshold=args.no_threshold)
+    model.fit(examples, epochs=args.epochs, l2=args.l2)
+    correct = sum(1 for ex in examples if model.classify(ex.text)["signal"] == ex.label)
+    model.save(Path(args.out))
+    print(
+        f"Trained on {len(examples)} examples {model.meta['sources']}; "
+        f"training accuracy {correct / len(examples):.2f}"
+    )
+    print(f"Model written to {args.out}")
+    return 0
+
+
 def check_command(args: argparse.Namespace) -> int:
     from pathlib import Path
 
@@ -0,0 +1,49 @@
+"""Canonical-domain grouping so branches sharing one website are scanned once."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+import pandas as pd
+
+from .http_pool import host_key
+
+
+def load_redirects(path: Path | None) -> Dict[str, str]:
+    """Map host -> redirect target host from a `domains --validate` CSV (domain, redirected_to)."""
+    if path is None or not path.exists():
+        return {}
+    df = pd.read_csv(path)
+    if "domain" not in df.columns or "redirected_to" not in df.columns:
+        return {}
+    redirects: Dict[str, str] = {}
+    for domain, target in zip(df["domain"], df["redirected_to"], strict=True):
+        if pd.isna(domain) or pd.isna(target) or not str(target).strip():
+            continue
+        src, dst = host_key(str(domain)), host_key(str(target))
+        if src and dst and src != dst:
+            redirects[src] = dst
+    return redirects
+
+
+def canonical_domain(value: str, redirects: Dict[str, str] | None = None) -> str:
+    """Lowercased host without scheme/www, following known redirects (cycle-safe)."""
+    host = host_key(str(value or "").strip()) if str(value or "").strip() else ""
+    seen = {host}
+    while redirects and host in redirects and redirects[host] not in seen:
+        host = redirects[host]
+        seen.add(host)
+    return host
+
+
+def group_by_domain(
+    items: Iterable[Tuple[str, str]], redirects: Dict[str, str] | None = None
+) -> Dict[str, List[str]]:
+    """Group (key, domain) pairs by canonical domain; first-seen order is kept in both levels."""
+    groups: Dict[str, List[str]] = {}
+    for key, domain in items:
+        canon = canonical_domain(domain, redirects)
+        if canon:
+            groups.setdefault(canon, []).append(key)
+    return groups
@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
-import re
-from dataclasses import dataclass
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, fields
 from pathlib import Path
 from typing import Dict, Iterable, List, Optional
 from urllib.parse import urljoin, urlparse
@@ -12,6 +13,9 @@ import pandas as pd
 import requests
 from bs4 import BeautifulSoup
 
+from .http_pool import CsvRowWriter, HostLimiter, pooled_session, speculative_probe
+from .jobs.ats import detect_ats_links, extract_links
+
 CAREER_HINTS = [
     "career",
     "careers",
@@ -27,13 +31,23 @@ CAREER_HINTS = [
     "join",
 ]
 COMMON_PATHS = ["/careers", "/jobs", "/open-positions", "/rekry", "/ura", "/tyopaikat"]
-ATS_PATTERNS = {
-    "greenhouse": r"boards\.greenhouse\.io/([^/]+)/?",
-    "lever": r"jobs\.lever\.co/([^/]+)/?",
-    "recruitee": r"\.recruitee\.com",
-    "teamtailor": r"\.teamtailor\.com",
-    "smartrecruiters": r"\.smartrecruiters\.com",
-}
+VALIDATE_COLUMNS = ["business_id", "name", "domain", "status", "redirected_to", "reason"]
+CONSENT_HINTS = ["cookie", "consent", "eväste", "evaste", "hyväksy"]
+CONSENT_SCAN_BYTES = 262_144
+
+# Shared by all worker threads: one keep-alive pool, at most two requests per host at a time.
+# LIMITER caps concurrency only; it does not space requests to a host apart.
+_SESSION: Optional[requests.Session] = None
+_SESSION_LOCK = threading.Lock()
+LIMITER = HostLimiter(per_host=2)
+
+
+def _session() -> requests.Session:
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            _SESSION = pooled_session()
+        return _SESSION
 
 
 @dataclass
@@ -45,8 +59,9 @@ class DomainSuggestion:
     source: str
     confidence: str
     reason: str
+    probes_saved: int = 0
 
-    def to_dict(self) -> Dict[str, str]:
+    def to_dict(self) -> Dict[str, object]:
         return {
             "business_id": self.business_id,
             "name": self.name,
@@ -55,6 +70,7 @@ class DomainSuggestion:
             "source": self.source,
             "confidence": self.confidence,
             "reason": self.reason,
+            "probes_saved": self.probes_saved,
         }
 
 
@@ -69,7 +85,13 @@ def _clean_domain(val: str) -> str:
 
 def _fetch(url: str, timeout: float = 10.0) -> Optional[str]:
     try:
-        resp = requests.get(url, timeout=timeout, allow_redirects=True, headers={"User-Agent": "apprscan-domain/0.1"})
+        with LIMITER.slot(url):
+            resp = _session().get(
+                url,
+                timeout=timeout,
+                allow_redirects=True,
+                headers={"User-Agent": "apprscan-domain/0.1"},
+            )
         if resp.status_code >= 400:
             return None
         return resp.text
@@ -112,19 +134,18 @@ def _find_links(html: str, base_url: str) -> List[str]:
 
 
 def _ats_from_links(links: Iterable[str]) -> Optional[DomainSuggestion]:
-    for link in links:
-        for kind, pattern in ATS_PATTERNS.items():
-            if re.search(pattern, link):
-                return DomainSuggestion(
-                    business_id="",
-                    name="",
-                    homepage_domain="",
-                    suggested_base_url=link,
-                    source="ats",
-                    confidence="high",
-                    reason=f"found {kind} link",
-                )
-    return None
+    detected = detect_ats_links(links)
+    if not detected:
+        return None
+    return DomainSuggestion(
+        business_id="",
+        name="",
+        homepage_domain="",
+        suggested_base_url=detected.get("board_url") or "",
+        source="ats",
+        confidence="high" if detected.get("slug") else "med",
+        reason=f"found {detected.get('kind')} link",
+    )
 
 
 def suggest_for_company(business_id: str, name: str, domain: str) -> Optional[DomainSuggestion]:
@@ -135,101 +156,193 @@ def suggest_for_company(business_id: str, name: str, domain: str) -> Optional[Do
     base = f"https://{domain_clean}"
     html = _fetch(base)
     links = _find_links(html or "", base) if html else []
-    ats_suggestion = _ats_from_links(links)
+    ats_suggestion = _ats_from_links(extract_links(html or ""))
     if ats_suggestion:
         ats_suggestion.business_id = business_id
         ats_suggestion.name = name
         ats_suggestion.homepage_domain = domain_clean
         return ats_suggestion
 
-    # test common paths
-    for path in COMMON_PATHS:
-        url = f"{base}{path}"
-        page = _fetch(url)
-        if page and contains_job_signal(page):
-            return DomainSuggestion(
+    # Common paths, then homepage links, in priority order. Later probes are sent ahead
+    # (bounded by the per-host limiter) and cancelled once an earlier one hits.
+    by_url = {f"{base}{path}": ("common_path", path) for path in COMMON_PATHS}
+    for link in links:
+        by_url.setdefault(link, ("homepage_link", ""))
+    found: List[DomainSuggestion] = []
+
+    def _handle(url: str, page: Optional[str]) -> bool:
+        if not (page and contains_job_signal(page)):
+            return False
+        source, path = by_url[url]
+        found.append(
+            DomainSuggestion(
                 business_id=business_id,
                 name=name,
                 homepage_domain=domain_clean,
                 suggested_base_url=url,
-                source="common_path",
+                source=source,
                 confidence="med",
-                reason=f"matched common path {path}",
+                reason=(
+                    f"matched common path {path}"
+                    if source == "common_path"
+                    else "homepage link with job signals"
+                ),
             )
+        )
+        return True
 
-    # links from homepage
-    for link in links:
-        page = _fetch(link)
-        if page and contains_job_signal(page):
-            return DomainSuggestion(
-                business_id=business_id,
-                name=name,
-                homepage_domain=domain_clean,
-                suggested_base_url=link,
-                source="homepage_link",
-                confidence="med",
-                reason="homepage link with job signals",
-            )
-    return None
+    saved = speculative_probe(list(by_url), _fetch, _handle, max_parallel=LIMITER.per_host)
+    if not found:
+        return None
+    found[0].probes_saved = saved
+    return found[0]
 
 
-def suggest_domains(companies_df: pd.DataFrame, max_companies: int = 200) -> pd.DataFrame:
-    suggestions: List[DomainSuggestion] = []
-    processed = 0
+def suggest_domains(
+    companies_df: pd.DataFrame,
+    max_companies: int = 200,
+    *,
+    max_workers: int = 16,
+    out_path: Optional[Path] = None,
+) -> pd.DataFrame:
+    """Suggest careers URLs concurrently; rows are appended to out_path as they complete."""
+    jobs = []
     for _, row in companies_df.iterrows():
-        if processed >= max_companies:
+        if len(jobs) >= max_companies:
             break
         domain = str(row.get("domain") or "").strip()
         if not domain:
             continue
-        bid = str(row.get("business_id") or "")
-        name = str(row.get("name") or "")
-        sug = suggest_for_company(bid, name, domain)
-        if sug:
-            suggestions.append(sug)
-        processed += 1
-    return pd.DataFrame([s.to_dict() for s in suggestions])
+        jobs.append((str(row.get("business_id") or ""), str(row.get("name") or ""), domain))
+
+    columns = [f.name for f in fields(DomainSuggestion)]
+    writer = CsvRowWriter(out_path, columns) if out_path else None
+    results: Dict[int, DomainSuggestion] = {}
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = {
+                executor.submit(suggest_for_company, *job): idx for idx, job in enumerate(jobs)
+            }
+            for fut in as_completed(futures):
+                sug = fut.result()
+                if sug:
+                    results[futures[fut]] = sug
+                    if writer:
+                        writer.write(sug.to_dict())
+    finally:
+        if writer:
+            writer.close()
+    return pd.DataFrame([results[i].to_dict() for i in sorted(results)])
+
+
+def _read_text_prefix(resp: requests.Response, limit: int = CONSENT_SCAN_BYTES) -> str:
+    chunks: List[bytes] = []
+    size = 0
+    for chunk in resp.iter_content(chunk_size=16_384):
+        chunks.append(chunk)
+        size += len(chunk)
+        if size >= limit:
+            break
+    resp.close()
+    return b"".join(chunks).decode(resp.encoding or "utf-8", errors="replace")
 
 
-def _status_for_url(url: str) -> Dict[str, str]:
+def _status_for_url(url: str, check_consent: bool = True) -> Dict[str, str]:
+    """HEAD first; GET (first 256 KB only) only if HEAD is inconclusive, or for the consent hint
+    on an HTML page (check_consent=False settles every conclusive HEAD)."""
+    target = url if url.startswith("http") else f"https://{url}"
+    headers = {"User-Agent": "apprscan-domain-validate/0.1"}
+    session = _session()
+    head = None
     try:
-        resp = requests.get(
-            url if url.startswith("http") else f"https://{url}",
-            timeout=8,
-            allow_redirects=True,
-            headers={"User-Agent": "apprscan-domain-validate/0.1"},
-        )
+        with LIMITER.slot(target):
+            head = session.head(target, timeout=8, allow_redirects=True, headers=headers)
+    except requests.RequestException:
+        head = None  # some servers drop HEAD; GET decides
+    # Consent gates are HTML; a non-HTML answer needs no sniffing GET.
+    html = head is not None and "text/html" in head.headers.get("Content-Type", "text/html")
+    head_decides = head is not None and (
+        head.status_code in (404, 410)
+        or (head.status_code < 400 and not (check_consent and html))
+    )
+    if head_decides:
+        if head.status_code >= 400:
+            return {"status": f"http_{head.status_code}", "reason": "", "redirected_to": ""}
+        final_url = str(head.url)
+        redirected_to = final_url if final_url.rstrip("/") != url.rstrip("/") else ""
+        return {"status": "ok", "reason": "", "redirected_to": redirected_to}
+    try:
+        with LIMITER.slot(target):
+            resp = session.get(
+                target, timeout=8, allow_redirects=True, headers=headers, stream=True
+            )
+        if resp.status_code < 400:
+            text = _read_text_prefix(resp).lower()
+        else:
+            resp.close()
     except requests.RequestException as exc:
         return {"status": "fetch_failed", "reason": str(exc), "redirected_to": ""}
     final_url = str(resp.url)
     if resp.status_code >= 400:
         return {"status": f"http_{resp.status_code}", "reason": "", "redirected_to": ""}
     # consent hint
-    text = resp.text.lower()
-    if any(k in text for k in ["cookie", "consent", "eväste", "evaste", "hyväksy"]):
+    if any(k in text for k in CONSENT_HINTS):
         return {"status": "consent_gate", "reason": "", "redirected_to": final_url if final_url != url else ""}
     redirected_to = final_url if final_url.rstrip("/") != url.rstrip("/") else ""
     return {"status": "ok", "reason": "", "redirected_to": redirected_to}
 
 
-def validate_domains(domains_df: pd.DataFrame) -> pd.DataFrame:
-    rows = []
-    for _, r in domains_df.iterrows():
-        bid = str(r.get("business_id") or "").strip()
-        name = str(r.get("name") or "").strip()
-        domain = _clean_domain(str(r.get("domain") or ""))
-        if not domain:
-            rows.append({"business_id": bid, "name": name, "domain": "", "status": "no_domain", "redirected_to": "", "reason": ""})
-            continue
-        res = _status_for_url(domain)
-        rows.append(
-            {
-                "business_id": bid,
-                "name": name,
-                "domain": domain,
-                "status": res["status"],
-                "redirected_to": res.get("redirected_to", ""),
-                "reason": res.get("reason", ""),
-            }
+def _validate_row(bid: str, name: str, domain: str, check_consent: bool = True) -> Dict[str, str]:
+    if not domain:
+        return {
+            "business_id": bid,
+            "name": name,
+            "domain": "",
+            "status": "no_domain",
+            "redirected_to": "",
+            "reason": "",
+        }
+    res = _status_for_url(domain, check_consent=check_consent)
+    return {
+        "business_id": bid,
+        "name": name,
+        "domain": domain,
+        "status": res["status"],
+        "redirected_to": res.get("redirected_to", ""),
+        "reason": res.get("reason", ""),
+    }
+
+
+def validate_domains(
+    domains_df: pd.DataFrame,
+    *,
+    max_workers: int = 16,
+    out_path: Optional[Path] = None,
+    check_consent: bool = True,
+) -> pd.DataFrame:
+    """Validate domains concurrently; rows are appended to out_path as they complete."""
+    jobs = [
+        (
+            str(r.get("business_id") or "").strip(),
+            str(r.get("name") or "").strip(),
+            _clean_domain(str(r.get("domain") or "")),
         )
-    return pd.DataFrame(rows)
+        for _, r in domains_df.iterrows()
+    ]
+    writer = CsvRowWriter(out_path, VALIDATE_COLUMNS) if out_path else None
+    rows: Dict[int, Dict[str, str]] = {}
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = {
+                executor.submit(_validate_row, *job, check_consent): idx
+                for idx, job in enumerate(jobs)
+            }
+            for fut in as_completed(futures):
+                row = fut.result()
+                rows[futures[fut]] = row
+                if writer:
+                    writer.write(row)
+    finally:
+        if writer:
+            writer.close()
+    return pd.DataFrame([rows[i] for i in sorted(rows)], columns=VALIDATE_COLUMNS)
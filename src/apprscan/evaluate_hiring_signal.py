@@ -7,19 +7,26 @@ import json
 from pathlib import Path
 
 from .hiring_scan import evaluate_html
+from .text_classifier import HiringClassifier, html_to_text
 
 
-def _eval_set(items):
+def _eval_set(items, classifier: HiringClassifier | None = None):
     total = 0
     correct = 0
     tp = fp = fn = 0
     uncertain = 0
+    resolved = 0
     for item in items:
         html = item["html"]
         expected = item["label"]
         url = item["url"]
         result = evaluate_html(html, url=url)
         predicted = str(result.get("signal") or "").lower()
+        if classifier is not None and predicted != "yes":
+            local = classifier.classify(html_to_text(html))["signal"]
+            if local != "unclear":
+                predicted = local
+                resolved += 1
         total += 1
         if predicted == expected:
             correct += 1
@@ -41,6 +48,7 @@ def _eval_set(items):
         "precision": precision,
         "recall": recall,
         "uncertain_rate": uncertain_rate,
+        "classifier_resolved": resolved,
     }
 
 
@@ -91,7 +99,16 @@ def main() -> int:
     parser.add_argument("--min-precision", type=float, default=None, help="Minimum yes precision.")
     parser.add_argument("--min-recall", type=float, default=None, help="Minimum yes recall.")
     parser.add_argument("--max-uncertain", type=float, default=None, help="Maximum uncertain rate.")
+    parser.add_argument(
+        "--classifier",
+        default="",
+        help=(
+            "Also run a trained classifier (apprscan train-classifier) "
+            "on pages the heuristics leave open."
+        ),
+    )
     args = parser.parse_args()
+    classifier = HiringClassifier.load(Path(args.classifier)) if args.classifier else None
 
     fixtures_dir = Path(args.fixtures)
     try:
@@ -100,13 +117,15 @@ def main() -> int:
         print(str(exc))
         return 2
 
-    base_metrics = _eval_set(items)
+    base_metrics = _eval_set(items, classifier)
     print("Fixture metrics")
     print(f"Total: {base_metrics['total']}")
     print(f"Accuracy: {base_metrics['accuracy']:.2f}")
     print(f"Yes precision: {base_metrics['precision']:.2f}")
     print(f"Yes recall: {base_metrics['recall']:.2f}")
     print(f"Uncertain rate: {base_metrics['uncertain_rate']:.2f}")
+    if classifier is not None:
+        print(f"Classifier resolved: {base_metrics['classifier_resolved']}")
 
     failed = _check_thresholds(base_metrics, "fixtures", args)
 
@@ -125,13 +144,15 @@ def main() -> int:
             if label:
                 golden_items.append({"html": html, "label": label, "url": url})
         if golden_items:
-            golden_metrics = _eval_set(golden_items)
+            golden_metrics = _eval_set(golden_items, classifier)
             print("Golden metrics")
             print(f"Total: {golden_metrics['total']}")
             print(f"Accuracy: {golden_metrics['accuracy']:.2f}")
             print(f"Yes precision: {golden_metrics['precision']:.2f}")
             print(f"Yes recall: {golden_metrics['recall']:.2f}")
             print(f"Uncertain rate: {golden_metrics['uncertain_rate']:.2f}")
+            if classifier is not None:
+                print(f"Classifier resolved: {golden_metrics['classifier_resolved']}")
             failed = _check_thresholds(golden_metrics, "golden", args) or failed
 
     return 1 if failed else 0
@@ -7,10 +7,11 @@ import hashlib
 import json
 import subprocess
 import time
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Iterable, Tuple
+from typing import Any, Callable, Dict, Iterable, Tuple
 from urllib.parse import urlparse
 
 import pandas as pd
@@ -18,11 +19,39 @@ import requests
 from bs4 import BeautifulSoup
 
 from . import __version__
+from .domain_groups import canonical_domain, load_redirects
 from .domains_discovery import COMMON_PATHS, contains_job_signal
+from .http_pool import (
+    AsyncHostLimiter,
+    HostLimiter,
+    aspeculative_probe,
+    pooled_session,
+    speculative_probe,
+)
 from .jobs.ats import detect_ats
 from .jobs.constants import ROBOTS_DISALLOW_ALL, ROBOTS_DISALLOW_URL
-from .jobs.fetch import fetch_url
+from .jobs.fetch import afetch_url, fetch_url
 from .jobs.robots import RobotsChecker
+from .ollama_client import (
+    DEFAULT_ESCALATE_BELOW,
+    DEFAULT_KEEP_ALIVE,
+    DEFAULT_NUM_PREDICT,
+    DEFAULT_RETRIES,
+    ChatCall,
+    ChatSteps,
+    OllamaCallStats,
+    adrive,
+    drive,
+    get_pool,
+    join_model_tiers,
+    needs_escalation,
+    parse_hosts,
+    parse_model_tiers,
+    verdict_steps,
+)
+from .text_classifier import DEFAULT_MODEL_PATH, HiringClassifier
+from .prompt_context import DEFAULT_PROMPT_TOKENS, build_prompt_context, estimate_tokens
+from .url_stats import UrlHitStats
 
 
 PROMPT_SYSTEM = (
@@ -31,6 +60,22 @@ PROMPT_SYSTEM = (
     "evidence (short phrase), evidence_snippets (list of 2-6 short snippets), "
     "evidence_urls (list of URLs), next_url_hint (optional)."
 )
+SCAN_REQ_PER_SECOND = 0.5
+# Heuristic confidence at which probing stops (ATS detection 0.9, JobPosting data 0.8).
+DECISIVE_CONFIDENCE = 0.8
+# Help for the scan flags whose defaults live here; cli.add_scan_parser reuses them.
+ESCALATE_BELOW_HELP = (
+    "Cascade: re-ask the next tier below this confidence (or when the answer is unclear)."
+)
+KEEP_ALIVE_HELP = (
+    f"How long Ollama keeps the model loaded between calls (default {DEFAULT_KEEP_ALIVE})."
+)
+RETRIES_HELP = "Retries for malformed LLM JSON replies."
+CLASSIFIER_HELP = (
+    "Local classifier model run before the LLM (opt-in; "
+    f"e.g. {DEFAULT_MODEL_PATH.as_posix()} from train-classifier)."
+)
+PROMPT_TOKENS_HELP = "Token budget for page text sent to the LLM (relevance-ranked blocks)."
 PROMPT_VERSION = hashlib.sha256(PROMPT_SYSTEM.encode("utf-8")).hexdigest()[:8]
 EVIDENCE_KEYWORDS = [
     "open positions",
@@ -49,6 +94,19 @@ EVIDENCE_KEYWORDS = [
     "avoin tehtava",
     "hae tahan",
 ]
+# Ranking terms for the LLM page context (prefix matches, so inflected Finnish forms count).
+CONTEXT_KEYWORDS = EVIDENCE_KEYWORDS + [
+    "työpaik",
+    "avoimet",
+    "avoin",
+    "haemme",
+    "hae",
+    "oppisopimu",
+    "harjoittel",
+    "trainee",
+    "vacanc",
+    "position",
+]
 COOKIE_WALL_KEYWORDS = [
     "cookie",
     "cookies",
@@ -100,6 +158,13 @@ class ScanConfig:
     prompt_version: str
     use_llm: bool
     run_id: str
+    url_stats_path: Path | None = None
+    prompt_tokens: int = DEFAULT_PROMPT_TOKENS
+    ollama_keep_alive: str = DEFAULT_KEEP_ALIVE
+    llm_retries: int = DEFAULT_RETRIES
+    escalate_below: float = DEFAULT_ESCALATE_BELOW
+    classifier_path: Path | None = None
+    workers: int = 0
 
 
 @dataclass
@@ -111,6 +176,21 @@ class DomainScanResult:
     pages_fetched: int
     results_found: bool
     cookie_wall: Dict[str, Any]
+    probes_saved: int = 0
+    llm_calls: int = 0
+    prompt_chars: int = 0
+    prompt_tokens: int = 0
+    llm_retries: int = 0
+    llm_parse_failures: int = 0
+    llm_latency_ms: float = 0.0
+    llm_tiers: list[Dict[str, Any]] = field(default_factory=list)
+    llm_escalations: int = 0
+    llm_tier_agreements: int = 0
+    classifier_resolved: int = 0
+    # Candidate URLs as probed (before redirects) and the one behind a "yes" verdict, so
+    # url_stats credits the paths it ranks rather than where they redirected.
+    probed_urls: list[str] = field(default_factory=list)
+    signal_probe: str = ""
 
 
 def _load_env_file(path: Path | None) -> Dict[str, str]:
@@ -231,76 +311,141 @@ def _normalize_skip_reason(reason: str | None) -> str:
     return reason
 
 
-def scan_domain(
-    *,
-    domain: str,
-    name: str,
-    website_url: str | None,
-    max_urls: int,
-    sleep_s: float,
-    robots_mode: str,
-    robots_allowlist: Path | None,
-    session: requests.Session | None,
-    rate_limit_state: Dict[str, float] | None,
-    ollama_host: str,
-    ollama_model: str,
-    ollama_options: Dict[str, Any],
-    use_llm: bool,
-) -> DomainScanResult:
-    allowlist = _load_allowlist(robots_allowlist)
-    robots = None if robots_mode == "off" else RobotsChecker(user_agent="apprscan-scan")
-    rate_limit_state = rate_limit_state or {}
-    session = session or requests.Session()
-
-    candidates = _build_candidates(domain, website_url)[: int(max_urls)]
-    checked_urls: list[str] = []
-    errors: list[str] = []
-    skip_reasons: list[str] = []
-    results: list[Dict[str, Any]] = []
-    pages_fetched = 0
-    cookie_wall = {
-        "detected": False,
-        "score": 0.0,
-        "hit_count": 0,
-        "signals": [],
-        "threshold": _cookie_wall_threshold(),
-        "sample_title": "",
-        "matches": [],
-    }
-
-    for url in candidates:
-        robots_override = robots_mode == "allowlist" and domain.lower() in allowlist
-        if robots and not robots_override:
-            allowed, reason = robots.can_fetch_detail(url)
-            if not allowed:
-                checked_urls.append(url)
-                normalized = _normalize_skip_reason(reason or "blocked_by_robots")
-                skip_reasons.append(normalized)
-                errors.append(f"{url}:{normalized}")
-                continue
-        res, fetch_reason = fetch_url(
-            session,
-            url,
-            rate_limit_state=rate_limit_state,
-            req_per_second_per_domain=0.5,
-            robots=None if robots_override else robots,
-            max_bytes=2_000_000,
+class _DomainScan:
+    """State and per-page decisions of one domain scan, shared by scan_domain and ascan_domain.
+
+    handle_steps() yields its LLM calls as ChatCall instead of making them, so the sync and the
+    async driver run the very same logic and produce identical results.
+    """
+
+    def __init__(
+        self,
+        *,
+        domain: str,
+        name: str,
+        website_url: str | None,
+        max_urls: int,
+        sleep_s: float,
+        robots_mode: str,
+        robots_allowlist: Path | None,
+        ollama_host: str,
+        ollama_model: str,
+        ollama_options: Dict[str, Any],
+        use_llm: bool,
+        probe_parallelism: int = 2,
+        url_stats: UrlHitStats | None = None,
+        prompt_tokens: int = DEFAULT_PROMPT_TOKENS,
+        ollama_keep_alive: str = DEFAULT_KEEP_ALIVE,
+        llm_retries: int = DEFAULT_RETRIES,
+        escalate_below: float = DEFAULT_ESCALATE_BELOW,
+        classifier: HiringClassifier | None = None,
+        robots: RobotsChecker | None = None,
+        on_event: Callable[..., None] | None = None,
+        on_timing: Callable[[str, float], None] | None = None,
+    ):
+        allowlist = _load_allowlist(robots_allowlist)
+        self.name = name
+        self.ollama_host = ollama_host
+        self.ollama_model = ollama_model
+        self.ollama_options = ollama_options
+        self.use_llm = use_llm
+        self.probe_parallelism = probe_parallelism
+        self.prompt_tokens = prompt_tokens
+        self.ollama_keep_alive = ollama_keep_alive
+        self.llm_retries = llm_retries
+        self.escalate_below = escalate_below
+        self.classifier = classifier
+        self.emit = on_event or (lambda stage, **data: None)
+        self.on_timing = on_timing or (lambda stage, seconds: None)
+        self.fetch_ms: Dict[str, float] = {}
+        # A caller-supplied checker (companion batch) shares its robots.txt cache across domains.
+        self.robots = (
+            None if robots_mode == "off" else (robots or RobotsChecker(user_agent="apprscan-scan"))
         )
+        self.robots_override = robots_mode == "allowlist" and domain.lower() in allowlist
+        self.min_interval = max(sleep_s, 1.0 / SCAN_REQ_PER_SECOND)
+
+        candidates = _build_candidates(domain, website_url)
+        if url_stats is not None:
+            candidates = url_stats.order(domain, candidates)
+        self.candidates = candidates[: int(max_urls)]
+        self.blocked: Dict[str, str] = {}
+        self.checked_urls: list[str] = []
+        self.probed_urls: list[str] = []
+        self.probe_of: Dict[str, str] = {}  # final URL -> candidate URL
+        self.errors: list[str] = []
+        self.skip_reasons: list[str] = []
+        self.results: list[Dict[str, Any]] = []
+        self.pages_fetched = 0
+        self.cookie_wall = {
+            "detected": False,
+            "score": 0.0,
+            "hit_count": 0,
+            "signals": [],
+            "threshold": _cookie_wall_threshold(),
+            "sample_title": "",
+            "matches": [],
+        }
+        self.llm_usage = {"llm_calls": 0, "prompt_chars": 0, "prompt_tokens": 0}
+        # ollama_model may list cascade tiers ("small,large"); stats are kept per tier.
+        self.tiers = parse_model_tiers(ollama_model)
+        self.tier_stats = {model: OllamaCallStats() for model in self.tiers}
+        self.cascade = {"llm_escalations": 0, "llm_tier_agreements": 0}
+        self.classifier_resolved = 0
+
+    def timing(self, stage: str, started: float) -> None:
+        self.on_timing(stage, time.monotonic() - started)
+
+    @property
+    def fetch_robots(self) -> RobotsChecker | None:
+        return None if self.robots_override else self.robots
+
+    def robots_hosts(self) -> set[str]:
+        """Hosts whose robots.txt the up-front check needs (ascan_domain prefetches them)."""
+        if not self.robots or self.robots_override:
+            return set()
+        return {urlparse(url).netloc for url in self.candidates}
+
+    def check_robots(self, started: float | None = None) -> None:
+        """`started`: when robots work began (ascan_domain prefetches robots.txt first)."""
+        # Robots decisions are made up front, in candidate order; allowed URLs are probed
+        # speculatively (probe_parallelism in flight, requests spaced per host) and handled
+        # in order.
+        if self.robots and not self.robots_override:
+            started = time.monotonic() if started is None else started
+            for url in self.candidates:
+                allowed, reason = self.robots.can_fetch_detail(url)
+                if not allowed:
+                    self.blocked[url] = _normalize_skip_reason(reason or "blocked_by_robots")
+            self.timing("robots", started)
+
+    def handle_steps(self, url: str, probe) -> ChatSteps[bool]:
+        """Record one probe; True when it is decisive (later probes are cancelled)."""
+        res, fetch_reason = probe
+        fetch_ms = self.fetch_ms.get(url, 0.0)
+        self.probed_urls.append(url)
         if res is None:
-            checked_urls.append(url)
-            normalized = _normalize_skip_reason(fetch_reason or "fetch_failed")
-            skip_reasons.append(normalized)
-            errors.append(f"{url}:{normalized}")
-            continue
-        pages_fetched += 1
-        checked_urls.append(res.final_url)
+            self.checked_urls.append(url)
+            normalized = self.blocked.get(url) or _normalize_skip_reason(
+                fetch_reason or "fetch_failed"
+            )
+            self.skip_reasons.append(normalized)
+            self.errors.append(f"{url}:{normalized}")
+            self.emit("url_fetched", url=url, ok=False, reason=normalized, ms=fetch_ms)
+            return False
+        self.pages_fetched += 1
+        self.emit("url_fetched", url=res.final_url, ok=True, status=res.status, ms=fetch_ms)
+        self.checked_urls.append(res.final_url)
+        self.probe_of.setdefault(res.final_url, url)
+        # "heuristic" covers text extraction, cookie-wall check, heuristics and the classifier.
+        heuristic_started = time.monotonic()
         title, text = _extract_text(res.html)
         is_wall, hits, score, matches, signals, threshold = _cookie_wall_signals(title, text)
         if is_wall:
             matched = ",".join(matches[:5])
-            errors.append(f"{res.final_url}:cookie_wall:{hits}:{score:.2f}:{matched}")
-            if not cookie_wall["detected"] or score > cookie_wall["score"]:
-                cookie_wall.update(
+            self.errors.append(f"{res.final_url}:cookie_wall:{hits}:{score:.2f}:{matched}")
+            if not self.cookie_wall["detected"] or score > self.cookie_wall["score"]:
+                self.cookie_wall.update(
                     {
                         "detected": True,
                         "score": score,
@@ -311,10 +456,11 @@ def scan_domain(
                         "matches": matches[:5],
                     }
                 )
-            continue
+            self.timing("heuristic", heuristic_started)
+            return False
         heuristic = evaluate_html(res.html, res.final_url)
         if heuristic["signal"] == "yes":
-            results.append(
+            self.results.append(
                 {
                     "hiring_signal": "yes",
                     "confidence": heuristic["confidence"],
@@ -324,30 +470,77 @@ def scan_domain(
                     "next_url_hint": "",
                     "url_checked": res.final_url,
                 }
+            )
+            self.timing("heuristic", heuristic_started)
+            # ATS / JSON-LD hits are decisive: no other page can outrank them.
+            return float(heuristic["confidence"]) >= DECISIVE_CONFIDENCE
+        if self.classifier is not None:
+            local = self.classifier.classify(text)
+            if local["signal"] in {"yes", "no"}:
+                keywords = EVIDENCE_KEYWORDS if local["signal"] == "yes" else NEGATIVE_KEYWORDS
+                # Same evidence bar as LLM verdicts; a label the page text does not back up
+                # falls through to the LLM.
+                verdict = _ensure_evidence(
+                    {
+                        "hiring_signal": local["signal"],
+                        "confidence": local["confidence"],
+                        "evidence": local["evidence"],
+                        "evidence_snippets": _extract_snippets(text, keywords, max_snippets=3),
+                        "evidence_urls": [res.final_url],
+                        "next_url_hint": "",
+                        "url_checked": res.final_url,
+                    }
                 )
-            continue
-        if use_llm and ollama_model:
+                if verdict["hiring_signal"] != "unclear":
+                    self.classifier_resolved += 1
+                    self.results.append(verdict)
+                    self.timing("heuristic", heuristic_started)
+                    return False
+        self.timing("heuristic", heuristic_started)
+        if self.use_llm and self.ollama_model:
+            llm_started = time.monotonic()
+            self.emit("llm_started", url=res.final_url)
             try:
-                result = _evaluate_page(
+                _, context = build_prompt_context(
+                    res.html,
+                    keywords=CONTEXT_KEYWORDS,
+                    penalty_keywords=COOKIE_WALL_KEYWORDS,
+                    budget_tokens=self.prompt_tokens,
+                )
+                result = yield from _cascade_steps(
                     res.final_url,
                     title,
-                    text,
-                    company_name=name,
-                    host=ollama_host,
-                    model=ollama_model,
-                    options=ollama_options,
+                    context.text,
+                    company_name=self.name,
+                    host=self.ollama_host,
+                    tiers=self.tiers,
+                    options=self.ollama_options,
+                    escalate_below=self.escalate_below,
+                    usage=self.llm_usage,
+                    keep_alive=self.ollama_keep_alive,
+                    retries=self.llm_retries,
+                    tier_stats=self.tier_stats,
+                    cascade=self.cascade,
                 )
                 if not result.get("evidence_urls"):
                     result["evidence_urls"] = [res.final_url]
                 if "evidence_snippets" not in result:
-                    result["evidence_snippets"] = _extract_snippets(text, EVIDENCE_KEYWORDS, max_snippets=3)
+                    result["evidence_snippets"] = _extract_snippets(
+                        text, EVIDENCE_KEYWORDS, max_snippets=3
+                    )
                 result["url_checked"] = res.final_url
                 result = _ensure_evidence(result)
-                results.append(result)
+                self.results.append(result)
             except Exception as exc:
-                errors.append(f"{res.final_url}:{exc}")
+                self.errors.append(f"{res.final_url}:{exc}")
+                outcome = {"signal": "", "error": str(exc)}
+            else:
+                outcome = {"signal": result.get("hiring_signal") or ""}
+            self.timing("llm", llm_started)
+            llm_ms = round(1000 * (time.monotonic() - llm_started), 1)
+            self.emit("llm_finished", url=res.final_url, ms=llm_ms, **outcome)
         else:
-            results.append(
+            self.results.append(
                 {
                     "hiring_signal": "unclear",
                     "confidence": 0.0,
@@ -358,19 +551,164 @@ def scan_domain(
                     "url_checked": res.final_url,
                 }
             )
-        if sleep_s:
-            time.sleep(sleep_s)
-
-    selected = _select_result(results)
-    return DomainScanResult(
-        selected=selected,
-        checked_urls=checked_urls,
-        errors=errors,
-        skipped_reasons=skip_reasons,
-        pages_fetched=pages_fetched,
-        results_found=bool(results),
-        cookie_wall=cookie_wall,
+        return False
+
+    def result(self, probes_saved: int) -> DomainScanResult:
+        tier_stats = self.tier_stats
+        selected = _select_result(self.results)
+        hit_url = str(selected.get("url_checked") or "")
+        if str(selected.get("hiring_signal") or "").lower() != "yes":
+            hit_url = ""
+        return DomainScanResult(
+            selected=selected,
+            checked_urls=self.checked_urls,
+            errors=self.errors,
+            skipped_reasons=self.skip_reasons,
+            pages_fetched=self.pages_fetched,
+            results_found=bool(self.results),
+            cookie_wall=self.cookie_wall,
+            probes_saved=probes_saved,
+            **self.llm_usage,
+            llm_retries=sum(st.retries for st in tier_stats.values()),
+            llm_parse_failures=sum(st.parse_failures for st in tier_stats.values()),
+            llm_latency_ms=round(1000 * sum(sum(st.latencies_s) for st in tier_stats.values()), 1),
+            llm_tiers=[
+                {"model": model, **st.to_dict()} for model, st in tier_stats.items() if st.calls
+            ],
+            **self.cascade,
+            classifier_resolved=self.classifier_resolved,
+            probed_urls=self.probed_urls,
+            signal_probe=self.probe_of.get(hit_url, "") if hit_url else "",
+        )
+
+
+def scan_domain(
+    *,
+    domain: str,
+    name: str,
+    website_url: str | None,
+    max_urls: int,
+    sleep_s: float,
+    robots_mode: str,
+    robots_allowlist: Path | None,
+    session: requests.Session | None,
+    rate_limit_state: Dict[str, float] | None,
+    ollama_host: str,
+    ollama_model: str,
+    ollama_options: Dict[str, Any],
+    use_llm: bool,
+    probe_parallelism: int = 2,
+    url_stats: UrlHitStats | None = None,
+    prompt_tokens: int = DEFAULT_PROMPT_TOKENS,
+    ollama_keep_alive: str = DEFAULT_KEEP_ALIVE,
+    llm_retries: int = DEFAULT_RETRIES,
+    escalate_below: float = DEFAULT_ESCALATE_BELOW,
+    classifier: HiringClassifier | None = None,
+    robots: RobotsChecker | None = None,
+    on_event: Callable[..., None] | None = None,
+    on_timing: Callable[[str, float], None] | None = None,
+) -> DomainScanResult:
+    """Probe candidate URLs and pick the best verdict.
+
+    on_event(stage, **data) is called in candidate order for `url_fetched`, `llm_started` and
+    `llm_finished` (the companion service streams these as run progress). on_timing(stage,
+    seconds) reports `robots`, `fetch`, `heuristic` and `llm` durations (service metrics).
+    """
+    scan = _DomainScan(
+        domain=domain,
+        name=name,
+        website_url=website_url,
+        max_urls=max_urls,
+        sleep_s=sleep_s,
+        robots_mode=robots_mode,
+        robots_allowlist=robots_allowlist,
+        ollama_host=ollama_host,
+        ollama_model=ollama_model,
+        ollama_options=ollama_options,
+        use_llm=use_llm,
+        probe_parallelism=probe_parallelism,
+        url_stats=url_stats,
+        prompt_tokens=prompt_tokens,
+        ollama_keep_alive=ollama_keep_alive,
+        llm_retries=llm_retries,
+        escalate_below=escalate_below,
+        classifier=classifier,
+        robots=robots,
+        on_event=on_event,
+        on_timing=on_timing,
+    )
+    # rate_limit_state is kept for callers; spacing is now done by the per-host limiter below.
+    session = session or requests.Session()
+    scan.check_robots()
+    limiter = HostLimiter(per_host=probe_parallelism, min_interval=scan.min_interval)
+
+    def _probe(url: str):
+        if url in scan.blocked:
+            return None, scan.blocked[url]
+        with limiter.slot(url):
+            started = time.monotonic()
+            try:
+                return fetch_url(
+                    session,
+                    url,
+                    rate_limit_state=None,
+                    req_per_second_per_domain=SCAN_REQ_PER_SECOND,
+                    robots=scan.fetch_robots,
+                    max_bytes=2_000_000,
+                )
+            finally:
+                scan.fetch_ms[url] = round(1000 * (time.monotonic() - started), 1)
+                scan.timing("fetch", started)
+
+    probes_saved = speculative_probe(
+        scan.candidates,
+        _probe,
+        lambda url, probe: drive(scan.handle_steps(url, probe), _sync_chat),
+        max_parallel=probe_parallelism,
     )
+    return scan.result(probes_saved)
+
+
+async def ascan_domain(*, client: Any, **kwargs: Any) -> DomainScanResult:
+    """scan_domain over an async client (httpx.AsyncClient): same arguments and same result.
+
+    Fetches, robots.txt and Ollama calls are awaited instead of holding a thread; `session`
+    and `rate_limit_state` are accepted for symmetry and ignored.
+    """
+    kwargs.pop("session", None)
+    kwargs.pop("rate_limit_state", None)
+    scan = _DomainScan(**kwargs)
+    robots_started = time.monotonic()
+    for host in sorted(scan.robots_hosts()):
+        await scan.robots.aget_parser(host, client)
+    scan.check_robots(robots_started)
+    limiter = AsyncHostLimiter(per_host=scan.probe_parallelism, min_interval=scan.min_interval)
+
+    async def _probe(url: str):
+        if url in scan.blocked:
+            return None, scan.blocked[url]
+        async with limiter.slot(url):
+            started = time.monotonic()
+            try:
+                return await afetch_url(
+                    client,
+                    url,
+                    rate_limit_state=None,
+                    req_per_second_per_domain=SCAN_REQ_PER_SECOND,
+                    robots=scan.fetch_robots,
+                    max_bytes=2_000_000,
+                )
+            finally:
+                scan.fetch_ms[url] = round(1000 * (time.monotonic() - started), 1)
+                scan.timing("fetch", started)
+
+    async def _handle(url: str, probe) -> bool:
+        return await adrive(scan.handle_steps(url, probe), lambda call: _aollama_chat(client, call))
+
+    probes_saved = await aspeculative_probe(
+        scan.candidates, _probe, _handle, max_parallel=scan.probe_parallelism
+    )
+    return scan.result(probes_saved)
 
 
 def _ensure_evidence(result: Dict[str, Any]) -> Dict[str, Any]:
@@ -444,37 +782,18 @@ def _build_candidates(domain: str, website_url: str | None) -> list[str]:
     return ordered
 
 
-def _ollama_chat(host: str, model: str, system: str, user: str, options: Dict[str, Any]) -> str:
-    payload = {
-        "model": model,
-        "messages": [
-            {"role": "system", "content": system},
-            {"role": "user", "content": user},
-        ],
-        "stream": False,
-        "options": options,
-    }
-    url = host.rstrip("/") + "/api/chat"
-    resp = requests.post(url, json=payload, timeout=90)
-    if resp.status_code >= 400:
-        raise RuntimeError(f"ollama_http_{resp.status_code}")
-    data = resp.json()
-    content = data.get("message", {}).get("content")
-    if not isinstance(content, str):
-        raise RuntimeError("ollama_empty_response")
-    return content
-
-
-def _parse_json(content: str) -> Dict[str, Any]:
-    try:
-        return json.loads(content)
-    except json.JSONDecodeError:
-        pass
-    start = content.find("{")
-    end = content.rfind("}")
-    if start != -1 and end != -1 and end > start:
-        return json.loads(content[start : end + 1])
-    raise json.JSONDecodeError("No JSON block", content, 0)
+def _ollama_chat(
+    host: str,
+    model: str,
+    system: str,
+    user: str,
+    options: Dict[str, Any],
+    *,
+    format: Dict[str, Any] | str | None = None,
+    keep_alive: str | None = None,
+) -> str:
+    # host may list several Ollama servers ("http://a:11434,http://b:11434"); see OllamaPool.
+    return get_pool(host).chat(model, system, user, options, format=format, keep_alive=keep_alive)
 
 
 def evaluate_html(html: str, url: str) -> Dict[str, Any]:
@@ -514,7 +833,36 @@ def evaluate_html(html: str, url: str) -> Dict[str, Any]:
     return {"signal": "unclear", "confidence": 0.0, "evidence": ""}
 
 
-def _evaluate_page(
+async def _aollama_chat(client: Any, call: ChatCall) -> str:
+    return await get_pool(call.host).achat(
+        client,
+        call.model,
+        call.system,
+        call.user,
+        call.options,
+        format=call.format,
+        keep_alive=call.keep_alive,
+    )
+
+
+def _sync_chat(call: ChatCall) -> str:
+    # Looked up at call time so tests can monkeypatch _ollama_chat.
+    return _ollama_chat(
+        call.host,
+        call.model,
+        call.system,
+        call.user,
+        call.options,
+        format=call.format,
+        keep_alive=call.keep_alive,
+    )
+
+
+def _evaluate_page(url: str, title: str, text: str, **kwargs: Any) -> Dict[str, Any]:
+    return drive(_page_steps(url, title, text, **kwargs), _sync_chat)
+
+
+def _page_steps(
     url: str,
     title: str,
     text: str,
@@ -523,13 +871,17 @@ def _evaluate_page(
     host: str,
     model: str,
     options: Dict[str, Any],
-) -> Dict[str, Any]:
+    usage: Dict[str, int] | None = None,
+    keep_alive: str | None = DEFAULT_KEEP_ALIVE,
+    retries: int = DEFAULT_RETRIES,
+    stats: OllamaCallStats | None = None,
+) -> ChatSteps[Dict[str, Any]]:
     system = PROMPT_SYSTEM
     user = (
         f"Company: {company_name}\n"
         f"URL: {url}\n"
         f"Title: {title}\n"
-        "Page text snippet:\n"
+        "Page text (most relevant parts, in page order):\n"
         f"{text}\n\n"
         "Decision rules:\n"
         "- yes: explicit hiring, careers, open positions, job listings, 'rekry', 'ura', 'tyopaikat'.\n"
@@ -537,8 +889,76 @@ def _evaluate_page(
         "- unclear: insufficient or ambiguous.\n"
         "- evidence must include 2-6 snippets + URLs; otherwise return unclear.\n"
     )
-    raw = _ollama_chat(host, model, system, user, options)
-    return _parse_json(raw)
+    if usage is not None:
+        chars = len(system) + len(user)
+        usage["llm_calls"] = usage.get("llm_calls", 0) + 1
+        usage["prompt_chars"] = usage.get("prompt_chars", 0) + chars
+        usage["prompt_tokens"] = usage.get("prompt_tokens", 0) + estimate_tokens(system + user)
+    verdict = yield from verdict_steps(
+        host,
+        model,
+        system,
+        user,
+        options,
+        keep_alive=keep_alive,
+        retries=retries,
+        stats=stats,
+    )
+    return verdict
+
+
+def _evaluate_cascade(url: str, title: str, text: str, **kwargs: Any) -> Dict[str, Any]:
+    return drive(_cascade_steps(url, title, text, **kwargs), _sync_chat)
+
+
+def _cascade_steps(
+    url: str,
+    title: str,
+    text: str,
+    *,
+    company_name: str,
+    host: str,
+    tiers: list[str],
+    options: Dict[str, Any],
+    escalate_below: float,
+    usage: Dict[str, int],
+    keep_alive: str | None,
+    retries: int,
+    tier_stats: Dict[str, OllamaCallStats],
+    cascade: Dict[str, int],
+) -> ChatSteps[Dict[str, Any]]:
+    """Ask tiers in order; only unclear/low-confidence answers go to the next (larger) model."""
+    verdict: Dict[str, Any] | None = None
+    for idx, model in enumerate(tiers):
+        if verdict is not None:
+            cascade["llm_escalations"] += 1
+        try:
+            result = yield from _page_steps(
+                url,
+                title,
+                text,
+                company_name=company_name,
+                host=host,
+                model=model,
+                options=options,
+                usage=usage,
+                keep_alive=keep_alive,
+                retries=retries,
+                stats=tier_stats[model],
+            )
+        except Exception:
+            if verdict is None and idx == len(tiers) - 1:
+                raise
+            continue
+        if verdict is not None and result.get("hiring_signal") == verdict.get("hiring_signal"):
+            cascade["llm_tier_agreements"] += 1
+        verdict = result
+        verdict["ollama_tier"] = model
+        if not needs_escalation(verdict, escalate_below):
+            break
+    if verdict is None:
+        raise RuntimeError("ollama_no_tiers")
+    return verdict
 
 
 def _score_signal(signal: str) -> int:
@@ -598,9 +1018,8 @@ def build_config(args: argparse.Namespace) -> ScanConfig:
 
     ollama_host = args.ollama_host or env.get("OLLAMA_URL") or env.get("OLLAMA_HOST") or "http://127.0.0.1:11434"
     ollama_model = args.ollama_model or env.get("MODEL_NAME") or env.get("OLLAMA_MODEL") or ""
-    if "ollama:11434" in ollama_host:
-        ollama_host = "http://127.0.0.1:11434"
-    options: Dict[str, Any] = {"temperature": 0.2, "num_predict": 400}
+    ollama_host = ",".join(parse_hosts(ollama_host))
+    options: Dict[str, Any] = {"temperature": 0.2, "num_predict": DEFAULT_NUM_PREDICT}
     if env.get("OLLAMA_OPTIONS"):
         try:
             options.update(json.loads(env["OLLAMA_OPTIONS"]))
@@ -613,6 +1032,7 @@ def build_config(args: argparse.Namespace) -> ScanConfig:
             pass
     if args.deterministic:
         options["temperature"] = 0.0
+    keep_alive = args.ollama_keep_alive or env.get("OLLAMA_KEEP_ALIVE") or DEFAULT_KEEP_ALIVE
     run_id = args.run_id or datetime.utcnow().strftime("%Y%m%d_%H%M%S")
     ollama_temperature = float(options.get("temperature", 0.0))
 
@@ -638,6 +1058,13 @@ def build_config(args: argparse.Namespace) -> ScanConfig:
         prompt_version=PROMPT_VERSION,
         use_llm=not args.no_llm,
         run_id=run_id,
+        url_stats_path=Path(args.url_stats) if args.url_stats else None,
+        prompt_tokens=int(args.prompt_tokens),
+        ollama_keep_alive=keep_alive,
+        llm_retries=int(args.llm_retries),
+        escalate_below=float(args.escalate_below),
+        classifier_path=Path(args.classifier) if args.classifier else None,
+        workers=int(args.workers),
     )
 
 
@@ -670,21 +1097,39 @@ def run_scan(config: ScanConfig) -> int:
         return 1
 
     target = filtered.head(int(config.limit))
+    # Branches sharing a website (www/scheme/known redirects) are scanned once.
+    redirects = load_redirects(config.domains_path)
+    scanned: Dict[str, Tuple[str, DomainScanResult]] = {}
     rate_limit_state: Dict[str, float] = {}
     crawl_ts = _now_iso()
     git_sha = _resolve_git_sha(_repo_root())
-    session = requests.Session()
+    session = pooled_session()
+    url_stats = UrlHitStats.load(config.url_stats_path) if config.url_stats_path else None
+    classifier = None
+    if config.classifier_path:
+        if config.classifier_path.exists():
+            classifier = HiringClassifier.load(config.classifier_path)
+            print(f"Classifier: {config.classifier_path} (resolves confident pages before the LLM)")
+        else:
+            print(f"Classifier not found, skipping: {config.classifier_path}")
 
-    rows: list[Dict[str, Any]] = []
+    records = []
+    leads: Dict[str, Tuple[str, str, str, Any]] = {}
     for _, row in target.iterrows():
         bid = str(row.get("business_id") or "").strip()
         name = str(row.get("name") or "")
         domain = str(row.get("domain") or "").strip()
         website_url = row.get("website.url")
-        scan_result = scan_domain(
-            domain=domain,
-            name=name,
-            website_url=website_url,
+        canon = canonical_domain(domain, redirects)
+        records.append((bid, name, domain, website_url, canon))
+        leads.setdefault(canon, (bid, name, domain, website_url))
+
+    def _scan(lead: Tuple[str, str, str, Any]) -> DomainScanResult:
+        _, lead_name, lead_domain, lead_website = lead
+        return scan_domain(
+            domain=lead_domain,
+            name=lead_name,
+            website_url=lead_website,
             max_urls=config.max_urls,
             sleep_s=config.sleep_s,
             robots_mode=config.robots_mode,
@@ -695,7 +1140,26 @@ def run_scan(config: ScanConfig) -> int:
             ollama_model=config.ollama_model,
             ollama_options=config.ollama_options,
             use_llm=config.use_llm,
+            url_stats=url_stats,
+            prompt_tokens=config.prompt_tokens,
+            ollama_keep_alive=config.ollama_keep_alive,
+            llm_retries=config.llm_retries,
+            escalate_below=config.escalate_below,
+            classifier=classifier,
         )
+
+    # Domains run concurrently (default: one worker per Ollama host); rows keep input order.
+    workers = config.workers or max(1, len(parse_hosts(config.ollama_host)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {canon: executor.submit(_scan, lead) for canon, lead in leads.items()}
+        for canon, fut in futures.items():
+            scanned[canon] = (leads[canon][0], fut.result())
+
+    rows: list[Dict[str, Any]] = []
+    for bid, name, domain, _website_url, canon in records:
+        lead_bid, scan_result = scanned[canon]
+        lead_domain = leads[canon][2]
+        shared_scan_of = "" if (lead_bid, lead_domain) == (bid, domain) else lead_bid
         selected = scan_result.selected
         skipped_reason = ""
         if not scan_result.results_found and scan_result.skipped_reasons:
@@ -719,10 +1183,23 @@ def run_scan(config: ScanConfig) -> int:
                 "evidence_urls": selected.get("evidence_urls") or [],
                 "signal_url": selected.get("url_checked") or "",
                 "checked_urls": ";".join(scan_result.checked_urls),
+                "probes_saved": scan_result.probes_saved,
+                "shared_scan_of": shared_scan_of,
+                "llm_calls": 0 if shared_scan_of else scan_result.llm_calls,
+                "prompt_chars": 0 if shared_scan_of else scan_result.prompt_chars,
+                "prompt_tokens": 0 if shared_scan_of else scan_result.prompt_tokens,
+                "llm_retries": 0 if shared_scan_of else scan_result.llm_retries,
+                "llm_parse_failures": 0 if shared_scan_of else scan_result.llm_parse_failures,
+                "llm_latency_ms": 0.0 if shared_scan_of else scan_result.llm_latency_ms,
+                "llm_tiers": [] if shared_scan_of else scan_result.llm_tiers,
+                "llm_escalations": 0 if shared_scan_of else scan_result.llm_escalations,
+                "llm_tier_agreements": 0 if shared_scan_of else scan_result.llm_tier_agreements,
+                "classifier_resolved": 0 if shared_scan_of else scan_result.classifier_resolved,
                 "next_url_hint": selected.get("next_url_hint") or "",
                 "errors": ";".join(scan_result.errors),
                 "skipped_reason": skipped_reason,
-                "ollama_model": config.ollama_model or "",
+                "ollama_model": join_model_tiers(config.ollama_model),
+                "ollama_tier": selected.get("ollama_tier") or "",
                 "ollama_temperature": config.ollama_temperature,
                 "prompt_version": config.prompt_version,
                 "deterministic": bool(config.deterministic),
@@ -730,19 +1207,52 @@ def run_scan(config: ScanConfig) -> int:
                 "output_format": config.output_format,
             }
         )
+        if url_stats is not None and not shared_scan_of:
+            url_stats.record_probes(scan_result.probed_urls, scan_result.signal_probe)
+
+    if url_stats is not None and config.url_stats_path:
+        url_stats.save(config.url_stats_path)
 
     config.out_path.parent.mkdir(parents=True, exist_ok=True)
     df = pd.DataFrame(rows)
     if config.output_format == "jsonl":
         df.to_json(config.out_path, orient="records", lines=True, force_ascii=False)
     else:
-        for col in ("evidence_snippets", "evidence_urls"):
+        for col in ("evidence_snippets", "evidence_urls", "llm_tiers"):
             df[col] = df[col].apply(lambda val: json.dumps(val, ensure_ascii=False))
         df.to_csv(config.out_path, index=False)
     print(f"Wrote hiring signals: {config.out_path} ({len(rows)} rows)")
+    if config.use_llm:
+        _print_llm_summary(rows)
     return 0
 
 
+def _print_llm_summary(rows: list[Dict[str, Any]]) -> None:
+    calls = sum(int(r["llm_calls"]) for r in rows)
+    latency = sum(float(r["llm_latency_ms"]) for r in rows)
+    prompt_tokens = sum(int(r["prompt_tokens"]) for r in rows)
+    print(
+        f"LLM: {calls} calls, {sum(int(r['llm_retries']) for r in rows)} retries, "
+        f"{sum(int(r['llm_parse_failures']) for r in rows)} parse failures, "
+        f"{latency / max(calls, 1):.0f} ms/call, {prompt_tokens} prompt tokens"
+    )
+    tiers: Dict[str, list[float]] = {}
+    for row in rows:
+        for tier in row["llm_tiers"]:
+            agg = tiers.setdefault(tier["model"], [0, 0.0])
+            agg[0] += tier["calls"]
+            agg[1] += tier["latency_ms_mean"] * tier["calls"]
+    for model, (tier_calls, tier_ms) in tiers.items():
+        print(f"  tier {model}: {tier_calls} calls, {tier_ms / max(tier_calls, 1):.0f} ms/call")
+    escalations = sum(int(r["llm_escalations"]) for r in rows)
+    if escalations:
+        agreements = sum(int(r["llm_tier_agreements"]) for r in rows)
+        print(
+            f"  escalations: {escalations}, "
+            f"agreement with previous tier: {agreements / escalations:.0%}"
+        )
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="LLM-assisted hiring signal scan (Ollama).")
     parser.add_argument("--master", default="out/master_places.xlsx", help="Master file (xlsx/csv/parquet).")
@@ -752,6 +1262,11 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--max-distance-km", type=float, default=1.0, help="Distance threshold in km.")
     parser.add_argument("--limit", type=int, default=10, help="Max companies to process.")
     parser.add_argument("--max-urls", type=int, default=2, help="Max URLs to check per company.")
+    parser.add_argument(
+        "--url-stats",
+        default="out/url_stats.json",
+        help="Candidate URL hit statistics (learned ordering); empty to disable.",
+    )
     parser.add_argument("--sleep-s", type=float, default=1.0, help="Sleep between HTTP fetches.")
     parser.add_argument("--out", default="out/hiring_signal_lahti.csv", help="Output file.")
     parser.add_argument("--format", default="csv", choices=["csv", "jsonl"], help="Output format.")
@@ -763,10 +1278,48 @@ def build_parser() -> argparse.ArgumentParser:
     )
     parser.add_argument("--robots-allowlist", default="", help="Optional allowlist file for robots override.")
     parser.add_argument("--env-file", default="", help="Optional .env path (defaults to repo .env).")
-    parser.add_argument("--ollama-host", default="", help="Ollama host (override).")
-    parser.add_argument("--ollama-model", default="", help="Ollama model (override).")
+    parser.add_argument(
+        "--ollama-host",
+        default="",
+        help="Ollama host, or comma-separated hosts for a load-balanced pool (override).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Domains scanned in parallel (default: one per Ollama host).",
+    )
+    parser.add_argument(
+        "--ollama-model",
+        default="",
+        help="Ollama model, or comma-separated cascade tiers small,large (override).",
+    )
+    parser.add_argument(
+        "--escalate-below",
+        type=float,
+        default=DEFAULT_ESCALATE_BELOW,
+        help=ESCALATE_BELOW_HELP,
+    )
     parser.add_argument("--ollama-options", default="", help="JSON options for Ollama (override).")
+    parser.add_argument(
+        "--ollama-keep-alive",
+        default="",
+        help=KEEP_ALIVE_HELP,
+    )
+    parser.add_argument(
+        "--llm-retries",
+        type=int,
+        default=DEFAULT_RETRIES,
+        help=RETRIES_HELP,
+    )
     parser.add_argument("--no-llm", action="store_true", help="Skip LLM and use heuristics only.")
+    parser.add_argument("--classifier", default="", help=CLASSIFIER_HELP)
+    parser.add_argument(
+        "--prompt-tokens",
+        type=int,
+        default=DEFAULT_PROMPT_TOKENS,
+        help=PROMPT_TOKENS_HELP,
+    )
     parser.add_argument("--deterministic", action="store_true", help="Set deterministic LLM options (temp=0).")
     parser.add_argument("--run-id", default="", help="Optional run identifier for outputs.")
     return parser
@@ -0,0 +1,205 @@
+"""Pooled HTTP session and per-host politeness for concurrent fetchers."""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Sequence,
+    TypeVar,
+)
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+T = TypeVar("T")
+
+
+def host_key(url: str) -> str:
+    parsed = urlparse(url if "://" in url else f"https://{url}")
+    host = (parsed.hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+class HostLimiter:
+    """Caps concurrent requests per host and spaces request starts by min_interval seconds."""
+
+    def __init__(self, per_host: int = 2, min_interval: float = 0.0):
+        self.per_host = max(1, per_host)
+        self.min_interval = max(0.0, min_interval)
+        self._lock = threading.Lock()
+        self._sems: Dict[str, threading.BoundedSemaphore] = {}
+        self._next_start: Dict[str, float] = {}
+
+    @contextmanager
+    def slot(self, url: str) -> Iterator[None]:
+        host = host_key(url)
+        with self._lock:
+            sem = self._sems.setdefault(host, threading.BoundedSemaphore(self.per_host))
+        with sem:
+            with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next_start.get(host, 0.0))
+                self._next_start[host] = start + self.min_interval
+            if start > now:
+                time.sleep(start - now)
+            yield
+
+
+class AsyncHostLimiter:
+    """HostLimiter for coroutines on one event loop (waits with asyncio.sleep, no threads)."""
+
+    def __init__(self, per_host: int = 2, min_interval: float = 0.0):
+        self.per_host = max(1, per_host)
+        self.min_interval = max(0.0, min_interval)
+        self._sems: Dict[str, asyncio.Semaphore] = {}
+        self._next_start: Dict[str, float] = {}
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[None]:
+        host = host_key(url)
+        sem = self._sems.setdefault(host, asyncio.Semaphore(self.per_host))
+        async with sem:
+            now = time.monotonic()
+            start = max(now, self._next_start.get(host, 0.0))
+            self._next_start[host] = start + self.min_interval
+            if start > now:
+                await asyncio.sleep(start - now)
+            yield
+
+
+def pooled_session(pool_size: int = 32) -> requests.Session:
+    """One keep-alive session shared by worker threads (urllib3 pools are thread-safe)."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def require_httpx() -> Any:
+    """The httpx module (installed with the `server` extra), or a RuntimeError saying so."""
+    try:
+        import httpx
+    except ImportError as exc:
+        raise RuntimeError("Async scanning requires httpx: pip install .[server]") from exc
+    return httpx
+
+
+def async_client(pool_size: int = 32, timeout: float = 20.0) -> Any:
+    """httpx.AsyncClient counterpart of pooled_session."""
+    httpx = require_httpx()
+    limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+    return httpx.AsyncClient(limits=limits, timeout=timeout, follow_redirects=True)
+
+
+def async_transport_errors() -> tuple[type[BaseException], ...]:
+    """Exceptions an async client raises for network failures (requests.RequestException's role)."""
+    try:
+        import httpx
+    except ImportError:
+        return (OSError,)
+    return (OSError, httpx.TransportError)
+
+
+def decode_like_requests(content: bytes, headers: Mapping[str, str]) -> str:
+    """Body text exactly as requests' Response.text would decode it (header charset, else
+    ISO-8859-1 for text/*, else detected), so async fetches see the same page text."""
+    shim = requests.Response()
+    shim._content = content
+    shim.headers = CaseInsensitiveDict(headers)
+    shim.encoding = get_encoding_from_headers(shim.headers)
+    return shim.text
+
+
+class CsvRowWriter:
+    """Append rows to a CSV as they complete (header written up front, flushed per row)."""
+
+    def __init__(self, path: Path, columns: List[str]):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = path.open("w", encoding="utf-8", newline="")
+        self._writer = csv.DictWriter(self._fh, fieldnames=columns, extrasaction="ignore")
+        self._writer.writeheader()
+        self._lock = threading.Lock()
+
+    def write(self, row: Dict[str, object]) -> None:
+        with self._lock:
+            self._writer.writerow(row)
+            self._fh.flush()
+
+    def close(self) -> None:
+        self._fh.close()
+
+    def __enter__(self) -> "CsvRowWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def speculative_probe(
+    urls: Sequence[str],
+    fetch: Callable[[str], T],
+    handle: Callable[[str, T], bool],
+    *,
+    max_parallel: int = 2,
+) -> int:
+    """Fetch urls ahead of time (max_parallel in flight) but hand results to handle() in order.
+
+    handle returns True on a decisive signal; probes still queued are cancelled. Returns the
+    number of probes saved (never sent).
+    """
+    if not urls:
+        return 0
+    with ThreadPoolExecutor(max_workers=max(1, max_parallel)) as executor:
+        futures = [executor.submit(fetch, url) for url in urls]
+        for idx, (url, fut) in enumerate(zip(urls, futures, strict=True)):
+            if handle(url, fut.result()):
+                return sum(1 for pending in futures[idx + 1 :] if pending.cancel())
+    return 0
+
+
+async def aspeculative_probe(
+    urls: Sequence[str],
+    fetch: Callable[[str], Awaitable[T]],
+    handle: Callable[[str, T], Awaitable[bool]],
+    *,
+    max_parallel: int = 2,
+) -> int:
+    """speculative_probe for coroutines: same ordering, cancellation and saved-probe count."""
+    if not urls:
+        return 0
+    gate = asyncio.Semaphore(max(1, max_parallel))
+    started: set[int] = set()
+
+    async def _run(idx: int, url: str) -> T:
+        async with gate:
+            started.add(idx)
+            return await fetch(url)
+
+    tasks = [asyncio.create_task(_run(idx, url)) for idx, url in enumerate(urls)]
+    try:
+        for idx, (url, task) in enumerate(zip(urls, tasks, strict=True)):
+            if await handle(url, await task):
+                return sum(1 for later in range(idx + 1, len(urls)) if later not in started)
+        return 0
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,168 @@
+"""Content-addressed raw page archive and offline replay.
+
+Layout of an archive directory:
+- pages.seg: concatenated gzip members, one per unique response body (sha256-addressed)
+- index.jsonl: one line per response: method, url, status, headers, fetched_at, sha256,
+  offset, length. The last line for a (method, url) pair wins on replay.
+
+Recording and replay both plug in as requests transport adapters, so every consumer
+that goes through a session (pages, sitemaps, robots.txt, ATS APIs) is covered.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import io
+import json
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+SEGMENT_NAME = "pages.seg"
+INDEX_NAME = "index.jsonl"
+# Bodies are stored decoded; these would describe the wire format, not the stored bytes.
+DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+@dataclass
+class ArchiveEntry:
+    method: str
+    url: str
+    status: int
+    headers: Dict[str, str]
+    fetched_at: str
+    sha256: str
+    offset: int
+    length: int
+
+
+class PageArchive:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.entries: Dict[str, ArchiveEntry] = {}
+        self.blobs: Dict[str, tuple[int, int]] = {}
+        self._lock = threading.Lock()
+        index_path = self.path / INDEX_NAME
+        if index_path.exists():
+            for line in index_path.read_text(encoding="utf-8").splitlines():
+                if not line.strip():
+                    continue
+                entry = ArchiveEntry(**json.loads(line))
+                self.entries[self._key(entry.method, entry.url)] = entry
+                self.blobs[entry.sha256] = (entry.offset, entry.length)
+
+    @staticmethod
+    def _key(method: str, url: str) -> str:
+        return f"{method.upper()} {url}"
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def record(
+        self, method: str, url: str, status: int, headers: Dict[str, str], body: bytes
+    ) -> ArchiveEntry:
+        sha = hashlib.sha256(body).hexdigest()
+        headers = {k: v for k, v in headers.items() if k.lower() not in DROP_HEADERS}
+        with self._lock:
+            self.path.mkdir(parents=True, exist_ok=True)
+            if sha not in self.blobs:
+                member = gzip.compress(body)
+                with (self.path / SEGMENT_NAME).open("ab") as seg:
+                    offset = seg.tell()
+                    seg.write(member)
+                self.blobs[sha] = (offset, len(member))
+            offset, length = self.blobs[sha]
+            entry = ArchiveEntry(
+                method=method.upper(),
+                url=url,
+                status=status,
+                headers=headers,
+                fetched_at=time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                sha256=sha,
+                offset=offset,
+                length=length,
+            )
+            with (self.path / INDEX_NAME).open("a", encoding="utf-8") as idx:
+                idx.write(json.dumps(entry.__dict__, ensure_ascii=False) + "\n")
+            self.entries[self._key(entry.method, url)] = entry
+        return entry
+
+    def lookup(self, method: str, url: str) -> Optional[ArchiveEntry]:
+        return self.entries.get(self._key(method, url))
+
+    def read_body(self, entry: ArchiveEntry) -> bytes:
+        with (self.path / SEGMENT_NAME).open("rb") as seg:
+            seg.seek(entry.offset)
+            return gzip.decompress(seg.read(entry.length))
+
+
+class ArchivingAdapter(HTTPAdapter):
+    """Live transport that also writes every response into the archive."""
+
+    def __init__(self, archive: PageArchive, **kwargs):
+        super().__init__(**kwargs)
+        self.archive = archive
+
+    def send(self, request, **kwargs):  # type: ignore[override]
+        resp = super().send(request, **kwargs)
+        body = resp.content
+        self.archive.record(
+            request.method or "GET", request.url or "", resp.status_code, dict(resp.headers), body
+        )
+        if kwargs.get("stream"):
+            # Streaming readers (sitemaps) read resp.raw, which .content has drained.
+            resp.raw = io.BytesIO(body)
+        return resp
+
+
+class ReplayAdapter(BaseAdapter):
+    """Offline transport: answers from the archive, 404 for anything not recorded."""
+
+    def __init__(self, archive: PageArchive):
+        super().__init__()
+        self.archive = archive
+
+    def send(self, request, **kwargs):  # type: ignore[override]
+        entry = self.archive.lookup(request.method or "GET", request.url or "")
+        resp = requests.Response()
+        resp.request = request
+        resp.url = request.url
+        if entry is None:
+            resp.status_code = 404
+            resp.reason = "Not in archive"
+            resp.headers = CaseInsensitiveDict({"X-Apprscan-Replay": "miss"})
+            resp.raw = io.BytesIO(b"")
+            return resp
+        resp.status_code = entry.status
+        resp.reason = "Replayed"
+        resp.headers = CaseInsensitiveDict(entry.headers)
+        resp.encoding = get_encoding_from_headers(resp.headers)
+        resp.raw = io.BytesIO(self.archive.read_body(entry))
+        return resp
+
+    def close(self) -> None:
+        pass
+
+
+def archiving_session(archive: PageArchive) -> requests.Session:
+    session = requests.Session()
+    adapter = ArchivingAdapter(archive)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def replay_session(archive: PageArchive) -> requests.Session:
+    session = requests.Session()
+    adapter = ReplayAdapter(archive)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
@@ -2,31 +2,52 @@
 
 from __future__ import annotations
 
-from typing import Dict, Optional
+from typing import Dict
 
-from .lever import detect_lever, fetch_lever_jobs
-from .greenhouse import detect_greenhouse, fetch_greenhouse_jobs
-from .recruitee import detect_recruitee, fetch_recruitee_jobs
-from .teamtailor import detect_teamtailor, fetch_teamtailor_jobs
+from .detect import (
+    ATS_HOSTS,
+    ATS_PROVIDERS,
+    detect_ats,
+    detect_ats_links,
+    extract_links,
+    is_ats_url,
+)
+from .greenhouse import fetch_greenhouse_jobs
+from .lever import fetch_lever_jobs
+from .recruitee import fetch_recruitee_jobs
+from .smartrecruiters import fetch_smartrecruiters_jobs
+from .teamtailor import fetch_teamtailor_jobs
+from .workable import fetch_workable_jobs
 
+__all__ = [
+    "ATS_HOSTS",
+    "ATS_PROVIDERS",
+    "detect_ats",
+    "detect_ats_links",
+    "extract_links",
+    "fetch_ats_jobs",
+    "is_ats_url",
+]
 
-def detect_ats(url: str, html: str) -> Optional[Dict[str, str]]:
-    for detector in (detect_lever, detect_greenhouse, detect_recruitee, detect_teamtailor):
-        detected = detector(url, html)
-        if detected:
-            return detected
-    return None
+FETCHERS = {
+    "lever": fetch_lever_jobs,
+    "greenhouse": fetch_greenhouse_jobs,
+    "recruitee": fetch_recruitee_jobs,
+    "teamtailor": fetch_teamtailor_jobs,
+    "workable": fetch_workable_jobs,
+    "smartrecruiters": fetch_smartrecruiters_jobs,
+}
 
 
-def fetch_ats_jobs(detected: Dict[str, str], company: Dict[str, str], crawl_ts: str):
+def fetch_ats_jobs(detected: Dict[str, str], company: Dict[str, str], crawl_ts: str, session=None):
     kind = detected.get("kind")
     slug = detected.get("slug") or detected.get("board")
-    if kind == "lever" and slug:
-        return fetch_lever_jobs(slug, company, crawl_ts)
-    if kind == "greenhouse" and slug:
-        return fetch_greenhouse_jobs(slug, company, crawl_ts)
-    if kind == "recruitee" and slug:
-        return fetch_recruitee_jobs(slug, company, crawl_ts)
-    if kind == "teamtailor" and slug:
-        return fetch_teamtailor_jobs(slug, company, crawl_ts)
+    if not kind:
+        return [], "ats_not_detected"
+    fetcher = FETCHERS.get(kind)
+    if fetcher is None:
+        # Recognised provider without a public unauthenticated feed.
+        return [], f"{kind}_not_implemented"
+    if slug:
+        return fetcher(slug, company, crawl_ts, session=session)
     return [], "ats_missing_slug"
@@ -0,0 +1,154 @@
+"""Single-pass ATS detection over page links."""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+# One regex pass over the page pulls out every absolute (or protocol-relative) URL;
+# ATS boards are always on their own hosts so relative links never matter here.
+LINK_RE = re.compile(r"""(?:https?:)?//[A-Za-z0-9.-]+\.[A-Za-z]{2,}(?::\d+)?[^\s"'<>)\\]*""")
+
+
+@dataclass(frozen=True)
+class AtsProvider:
+    kind: str
+    hosts: tuple[str, ...]
+    slug_from: str  # "path" (first path segment) or "subdomain" or "none"
+    board_template: str = ""
+    ignored_slugs: frozenset[str] = frozenset()
+
+
+ATS_PROVIDERS: List[AtsProvider] = [
+    AtsProvider(
+        "lever", ("lever.co",), "path", "https://jobs.lever.co/{slug}", frozenset({"hire"})
+    ),
+    AtsProvider(
+        "greenhouse",
+        ("greenhouse.io",),
+        "path",
+        "https://boards.greenhouse.io/{slug}",
+        frozenset({"embed", "v1"}),
+    ),
+    AtsProvider("recruitee", ("recruitee.com",), "subdomain", "https://{slug}.recruitee.com"),
+    AtsProvider(
+        "teamtailor",
+        ("teamtailor.com", "teamtailor-cdn.com"),
+        "subdomain",
+        "https://{slug}.teamtailor.com/jobs",
+        frozenset({"career", "scripts", "images"}),
+    ),
+    AtsProvider(
+        "workable",
+        ("workable.com",),
+        "path",
+        "https://apply.workable.com/{slug}",
+        frozenset({"j", "api", "careers-page"}),
+    ),
+    AtsProvider(
+        "smartrecruiters",
+        ("smartrecruiters.com",),
+        "path",
+        "https://jobs.smartrecruiters.com/{slug}",
+        frozenset({"oneclick-ui"}),
+    ),
+    AtsProvider("jobylon", ("jobylon.com",), "none"),
+    AtsProvider("talentadore", ("talentadore.com",), "none"),
+    AtsProvider("sympa", ("sympa.com",), "none"),
+    AtsProvider("jazzhr", ("applytojob.com", "jazzhr.com"), "subdomain", "https://{slug}.applytojob.com/apply"),
+]
+
+# Host suffix -> provider; lookups walk the last 2-3 labels of a host instead of looping providers.
+HOST_TABLE: Dict[str, AtsProvider] = {host: p for p in ATS_PROVIDERS for host in p.hosts}
+ATS_HOSTS = frozenset(HOST_TABLE)
+GENERIC_SUBDOMAINS = {
+    "www",
+    "app",
+    "api",
+    "assets",
+    "cdn",
+    "static",
+    "jobs",
+    "careers",
+    "apply",
+    "boards",
+    "job-boards",
+}
+
+
+def _host(url: str) -> str:
+    if url.startswith("//"):
+        url = "https:" + url
+    parsed = urlparse(url if "://" in url else f"https://{url}")
+    return (parsed.hostname or "").lower()
+
+
+def provider_for_host(host: str) -> Optional[AtsProvider]:
+    labels = host.lower().split(".")
+    for size in (2, 3):
+        if len(labels) >= size:
+            provider = HOST_TABLE.get(".".join(labels[-size:]))
+            if provider:
+                return provider
+    return None
+
+
+def is_ats_url(url: str) -> bool:
+    if not url:
+        return False
+    return provider_for_host(_host(url)) is not None
+
+
+def _slug_for(provider: AtsProvider, url: str, host: str) -> Optional[str]:
+    if provider.slug_from == "subdomain":
+        suffix = next((h for h in provider.hosts if host.endswith(h)), "")
+        if suffix == "teamtailor-cdn.com":
+            return None
+        prefix = host[: -len(suffix)].rstrip(".") if suffix else ""
+        slug = prefix.split(".")[-1] if prefix else ""
+    elif provider.slug_from == "path":
+        parsed = urlparse(url if not url.startswith("//") else "https:" + url)
+        for key in ("for", "board"):
+            values = parse_qs(parsed.query).get(key)
+            if values:
+                return values[0]
+        segments = [seg for seg in parsed.path.split("/") if seg]
+        slug = segments[0] if segments else ""
+        if not slug:
+            # Legacy {slug}.provider.com boards.
+            labels = host.split(".")
+            slug = labels[0] if len(labels) > 2 else ""
+    else:
+        return None
+    if not slug or slug.lower() in GENERIC_SUBDOMAINS or slug.lower() in provider.ignored_slugs:
+        return None
+    return slug
+
+
+def extract_links(html: str) -> List[str]:
+    return list(dict.fromkeys(LINK_RE.findall(html or "")))
+
+
+def detect_ats_links(links: Iterable[str]) -> Optional[Dict[str, Optional[str]]]:
+    """Return {kind, slug, board_url} for the best ATS link, preferring one with a slug."""
+    fallback: Optional[Dict[str, Optional[str]]] = None
+    for link in links:
+        host = _host(link)
+        provider = provider_for_host(host) if host else None
+        if provider is None:
+            continue
+        slug = _slug_for(provider, link, host)
+        if slug:
+            board_url = (
+                provider.board_template.format(slug=slug) if provider.board_template else link
+            )
+            return {"kind": provider.kind, "slug": slug, "board_url": board_url}
+        if fallback is None:
+            fallback = {"kind": provider.kind, "slug": None, "board_url": link}
+    return fallback
+
+
+def detect_ats(url: str, html: str) -> Optional[Dict[str, Optional[str]]]:
+    return detect_ats_links([url, *extract_links(html)])
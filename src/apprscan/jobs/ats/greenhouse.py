@@ -3,29 +3,22 @@
 from __future__ import annotations
 
 import requests
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Tuple
 
 from ..model import JobPosting
 from ..tagging import detect_tags
 from ..text import clean_html_snippet
 
 
-def detect_greenhouse(url: str, html: str) -> Optional[Dict[str, str]]:
-    if "greenhouse.io" in url or "boards.greenhouse.io" in html:
-        parts = url.split("/")
-        token = None
-        for i, part in enumerate(parts):
-            if "greenhouse" in part and i + 1 < len(parts):
-                token = parts[i + 1]
-                break
-        return {"kind": "greenhouse", "slug": token}
-    return None
-
-
-def fetch_greenhouse_jobs(slug: str, company: Dict[str, str], crawl_ts: str) -> Tuple[List[JobPosting], str | None]:
+def fetch_greenhouse_jobs(
+    slug: str,
+    company: Dict[str, str],
+    crawl_ts: str,
+    session: requests.Session | None = None,
+) -> Tuple[List[JobPosting], str | None]:
     url = f"https://boards-api.greenhouse.io/v1/boards/{slug}/jobs"
     try:
-        resp = requests.get(url, timeout=20)
+        resp = (session or requests).get(url, timeout=20)
         if resp.status_code >= 400:
             return [], f"http_{resp.status_code}"
         data = resp.json()
@@ -3,31 +3,22 @@
 from __future__ import annotations
 
 import requests
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Tuple
 
 from ..model import JobPosting
 from ..tagging import detect_tags
 from ..text import clean_html_snippet
 
 
-def detect_lever(url: str, html: str) -> Optional[Dict[str, str]]:
-    if "lever.co" in url or "lever.co" in html:
-        # Try to extract slug from URL (jobs.lever.co/{slug})
-        parts = url.split("/")
-        for i, part in enumerate(parts):
-            if part.endswith("lever.co") and i + 1 < len(parts):
-                return {"kind": "lever", "slug": parts[i + 1]}
-        # fallback: search for hire.lever.co script
-        if "hire.lever.co" in html:
-            return {"kind": "lever", "slug": "hire"}
-        return {"kind": "lever", "slug": None}
-    return None
-
-
-def fetch_lever_jobs(slug: str, company: Dict[str, str], crawl_ts: str) -> Tuple[List[JobPosting], str | None]:
+def fetch_lever_jobs(
+    slug: str,
+    company: Dict[str, str],
+    crawl_ts: str,
+    session: requests.Session | None = None,
+) -> Tuple[List[JobPosting], str | None]:
     url = f"https://api.lever.co/v0/postings/{slug}?mode=json"
     try:
-        resp = requests.get(url, timeout=20)
+        resp = (session or requests).get(url, timeout=20)
         if resp.status_code >= 400:
             return [], f"http_{resp.status_code}"
         data = resp.json()
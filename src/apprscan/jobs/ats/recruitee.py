@@ -3,29 +3,22 @@
 from __future__ import annotations
 
 import requests
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Tuple
 
 from ..model import JobPosting
 from ..tagging import detect_tags
 from ..text import clean_html_snippet
 
 
-def detect_recruitee(url: str, html: str) -> Optional[Dict[str, str]]:
-    if "recruitee.com" in url or "recruitee.com" in html:
-        parts = url.split("/")
-        slug = None
-        for part in parts:
-            if part.endswith(".recruitee.com"):
-                slug = part.split(".")[0]
-                break
-        return {"kind": "recruitee", "slug": slug}
-    return None
-
-
-def fetch_recruitee_jobs(slug: str, company: Dict[str, str], crawl_ts: str) -> Tuple[List[JobPosting], str | None]:
+def fetch_recruitee_jobs(
+    slug: str,
+    company: Dict[str, str],
+    crawl_ts: str,
+    session: requests.Session | None = None,
+) -> Tuple[List[JobPosting], str | None]:
     url = f"https://{slug}.recruitee.com/api/offers/"
     try:
-        resp = requests.get(url, timeout=20)
+        resp = (session or requests).get(url, timeout=20)
         if resp.status_code >= 400:
             return [], f"http_{resp.status_code}"
         data = resp.json()
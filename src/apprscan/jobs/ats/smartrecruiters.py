@@ -0,0 +1,52 @@
+"""SmartRecruiters ATS fetcher (public postings API)."""
+
+from __future__ import annotations
+
+from typing import Dict, List, Tuple
+
+import requests
+
+from ..model import JobPosting
+from ..tagging import detect_tags
+
+
+def fetch_smartrecruiters_jobs(
+    slug: str, company: Dict[str, str], crawl_ts: str, session: requests.Session | None = None
+) -> Tuple[List[JobPosting], str | None]:
+    url = f"https://api.smartrecruiters.com/v1/companies/{slug}/postings"
+    try:
+        resp = (session or requests).get(url, timeout=20)
+        if resp.status_code >= 400:
+            return [], f"http_{resp.status_code}"
+        data = resp.json()
+    except Exception as exc:  # pragma: no cover - network failure
+        return [], str(exc)
+
+    jobs: List[JobPosting] = []
+    for item in data.get("content", []):
+        title = item.get("name") or ""
+        posting_id = item.get("id") or ""
+        job_url = f"https://jobs.smartrecruiters.com/{slug}/{posting_id}" if posting_id else ""
+        location = item.get("location") or {}
+        parts = (location.get("city"), location.get("country"))
+        loc = ", ".join(part for part in parts if part) or None
+        employment = (item.get("typeOfEmployment") or {}).get("label")
+        function = (item.get("function") or {}).get("label") or ""
+        tags = detect_tags(f"{title} {function}")
+        jobs.append(
+            JobPosting(
+                company_business_id=company.get("business_id", ""),
+                company_name=company.get("name", ""),
+                company_domain=company.get("domain", ""),
+                job_title=title,
+                job_url=job_url,
+                location_text=loc,
+                employment_type=employment,
+                posted_date=item.get("releasedDate"),
+                description_snippet=None,
+                source="smartrecruiters",
+                tags=tags,
+                crawl_ts=crawl_ts,
+            )
+        )
+    return jobs, None
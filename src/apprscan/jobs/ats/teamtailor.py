@@ -1,25 +1,69 @@
-"""Teamtailor ATS fetcher (best-effort placeholder)."""
+"""Teamtailor ATS fetcher (public RSS job feed)."""
 
 from __future__ import annotations
 
-from typing import Dict, List, Optional, Tuple
+import xml.etree.ElementTree as ET
+from typing import Dict, List, Tuple
+
+import requests
 
 from ..model import JobPosting
+from ..tagging import detect_tags
+from ..text import clean_html_snippet
 
 
-def detect_teamtailor(url: str, html: str) -> Optional[Dict[str, str]]:
-    if "teamtailor" in url or "teamtailor" in html:
-        # Look for company slug in URL like https://{slug}.teamtailor.com
-        slug = None
-        parts = url.split("/")
-        for part in parts:
-            if part.endswith(".teamtailor.com"):
-                slug = part.split(".")[0]
-                break
-        return {"kind": "teamtailor", "slug": slug}
+def _child_text(item: ET.Element, suffix: str) -> str | None:
+    for child in item.iter():
+        if child.tag == suffix or child.tag.endswith("}" + suffix):
+            if child.text and child.text.strip():
+                return child.text.strip()
     return None
 
 
-def fetch_teamtailor_jobs(slug: str, company: Dict[str, str], crawl_ts: str) -> Tuple[List[JobPosting], str | None]:
-    # Teamtailor often requires keys; we leave placeholder.
-    return [], "teamtailor_not_implemented"
+def parse_teamtailor_rss(xml_text: str, company: Dict[str, str], crawl_ts: str) -> List[JobPosting]:
+    root = ET.fromstring(xml_text)
+    jobs: List[JobPosting] = []
+    for item in root.iter("item"):
+        title = _child_text(item, "title") or ""
+        job_url = _child_text(item, "link") or ""
+        desc = _child_text(item, "description") or ""
+        posted = _child_text(item, "pubDate")
+        loc = _child_text(item, "city")
+        tags = detect_tags(f"{title} {desc}")
+        jobs.append(
+            JobPosting(
+                company_business_id=company.get("business_id", ""),
+                company_name=company.get("name", ""),
+                company_domain=company.get("domain", ""),
+                job_title=title,
+                job_url=job_url,
+                location_text=loc,
+                employment_type=None,
+                posted_date=posted,
+                description_snippet=clean_html_snippet(desc),
+                source="teamtailor",
+                tags=tags,
+                crawl_ts=crawl_ts,
+            )
+        )
+    return jobs
+
+
+def fetch_teamtailor_jobs(
+    slug: str,
+    company: Dict[str, str],
+    crawl_ts: str,
+    session: requests.Session | None = None,
+) -> Tuple[List[JobPosting], str | None]:
+    # The JSON API needs a per-company key; the career site RSS feed is public.
+    url = f"https://{slug}.teamtailor.com/jobs.rss"
+    try:
+        resp = (session or requests).get(url, timeout=20)
+        if resp.status_code >= 400:
+            return [], f"http_{resp.status_code}"
+        jobs = parse_teamtailor_rss(resp.text, company, crawl_ts)
+    except ET.ParseError:
+        return [], "teamtailor_bad_feed"
+    except Exception as exc:  # pragma: no cover - network failure
+        return [], str(exc)
+    return jobs, None
@@ -0,0 +1,52 @@
+"""Workable ATS fetcher (public widget API)."""
+
+from __future__ import annotations
+
+from typing import Dict, List, Tuple
+
+import requests
+
+from ..model import JobPosting
+from ..tagging import detect_tags
+from ..text import clean_html_snippet
+
+
+def fetch_workable_jobs(
+    slug: str,
+    company: Dict[str, str],
+    crawl_ts: str,
+    session: requests.Session | None = None,
+) -> Tuple[List[JobPosting], str | None]:
+    url = f"https://apply.workable.com/api/v1/widget/accounts/{slug}"
+    try:
+        resp = (session or requests).get(url, timeout=20)
+        if resp.status_code >= 400:
+            return [], f"http_{resp.status_code}"
+        data = resp.json()
+    except Exception as exc:  # pragma: no cover - network failure
+        return [], str(exc)
+
+    jobs: List[JobPosting] = []
+    for item in data.get("jobs", []):
+        title = item.get("title") or ""
+        job_url = item.get("url") or item.get("shortlink") or item.get("application_url") or ""
+        loc = ", ".join(part for part in (item.get("city"), item.get("country")) if part) or None
+        desc = item.get("description") or ""
+        tags = detect_tags(f"{title} {desc}")
+        jobs.append(
+            JobPosting(
+                company_business_id=company.get("business_id", ""),
+                company_name=company.get("name", ""),
+                company_domain=company.get("domain", ""),
+                job_title=title,
+                job_url=job_url,
+                location_text=loc,
+                employment_type=item.get("employment_type") or None,
+                posted_date=item.get("published_on") or item.get("created_at"),
+                description_snippet=clean_html_snippet(desc) if desc else None,
+                source="workable",
+                tags=tags,
+                crawl_ts=crawl_ts,
+            )
+        )
+    return jobs, None
@@ -2,12 +2,16 @@
 
 from __future__ import annotations
 
+import io
 import re
+import xml.etree.ElementTree as ET
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from urllib.parse import urljoin
 
-from bs4 import BeautifulSoup, FeatureNotFound
+from bs4 import BeautifulSoup
+
+from .sitemap import filter_entries, iter_sitemap_entries
 
 COMMON_PATHS = [
     "/careers",
@@ -40,34 +44,33 @@ def discover_paths(domain: str, existing: Optional[List[str]] = None) -> List[st
 
 
 def parse_sitemap(xml_text: str, base_url: str, max_urls: int = 200) -> List[str]:
-    try:
-        soup = BeautifulSoup(xml_text, "lxml-xml")
-    except FeatureNotFound:
-        try:
-            soup = BeautifulSoup(xml_text, "xml")
-        except FeatureNotFound:
-            soup = BeautifulSoup(xml_text, "html.parser")
+    entries = iter_sitemap_entries(io.BytesIO(xml_text.encode("utf-8")))
     urls = []
-    for loc in soup.find_all("loc"):
-        if len(urls) >= max_urls:
-            break
-        href = loc.get_text(strip=True)
-        if not href:
-            continue
-        lowered = href.lower()
-        if any(key in lowered for key in SITEMAP_KEYWORDS):
-            urls.append(href)
+    try:
+        for entry in filter_entries(entries, SITEMAP_KEYWORDS, max_urls):
+            if not entry.is_index:
+                urls.append(entry.loc)
+    except ET.ParseError:
+        pass
     return urls
 
 
-def filter_discovery_results(html: str, base_url: str) -> List[str]:
-    soup = BeautifulSoup(html, "html.parser")
-    urls = []
+def discover_links_with_text(html: str, base_url: str) -> List[Tuple[str, str]]:
+    """Return (url, anchor text) pairs for careers-like links on a page."""
+    return links_from_soup(BeautifulSoup(html, "html.parser"), base_url)
+
+
+def links_from_soup(soup: BeautifulSoup, base_url: str) -> List[Tuple[str, str]]:
+    links: Dict[str, str] = {}
     for a in soup.find_all("a", href=True):
         href = a["href"]
         text = a.get_text(" ", strip=True).lower()
         if any(k in href.lower() for k in SITEMAP_KEYWORDS) or any(
             kw in text for kw in SITEMAP_KEYWORDS
         ):
-            urls.append(urljoin(base_url, href))
-    return list(dict.fromkeys(urls))
+            links.setdefault(urljoin(base_url, href), text)
+    return list(links.items())
+
+
+def filter_discovery_results(html: str, base_url: str) -> List[str]:
+    return [url for url, _ in discover_links_with_text(html, base_url)]
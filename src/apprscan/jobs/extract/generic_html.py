@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Dict, List, Optional, Set
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
 from urllib.parse import urljoin, urlparse
 
 from bs4 import BeautifulSoup
@@ -11,6 +11,9 @@ from ..fetch import fetch_url
 from ..model import JobPosting
 from ..tagging import detect_tags
 
+if TYPE_CHECKING:
+    from ..parsing import PageParser
+
 JOB_URL_HINTS = ["/jobs", "/careers", "/positions", "/rekry", "/tyopaikat", "?job", "open-position"]
 JOB_TEXT_HINTS = ["apply", "hae", "avoin", "position", "job", "role", "tehtävä"]
 LISTING_PATHS = {"/jobs", "/careers", "/positions", "/open-positions", "/rekry", "/tyopaikat", "/ura"}
@@ -33,7 +36,10 @@ CONSENT_KEYWORDS = {
 
 
 def discover_job_links(html: str, base_url: str) -> List[str]:
-    soup = BeautifulSoup(html, "html.parser")
+    return job_links_from_soup(BeautifulSoup(html, "html.parser"), base_url)
+
+
+def job_links_from_soup(soup: BeautifulSoup, base_url: str) -> List[str]:
     urls: List[str] = []
     seen: Set[str] = set()
     for a in soup.find_all("a", href=True):
@@ -66,16 +72,27 @@ def _is_non_job_url(url: str) -> bool:
 
 
 def _is_cookie_consent_page(html: str) -> bool:
-    soup = BeautifulSoup(html, "html.parser")
+    return is_consent_soup(BeautifulSoup(html, "html.parser"))
+
+
+def is_consent_soup(soup: BeautifulSoup, body_text: str | None = None) -> bool:
     text_parts = [
         soup.title.get_text(" ", strip=True) if soup.title else "",
-        soup.get_text(" ", strip=True),
+        body_text if body_text is not None else soup.get_text(" ", strip=True),
     ]
     text = " ".join(text_parts).lower()
     hits = [kw for kw in CONSENT_KEYWORDS if kw in text]
     return len(hits) >= 2 or ("cookie" in text and "consent" in text)
 
 
+def parse_detail_soup(soup: BeautifulSoup) -> Tuple[bool, str | None, str | None]:
+    """Return (is_consent_page, h1 title, 300-char body snippet) from one parse."""
+    body_text = soup.get_text(" ", strip=True)
+    title_tag = soup.find("h1")
+    title = title_tag.get_text(" ", strip=True) if title_tag else None
+    return is_consent_soup(soup, body_text), title, (body_text[:300] if body_text else None)
+
+
 def extract_jobs_generic(
     session,
     html: str,
@@ -88,9 +105,18 @@ def extract_jobs_generic(
     debug_html_dir=None,
     req_per_second_per_domain: float = 1.0,
     errors: Optional[List[str]] = None,
+    job_links: Optional[List[str]] = None,
+    page_parser: Optional["PageParser"] = None,
 ) -> List[JobPosting]:
+    """Follow job-like links on a listing page and build postings from the detail pages.
+
+    job_links lets the caller pass links it already parsed; page_parser offloads detail
+    page parsing (see jobs.parsing).
+    """
     jobs: List[JobPosting] = []
-    candidates = discover_job_links(html, base_url)[:max_detail_pages]
+    if job_links is None:
+        job_links = discover_job_links(html, base_url)
+    candidates = job_links[:max_detail_pages]
     seen_detail: Set[str] = set()
     for url in candidates:
         if _is_listing_url(url):
@@ -113,16 +139,17 @@ def extract_jobs_generic(
         )
         if res is None:
             continue
-        if _is_cookie_consent_page(res.html):
+        if page_parser is not None:
+            detail = page_parser.detail(res.html)
+            consent, title, snippet = detail.consent, detail.title, detail.snippet
+        else:
+            consent, title, snippet = parse_detail_soup(BeautifulSoup(res.html, "html.parser"))
+        if consent:
             if errors is not None:
                 errors.append("cookie_consent")
             continue
         seen_detail.add(normalized)
-        detail_soup = BeautifulSoup(res.html, "html.parser")
-        title_tag = detail_soup.find("h1")
-        title = title_tag.get_text(" ", strip=True) if title_tag else res.final_url
-        body_text = detail_soup.get_text(" ", strip=True)
-        snippet = body_text[:300] if body_text else None
+        title = title or res.final_url
         tags = detect_tags(f"{title} {snippet or ''}")
         jobs.append(
             JobPosting(
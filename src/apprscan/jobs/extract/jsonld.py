@@ -27,7 +27,12 @@ def _iter_items(data):
 
 
 def extract_jobs_from_jsonld(html: str, base_url: str, company: Dict[str, str], crawl_ts: str) -> List[JobPosting]:
-    soup = BeautifulSoup(html, "html.parser")
+    return jobs_from_soup(BeautifulSoup(html, "html.parser"), base_url, company, crawl_ts)
+
+
+def jobs_from_soup(
+    soup: BeautifulSoup, base_url: str, company: Dict[str, str], crawl_ts: str
+) -> List[JobPosting]:
     jobs: List[JobPosting] = []
     for script in soup.find_all("script", type="application/ld+json"):
         try:
@@ -2,15 +2,18 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import Any, Dict, Optional, Tuple
 from urllib.parse import urlparse
 
 import requests
 from requests import Response
 
+from ..http_pool import async_transport_errors, decode_like_requests
 from .robots import RobotsChecker
 
 
@@ -26,6 +29,25 @@ def _should_retry(status: int) -> bool:
     return status == 429 or 500 <= status < 600
 
 
+def rate_limit_wait(
+    rate_limit_state: Optional[Dict[str, float]], domain: str, req_per_second_per_domain: float
+) -> float:
+    """Seconds to wait before the next request to domain (0 without state)."""
+    if rate_limit_state is None:
+        return 0.0
+    last = rate_limit_state.get(domain, 0)
+    min_interval = 1.0 / req_per_second_per_domain if req_per_second_per_domain > 0 else 0
+    return max(0, min_interval - (time.time() - last))
+
+
+def wait_for_rate_limit(
+    rate_limit_state: Optional[Dict[str, float]], domain: str, req_per_second_per_domain: float
+) -> None:
+    wait = rate_limit_wait(rate_limit_state, domain, req_per_second_per_domain)
+    if wait > 0:
+        time.sleep(wait)
+
+
 def fetch_url(
     session: requests.Session,
     url: str,
@@ -44,12 +66,7 @@ def fetch_url(
     if robots and not robots.can_fetch(url):
         return None, "robots_disallow"
 
-    if rate_limit_state is not None:
-        last = rate_limit_state.get(domain, 0)
-        min_interval = 1.0 / req_per_second_per_domain if req_per_second_per_domain > 0 else 0
-        wait = max(0, min_interval - (time.time() - last))
-        if wait > 0:
-            time.sleep(wait)
+    wait_for_rate_limit(rate_limit_state, domain, req_per_second_per_domain)
 
     headers = {"User-Agent": user_agent}
     attempt = 0
@@ -71,24 +88,85 @@ def fetch_url(
 
         if rate_limit_state is not None:
             rate_limit_state[domain] = time.time()
+        return _to_result(resp, domain, max_bytes, debug_html_dir)
+
+    return None, "max_retries_exceeded"
+
+
+def _to_result(
+    resp: Any,
+    domain: str,
+    max_bytes: int,
+    debug_html_dir: Optional[Path],
+    *,
+    decode: bool = False,
+) -> Tuple[Optional[FetchResult], Optional[str]]:
+    """decode=True for non-requests responses: text is decoded the way requests would."""
+    if resp.status_code >= 400:
+        return None, f"http_{resp.status_code}"
+
+    content = resp.content
+    if max_bytes and len(content) > max_bytes:
+        return None, "response_too_large"
+    html = decode_like_requests(content, resp.headers) if decode else resp.text
+    if debug_html_dir:
+        debug_html_dir.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha1(str(resp.url).encode("utf-8")).hexdigest()[:12]
+        fname = debug_html_dir / f"{domain}_{digest}.html"
+        fname.write_text(html, encoding="utf-8")
+
+    return FetchResult(
+        status=resp.status_code,
+        final_url=str(resp.url),
+        html=html,
+        headers=dict(resp.headers),
+    ), None
+
+
+async def afetch_url(
+    client: Any,
+    url: str,
+    *,
+    timeout: float = 20.0,
+    user_agent: str = "apprscan-jobs/0.1",
+    max_retries: int = 3,
+    max_bytes: int = 2_000_000,
+    rate_limit_state: Optional[Dict[str, float]] = None,
+    req_per_second_per_domain: float = 1.0,
+    debug_html_dir: Optional[Path] = None,
+    robots: Optional[RobotsChecker] = None,
+) -> Tuple[Optional[FetchResult], Optional[str]]:
+    """fetch_url over an async client (httpx.AsyncClient); same retries and outcomes."""
+    parsed = urlparse(url)
+    domain = parsed.netloc
+    if robots:
+        await robots.aget_parser(domain, client)
+        if not robots.can_fetch(url):
+            return None, "robots_disallow"
+
+    await asyncio.sleep(rate_limit_wait(rate_limit_state, domain, req_per_second_per_domain))
+
+    headers = {"User-Agent": user_agent}
+    errors = async_transport_errors()
+    attempt = 0
+    backoff = 1.0
+    while attempt < max_retries:
+        try:
+            resp = await client.get(url, timeout=timeout, headers=headers, follow_redirects=True)
+        except errors:
+            attempt += 1
+            await asyncio.sleep(backoff)
+            backoff *= 2
+            continue
+
+        if _should_retry(resp.status_code) and attempt < max_retries - 1:
+            attempt += 1
+            await asyncio.sleep(backoff)
+            backoff *= 2
+            continue
 
-        if resp.status_code >= 400:
-            return None, f"http_{resp.status_code}"
-
-        content = resp.content
-        if max_bytes and len(content) > max_bytes:
-            return None, "response_too_large"
-        html = resp.text
-        if debug_html_dir:
-            debug_html_dir.mkdir(parents=True, exist_ok=True)
-            fname = debug_html_dir / f"{domain}_{int(time.time())}.html"
-            fname.write_text(html, encoding="utf-8")
-
-        return FetchResult(
-            status=resp.status_code,
-            final_url=str(resp.url),
-            html=html,
-            headers=dict(resp.headers),
-        ), None
+        if rate_limit_state is not None:
+            rate_limit_state[domain] = time.time()
+        return _to_result(resp, domain, max_bytes, debug_html_dir, decode=True)
 
     return None, "max_retries_exceeded"
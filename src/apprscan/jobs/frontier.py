@@ -0,0 +1,130 @@
+"""Priority-ordered crawl frontier for a single domain."""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import time
+from typing import List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+CAREER_URL_HINTS = [
+    "career",
+    "job",
+    "rekry",
+    "tyopaikat",
+    "tyopaikka",
+    "avoimet",
+    "ura",
+    "open-position",
+    "positions",
+    "join-us",
+    "vacanc",
+]
+CAREER_TEXT_HINTS = [
+    "career",
+    "job",
+    "open position",
+    "apply",
+    "hiring",
+    "rekry",
+    "ura",
+    "työpaik",
+    "tyopaik",
+    "avoimet",
+    "hae",
+]
+LISTING_PATHS = {
+    "/jobs",
+    "/careers",
+    "/positions",
+    "/open-positions",
+    "/rekry",
+    "/tyopaikat",
+    "/ura",
+}
+LOW_VALUE_PATH_HINTS = [
+    "/news",
+    "/blog",
+    "/privacy",
+    "/terms",
+    "/tag/",
+    "/category/",
+    "/author/",
+    ".pdf",
+    ".jpg",
+]
+TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "ref"}
+
+
+def normalize_url(url: str) -> str:
+    """Visited-set key: ignore scheme, www., trailing slash, fragment and tracking params."""
+    parsed = urlparse(url)
+    host = (parsed.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    path = parsed.path.rstrip("/") or "/"
+    params = [
+        (k, v)
+        for k, v in parse_qsl(parsed.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS
+    ]
+    query = urlencode(sorted(params))
+    return f"{host}{path}" + (f"?{query}" if query else "")
+
+
+def score_url(url: str, anchor: str = "", depth: int = 0, source: str = "link") -> float:
+    """Higher is better: careers hints in the URL/anchor win, depth and sitemap origin cost."""
+    path = urlparse(url).path.lower()
+    text = (anchor or "").lower()
+    score = 0.0
+    if (path.rstrip("/") or "/") in LISTING_PATHS:
+        score += 3.0
+    elif any(hint in path for hint in CAREER_URL_HINTS):
+        score += 2.0
+    if text and any(hint in text for hint in CAREER_TEXT_HINTS):
+        score += 1.0
+    if any(hint in path for hint in LOW_VALUE_PATH_HINTS):
+        score -= 2.0
+    if source == "sitemap":
+        score -= 0.5
+    return score - 0.5 * depth
+
+
+class CrawlFrontier:
+    def __init__(self, *, max_pages: int, max_seconds: float | None = None):
+        self.max_pages = max_pages
+        self.max_seconds = max_seconds if max_seconds and max_seconds > 0 else None
+        self.started = time.monotonic()
+        self._heap: List[Tuple[float, int, str, int]] = []
+        self._counter = itertools.count()
+        self._seen: set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def add(self, url: str, *, anchor: str = "", depth: int = 0, source: str = "link") -> bool:
+        key = normalize_url(url)
+        if key in self._seen:
+            return False
+        self._seen.add(key)
+        priority = -score_url(url, anchor, depth, source)
+        # The counter keeps insertion (BFS) order among equal priorities.
+        heapq.heappush(self._heap, (priority, next(self._counter), url, depth))
+        return True
+
+    def mark_visited(self, url: str) -> None:
+        self._seen.add(normalize_url(url))
+
+    def pop(self) -> Optional[Tuple[str, int]]:
+        if not self._heap:
+            return None
+        _, _, url, depth = heapq.heappop(self._heap)
+        return url, depth
+
+    def budget_exhausted(self, pages_fetched: int) -> str | None:
+        if pages_fetched >= self.max_pages:
+            return "pages"
+        if self.max_seconds is not None and time.monotonic() - self.started >= self.max_seconds:
+            return "time"
+        return None
@@ -20,6 +20,7 @@ class JobPosting:
     source: str = "unknown"
     tags: List[str] = field(default_factory=list)
     crawl_ts: str = ""
+    shared_scan_of: str = ""
 
     def to_dict(self) -> Dict[str, Any]:
         return asdict(self)
@@ -0,0 +1,123 @@
+"""Single-parse page analysis, optionally offloaded to a process pool.
+
+Fetching stays in the crawl threads; the CPU-bound part (HTML parse, JSON-LD, link
+discovery, detail-page parsing) runs either inline or in worker processes so it is not
+serialized behind the GIL.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+from bs4 import BeautifulSoup
+
+from .discovery import links_from_soup
+from .extract.generic_html import job_links_from_soup, parse_detail_soup
+from .extract.jsonld import jobs_from_soup
+from .model import JobPosting
+
+HTML_PARSERS = ("html.parser", "lxml")
+
+
+def resolve_backend(name: str) -> str:
+    if name not in HTML_PARSERS:
+        raise ValueError(f"Unknown HTML parser: {name} (choose from {', '.join(HTML_PARSERS)})")
+    if name == "lxml" and importlib.util.find_spec("lxml") is None:
+        raise ValueError("HTML parser 'lxml' requires the lxml package (pip install lxml).")
+    return name
+
+
+@dataclass
+class ListingAnalysis:
+    jsonld_jobs: List[JobPosting] = field(default_factory=list)
+    links: List[Tuple[str, str]] = field(default_factory=list)
+    job_links: List[str] = field(default_factory=list)
+    cpu_seconds: float = 0.0
+
+
+@dataclass
+class DetailAnalysis:
+    consent: bool = False
+    title: str | None = None
+    snippet: str | None = None
+    cpu_seconds: float = 0.0
+
+
+def analyze_listing(
+    html: str, base_url: str, company: Dict[str, str], crawl_ts: str, backend: str = "html.parser"
+) -> ListingAnalysis:
+    started = time.thread_time()
+    soup = BeautifulSoup(html, backend)
+    result = ListingAnalysis(jsonld_jobs=jobs_from_soup(soup, base_url, company, crawl_ts))
+    if not result.jsonld_jobs:
+        result.links = links_from_soup(soup, base_url)
+        result.job_links = job_links_from_soup(soup, base_url)
+    result.cpu_seconds = time.thread_time() - started
+    return result
+
+
+def analyze_detail(html: str, backend: str = "html.parser") -> DetailAnalysis:
+    started = time.thread_time()
+    consent, title, snippet = parse_detail_soup(BeautifulSoup(html, backend))
+    return DetailAnalysis(consent, title, snippet, time.thread_time() - started)
+
+
+class PageParser:
+    """Runs page analysis inline (workers=0) or in a spawn-based process pool."""
+
+    def __init__(self, *, workers: int = 0, backend: str = "html.parser"):
+        self.backend = resolve_backend(backend)
+        self.workers = max(0, workers)
+        self._pool = (
+            ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+            if self.workers
+            else None
+        )
+        self._lock = threading.Lock()
+        self.pages_parsed = 0
+        self.cpu_seconds = 0.0
+
+    def _run(self, fn, *args):
+        result = self._pool.submit(fn, *args).result() if self._pool else fn(*args)
+        with self._lock:
+            self.pages_parsed += 1
+            self.cpu_seconds += result.cpu_seconds
+        return result
+
+    def listing(
+        self, html: str, base_url: str, company: Dict[str, str], crawl_ts: str
+    ) -> ListingAnalysis:
+        return self._run(analyze_listing, html, base_url, company, crawl_ts, self.backend)
+
+    def detail(self, html: str) -> DetailAnalysis:
+        return self._run(analyze_detail, html, self.backend)
+
+    def pages_per_core_second(self) -> float:
+        return self.pages_parsed / self.cpu_seconds if self.cpu_seconds > 0 else 0.0
+
+    def summary(self) -> str:
+        mode = f"{self.workers} process(es)" if self.workers else "inline"
+        return (
+            f"Parse: {self.pages_parsed} pages, "
+            f"{self.pages_per_core_second():.1f} pages/s per core "
+            f"({self.backend}, {mode})"
+        )
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self) -> "PageParser":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
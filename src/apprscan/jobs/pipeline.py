@@ -2,25 +2,32 @@
 
 from __future__ import annotations
 
+import json
 import time
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields, replace
 from collections import Counter
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import urlparse
 
 import pandas as pd
 import requests
 
 from .ats import detect_ats, fetch_ats_jobs
-from .discovery import DiscoveryResult, discover_paths, parse_sitemap, filter_discovery_results
-from .extract import extract_jobs_from_jsonld, extract_jobs_generic
+from .discovery import SITEMAP_KEYWORDS, discover_links_with_text, discover_paths
+from .extract import extract_jobs_generic
 from .fetch import fetch_url
+from .frontier import CrawlFrontier, normalize_url
+from .archive import PageArchive, archiving_session, replay_session
 from .constants import ROBOTS_DISALLOW_ALL, ROBOTS_DISALLOW_URL
 from .model import JobPosting
+from .parsing import PageParser
 from .robots import RobotsChecker
+from .sitemap import read_sitemaps
 from .storage import jobs_to_dataframe
 from .tagging import detect_tags, DEFAULT_TAG_RULES
+from ..domain_groups import canonical_domain
+from ..url_stats import UrlHitStats
 
 
 @dataclass
@@ -36,6 +43,9 @@ class CrawlStats:
     ats_fetch_reason: str | None = None
     robots_rule_hit: str | None = None
     first_blocked_url: str | None = None
+    budget_exhausted: str | None = None
+    sitemap_unchanged: int = 0
+    shared_scan_of: str = ""
     status: str | None = None
 
     def _compute_status(self) -> str:
@@ -74,6 +84,9 @@ class CrawlStats:
             "ats_fetch_reason": self.ats_fetch_reason,
             "robots_rule_hit": self.robots_rule_hit,
             "first_blocked_url": self.first_blocked_url,
+            "budget_exhausted": self.budget_exhausted,
+            "sitemap_unchanged": self.sitemap_unchanged,
+            "shared_scan_of": self.shared_scan_of,
             "status": status,
         }
 
@@ -121,7 +134,21 @@ def crawl_domain(
     session: requests.Session,
     crawl_ts: str,
     tag_rules: Dict[str, List[str]] | None = None,
+    max_seconds: float | None = None,
+    sitemap_seen: Dict[str, Dict[str, Any]] | None = None,
+    page_parser: PageParser | None = None,
+    robots: RobotsChecker | None = None,
+    url_stats: UrlHitStats | None = None,
 ) -> Tuple[List[JobPosting], CrawlStats]:
+    """Crawl one domain.
+
+    sitemap_seen maps normalized URL -> {"lastmod", "jobs"} from earlier runs; when given,
+    sitemap URLs whose lastmod is unchanged are not refetched but their remembered postings
+    are returned again (so jobs-diff does not see them as removed), and the map is updated
+    in place.
+    url_stats orders the common careers paths by observed hit rate (a domain's known-good
+    URL first) and is updated with whether each of those seeds yielded jobs.
+    """
     def _normalize_robots_rule(rule: str | None) -> str | None:
         if not rule:
             return None
@@ -132,7 +159,8 @@ def crawl_domain(
         return rule
 
     stats = CrawlStats(domain=domain)
-    robots_checker = RobotsChecker()
+    robots_checker = robots or RobotsChecker()
+    page_parser = page_parser or PageParser()
 
     # Fetch base page for ATS detection
     base_url = f"https://{domain}"
@@ -158,7 +186,7 @@ def crawl_domain(
     detected = detect_ats(base_url, res.html)
     if detected:
         stats.ats_detected = detected.get("kind")
-        jobs, ats_reason = fetch_ats_jobs(detected, company, crawl_ts)
+        jobs, ats_reason = fetch_ats_jobs(detected, company, crawl_ts, session=session)
         if jobs:
             stats.ats_fetch_ok = True
             stats.jobs_found = len(jobs)
@@ -167,34 +195,69 @@ def crawl_domain(
         else:
             stats.ats_fetch_reason = ats_reason
 
-    # discovery
+    # discovery: careers paths first, sitemap URLs and page links scored into the frontier
+    frontier = CrawlFrontier(max_pages=max_pages, max_seconds=max_seconds)
+    frontier.mark_visited(base_url)
+    frontier.mark_visited(res.final_url)
     seeds = discover_paths(domain)
-    # try sitemap
-    sitemap_url = f"https://{domain}/sitemap.xml"
-    sm_allowed, sm_rule = robots_checker.can_fetch_detail(sitemap_url)
-    sm_res = None
-    if sm_allowed:
-        sm_res, _ = fetch_url(
-            session,
-            sitemap_url,
-            rate_limit_state=rate_limit_state,
-            req_per_second_per_domain=req_per_second,
-            debug_html_dir=debug_html_dir,
-        )
-    else:
-        stats.errors.append("robots_disallow_sitemap")
-    if sm_res and sm_res.status == 200:
-        stats.pages_fetched += 1
-        seeds.extend(parse_sitemap(sm_res.html, base_url, max_urls=200))
-
-    seeds = list(dict.fromkeys(seeds))
-
-    all_jobs: List[JobPosting] = []
+    if url_stats is not None:
+        seeds = url_stats.order(domain, seeds)
+    seed_keys = {normalize_url(seed) for seed in seeds}
     for seed in seeds:
-        if stats.pages_fetched >= max_pages:
+        frontier.add(seed, depth=0, source="common_path")
+    # sitemaps: robots.txt `Sitemap:` lines first, then the conventional location
+    sitemap_urls = list(robots_checker.sitemaps(domain)) + [f"https://{domain}/sitemap.xml"]
+    sm = read_sitemaps(
+        session,
+        sitemap_urls,
+        keywords=SITEMAP_KEYWORDS,
+        max_urls=200,
+        can_fetch=lambda url: robots_checker.can_fetch_detail(url)[0],
+        rate_limit_state=rate_limit_state,
+        req_per_second_per_domain=req_per_second,
+    )
+    stats.pages_fetched += sm.sitemaps_fetched
+    stats.errors.extend(e for e in sm.errors if e == "robots_disallow_sitemap")
+    all_jobs: List[JobPosting] = []
+    lastmods: Dict[str, str] = {}
+    for entry in sm.entries:
+        key = normalize_url(entry.loc)
+        if entry.lastmod:
+            prior = sitemap_seen.get(key) if sitemap_seen is not None else None
+            if prior and prior["lastmod"] == entry.lastmod:
+                stats.sitemap_unchanged += 1
+                frontier.mark_visited(entry.loc)
+                all_jobs.extend(_carried_jobs(prior["jobs"], company, crawl_ts))
+                continue
+            lastmods[key] = entry.lastmod
+        frontier.add(entry.loc, depth=1, source="sitemap")
+    for url, anchor in discover_links_with_text(res.html, res.final_url):
+        frontier.add(url, anchor=anchor, depth=1)
+
+    def _remember(key: str, page_jobs: List[JobPosting]) -> None:
+        if sitemap_seen is not None and key in lastmods:
+            sitemap_seen[key] = {
+                "lastmod": lastmods[key],
+                "jobs": [job.to_dict() for job in page_jobs],
+            }
+
+    while True:
+        exhausted = frontier.budget_exhausted(stats.pages_fetched)
+        if exhausted:
+            if len(frontier):
+                stats.budget_exhausted = exhausted
             break
+        item = frontier.pop()
+        if item is None:
+            break
+        seed, depth = item
+        seed_key = normalize_url(seed)
+        # Seed paths that are blocked or do not exist count as misses for the hit-rate order.
+        is_seed = url_stats is not None and seed_key in seed_keys
         allowed, rule = robots_checker.can_fetch_detail(seed)
         if not allowed:
+            if is_seed:
+                url_stats.record(seed, False)
             normalized = _normalize_robots_rule(rule) or ROBOTS_DISALLOW_URL
             stats.errors.append(normalized)
             if not stats.first_blocked_url:
@@ -210,6 +273,8 @@ def crawl_domain(
             debug_html_dir=debug_html_dir,
         )
         if res is None:
+            if is_seed:
+                url_stats.record(seed, False)
             stats.errors.append(reason or f"fetch_failed:{seed}")
             if reason in (ROBOTS_DISALLOW_ALL, ROBOTS_DISALLOW_URL) and not stats.first_blocked_url:
                 stats.first_blocked_url = seed
@@ -217,17 +282,21 @@ def crawl_domain(
                 stats.skipped_reason = stats.skipped_reason or reason
             continue
         stats.pages_fetched += 1
-        html = res.html
-        jsonld_jobs = extract_jobs_from_jsonld(html, res.final_url, company, crawl_ts)
-        if jsonld_jobs:
-            all_jobs.extend(jsonld_jobs)
+        frontier.mark_visited(res.final_url)
+        page = page_parser.listing(res.html, res.final_url, company, crawl_ts)
+        if page.jsonld_jobs:
+            all_jobs.extend(page.jsonld_jobs)
+            _remember(seed_key, page.jsonld_jobs)
             stats.extractor_used = (stats.extractor_used or "") + ";jsonld"
+            if is_seed:
+                url_stats.record(seed, True)
             continue
         # discover more links on this page
-        seeds.extend(filter_discovery_results(html, res.final_url))
+        for url, anchor in page.links:
+            frontier.add(url, anchor=anchor, depth=depth + 1)
         generic_jobs = extract_jobs_generic(
             session,
-            html,
+            res.html,
             res.final_url,
             company,
             crawl_ts,
@@ -235,10 +304,15 @@ def crawl_domain(
             debug_html_dir=debug_html_dir,
             req_per_second_per_domain=req_per_second,
             errors=stats.errors,
+            job_links=page.job_links,
+            page_parser=page_parser,
         )
         if generic_jobs:
             all_jobs.extend(generic_jobs)
             stats.extractor_used = (stats.extractor_used or "") + ";generic"
+        _remember(seed_key, generic_jobs)
+        if is_seed:
+            url_stats.record(seed, bool(generic_jobs))
 
     stats.jobs_found = len(all_jobs)
     return all_jobs, stats
@@ -256,14 +330,44 @@ def crawl_jobs_pipeline(
     out_raw_dir: Optional[Path] = None,
     tag_rules: Dict[str, List[str]] | None = None,
     max_workers: int = 5,
+    max_seconds_per_domain: float | None = None,
+    sitemap_state_path: Optional[Path] = None,
+    page_parser: Optional[PageParser] = None,
+    archive_dir: Optional[Path] = None,
+    replay_dir: Optional[Path] = None,
+    url_stats_path: Optional[Path] = None,
+    redirects: Optional[Dict[str, str]] = None,
 ) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """Crawl companies concurrently (I/O threads); page_parser may offload parsing to processes.
+
+    archive_dir records every response into a page archive (debug_html does the same under
+    out_raw_dir); replay_dir serves all requests from an existing archive without network.
+    Companies sharing a canonical domain (www/scheme/redirects) are crawled once; the other
+    members get copies of the jobs and a stats row with shared_scan_of set.
+    """
     crawl_ts = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+    if debug_html and out_raw_dir is not None and archive_dir is None:
+        archive_dir = out_raw_dir
+    archive = PageArchive(replay_dir or archive_dir) if (replay_dir or archive_dir) else None
+    if replay_dir is not None:
+        req_per_second = 0.0
+
+    def _session() -> requests.Session:
+        if replay_dir is not None:
+            return replay_session(archive)
+        if archive is not None:
+            return archiving_session(archive)
+        return requests.Session()
+
     jobs: List[JobPosting] = []
     stats_rows: List[Dict[str, object]] = []
+    sitemap_seen = load_sitemap_state(sitemap_state_path) if sitemap_state_path else None
+    url_stats = UrlHitStats.load(url_stats_path) if url_stats_path else None
 
     from concurrent.futures import ThreadPoolExecutor, as_completed
 
-    tasks = []
+    tasks = {}
+    members: Dict[str, List[Dict[str, str]]] = {}
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
         processed = 0
         for _, row in companies_df.iterrows():
@@ -283,40 +387,116 @@ def crawl_jobs_pipeline(
                 "name": row.get("name", ""),
                 "domain": domain,
             }
-            domain_raw_dir = out_raw_dir if debug_html else None
-            tasks.append(
-                executor.submit(
-                    crawl_domain,
-                    company,
-                    domain,
-                    max_pages=max_pages_per_domain,
-                    req_per_second=req_per_second,
-                    rate_limit_state={},
-                    debug_html_dir=domain_raw_dir,
-                    session=requests.Session(),
-                    crawl_ts=crawl_ts,
-                    tag_rules=tag_rules,
-                )
+            canon = canonical_domain(domain, redirects)
+            if canon in members:
+                members[canon].append(company)
+                continue
+            members[canon] = [company]
+            session = _session()
+            future = executor.submit(
+                crawl_domain,
+                company,
+                domain,
+                max_pages=max_pages_per_domain,
+                req_per_second=req_per_second,
+                rate_limit_state={},
+                debug_html_dir=None,
+                session=session,
+                crawl_ts=crawl_ts,
+                tag_rules=tag_rules,
+                max_seconds=max_seconds_per_domain,
+                sitemap_seen=sitemap_seen,
+                page_parser=page_parser,
+                robots=RobotsChecker(session=session) if archive is not None else None,
+                url_stats=url_stats,
             )
+            tasks[future] = canon
             processed += 1
 
         for fut in as_completed(tasks):
             domain_jobs, stat = fut.result()
             jobs.extend(domain_jobs)
             stats_rows.append(stat.to_dict())
+            lead, *shared = members[tasks[fut]]
+            for company in shared:
+                jobs.extend(
+                    replace(
+                        job,
+                        company_business_id=company["business_id"],
+                        company_name=company["name"],
+                        company_domain=company["domain"],
+                        shared_scan_of=lead["business_id"],
+                    )
+                    for job in domain_jobs
+                )
+                stats_rows.append(
+                    replace(
+                        stat,
+                        domain=company["domain"],
+                        pages_fetched=0,
+                        shared_scan_of=lead["business_id"],
+                    ).to_dict()
+                )
 
+    if sitemap_state_path and sitemap_seen is not None:
+        save_sitemap_state(sitemap_state_path, sitemap_seen)
+    if url_stats_path and url_stats is not None and replay_dir is None:
+        url_stats.save(url_stats_path)
     jobs_df = jobs_to_dataframe(jobs)
     stats_df = pd.DataFrame(stats_rows)
     activity_df = summarize_activity(jobs_df)
     return jobs_df, stats_df, activity_df
 
 
+def _carried_jobs(
+    jobs: List[Dict[str, Any]], company: Dict[str, str], crawl_ts: str
+) -> List[JobPosting]:
+    """Postings remembered for an unchanged sitemap URL, re-stamped for this crawl."""
+    names = {f.name for f in fields(JobPosting)}
+    restamp = {
+        "company_business_id": company.get("business_id", ""),
+        "company_name": company.get("name", ""),
+        "company_domain": company.get("domain", ""),
+        "crawl_ts": crawl_ts,
+        "shared_scan_of": "",
+    }
+    return [
+        JobPosting(**{**{k: v for k, v in job.items() if k in names}, **restamp}) for job in jobs
+    ]
+
+
+def load_sitemap_state(path: Path) -> Dict[str, Dict[str, Any]]:
+    """URL -> {"lastmod", "jobs"}; entries without remembered postings are dropped (refetched)."""
+    if not path.exists():
+        return {}
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return {
+        str(k): {"lastmod": str(v["lastmod"]), "jobs": list(v["jobs"])}
+        for k, v in data.items()
+        if isinstance(v, dict) and "lastmod" in v and isinstance(v.get("jobs"), list)
+    }
+
+
+def save_sitemap_state(path: Path, state: Dict[str, Dict[str, Any]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = json.dumps(state, ensure_ascii=False, sort_keys=True, indent=0)
+    path.write_text(payload, encoding="utf-8")
+
+
 def apply_diff(jobs_df: pd.DataFrame, known_path: Path) -> Tuple[pd.DataFrame, pd.DataFrame]:
     """Mark is_new and produce diff of new jobs."""
-    # Drop obvious duplicates before computing fingerprints/diff
-    jobs_df = jobs_df.drop_duplicates(subset=["job_url"]).reset_index(drop=True)
     if "company_business_id" not in jobs_df.columns:
-        jobs_df["company_business_id"] = jobs_df.get("business_id", "")
+        jobs_df = jobs_df.assign(company_business_id=jobs_df.get("business_id", ""))
+    # Drop obvious duplicates before computing fingerprints/diff; branches sharing a domain
+    # (shared_scan_of) keep their own copy of each posting.
+    jobs_df = jobs_df.drop_duplicates(subset=["company_business_id", "job_url"]).reset_index(
+        drop=True
+    )
 
     def fingerprint(row):
         def norm(val: str) -> str:
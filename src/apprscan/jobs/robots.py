@@ -6,24 +6,72 @@ from functools import lru_cache
 from urllib.parse import urlparse
 from urllib.robotparser import RobotFileParser
 
+from ..http_pool import decode_like_requests
+
 
 class RobotsChecker:
-    def __init__(self, user_agent: str = "apprscan-jobs"):
+    def __init__(self, user_agent: str = "apprscan-jobs", session=None):
         self.user_agent = user_agent
+        self.session = session
         self.cache: dict[str, RobotFileParser] = {}
 
+    def _read_with_session(self, parser: RobotFileParser, robots_url: str) -> None:
+        # Same status handling as RobotFileParser.read(), but through a requests session
+        # (so robots.txt is archived/replayed with the pages).
+        resp = self.session.get(robots_url, timeout=20)
+        self._apply_response(parser, resp.status_code, resp.text)
+
+    def _apply_response(self, parser: RobotFileParser, status: int, text: str) -> None:
+        if status in (401, 403):
+            parser.disallow_all = True
+        elif 400 <= status < 500:
+            parser.allow_all = True
+        elif status >= 500:
+            if self.session is not None:
+                raise OSError(f"robots_http_{status}")
+            # RobotFileParser.read() leaves the parser unread on 5xx, so everything is blocked.
+        else:
+            parser.parse(text.splitlines())
+
+    @staticmethod
+    def _unavailable() -> RobotFileParser:
+        parser = RobotFileParser()
+        parser.parse(["User-agent: *", "Disallow: /"])
+        parser.apprscan_error = "robots_unavailable"  # type: ignore[attr-defined]
+        return parser
+
     def _fetch_parser(self, domain: str) -> RobotFileParser:
         robots_url = f"https://{domain}/robots.txt"
         parser = RobotFileParser()
         try:
             parser.set_url(robots_url)
-            parser.read()
+            if self.session is not None:
+                self._read_with_session(parser, robots_url)
+            else:
+                parser.read()
         except Exception:
-            parser = RobotFileParser()
-            parser.parse(["User-agent: *", "Disallow: /"])
-            setattr(parser, "apprscan_error", "robots_unavailable")
+            parser = self._unavailable()
         return parser
 
+    async def aget_parser(self, domain: str, client) -> RobotFileParser:
+        """get_parser with robots.txt fetched over an async client (same status handling)."""
+        if domain in self.cache:
+            return self.cache[domain]
+        robots_url = f"https://{domain}/robots.txt"
+        parser = RobotFileParser()
+        try:
+            parser.set_url(robots_url)
+            resp = await client.get(robots_url, timeout=20, follow_redirects=True)
+            # Decode like the sync reader in use: requests' rules, or read()'s strict UTF-8.
+            if self.session is not None:
+                text = decode_like_requests(resp.content, resp.headers)
+            else:
+                text = resp.content.decode("utf-8")
+            self._apply_response(parser, resp.status_code, text)
+        except Exception:
+            parser = self._unavailable()
+        return self.cache.setdefault(domain, parser)
+
     def get_parser(self, domain: str) -> RobotFileParser:
         if domain not in self.cache:
             self.cache[domain] = self._fetch_parser(domain)
@@ -46,3 +94,8 @@ class RobotsChecker:
         if not allowed:
             return False, "blocked_by_robots"
         return True, None
+
+    def sitemaps(self, domain: str) -> list[str]:
+        """Sitemap URLs announced with `Sitemap:` lines in robots.txt."""
+        parser = self.get_parser(domain)
+        return list(parser.site_maps() or [])
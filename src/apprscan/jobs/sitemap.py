@@ -0,0 +1,197 @@
+"""Streaming sitemap reader (gzip and sitemap-index aware)."""
+
+from __future__ import annotations
+
+import gzip
+import io
+import time
+import xml.etree.ElementTree as ET
+from collections import deque
+from dataclasses import dataclass, field
+from typing import IO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+
+from .fetch import wait_for_rate_limit
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+@dataclass
+class SitemapEntry:
+    loc: str
+    lastmod: str | None = None
+    is_index: bool = False
+
+
+@dataclass
+class SitemapResult:
+    entries: List[SitemapEntry] = field(default_factory=list)
+    sitemaps_fetched: int = 0
+    errors: List[str] = field(default_factory=list)
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _namespace(tag: str) -> str:
+    return tag[1:].split("}", 1)[0] if tag.startswith("{") else ""
+
+
+class _PrefixedStream(io.RawIOBase):
+    """Re-attach bytes already read (the gzip sniff) in front of a stream."""
+
+    def __init__(self, prefix: bytes, stream: IO[bytes]):
+        self._prefix = prefix
+        self._stream = stream
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:  # type: ignore[no-untyped-def]
+        if self._prefix:
+            n = min(len(buffer), len(self._prefix))
+            buffer[:n] = self._prefix[:n]
+            self._prefix = self._prefix[n:]
+            return n
+        chunk = self._stream.read(len(buffer))
+        buffer[: len(chunk)] = chunk
+        return len(chunk)
+
+
+def iter_sitemap_entries(stream: IO[bytes]) -> Iterator[SitemapEntry]:
+    """Yield <url>/<sitemap> entries with iterparse, clearing parsed elements as we go.
+
+    Memory stays flat regardless of sitemap size; gzip input is detected by magic bytes.
+    Only <loc>/<lastmod> that are direct children of an entry, in the entry's namespace, are
+    read, so extension elements such as <image:image><image:loc> do not replace the page URL.
+    """
+    head = stream.read(2)
+    source: IO[bytes] = io.BufferedReader(_PrefixedStream(head, stream))
+    if head == GZIP_MAGIC:
+        source = gzip.GzipFile(fileobj=source)  # type: ignore[assignment]
+    root = None
+    depth = 0
+    entry_ns = ""
+    loc: str | None = None
+    lastmod: str | None = None
+    for event, elem in ET.iterparse(source, events=("start", "end")):
+        if event == "start":
+            depth += 1
+            if root is None:
+                root = elem
+            elif depth == 2:
+                entry_ns = _namespace(elem.tag)
+            continue
+        depth -= 1
+        tag = _local(elem.tag)
+        if depth == 2 and _namespace(elem.tag) == entry_ns:
+            if tag == "loc":
+                loc = (elem.text or "").strip()
+            elif tag == "lastmod":
+                lastmod = (elem.text or "").strip() or None
+        elif depth == 1 and tag in ("url", "sitemap"):
+            if loc:
+                yield SitemapEntry(loc=loc, lastmod=lastmod, is_index=tag == "sitemap")
+            loc = lastmod = None
+            if root is not None:
+                root.clear()
+
+
+def filter_entries(
+    entries: Iterable[SitemapEntry], keywords: Iterable[str], max_urls: int
+) -> Iterator[SitemapEntry]:
+    keys = [k.lower() for k in keywords]
+    taken = 0
+    for entry in entries:
+        if entry.is_index:
+            yield entry
+            continue
+        if taken >= max_urls:
+            continue
+        if not keys or any(k in entry.loc.lower() for k in keys):
+            taken += 1
+            yield entry
+
+
+def _open_stream(
+    session: requests.Session,
+    url: str,
+    *,
+    timeout: float,
+    user_agent: str,
+    rate_limit_state: Optional[Dict[str, float]],
+    req_per_second_per_domain: float,
+) -> Tuple[Optional[requests.Response], Optional[str]]:
+    domain = urlparse(url).netloc
+    wait_for_rate_limit(rate_limit_state, domain, req_per_second_per_domain)
+    try:
+        resp = session.get(url, timeout=timeout, headers={"User-Agent": user_agent}, stream=True)
+    except requests.RequestException:
+        return None, "sitemap_fetch_failed"
+    finally:
+        if rate_limit_state is not None:
+            rate_limit_state[domain] = time.time()
+    if resp.status_code >= 400:
+        resp.close()
+        return None, f"sitemap_http_{resp.status_code}"
+    resp.raw.decode_content = True
+    return resp, None
+
+
+def read_sitemaps(
+    session: requests.Session,
+    sitemap_urls: Iterable[str],
+    *,
+    keywords: Iterable[str],
+    max_urls: int = 200,
+    max_sitemaps: int = 5,
+    can_fetch: Optional[Callable[[str], bool]] = None,
+    rate_limit_state: Optional[Dict[str, float]] = None,
+    req_per_second_per_domain: float = 1.0,
+    timeout: float = 20.0,
+    user_agent: str = "apprscan-jobs/0.1",
+) -> SitemapResult:
+    """Follow sitemaps and sitemap indexes (budgeted) and collect keyword-matching URLs."""
+    keywords = list(keywords)
+    result = SitemapResult()
+    queue = deque(dict.fromkeys(sitemap_urls))
+    seen: set[str] = set(queue)
+    while queue and result.sitemaps_fetched < max_sitemaps and len(result.entries) < max_urls:
+        url = queue.popleft()
+        if can_fetch is not None and not can_fetch(url):
+            result.errors.append("robots_disallow_sitemap")
+            continue
+        resp, reason = _open_stream(
+            session,
+            url,
+            timeout=timeout,
+            user_agent=user_agent,
+            rate_limit_state=rate_limit_state,
+            req_per_second_per_domain=req_per_second_per_domain,
+        )
+        if resp is None:
+            if reason:
+                result.errors.append(reason)
+            continue
+        result.sitemaps_fetched += 1
+        children: List[str] = []
+        remaining = max_urls - len(result.entries)
+        try:
+            for entry in filter_entries(iter_sitemap_entries(resp.raw), keywords, remaining):
+                if entry.is_index:
+                    if entry.loc not in seen:
+                        seen.add(entry.loc)
+                        children.append(entry.loc)
+                else:
+                    result.entries.append(entry)
+        except (ET.ParseError, OSError, EOFError):
+            result.errors.append("sitemap_parse_error")
+        finally:
+            resp.close()
+        # Child sitemaps named like jobs/careers are read first.
+        children.sort(key=lambda loc: not any(k in loc.lower() for k in keywords))
+        queue.extend(children)
+    return result
@@ -22,6 +22,7 @@ ORDERED_COLUMNS = [
     "source",
     "tags",
     "crawl_ts",
+    "shared_scan_of",
 ]
 
 
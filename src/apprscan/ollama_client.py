@@ -0,0 +1,510 @@
+"""Ollama chat calls with structured JSON output, retries, call statistics and a host pool."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Generator, Iterator, List, Tuple, TypeVar
+
+import requests
+
+from .http_pool import async_transport_errors
+
+T = TypeVar("T")
+DEFAULT_KEEP_ALIVE = "10m"
+# A full verdict (6 snippets + URLs) fits comfortably; the schema stops rambling earlier.
+DEFAULT_NUM_PREDICT = 256
+DEFAULT_RETRIES = 1
+# Cascade: answers below this confidence (or "unclear") are re-asked to the next model tier.
+DEFAULT_ESCALATE_BELOW = 0.6
+# Host pool: consecutive failures before a host is taken out, and for how long.
+BREAKER_FAILURES = 3
+BREAKER_COOLDOWN_S = 30.0
+EWMA_ALPHA = 0.3
+HEALTH_TIMEOUT_S = 3.0
+HIRING_SIGNALS = ["yes", "no", "unclear"]
+HIRING_SIGNAL_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "hiring_signal": {"type": "string", "enum": HIRING_SIGNALS},
+        "confidence": {"type": "number"},
+        "evidence": {"type": "string"},
+        "evidence_snippets": {"type": "array", "items": {"type": "string"}},
+        "evidence_urls": {"type": "array", "items": {"type": "string"}},
+        "next_url_hint": {"type": "string"},
+    },
+    "required": ["hiring_signal", "confidence", "evidence", "evidence_snippets", "evidence_urls"],
+}
+
+
+@dataclass
+class OllamaCallStats:
+    """LLM call counters and latencies (thread-safe)."""
+
+    calls: int = 0
+    retries: int = 0
+    parse_failures: int = 0
+    http_errors: int = 0
+    latencies_s: List[float] = field(default_factory=list)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record_call(self, latency_s: float) -> None:
+        with self._lock:
+            self.calls += 1
+            self.latencies_s.append(latency_s)
+
+    def record(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            lat = sorted(self.latencies_s)
+        return {
+            "calls": self.calls,
+            "retries": self.retries,
+            "parse_failures": self.parse_failures,
+            "http_errors": self.http_errors,
+            "latency_ms_mean": round(1000 * sum(lat) / len(lat), 1) if lat else 0.0,
+            "latency_ms_p50": round(1000 * lat[len(lat) // 2], 1) if lat else 0.0,
+            "latency_ms_max": round(1000 * lat[-1], 1) if lat else 0.0,
+        }
+
+
+def parse_model_tiers(value: str | None) -> List[str]:
+    """"small,large" -> ["small", "large"]; the first tier is asked first."""
+    return list(dict.fromkeys(m.strip() for m in str(value or "").split(",") if m.strip()))
+
+
+def join_model_tiers(value: str | None) -> str:
+    """" small, large" -> "small,large": the tier string recorded in rows and packages."""
+    return ",".join(parse_model_tiers(value))
+
+
+def needs_escalation(verdict: Dict[str, Any], escalate_below: float) -> bool:
+    signal = str(verdict.get("hiring_signal") or "").lower()
+    return signal == "unclear" or float(verdict.get("confidence") or 0.0) < escalate_below
+
+
+def parse_hosts(value: str | None) -> List[str]:
+    """"http://a:11434,http://b:11434" -> both hosts; the docker-only name maps to localhost."""
+    hosts = []
+    for raw in str(value or "").split(","):
+        host = raw.strip().rstrip("/")
+        if not host:
+            continue
+        if "ollama:11434" in host:
+            host = "http://127.0.0.1:11434"
+        hosts.append(host)
+    return list(dict.fromkeys(hosts))
+
+
+def health_check(host: str, timeout: float = HEALTH_TIMEOUT_S) -> Tuple[bool, List[str]]:
+    """GET /api/tags like checks.check_ollama; returns (reachable, model names)."""
+    try:
+        resp = requests.get(host.rstrip("/") + "/api/tags", timeout=timeout)
+        if resp.status_code >= 400:
+            return False, []
+        payload = resp.json()
+    except (requests.RequestException, ValueError):
+        return False, []
+    return True, [m.get("name") for m in payload.get("models", []) if isinstance(m, dict)]
+
+
+@dataclass
+class _HostState:
+    host: str
+    in_flight: int = 0
+    ewma_s: float | None = None
+    failures: int = 0
+    open_until: float = 0.0
+    calls: int = 0
+    errors: int = 0
+
+
+class OllamaPool:
+    """Least-loaded dispatch over several Ollama hosts with a per-host circuit breaker.
+
+    Load is (in-flight + 1) * latency EWMA, so a fast idle box wins over a slow busy one.
+    After BREAKER_FAILURES consecutive failures a host is skipped for BREAKER_COOLDOWN_S and
+    must pass an /api/tags health check before it gets traffic again.
+    """
+
+    def __init__(
+        self,
+        hosts: List[str],
+        *,
+        health_fn: Callable[[str], Tuple[bool, List[str]]] = health_check,
+    ):
+        if not hosts:
+            raise ValueError("OllamaPool needs at least one host")
+        self.hosts = {h: _HostState(h) for h in hosts}
+        self._health_fn = health_fn
+        self._lock = threading.Lock()
+
+    def _load(self, state: _HostState) -> float:
+        known = [s.ewma_s for s in self.hosts.values() if s.ewma_s is not None]
+        ewma = state.ewma_s if state.ewma_s is not None else (min(known) if known else 1.0)
+        return (state.in_flight + 1) * ewma
+
+    def _pick(self, exclude: set[str]) -> _HostState | None:
+        now = time.monotonic()
+        with self._lock:
+            closed = [
+                s for s in self.hosts.values() if s.host not in exclude and s.open_until <= now
+            ]
+            if not closed:
+                return None
+            state = min(closed, key=self._load)
+            state.in_flight += 1
+            return state
+
+    def _half_open_ok(self, state: _HostState) -> bool:
+        if state.failures < BREAKER_FAILURES:
+            return True
+        ok, _ = self._health_fn(state.host)
+        with self._lock:
+            if ok:
+                state.failures = 0
+            else:
+                state.open_until = time.monotonic() + BREAKER_COOLDOWN_S
+        return ok
+
+    @contextmanager
+    def acquire(self, exclude: set[str] | None = None) -> Iterator[_HostState | None]:
+        state = self._pick(exclude or set())
+        try:
+            yield state
+        finally:
+            if state is not None:
+                with self._lock:
+                    state.in_flight -= 1
+
+    def record(self, state: _HostState, latency_s: float | None) -> None:
+        """latency_s=None records a failure."""
+        with self._lock:
+            if latency_s is None:
+                state.errors += 1
+                state.failures += 1
+                if state.failures >= BREAKER_FAILURES:
+                    state.open_until = time.monotonic() + BREAKER_COOLDOWN_S
+                return
+            state.failures = 0
+            state.calls += 1
+            prev = state.ewma_s
+            state.ewma_s = (
+                latency_s if prev is None else EWMA_ALPHA * latency_s + (1 - EWMA_ALPHA) * prev
+            )
+
+    def chat(
+        self, model: str, system: str, user: str, options: Dict[str, Any], **kwargs: Any
+    ) -> str:
+        """Send to the least-loaded healthy host; on failure try the next one."""
+        tried: set[str] = set()
+        last_error: Exception | None = None
+        while len(tried) < len(self.hosts):
+            with self.acquire(tried) as state:
+                if state is None:
+                    break
+                tried.add(state.host)
+                if not self._half_open_ok(state):
+                    continue
+                started = time.monotonic()
+                try:
+                    content = chat(state.host, model, system, user, options, **kwargs)
+                except (RuntimeError, requests.RequestException) as exc:
+                    self.record(state, None)
+                    last_error = exc
+                    continue
+                self.record(state, time.monotonic() - started)
+                return content
+        if last_error is not None:
+            raise RuntimeError(f"ollama_all_hosts_failed:{last_error}")
+        raise RuntimeError("ollama_no_healthy_host")
+
+    async def achat(
+        self,
+        client: Any,
+        model: str,
+        system: str,
+        user: str,
+        options: Dict[str, Any],
+        **kwargs: Any,
+    ) -> str:
+        """chat() over an async client; load, EWMA and breaker state are shared with chat()."""
+        tried: set[str] = set()
+        last_error: Exception | None = None
+        while len(tried) < len(self.hosts):
+            with self.acquire(tried) as state:
+                if state is None:
+                    break
+                tried.add(state.host)
+                if state.failures >= BREAKER_FAILURES:
+                    if not await asyncio.to_thread(self._half_open_ok, state):
+                        continue
+                started = time.monotonic()
+                try:
+                    content = await achat(
+                        client, state.host, model, system, user, options, **kwargs
+                    )
+                except RuntimeError as exc:
+                    self.record(state, None)
+                    last_error = exc
+                    continue
+                self.record(state, time.monotonic() - started)
+                return content
+        if last_error is not None:
+            raise RuntimeError(f"ollama_all_hosts_failed:{last_error}")
+        raise RuntimeError("ollama_no_healthy_host")
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "host": s.host,
+                    "in_flight": s.in_flight,
+                    "ewma_ms": round(1000 * s.ewma_s, 1) if s.ewma_s is not None else None,
+                    "calls": s.calls,
+                    "errors": s.errors,
+                    "failures": s.failures,
+                    "open": s.open_until > now,
+                }
+                for s in self.hosts.values()
+            ]
+
+
+_POOLS: Dict[Tuple[str, ...], OllamaPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_pool(hosts: str | List[str]) -> OllamaPool:
+    """Process-wide pool per host list, so load and breaker state outlive one domain/request."""
+    key = tuple(parse_hosts(hosts) if isinstance(hosts, str) else hosts)
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None:
+            pool = _POOLS[key] = OllamaPool(list(key))
+        return pool
+
+
+def pool_snapshots() -> List[Dict[str, Any]]:
+    """snapshot() of every pool created in this process (one entry per pool and host)."""
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+    return [host for pool in pools for host in pool.snapshot()]
+
+
+def _chat_payload(
+    model: str,
+    system: str,
+    user: str,
+    options: Dict[str, Any],
+    format: Dict[str, Any] | str | None,
+    keep_alive: str | None,
+) -> Dict[str, Any]:
+    payload: Dict[str, Any] = {
+        "model": model,
+        "messages": [
+            {"role": "system", "content": system},
+            {"role": "user", "content": user},
+        ],
+        "stream": False,
+        "options": options,
+    }
+    if format is not None:
+        payload["format"] = format
+    if keep_alive:
+        payload["keep_alive"] = keep_alive
+    return payload
+
+
+def _reply_content(resp: Any) -> str:
+    if resp.status_code >= 400:
+        raise RuntimeError(f"ollama_http_{resp.status_code}")
+    data = resp.json()
+    content = data.get("message", {}).get("content")
+    if not isinstance(content, str):
+        raise RuntimeError("ollama_empty_response")
+    return content
+
+
+def chat(
+    host: str,
+    model: str,
+    system: str,
+    user: str,
+    options: Dict[str, Any],
+    *,
+    format: Dict[str, Any] | str | None = None,
+    keep_alive: str | None = None,
+    timeout: float = 90,
+) -> str:
+    payload = _chat_payload(model, system, user, options, format, keep_alive)
+    resp = requests.post(host.rstrip("/") + "/api/chat", json=payload, timeout=timeout)
+    return _reply_content(resp)
+
+
+async def achat(
+    client: Any,
+    host: str,
+    model: str,
+    system: str,
+    user: str,
+    options: Dict[str, Any],
+    *,
+    format: Dict[str, Any] | str | None = None,
+    keep_alive: str | None = None,
+    timeout: float = 90,
+) -> str:
+    """chat() over an async client (httpx.AsyncClient); network errors become RuntimeError."""
+    payload = _chat_payload(model, system, user, options, format, keep_alive)
+    try:
+        resp = await client.post(host.rstrip("/") + "/api/chat", json=payload, timeout=timeout)
+    except async_transport_errors() as exc:
+        raise RuntimeError(f"ollama_request_failed:{type(exc).__name__}") from exc
+    return _reply_content(resp)
+
+
+def parse_json_reply(content: str) -> Dict[str, Any]:
+    """Strict parse first; fall back to the outermost {...} block (servers without `format`)."""
+    try:
+        data = json.loads(content)
+    except json.JSONDecodeError as exc:
+        start = content.find("{")
+        end = content.rfind("}")
+        if start == -1 or end <= start:
+            raise json.JSONDecodeError("No JSON block", content, 0) from exc
+        data = json.loads(content[start : end + 1])
+    if not isinstance(data, dict):
+        raise json.JSONDecodeError("Reply is not a JSON object", content, 0)
+    return data
+
+
+def validate_verdict(data: Dict[str, Any]) -> Dict[str, Any]:
+    signal = str(data.get("hiring_signal") or data.get("signal") or "").lower()
+    if signal not in HIRING_SIGNALS:
+        raise ValueError(f"invalid hiring_signal: {signal or 'missing'}")
+    data["hiring_signal"] = signal
+    try:
+        data["confidence"] = max(0.0, min(1.0, float(data.get("confidence") or 0.0)))
+    except (TypeError, ValueError) as exc:
+        raise ValueError("invalid confidence") from exc
+    return data
+
+
+@dataclass(frozen=True)
+class ChatCall:
+    """One chat request yielded by a *_steps generator; a driver sends back the reply text."""
+
+    host: str
+    model: str
+    system: str
+    user: str
+    options: Dict[str, Any]
+    format: Dict[str, Any] | str | None = None
+    keep_alive: str | None = None
+
+
+# Verdict/cascade logic is written once as generators that yield ChatCall and receive the
+# reply (or have the transport error thrown in); drive/adrive run them over sync/async chat.
+ChatSteps = Generator[ChatCall, str, T]
+
+
+def drive(steps: ChatSteps[T], call: Callable[[ChatCall], str]) -> T:
+    try:
+        request = next(steps)
+        while True:
+            try:
+                reply = call(request)
+            except Exception as exc:  # noqa: BLE001 - handed to the generator to decide
+                request = steps.throw(exc)
+            else:
+                request = steps.send(reply)
+    except StopIteration as stop:
+        return stop.value
+
+
+async def adrive(steps: ChatSteps[T], call: Callable[[ChatCall], Awaitable[str]]) -> T:
+    try:
+        request = next(steps)
+        while True:
+            try:
+                reply = await call(request)
+            except Exception as exc:  # noqa: BLE001 - handed to the generator to decide
+                request = steps.throw(exc)
+            else:
+                request = steps.send(reply)
+    except StopIteration as stop:
+        return stop.value
+
+
+def chat_verdict(
+    chat_fn: Callable[..., str],
+    host: str,
+    model: str,
+    system: str,
+    user: str,
+    options: Dict[str, Any],
+    *,
+    keep_alive: str | None = DEFAULT_KEEP_ALIVE,
+    retries: int = DEFAULT_RETRIES,
+    stats: OllamaCallStats | None = None,
+) -> Dict[str, Any]:
+    """Ask for a schema-constrained hiring verdict; malformed replies retry at temperature 0."""
+    steps = verdict_steps(
+        host, model, system, user, options, keep_alive=keep_alive, retries=retries, stats=stats
+    )
+    return drive(
+        steps,
+        lambda c: chat_fn(
+            c.host, c.model, c.system, c.user, c.options, format=c.format, keep_alive=c.keep_alive
+        ),
+    )
+
+
+def verdict_steps(
+    host: str,
+    model: str,
+    system: str,
+    user: str,
+    options: Dict[str, Any],
+    *,
+    keep_alive: str | None = DEFAULT_KEEP_ALIVE,
+    retries: int = DEFAULT_RETRIES,
+    stats: OllamaCallStats | None = None,
+) -> ChatSteps[Dict[str, Any]]:
+    attempt_options = dict(options)
+    last_error: Exception | None = None
+    for attempt in range(max(0, retries) + 1):
+        if attempt and stats is not None:
+            stats.record("retries")
+        started = time.monotonic()
+        try:
+            raw = yield ChatCall(
+                host,
+                model,
+                system,
+                user,
+                attempt_options,
+                format=HIRING_SIGNAL_SCHEMA,
+                keep_alive=keep_alive,
+            )
+        except (RuntimeError, requests.RequestException):
+            if stats is not None:
+                stats.record("http_errors")
+            raise
+        if stats is not None:
+            stats.record_call(time.monotonic() - started)
+        try:
+            return validate_verdict(parse_json_reply(raw))
+        except (json.JSONDecodeError, ValueError) as exc:
+            last_error = exc
+            if stats is not None:
+                stats.record("parse_failures")
+            attempt_options = {**attempt_options, "temperature": 0.0}
+    raise RuntimeError(f"ollama_parse_failed:{last_error}")
@@ -4,10 +4,13 @@ from __future__ import annotations
 
 import os
 import time
-from typing import Any, Iterable
+from typing import TYPE_CHECKING, Any, Iterable
 
 import requests
 
+if TYPE_CHECKING:
+    from .places_cache import PlacesCache
+
 API_URL = "https://places.googleapis.com/v1/places:searchText"
 NEARBY_URL = "https://places.googleapis.com/v1/places:searchNearby"
 DETAILS_URL = "https://places.googleapis.com/v1/places/"
@@ -43,18 +46,58 @@ def fetch_place_details(
     *,
     api_key: str | None = None,
     field_mask: str | Iterable[str] | None = None,
+    cache: PlacesCache | None = None,
 ) -> dict[str, Any]:
-    """Fetch place details for a place_id using Places API (New)."""
+    """Fetch place details for a place_id using Places API (New); `cache` skips repeat calls."""
+    mask = _field_mask(field_mask or DEFAULT_DETAILS_FIELD_MASK)
+    if cache is not None:
+        cached = cache.get_details(place_id, mask)
+        if cached is not None:
+            return cached
     key = api_key or get_api_key()
     headers = {
         "X-Goog-Api-Key": key,
-        "X-Goog-FieldMask": _field_mask(field_mask or DEFAULT_DETAILS_FIELD_MASK),
+        "X-Goog-FieldMask": mask,
     }
     url = f"{DETAILS_URL}{place_id}"
     resp = requests.get(url, headers=headers, timeout=20)
     if resp.status_code != 200:
         raise RuntimeError(f"Places API HTTP {resp.status_code}: {resp.text}")
-    data = resp.json()
+    details = _details_from(resp.json(), place_id)
+    if cache is not None:
+        cache.put_details(place_id, mask, details)
+    return details
+
+
+async def afetch_place_details(
+    client: Any,
+    place_id: str,
+    *,
+    api_key: str | None = None,
+    field_mask: str | Iterable[str] | None = None,
+    cache: PlacesCache | None = None,
+) -> dict[str, Any]:
+    """fetch_place_details over an async client (httpx.AsyncClient); same cache and result."""
+    mask = _field_mask(field_mask or DEFAULT_DETAILS_FIELD_MASK)
+    if cache is not None:
+        cached = cache.get_details(place_id, mask)
+        if cached is not None:
+            return cached
+    key = api_key or get_api_key()
+    headers = {
+        "X-Goog-Api-Key": key,
+        "X-Goog-FieldMask": mask,
+    }
+    resp = await client.get(f"{DETAILS_URL}{place_id}", headers=headers, timeout=20)
+    if resp.status_code != 200:
+        raise RuntimeError(f"Places API HTTP {resp.status_code}: {resp.text}")
+    details = _details_from(resp.json(), place_id)
+    if cache is not None:
+        cache.put_details(place_id, mask, details)
+    return details
+
+
+def _details_from(data: dict[str, Any], place_id: str) -> dict[str, Any]:
     display = data.get("displayName") or {}
     return {
         "place_id": data.get("id") or place_id,
@@ -0,0 +1,147 @@
+"""SQLite TTL cache for Places details and Maps short-link expansions, with hit counters."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator
+
+# Under out/ (gitignored): Places content stays local and uncommitted (docs/PLACES_RETENTION.md).
+DEFAULT_PLACES_CACHE_PATH = Path("out/service/places_cache.sqlite")
+# Places content (websiteUri etc.) may change; short links never do but share the same window.
+DEFAULT_PLACES_TTL_S = 7 * 86400
+CACHE_KINDS = ("short_links", "place_details")
+
+
+def _ensure_db(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS short_links (
+            url TEXT PRIMARY KEY,
+            expanded TEXT NOT NULL,
+            created_at REAL NOT NULL
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS place_details (
+            place_id TEXT NOT NULL,
+            field_mask TEXT NOT NULL,
+            details TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            PRIMARY KEY (place_id, field_mask)
+        )
+        """
+    )
+
+
+def _mask_fields(field_mask: str) -> set[str]:
+    return {part.strip() for part in field_mask.split(",") if part.strip()}
+
+
+class PlacesCache:
+    """Remembers short-link targets and Places details for `ttl_s` seconds (<= 0 disables).
+
+    Only successful lookups are stored. `stats()` counts hits and misses of this instance;
+    every place_details hit is one billed Places API call saved.
+    """
+
+    def __init__(self, path: Path = DEFAULT_PLACES_CACHE_PATH, ttl_s: float = DEFAULT_PLACES_TTL_S):
+        self.path = Path(path)
+        self.ttl_s = ttl_s
+        self._counts = {kind: {"hits": 0, "misses": 0} for kind in CACHE_KINDS}
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._db() as conn:
+            _ensure_db(conn)
+
+    @contextmanager
+    def _db(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def _count(self, kind: str, hit: bool) -> None:
+        with self._lock:
+            self._counts[kind]["hits" if hit else "misses"] += 1
+
+    def _fresh(self, created_at: float) -> bool:
+        return time.time() - created_at <= self.ttl_s
+
+    def get_expansion(self, url: str) -> str | None:
+        if self.ttl_s <= 0:
+            return None
+        with self._db() as conn:
+            row = conn.execute(
+                "SELECT expanded, created_at FROM short_links WHERE url = ?", (url,)
+            ).fetchone()
+        hit = row is not None and self._fresh(row[1])
+        self._count("short_links", hit)
+        return str(row[0]) if hit else None
+
+    def put_expansion(self, url: str, expanded: str) -> None:
+        if self.ttl_s <= 0:
+            return
+        with self._db() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO short_links(url, expanded, created_at) VALUES (?, ?, ?)",
+                (url, expanded, time.time()),
+            )
+
+    def get_details(self, place_id: str, field_mask: str) -> Dict[str, Any] | None:
+        """Fresh details fetched with `field_mask` or any wider mask (script and service share)."""
+        if self.ttl_s <= 0:
+            return None
+        wanted = _mask_fields(field_mask)
+        with self._db() as conn:
+            rows = conn.execute(
+                "SELECT field_mask, details, created_at FROM place_details WHERE place_id = ? "
+                "ORDER BY created_at DESC",
+                (place_id,),
+            ).fetchall()
+        details = next(
+            (
+                json.loads(row[1])
+                for row in rows
+                if self._fresh(row[2]) and wanted <= _mask_fields(row[0])
+            ),
+            None,
+        )
+        self._count("place_details", details is not None)
+        return details
+
+    def put_details(self, place_id: str, field_mask: str, details: Dict[str, Any]) -> None:
+        if self.ttl_s <= 0:
+            return
+        with self._db() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO place_details(place_id, field_mask, details, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                (place_id, field_mask, json.dumps(details, ensure_ascii=False), time.time()),
+            )
+
+    def purge(self) -> int:
+        """Delete rows past the TTL (all rows when caching is disabled); returns rows removed."""
+        cutoff = time.time() - max(self.ttl_s, 0)
+        with self._db() as conn:
+            removed = 0
+            for table in CACHE_KINDS:
+                removed += conn.execute(
+                    f"DELETE FROM {table} WHERE created_at < ?", (cutoff,)
+                ).rowcount
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = {kind: dict(values) for kind, values in self._counts.items()}
+        for values in counts.values():
+            total = values["hits"] + values["misses"]
+            values["hit_ratio"] = round(values["hits"] / total, 3) if total else 0.0
+        return {**counts, "places_calls_saved": counts["place_details"]["hits"]}
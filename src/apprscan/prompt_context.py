@@ -0,0 +1,132 @@
+"""Relevance-ranked page text for LLM prompts under a token budget.
+
+Pages are split into blocks (headings, paragraphs, list items, links, table cells); blocks
+are scored by keyword density, heading weight and position, and the best ones are kept in
+page order until the budget is spent. Tokens are estimated as chars / 4 (no tokenizer).
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from dataclasses import dataclass
+from typing import Iterable, List, Tuple
+
+from bs4 import BeautifulSoup
+
+BLOCK_TAGS = ["h1", "h2", "h3", "h4", "h5", "h6", "p", "li", "a", "td", "dt", "dd", "button"]
+HEADING_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+CHARS_PER_TOKEN = 4
+DEFAULT_PROMPT_TOKENS = 800
+MAX_BLOCK_CHARS = 600
+
+
+@dataclass
+class TextBlock:
+    text: str
+    tag: str
+    position: int
+
+
+@dataclass
+class PromptContext:
+    text: str
+    chars: int
+    tokens: int
+    blocks_used: int
+    blocks_total: int
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _keyword_pattern(keywords: Iterable[str]) -> re.Pattern[str] | None:
+    words = sorted({k.lower() for k in keywords if k}, key=len, reverse=True)
+    if not words:
+        return None
+    # Prefix match at a word start so Finnish inflections (uralle, rekrytoimme) count.
+    return re.compile(r"\b(?:" + "|".join(re.escape(w) for w in words) + ")")
+
+
+def extract_blocks(html: str) -> Tuple[str, List[TextBlock]]:
+    soup = BeautifulSoup(html, "html.parser")
+    title = (soup.title.get_text(" ", strip=True) if soup.title else "").strip()
+    for tag in soup(["script", "style", "noscript", "template"]):
+        tag.decompose()
+    blocks: List[TextBlock] = []
+    seen: set[str] = set()
+    for el in soup.find_all(BLOCK_TAGS):
+        if el.find_parent(BLOCK_TAGS) is not None:
+            continue  # text already counted in the enclosing block
+        text = " ".join(el.stripped_strings)
+        if not text or text in seen:
+            continue
+        seen.add(text)
+        blocks.append(TextBlock(text=text, tag=el.name, position=len(blocks)))
+    if not blocks:
+        text = " ".join(soup.stripped_strings)
+        if text:
+            blocks.append(TextBlock(text=text, tag="body", position=0))
+    return title, blocks
+
+
+def score_block(
+    block: TextBlock,
+    keywords: re.Pattern[str] | None,
+    penalties: re.Pattern[str] | None = None,
+) -> float:
+    lowered = block.text.lower()
+    words = max(1, len(lowered.split()))
+    hits = len(keywords.findall(lowered)) if keywords else 0
+    score = hits * (1.0 + hits / words)
+    if block.tag in HEADING_TAGS:
+        score *= 2.0
+    if penalties is not None:
+        score -= 0.5 * len(penalties.findall(lowered))
+    # Earlier blocks win ties and fill leftover budget (intro text, page title context).
+    return score + 0.5 / (1.0 + block.position / 10.0)
+
+
+def select_context(
+    blocks: List[TextBlock],
+    *,
+    keywords: Iterable[str],
+    penalty_keywords: Iterable[str] = (),
+    budget_tokens: int = DEFAULT_PROMPT_TOKENS,
+) -> PromptContext:
+    budget_chars = max(0, int(budget_tokens)) * CHARS_PER_TOKEN
+    kw = _keyword_pattern(keywords)
+    pen = _keyword_pattern(penalty_keywords)
+    ranked = sorted(blocks, key=lambda b: (-score_block(b, kw, pen), b.position))
+    chosen: List[Tuple[int, str]] = []
+    used = 0
+    for block in ranked:
+        remaining = budget_chars - used
+        if remaining <= 20:
+            break
+        text = block.text[: min(MAX_BLOCK_CHARS, remaining - 1)]
+        chosen.append((block.position, text))
+        used += len(text) + 1
+    text = "\n".join(t for _, t in sorted(chosen))
+    return PromptContext(
+        text=text,
+        chars=len(text),
+        tokens=estimate_tokens(text),
+        blocks_used=len(chosen),
+        blocks_total=len(blocks),
+    )
+
+
+def build_prompt_context(
+    html: str,
+    *,
+    keywords: Iterable[str],
+    penalty_keywords: Iterable[str] = (),
+    budget_tokens: int = DEFAULT_PROMPT_TOKENS,
+) -> Tuple[str, PromptContext]:
+    title, blocks = extract_blocks(html)
+    ctx = select_context(
+        blocks, keywords=keywords, penalty_keywords=penalty_keywords, budget_tokens=budget_tokens
+    )
+    return title, ctx
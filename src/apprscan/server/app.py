@@ -2,38 +2,105 @@
 
 from __future__ import annotations
 
+import functools
 import os
 import secrets
+import threading
 import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import JSONResponse
 
-from .routes import router
-from .service import purge_runs
+from ..http_pool import async_client, require_httpx
+from .job_queue import (
+    DEFAULT_CONCURRENCY,
+    DEFAULT_HEARTBEAT_S,
+    DEFAULT_MAX_QUEUED,
+    DEFAULT_QUEUE_PATH,
+    DEFAULT_WORKERS,
+    JobQueue,
+)
+from .metrics import metrics
+from .routes import arun_ingest_job, router, run_ingest_job
+from .service import default_places_cache, provenance, purge_runs
 
 
 class BodySizeLimitMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app: FastAPI, max_bytes: int):
+    def __init__(self, app: FastAPI, max_bytes: int, path_limits: dict[str, int] | None = None):
         super().__init__(app)
         self.max_bytes = max_bytes
+        self.path_limits = path_limits or {}
 
     async def dispatch(self, request, call_next):  # type: ignore[override]
         if request.method in {"POST", "PUT", "PATCH"}:
+            max_bytes = self.path_limits.get(request.url.path, self.max_bytes)
             length = request.headers.get("content-length")
-            if length and length.isdigit() and int(length) > self.max_bytes:
+            if length and length.isdigit() and int(length) > max_bytes:
                 return JSONResponse({"detail": "Request body too large."}, status_code=413)
             body = await request.body()
-            if len(body) > self.max_bytes:
+            if len(body) > max_bytes:
                 return JSONResponse({"detail": "Request body too large."}, status_code=413)
             request._body = body  # type: ignore[attr-defined]
         return await call_next(request)
 
 
-def create_app(token: str | None = None) -> FastAPI:
-    app = FastAPI(title="apprscan companion", version="0.1")
+class RequestMetricsMiddleware(BaseHTTPMiddleware):
+    """Counts requests per method, route template and status for /metrics."""
+
+    async def dispatch(self, request, call_next):  # type: ignore[override]
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            route = getattr(request.scope.get("route"), "path", "unmatched")
+            metrics().inc(
+                "apprscan_http_requests_total", method=request.method, route=route, status=status
+            )
+
+
+def _housekeeping(app: FastAPI, stop: threading.Event) -> None:
+    """Retention purge off the startup path: first pass right away, then every interval."""
+    while True:
+        try:
+            app.state.purged_runs += purge_runs(max_age_days=app.state.retention_days)
+            app.state.job_queue.purge(app.state.retention_days)
+            default_places_cache().purge()
+        except Exception as exc:  # noqa: BLE001 - retry on the next interval
+            app.state.purge_error = f"{type(exc).__name__}:{exc}"
+        if stop.wait(app.state.purge_interval_s):
+            return
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    queue: JobQueue = app.state.job_queue
+    provenance(reload=True)
+    app.state.recovered_jobs = queue.recover()
+    queue.start()
+    stop = threading.Event()
+    housekeeping = threading.Thread(
+        target=_housekeeping, args=(app, stop), name="apprscan-purge", daemon=True
+    )
+    housekeeping.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        queue.stop()
+        housekeeping.join(5.0)
+
+
+def create_app(token: str | None = None, queue_path: Path | None = None) -> FastAPI:
+    """Build the app (opens the job queue); for plain uvicorn use
+    `uvicorn --factory apprscan.server.app:create_app`."""
+    app = FastAPI(title="apprscan companion", version="0.1", lifespan=_lifespan)
     cors_origins = [
         origin.strip()
         for origin in os.getenv("APPRSCAN_CORS_ORIGINS", "").split(",")
@@ -48,7 +115,13 @@ def create_app(token: str | None = None) -> FastAPI:
             allow_headers=["*"],
         )
     max_body = int(os.getenv("APPRSCAN_MAX_BODY_BYTES", "10240"))
-    app.add_middleware(BodySizeLimitMiddleware, max_bytes=max_body)
+    max_batch_body = int(os.getenv("APPRSCAN_MAX_BATCH_BODY_BYTES", "262144"))
+    app.add_middleware(
+        BodySizeLimitMiddleware,
+        max_bytes=max_body,
+        path_limits={"/ingest/maps/batch": max_batch_body},
+    )
+    app.add_middleware(RequestMetricsMiddleware)
     app.include_router(router)
 
     token = token or os.getenv("APPRSCAN_TOKEN") or secrets.token_urlsafe(24)
@@ -56,11 +129,28 @@ def create_app(token: str | None = None) -> FastAPI:
     app.state.rate_limit = {}
     app.state.rate_limit_window_s = int(os.getenv("APPRSCAN_RATE_LIMIT_WINDOW_S", "60"))
     app.state.rate_limit_max = int(os.getenv("APPRSCAN_RATE_LIMIT_MAX", "10"))
+    app.state.batch_max_items = int(os.getenv("APPRSCAN_BATCH_MAX", "100"))
     app.state.start_ts = time.time()
     retention_days = int(os.getenv("APPRSCAN_RETENTION_DAYS", "30"))
     app.state.retention_days = retention_days
-    app.state.purged_runs = purge_runs(max_age_days=retention_days)
+    app.state.purged_runs = 0
+    app.state.purge_interval_s = float(os.getenv("APPRSCAN_PURGE_INTERVAL_S", "3600"))
+    # Async scanning: one event-loop thread carries APPRSCAN_ASYNC_CONCURRENCY ingests at once.
+    async_kwargs: dict[str, Any] = {}
+    if os.getenv("APPRSCAN_ASYNC_SCAN", "").lower() in {"1", "true", "yes"}:
+        require_httpx()
+        concurrency = int(os.getenv("APPRSCAN_ASYNC_CONCURRENCY", str(DEFAULT_CONCURRENCY)))
+        async_kwargs = {
+            "async_handler": arun_ingest_job,
+            "async_context": functools.partial(async_client, pool_size=concurrency),
+            "concurrency": concurrency,
+        }
+    app.state.job_queue = JobQueue(
+        queue_path or Path(os.getenv("APPRSCAN_QUEUE_DB", str(DEFAULT_QUEUE_PATH))),
+        run_ingest_job,
+        workers=int(os.getenv("APPRSCAN_WORKERS", str(DEFAULT_WORKERS))),
+        max_queued=int(os.getenv("APPRSCAN_QUEUE_MAX", str(DEFAULT_MAX_QUEUED))),
+        heartbeat_s=float(os.getenv("APPRSCAN_JOB_HEARTBEAT_S", str(DEFAULT_HEARTBEAT_S))),
+        **async_kwargs,
+    )
     return app
-
-
-app = create_app()
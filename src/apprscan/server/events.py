@@ -0,0 +1,80 @@
+"""In-memory per-run progress events for the companion service (SSE / long-poll)."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List
+
+# Only recent runs are kept; an older run falls back to its job state / package on disk.
+MAX_RUNS = 512
+MAX_EVENTS_PER_RUN = 200
+TERMINAL_STAGES = ("done", "failed")
+
+
+class EventLog:
+    """Append-only event list per run_id; `seq` numbers let clients resume after a reconnect.
+
+    Each event carries `t_ms`, milliseconds since the run's first event, so clients get stage
+    timings without clock sync. Writers are the job workers; readers never block them.
+    """
+
+    def __init__(self, max_runs: int = MAX_RUNS, max_events: int = MAX_EVENTS_PER_RUN):
+        self.max_runs = max_runs
+        self.max_events = max_events
+        self._runs: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+        self._started: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def emit(self, run_id: str, stage: str, **data: Any) -> Dict[str, Any]:
+        now = time.time()
+        with self._lock:
+            events = self._runs.get(run_id)
+            if events is None:
+                events = self._runs[run_id] = []
+                self._started[run_id] = now
+                while len(self._runs) > self.max_runs:
+                    old, _ = self._runs.popitem(last=False)
+                    self._started.pop(old, None)
+            else:
+                self._runs.move_to_end(run_id)
+            event = {
+                "seq": events[-1]["seq"] + 1 if events else 1,
+                "stage": stage,
+                "ts": now,
+                "t_ms": round(1000 * (now - self._started[run_id]), 1),
+                **data,
+            }
+            # Keep the first events (queued/started) and the newest ones when a run is chatty.
+            if len(events) >= self.max_events:
+                del events[self.max_events // 2]
+            events.append(event)
+            return event
+
+    def since(self, run_id: str, after: int = 0) -> List[Dict[str, Any]] | None:
+        """Events with seq > after; None when the run is unknown to this process."""
+        with self._lock:
+            events = self._runs.get(run_id)
+            if events is None:
+                return None
+            return [event for event in events if event["seq"] > after]
+
+    def discard(self, run_id: str) -> None:
+        """Forget a run that never made it into the queue."""
+        with self._lock:
+            self._runs.pop(run_id, None)
+            self._started.pop(run_id, None)
+
+    def finished(self, run_id: str) -> bool:
+        with self._lock:
+            events = self._runs.get(run_id) or []
+            return any(event["stage"] in TERMINAL_STAGES for event in events)
+
+
+_EVENT_LOG = EventLog()
+
+
+def event_log() -> EventLog:
+    """Process-wide log shared by the job workers and the /events route."""
+    return _EVENT_LOG
@@ -0,0 +1,410 @@
+"""SQLite-backed job queue with a fixed-size worker pool for the companion service."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import secrets
+import sqlite3
+import threading
+import time
+from contextlib import AbstractAsyncContextManager, contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Tuple
+
+DEFAULT_QUEUE_PATH = Path("out/service/jobs.sqlite")
+DEFAULT_WORKERS = 2
+DEFAULT_CONCURRENCY = 32
+DEFAULT_MAX_QUEUED = 1000
+# Each queue instance heartbeats its owner row; `running` jobs of an owner that stopped or
+# missed OWNER_TIMEOUT_BEATS heartbeats are taken as abandoned and requeued.
+DEFAULT_HEARTBEAT_S = 15.0
+OWNER_TIMEOUT_BEATS = 4
+MAX_ATTEMPTS = 3
+JOB_STATES = ("queued", "running", "done", "failed")
+POLL_INTERVAL_S = 1.0
+
+
+class QueueFull(RuntimeError):
+    pass
+
+
+def _ensure_db(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS jobs (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            run_id TEXT UNIQUE NOT NULL,
+            kind TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            state TEXT NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            error TEXT NOT NULL DEFAULT '',
+            enqueued_at REAL NOT NULL,
+            started_at REAL,
+            finished_at REAL
+        )
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS jobs_state_seq ON jobs(state, seq)")
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+    if "batch_id" not in columns:
+        conn.execute("ALTER TABLE jobs ADD COLUMN batch_id TEXT NOT NULL DEFAULT ''")
+    if "owner" not in columns:
+        conn.execute("ALTER TABLE jobs ADD COLUMN owner TEXT NOT NULL DEFAULT ''")
+    conn.execute("CREATE INDEX IF NOT EXISTS jobs_batch ON jobs(batch_id)")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS owners (owner TEXT PRIMARY KEY, expires_at REAL NOT NULL)"
+    )
+
+
+class JobQueue:
+    """Durable FIFO of ingest jobs; `workers` threads run `handler(run_id, payload)`.
+
+    Jobs survive restarts: each claim records this instance as the job's owner, and
+    `recover()` puts jobs of owners that stopped or stopped heartbeating back to `queued`
+    (right away at startup for a clean shutdown, within OWNER_TIMEOUT_BEATS heartbeats after
+    a crash), so a burst of pasted URLs is never lost. Jobs of live owners, including other
+    processes sharing the DB, are left alone; a job that keeps dying is failed after
+    MAX_ATTEMPTS claims.
+
+    With `async_handler` the workers are instead `concurrency` coroutines on one event-loop
+    thread, each awaiting `async_handler(run_id, payload, resource)`; `resource` is what
+    `async_context()` yields for the loop's lifetime (e.g. a shared httpx.AsyncClient).
+    """
+
+    def __init__(
+        self,
+        path: Path = DEFAULT_QUEUE_PATH,
+        handler: Callable[[str, Dict[str, Any]], Any] | None = None,
+        *,
+        workers: int = DEFAULT_WORKERS,
+        max_queued: int = DEFAULT_MAX_QUEUED,
+        async_handler: Callable[[str, Dict[str, Any], Any], Awaitable[Any]] | None = None,
+        async_context: Callable[[], AbstractAsyncContextManager[Any]] | None = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        heartbeat_s: float = DEFAULT_HEARTBEAT_S,
+    ):
+        self.path = Path(path)
+        self.handler = handler
+        self.workers = max(1, int(workers))
+        self.max_queued = max_queued
+        self.async_handler = async_handler
+        self.async_context = async_context
+        self.concurrency = max(1, int(concurrency))
+        self.heartbeat_s = float(heartbeat_s)
+        self.owner = secrets.token_hex(8)
+        self.recovered = 0
+        self.loop_error = ""
+        self._wake = threading.Condition()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._awake: asyncio.Event | None = None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._db() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            _ensure_db(conn)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @contextmanager
+    def _db(self) -> Iterator[sqlite3.Connection]:
+        conn = self._connect()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def enqueue(
+        self, run_id: str, payload: Dict[str, Any], kind: str = "maps_ingest"
+    ) -> Dict[str, Any]:
+        self.enqueue_batch("", [(run_id, payload)], kind=kind)
+        return self.status(run_id) or {}
+
+    def enqueue_batch(
+        self, batch_id: str, items: List[Tuple[str, Dict[str, Any]]], kind: str = "maps_ingest"
+    ) -> None:
+        """Insert all items in one transaction; a batch that does not fit is rejected whole."""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            queued = conn.execute("SELECT COUNT(*) FROM jobs WHERE state = 'queued'").fetchone()[0]
+            if self.max_queued and queued + len(items) > self.max_queued:
+                conn.execute("ROLLBACK")
+                raise QueueFull(f"queue_full:{queued}")
+            now = time.time()
+            conn.executemany(
+                "INSERT INTO jobs(run_id, batch_id, kind, payload, state, enqueued_at) "
+                "VALUES (?, ?, ?, ?, 'queued', ?)",
+                [
+                    (run_id, batch_id, kind, json.dumps(payload, ensure_ascii=False), now)
+                    for run_id, payload in items
+                ],
+            )
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+        self._notify()
+
+    def _notify(self) -> None:
+        with self._wake:
+            self._wake.notify_all()
+        loop, awake = self._loop, self._awake
+        if loop is not None and awake is not None:
+            try:
+                loop.call_soon_threadsafe(awake.set)
+            except RuntimeError:  # loop already closed
+                pass
+
+    def _beat(self, conn: sqlite3.Connection) -> None:
+        conn.execute(
+            "INSERT OR REPLACE INTO owners(owner, expires_at) VALUES (?, ?)",
+            (self.owner, time.time() + self.heartbeat_s * OWNER_TIMEOUT_BEATS),
+        )
+
+    def heartbeat(self) -> None:
+        """Mark this instance alive so its running jobs are not recovered by others."""
+        with self._db() as conn:
+            self._beat(conn)
+
+    def claim(self) -> sqlite3.Row | None:
+        """Atomically move the oldest queued job to `running`, owned by this instance."""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE state = 'queued' ORDER BY seq LIMIT 1"
+            ).fetchone()
+            if row is None:
+                conn.execute("ROLLBACK")
+                return None
+            self._beat(conn)
+            conn.execute(
+                "UPDATE jobs SET state = 'running', owner = ?, started_at = ?, "
+                "attempts = attempts + 1 WHERE seq = ?",
+                (self.owner, time.time(), row["seq"]),
+            )
+            conn.execute("COMMIT")
+            return row
+        finally:
+            conn.close()
+
+    def finish(self, run_id: str, state: str, error: str = "") -> None:
+        with self._db() as conn:
+            conn.execute(
+                "UPDATE jobs SET state = ?, error = ?, finished_at = ? WHERE run_id = ?",
+                (state, error, time.time(), run_id),
+            )
+
+    def recover(self) -> int:
+        """Requeue `running` jobs whose owner is gone; returns how many.
+
+        An owner is gone once it stopped (stop() drops its row) or missed OWNER_TIMEOUT_BEATS
+        of its own heartbeat intervals. Jobs already claimed MAX_ATTEMPTS times are failed as
+        `abandoned` instead, so a job that crashes the process cannot loop across restarts.
+        """
+        now = time.time()
+        orphaned = "state = 'running' AND owner NOT IN (SELECT owner FROM owners)"
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM owners WHERE expires_at <= ?", (now,))
+            conn.execute(
+                "UPDATE jobs SET state = 'failed', error = 'abandoned', finished_at = ? "
+                f"WHERE {orphaned} AND attempts >= ?",
+                (now, MAX_ATTEMPTS),
+            )
+            cur = conn.execute(
+                f"UPDATE jobs SET state = 'queued', owner = '', started_at = NULL WHERE {orphaned}"
+            )
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+        self.recovered += cur.rowcount
+        if cur.rowcount:
+            self._notify()
+        return cur.rowcount
+
+    def status(self, run_id: str) -> Dict[str, Any] | None:
+        with self._db() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE run_id = ?", (run_id,)).fetchone()
+            if row is None:
+                return None
+            return self._describe(conn, row)
+
+    def batch_status(self, batch_id: str) -> Dict[str, Any] | None:
+        """Per-item status plus aggregate counts and progress for one batch."""
+        if not batch_id:
+            return None
+        with self._db() as conn:
+            rows = conn.execute(
+                "SELECT * FROM jobs WHERE batch_id = ? ORDER BY seq", (batch_id,)
+            ).fetchall()
+            if not rows:
+                return None
+            items = [self._describe(conn, row) for row in rows]
+        counts = {state: 0 for state in JOB_STATES}
+        for item in items:
+            counts[item["state"]] = counts.get(item["state"], 0) + 1
+        finished = counts["done"] + counts["failed"]
+        return {
+            "batch_id": batch_id,
+            "total": len(items),
+            "counts": counts,
+            "progress": round(finished / len(items), 3),
+            "complete": finished == len(items),
+            "items": items,
+        }
+
+    def _describe(self, conn: sqlite3.Connection, row: sqlite3.Row) -> Dict[str, Any]:
+        position = None
+        if row["state"] == "queued":
+            position = conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE state = 'queued' AND seq < ?", (row["seq"],)
+            ).fetchone()[0]
+        now = time.time()
+        started, finished = row["started_at"], row["finished_at"]
+        return {
+            "run_id": row["run_id"],
+            "batch_id": row["batch_id"],
+            "state": row["state"],
+            "queue_position": position,
+            "attempts": row["attempts"],
+            "error": row["error"],
+            "enqueued_at": row["enqueued_at"],
+            "started_at": started,
+            "finished_at": finished,
+            "wait_s": round((started or now) - row["enqueued_at"], 3),
+            "run_s": round((finished or now) - started, 3) if started else None,
+        }
+
+    def counts(self) -> Dict[str, int]:
+        with self._db() as conn:
+            rows = conn.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall()
+        counts = {state: 0 for state in JOB_STATES}
+        counts.update({row[0]: row[1] for row in rows})
+        return counts
+
+    def purge(self, max_age_days: int) -> int:
+        """Drop finished job rows older than the run retention window."""
+        cutoff = time.time() - max_age_days * 86400
+        with self._db() as conn:
+            cur = conn.execute(
+                "DELETE FROM jobs WHERE state IN ('done', 'failed') AND finished_at < ?", (cutoff,)
+            )
+            return cur.rowcount
+
+    def run_once(self) -> bool:
+        """Claim and run one job; False when the queue is empty."""
+        row = self.claim()
+        if row is None:
+            return False
+        try:
+            if self.handler is None:
+                raise RuntimeError("no_handler")
+            self.handler(row["run_id"], json.loads(row["payload"]))
+        except Exception as exc:  # noqa: BLE001 - a failing job must not kill its worker
+            self.finish(row["run_id"], "failed", f"{type(exc).__name__}:{exc}")
+        else:
+            self.finish(row["run_id"], "done")
+        return True
+
+    async def arun_once(self, resource: Any = None) -> bool:
+        """run_once for the async workers: awaits async_handler(run_id, payload, resource).
+
+        claim() and finish() take SQLite write locks (busy timeout up to 30 s), so they run in
+        a thread to keep lock contention from stalling the other workers on the loop.
+        """
+        row = await asyncio.to_thread(self.claim)
+        if row is None:
+            return False
+        try:
+            if self.async_handler is None:
+                raise RuntimeError("no_handler")
+            await self.async_handler(row["run_id"], json.loads(row["payload"]), resource)
+        except Exception as exc:  # noqa: BLE001 - a failing job must not kill its worker
+            await asyncio.to_thread(
+                self.finish, row["run_id"], "failed", f"{type(exc).__name__}:{exc}"
+            )
+        else:
+            await asyncio.to_thread(self.finish, row["run_id"], "done")
+        return True
+
+    def _keepalive(self) -> None:
+        """Heartbeat and recover other owners' abandoned jobs every `heartbeat_s`."""
+        while not self._stop.wait(self.heartbeat_s):
+            try:
+                self.heartbeat()
+                self.recover()
+            except sqlite3.Error:  # busy DB: retry on the next beat
+                pass
+
+    def _worker(self) -> None:
+        while not self._stop.is_set():
+            if self.run_once():
+                continue
+            with self._wake:
+                self._wake.wait(POLL_INTERVAL_S)
+
+    async def _aworker(self, resource: Any, awake: asyncio.Event) -> None:
+        while not self._stop.is_set():
+            if await self.arun_once(resource):
+                continue
+            awake.clear()
+            try:
+                await asyncio.wait_for(awake.wait(), POLL_INTERVAL_S)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _aworkers(self) -> None:
+        self._awake = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        context = self.async_context() if self.async_context else nullcontext()
+        try:
+            async with context as resource:
+                await asyncio.gather(
+                    *(self._aworker(resource, self._awake) for _ in range(self.concurrency))
+                )
+        finally:
+            self._loop = self._awake = None
+
+    def _event_loop(self) -> None:
+        try:
+            asyncio.run(self._aworkers())
+        except Exception as exc:  # noqa: BLE001 - surfaced in /stats
+            self.loop_error = f"{type(exc).__name__}:{exc}"
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        self._stop.clear()
+        self.heartbeat()
+        if self.async_handler is not None:
+            self._threads = [
+                threading.Thread(target=self._event_loop, name="apprscan-job-loop", daemon=True)
+            ]
+        else:
+            self._threads = [
+                threading.Thread(target=self._worker, name=f"apprscan-job-{i}", daemon=True)
+                for i in range(self.workers)
+            ]
+        self._threads.append(
+            threading.Thread(target=self._keepalive, name="apprscan-job-heartbeat", daemon=True)
+        )
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop taking new jobs and retire this owner, so a job still mid-run is requeued by
+        the next `recover()` (the next start, or another live instance's heartbeat)."""
+        self._stop.set()
+        self._notify()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        with self._db() as conn:
+            conn.execute("DELETE FROM owners WHERE owner = ?", (self.owner,))
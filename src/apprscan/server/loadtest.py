@@ -0,0 +1,609 @@
+"""Offline load test for the companion service against local stand-ins.
+
+The app runs in-process under uvicorn; Places API, maps short links, company sites and Ollama
+are served by one local HTTP server that dispatches on the Host header. Outbound requests
+(requests sessions, urllib for robots.txt and, with --async-scan, httpx) are routed to it, so a
+run needs no network. The report is JSON so two releases can be compared side by side.
+
+Run it in a fresh process: it changes the working directory and the process environment.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import socket
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+import requests.sessions
+from requests.adapters import HTTPAdapter
+
+from .. import __version__, http_pool
+from ..hiring_scan import COMMON_PATHS, _repo_root, _resolve_git_sha
+
+LOADTEST_DOMAIN = "loadtest.invalid"
+SHORT_LINK_HOST = "maps.app.goo.gl"
+MAPS_HOST = "www.google.com"
+PLACES_HOST = "places.googleapis.com"
+ROUTED_HOSTS = {SHORT_LINK_HOST, MAPS_HOST, PLACES_HOST}
+LOADTEST_TOKEN = "loadtest"
+LOADTEST_MODELS = "loadtest-small,loadtest-large"
+DEFAULT_REPORT_PATH = Path("out/loadtest/report.json")
+ENDPOINTS = ("POST /ingest/maps", "GET /result/{run_id}", "ingest (end-to-end)")
+
+
+@dataclass
+class LoadTestConfig:
+    ingests: int = 40
+    concurrency: int = 8
+    places: int = 20
+    short_link_ratio: float = 0.5
+    hiring_ratio: float = 0.5
+    workers: int = 2
+    async_scan: bool = False
+    use_llm: bool = True
+    site_latency_ms: float = 20.0
+    places_latency_ms: float = 30.0
+    llm_latency_ms: float = 150.0
+    scan_rate: float | None = None
+    result_ttl_s: float | None = None
+    poll_interval_s: float = 0.1
+    timeout_s: float = 120.0
+    workdir: str = ""
+
+
+def place_id(n: int) -> str:
+    return f"LT{n:05d}"
+
+
+def site_host(n: int) -> str:
+    return f"shop-{n:03d}.{LOADTEST_DOMAIN}"
+
+
+def is_hiring(n: int, ratio: float) -> bool:
+    """Deterministic spread: a ratio of 0.5 makes every other place hiring."""
+    return math.floor((n + 1) * ratio) > math.floor(n * ratio)
+
+
+def maps_url_for(n: int, index: int, short_link_ratio: float) -> str:
+    if is_hiring(index, short_link_ratio):
+        return f"https://{SHORT_LINK_HOST}/lt{n}"
+    return f"https://{MAPS_HOST}/maps/place/Shop+{n}/data=!4m2!3m1!1s{place_id(n)}"
+
+
+def _is_routed(host: str) -> bool:
+    return host in ROUTED_HOSTS or host.endswith("." + LOADTEST_DOMAIN)
+
+
+# --- stand-ins ---------------------------------------------------------------------------
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    server: "StandIns"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - stdlib signature
+        pass
+
+    def _send(
+        self,
+        status: int,
+        body: str = "",
+        content_type: str = "text/html; charset=utf-8",
+        headers: Dict[str, str] | None = None,
+    ) -> None:
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(data)
+
+    def _host(self) -> str:
+        return (self.headers.get("Host") or "").split(":")[0].lower()
+
+    def do_HEAD(self) -> None:  # noqa: N802 - stdlib naming
+        self.do_GET()
+
+    def do_GET(self) -> None:  # noqa: N802 - stdlib naming
+        host, path = self._host(), urlsplit(self.path).path
+        config = self.server.config
+        if host == SHORT_LINK_HOST and path.startswith("/lt") and path[3:].isdigit():
+            n = int(path[3:])
+            target = f"https://{MAPS_HOST}/maps/place/Shop+{n}/data=!4m2!3m1!1s{place_id(n)}"
+            self._send(302, headers={"Location": target})
+        elif host == MAPS_HOST:
+            self._send(200, "<title>Google Maps</title>")
+        elif host == PLACES_HOST and path.startswith("/v1/places/LT"):
+            time.sleep(config.places_latency_ms / 1000)
+            pid = path.rsplit("/", 1)[-1]
+            n = int(pid[2:])
+            details = {"id": pid, "websiteUri": f"https://{site_host(n)}/"}
+            self._send(200, json.dumps(details), "application/json")
+        elif host.endswith("." + LOADTEST_DOMAIN):
+            time.sleep(config.site_latency_ms / 1000)
+            self._site(host, path)
+        elif path == "/api/tags":
+            models = [{"name": name} for name in LOADTEST_MODELS.split(",")]
+            self._send(200, json.dumps({"models": models}), "application/json")
+        else:
+            self._send(404, "not found")
+
+    def _site(self, host: str, path: str) -> None:
+        n = int(host.split(".")[0].rsplit("-", 1)[-1])
+        if path == "/robots.txt":
+            self._send(200, "User-agent: *\nAllow: /\n", "text/plain")
+        elif path in {"", "/"}:
+            self._send(200, f"<title>Shop {n}</title><p>Tervetuloa kauppaan {n}.</p>")
+        elif path.rstrip("/") == COMMON_PATHS[0].rstrip("/") and is_hiring(
+            n, self.server.config.hiring_ratio
+        ):
+            self._send(200, "<title>Ura</title><p>Open positions: sales assistant. Apply now!</p>")
+        else:
+            self._send(404, "not found")
+
+    def do_POST(self) -> None:  # noqa: N802 - stdlib naming
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}")
+        if urlsplit(self.path).path != "/api/chat":
+            self._send(404, "not found")
+            return
+        time.sleep(self.server.config.llm_latency_ms / 1000)
+        hiring = "Apply now" in str((body.get("messages") or [{}])[-1].get("content"))
+        snippets = (
+            ["Open positions: sales assistant", "Apply now"]
+            if hiring
+            else ["No open positions right now", "Not hiring at the moment"]
+        )
+        verdict = {
+            "hiring_signal": "yes" if hiring else "no",
+            "confidence": 0.9,
+            "evidence": snippets[0],
+            "evidence_snippets": snippets,
+            "evidence_urls": [],
+        }
+        reply = {"message": {"content": json.dumps(verdict)}}
+        self._send(200, json.dumps(reply), "application/json")
+
+
+class StandIns(ThreadingHTTPServer):
+    """Places API, short links, maps pages, company sites and Ollama on one local port."""
+
+    daemon_threads = True
+
+    def __init__(self, config: LoadTestConfig):
+        super().__init__(("127.0.0.1", 0), _StandInHandler)
+        self.config = config
+
+    @property
+    def port(self) -> int:
+        return int(self.server_address[1])
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+
+def _routing_adapter(port: int) -> type:
+    class RoutingAdapter(HTTPAdapter):
+        """Sends stand-in hosts to the local server over plain HTTP, keeping the Host header."""
+
+        def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+            parts = urlsplit(request.url or "")
+            host = parts.hostname or ""
+            if not _is_routed(host) and (host, parts.port) != ("127.0.0.1", port):
+                return super().send(request, **kwargs)
+            routed = request.copy()
+            routed.url = urlunsplit(("http", f"127.0.0.1:{port}", parts.path, parts.query, ""))
+            routed.headers["Host"] = parts.netloc
+            kwargs["proxies"] = {}
+            response = super().send(routed, **kwargs)
+            response.url = request.url or ""
+            response.request = request
+            return response
+
+    return RoutingAdapter
+
+
+class _UrllibRouting(urllib.request.BaseHandler):
+    """urllib counterpart for RobotFileParser.read(); other hosts fall through."""
+
+    handler_order = 100  # ahead of the default HTTP(S) handlers
+
+    def __init__(self, port: int):
+        self.port = port
+
+    def _route(self, req: urllib.request.Request) -> Any:
+        parts = urlsplit(req.full_url)
+        if not _is_routed(parts.hostname or ""):
+            return None
+        url = urlunsplit(("http", f"127.0.0.1:{self.port}", parts.path, parts.query, ""))
+        routed = urllib.request.Request(url, headers={**req.headers, "Host": parts.netloc})
+        routed.timeout = req.timeout  # type: ignore[attr-defined]
+        return urllib.request.HTTPHandler().http_open(routed)
+
+    def http_open(self, req: urllib.request.Request) -> Any:
+        return self._route(req)
+
+    def https_open(self, req: urllib.request.Request) -> Any:
+        return self._route(req)
+
+
+def _routed_async_client(port: int, pool_size: int = 32, timeout: float = 20.0) -> Any:
+    """http_pool.async_client with stand-in hosts rewritten to the local server."""
+    httpx = http_pool.require_httpx()
+
+    class RoutingTransport(httpx.AsyncHTTPTransport):
+        async def handle_async_request(self, request: Any) -> Any:
+            original = request.url
+            if _is_routed(original.host):
+                request.url = original.copy_with(scheme="http", host="127.0.0.1", port=port)
+            try:
+                return await super().handle_async_request(request)
+            finally:
+                request.url = original
+
+    limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+    return httpx.AsyncClient(
+        transport=RoutingTransport(limits=limits),
+        timeout=timeout,
+        follow_redirects=True,
+        trust_env=False,
+    )
+
+
+@contextmanager
+def route_outbound(port: int) -> Iterator[None]:
+    """Route requests sessions (new ones) and urllib.request.urlopen to the stand-ins."""
+    adapter = _routing_adapter(port)
+    saved = requests.sessions.HTTPAdapter, http_pool.HTTPAdapter
+    requests.sessions.HTTPAdapter = adapter  # type: ignore[misc]
+    http_pool.HTTPAdapter = adapter  # type: ignore[misc]
+    urllib.request.install_opener(urllib.request.build_opener(_UrllibRouting(port)))
+    try:
+        yield
+    finally:
+        requests.sessions.HTTPAdapter, http_pool.HTTPAdapter = saved  # type: ignore[misc]
+        urllib.request.install_opener(None)  # type: ignore[arg-type]
+
+
+@contextmanager
+def _environment(values: Dict[str, str]) -> Iterator[None]:
+    saved = {key: os.environ.get(key) for key in values}
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def _service_env(config: LoadTestConfig, stand_ins: StandIns, workdir: Path) -> Dict[str, str]:
+    env = {
+        "APPRSCAN_TOKEN": LOADTEST_TOKEN,
+        "APPRSCAN_RATE_LIMIT_MAX": str(10**9),
+        "APPRSCAN_QUEUE_MAX": str(max(1000, config.ingests * 2)),
+        "APPRSCAN_WORKERS": str(config.workers),
+        "APPRSCAN_QUEUE_DB": str(workdir / "service" / "jobs.sqlite"),
+        "APPRSCAN_RESULT_CACHE_DB": str(workdir / "service" / "results.sqlite"),
+        "APPRSCAN_PLACES_CACHE_DB": str(workdir / "service" / "places.sqlite"),
+        "APPRSCAN_ASYNC_SCAN": "1" if config.async_scan else "",
+        "GOOGLE_MAPS_API_KEY": "loadtest",
+        "OLLAMA_URL": stand_ins.url,
+        "OLLAMA_MODEL": LOADTEST_MODELS if config.use_llm else "",
+    }
+    if config.result_ttl_s is not None:
+        env["APPRSCAN_RESULT_TTL_S"] = str(config.result_ttl_s)
+    return env
+
+
+@dataclass
+class _Recorder:
+    latencies: Dict[str, List[float]] = field(default_factory=lambda: {n: [] for n in ENDPOINTS})
+    errors: Dict[str, int] = field(default_factory=lambda: {n: 0 for n in ENDPOINTS})
+    statuses: Dict[str, int] = field(default_factory=dict)
+    reused: int = 0
+    timed_out: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def record(self, endpoint: str, started: float, ok: bool) -> None:
+        elapsed_ms = (time.monotonic() - started) * 1000
+        with self.lock:
+            self.latencies[endpoint].append(elapsed_ms)
+            if not ok:
+                self.errors[endpoint] += 1
+
+    def package(self, package: Dict[str, Any]) -> None:
+        status = str(package.get("status") or "unknown")
+        with self.lock:
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+            self.reused += bool(package.get("reused_from"))
+
+
+def percentile(values: List[float], q: float) -> float | None:
+    """Nearest-rank percentile (no interpolation), in the unit of `values`."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+def _summary(latencies: List[float], errors: int) -> Dict[str, Any]:
+    def ms(value: float | None) -> float | None:
+        return round(value, 1) if value is not None else None
+
+    count = len(latencies)
+    return {
+        "count": count,
+        "errors": errors,
+        "error_rate": round(errors / count, 4) if count else 0.0,
+        "mean_ms": ms(sum(latencies) / count if count else None),
+        "p50_ms": ms(percentile(latencies, 50)),
+        "p95_ms": ms(percentile(latencies, 95)),
+        "p99_ms": ms(percentile(latencies, 99)),
+        "max_ms": ms(max(latencies) if latencies else None),
+    }
+
+
+def _ingest(
+    base_url: str, index: int, config: LoadTestConfig, recorder: _Recorder, session: Any
+) -> None:
+    headers = {"X-APPRSCAN-TOKEN": LOADTEST_TOKEN}
+    n = index % config.places
+    started = time.monotonic()
+    try:
+        resp = session.post(
+            f"{base_url}/ingest/maps",
+            json={"maps_url": maps_url_for(n, index, config.short_link_ratio)},
+            headers=headers,
+            timeout=30,
+        )
+        ok = resp.status_code == 200
+    except requests.RequestException:
+        ok = False
+    recorder.record("POST /ingest/maps", started, ok)
+    if not ok:
+        recorder.record("ingest (end-to-end)", started, False)
+        return
+    run_id = resp.json()["run_id"]
+    deadline = started + config.timeout_s
+    while time.monotonic() < deadline:
+        polled = time.monotonic()
+        try:
+            result = session.get(f"{base_url}/result/{run_id}", headers=headers, timeout=30)
+            status = result.status_code
+        except requests.RequestException:
+            status = 0
+        recorder.record("GET /result/{run_id}", polled, status in {200, 202})
+        if status == 200:
+            package = result.json()
+            recorder.package(package)
+            recorder.record("ingest (end-to-end)", started, package.get("status") != "error")
+            return
+        if status not in {202, 0}:
+            recorder.record("ingest (end-to-end)", started, False)
+            return
+        time.sleep(config.poll_interval_s)
+    with recorder.lock:
+        recorder.timed_out += 1
+    recorder.record("ingest (end-to-end)", started, False)
+
+
+def drive(base_url: str, config: LoadTestConfig) -> Dict[str, Any]:
+    """Submit `config.ingests` ingests from `config.concurrency` clients and wait for results."""
+    recorder = _Recorder()
+    local = threading.local()
+
+    def one(index: int) -> None:
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+            session.trust_env = False
+        _ingest(base_url, index, config, recorder, session)
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=config.concurrency) as pool:
+        list(pool.map(one, range(config.ingests)))
+    duration = time.monotonic() - started
+    e2e = recorder.latencies["ingest (end-to-end)"]
+    failed = recorder.errors["ingest (end-to-end)"]
+    requests_made = sum(len(recorder.latencies[n]) for n in ENDPOINTS[:2])
+    return {
+        "duration_s": round(duration, 3),
+        "throughput": {
+            "ingests_per_s": round((len(e2e) - failed) / duration, 3) if duration else 0.0,
+            "requests_per_s": round(requests_made / duration, 3) if duration else 0.0,
+        },
+        "ingests": {
+            "submitted": config.ingests,
+            "completed": len(e2e) - failed,
+            "failed": failed,
+            "timed_out": recorder.timed_out,
+            "reused": recorder.reused,
+            "statuses": dict(sorted(recorder.statuses.items())),
+        },
+        "endpoints": {
+            name: _summary(recorder.latencies[name], recorder.errors[name]) for name in ENDPOINTS
+        },
+    }
+
+
+def _free_socket() -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(("127.0.0.1", 0))
+    return sock
+
+
+def run_load_test(config: LoadTestConfig) -> Dict[str, Any]:
+    """Start the stand-ins and the app, drive the traffic and return the report."""
+    import uvicorn
+
+    from .. import hiring_scan
+    from . import app as app_module
+
+    workdir = Path(config.workdir or tempfile.mkdtemp(prefix="apprscan-loadtest-")).resolve()
+    workdir.mkdir(parents=True, exist_ok=True)
+    stand_ins = StandIns(config)
+    threading.Thread(target=stand_ins.serve_forever, name="loadtest-stand-ins", daemon=True).start()
+    if config.scan_rate:
+        hiring_scan.SCAN_REQ_PER_SECOND = config.scan_rate
+    cwd = Path.cwd()
+    os.chdir(workdir)
+    try:
+        with _environment(_service_env(config, stand_ins, workdir)), route_outbound(stand_ins.port):
+            app = app_module.create_app()
+            queue = app.state.job_queue
+            if queue.async_context is not None:
+                queue.async_context = lambda: _routed_async_client(
+                    stand_ins.port, pool_size=queue.concurrency
+                )
+            sock = _free_socket()
+            base_url = f"http://127.0.0.1:{sock.getsockname()[1]}"
+            server = uvicorn.Server(
+                uvicorn.Config(app, log_level="warning", access_log=False, lifespan="on")
+            )
+            thread = threading.Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True)
+            thread.start()
+            while not server.started and thread.is_alive():
+                time.sleep(0.01)
+            try:
+                report = drive(base_url, config)
+                stats = requests.get(
+                    f"{base_url}/stats", headers={"X-APPRSCAN-TOKEN": LOADTEST_TOKEN}, timeout=10
+                )
+                report["service_stats"] = stats.json() if stats.ok else {}
+            finally:
+                server.should_exit = True
+                thread.join(30)
+    finally:
+        os.chdir(cwd)
+        stand_ins.shutdown()
+        stand_ins.server_close()
+    return {
+        "tool_version": __version__,
+        "git_sha": _resolve_git_sha(_repo_root()),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "config": {**asdict(config), "workdir": str(workdir)},
+        **report,
+    }
+
+
+def _print_summary(report: Dict[str, Any]) -> None:
+    ingests = report["ingests"]
+    print(
+        f"Ingests: {ingests['completed']}/{ingests['submitted']} completed, "
+        f"{ingests['failed']} failed, {ingests['reused']} reused "
+        f"in {report['duration_s']:.1f}s ({report['throughput']['ingests_per_s']:.2f}/s)"
+    )
+    for name, row in report["endpoints"].items():
+        print(
+            f"{name:<22} n={row['count']:<5} err={row['error_rate']:.2%} "
+            f"p50={row['p50_ms']}ms p95={row['p95_ms']}ms p99={row['p99_ms']}ms"
+        )
+
+
+def main(argv: List[str] | None = None) -> int:
+    defaults = LoadTestConfig()
+    parser = argparse.ArgumentParser(
+        description="Load-test the companion service offline against local stand-ins."
+    )
+    parser.add_argument("--ingests", type=int, default=defaults.ingests, help="Total ingests.")
+    parser.add_argument(
+        "--concurrency", type=int, default=defaults.concurrency, help="Concurrent clients."
+    )
+    parser.add_argument(
+        "--places",
+        type=int,
+        default=defaults.places,
+        help="Distinct places; repeats exercise the result reuse cache.",
+    )
+    parser.add_argument(
+        "--short-link-ratio",
+        type=float,
+        default=defaults.short_link_ratio,
+        help="Share of ingests sent as maps.app.goo.gl short links.",
+    )
+    parser.add_argument(
+        "--hiring-ratio",
+        type=float,
+        default=defaults.hiring_ratio,
+        help="Share of stand-in sites with an open positions page.",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=defaults.workers, help="APPRSCAN_WORKERS for the service."
+    )
+    parser.add_argument("--async-scan", action="store_true", help="Use APPRSCAN_ASYNC_SCAN.")
+    parser.add_argument("--no-llm", action="store_true", help="Run without the fake Ollama.")
+    parser.add_argument("--site-latency-ms", type=float, default=defaults.site_latency_ms)
+    parser.add_argument("--places-latency-ms", type=float, default=defaults.places_latency_ms)
+    parser.add_argument("--llm-latency-ms", type=float, default=defaults.llm_latency_ms)
+    parser.add_argument(
+        "--scan-rate",
+        type=float,
+        default=None,
+        help="Override the per-site request rate (req/s); default keeps the production limit.",
+    )
+    parser.add_argument(
+        "--result-ttl-s",
+        type=float,
+        default=None,
+        help="APPRSCAN_RESULT_TTL_S for the run (0 disables result reuse).",
+    )
+    parser.add_argument(
+        "--timeout-s", type=float, default=defaults.timeout_s, help="Per-ingest time limit."
+    )
+    parser.add_argument(
+        "--workdir", default="", help="Service working directory (default: a new temp dir)."
+    )
+    parser.add_argument("--out", default=str(DEFAULT_REPORT_PATH), help="JSON report path.")
+    args = parser.parse_args(argv)
+
+    config = LoadTestConfig(
+        ingests=args.ingests,
+        concurrency=args.concurrency,
+        places=max(1, args.places),
+        short_link_ratio=args.short_link_ratio,
+        hiring_ratio=args.hiring_ratio,
+        workers=args.workers,
+        async_scan=args.async_scan,
+        use_llm=not args.no_llm,
+        site_latency_ms=args.site_latency_ms,
+        places_latency_ms=args.places_latency_ms,
+        llm_latency_ms=args.llm_latency_ms,
+        scan_rate=args.scan_rate,
+        result_ttl_s=args.result_ttl_s,
+        timeout_s=args.timeout_s,
+        workdir=args.workdir,
+    )
+    out_path = Path(args.out).resolve()
+    report = run_load_test(config)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    _print_summary(report)
+    print(f"Report: {out_path}")
+    return 1 if report["ingests"]["failed"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
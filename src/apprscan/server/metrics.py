@@ -0,0 +1,132 @@
+"""Counters and stage latency histograms for the companion service (Prometheus text format)."""
+
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+# Pipeline stages of one ingest; scan stages are reported through scan_domain(on_timing=...).
+STAGES = ("maps_expand", "place_lookup", "robots", "fetch", "heuristic", "llm", "package_write")
+DEFAULT_BUCKETS_S = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+COUNTERS = {
+    "apprscan_http_requests_total": "HTTP requests by method, route and status code.",
+    "apprscan_rate_limited_total": "Requests rejected by the per-token rate limit.",
+    "apprscan_queue_rejections_total": "Ingests rejected because the job queue was full.",
+}
+STAGE_HISTOGRAM = "apprscan_stage_duration_seconds"
+
+Labels = Tuple[Tuple[str, str], ...]
+Sample = Tuple[str, Dict[str, Any], float]
+_Histogram = Dict[str, Any]  # per-bucket counts (last is +Inf), sum, count
+
+
+def _labels(labels: Dict[str, Any]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        (key, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for key, value in labels
+    )
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def family(name: str, kind: str, help_text: str, samples: Iterable[Sample]) -> List[str]:
+    """Text-format lines of one metric family: HELP, TYPE and `name{labels} value` samples."""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    for sample_name, labels, value in samples:
+        lines.append(f"{sample_name}{_format_labels(_labels(labels))} {_format_value(value)}")
+    return lines
+
+
+class Metrics:
+    """Process-wide counters plus one latency histogram per pipeline stage.
+
+    Gauges that already live elsewhere (queue depth, cache stats, Ollama hosts) are not copied
+    here; the /metrics route reads them at scrape time and passes them to `render()`.
+    """
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS_S):
+        self.buckets = tuple(sorted(buckets))
+        self._counters: Dict[str, Dict[Labels, float]] = {name: {} for name in COUNTERS}
+        self._stages: Dict[str, _Histogram] = {stage: self._histogram() for stage in STAGES}
+        self._lock = threading.Lock()
+
+    def _histogram(self) -> _Histogram:
+        return {"counts": [0] * (len(self.buckets) + 1), "sum": 0.0, "count": 0}
+
+    def inc(self, name: str, amount: float = 1.0, **labels: Any) -> None:
+        key = _labels(labels)
+        with self._lock:
+            values = self._counters.setdefault(name, {})
+            values[key] = values.get(key, 0.0) + amount
+
+    def observe(self, stage: str, seconds: float) -> None:
+        seconds = max(0.0, float(seconds))
+        with self._lock:
+            histogram = self._stages.get(stage)
+            if histogram is None:
+                histogram = self._stages[stage] = self._histogram()
+            # bisect_left: a value equal to a bound belongs to that bucket (le is inclusive).
+            histogram["counts"][bisect.bisect_left(self.buckets, seconds)] += 1
+            histogram["sum"] += seconds
+            histogram["count"] += 1
+
+    @contextmanager
+    def timed(self, stage: str) -> Iterator[None]:
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.monotonic() - started)
+
+    def counter(self, name: str, **labels: Any) -> float:
+        with self._lock:
+            return self._counters.get(name, {}).get(_labels(labels), 0.0)
+
+    def render(self, extra: Iterable[List[str]] = ()) -> str:
+        """All families in Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            counters = {name: dict(values) for name, values in self._counters.items()}
+            stages = {
+                stage: (list(hist["counts"]), hist["sum"], hist["count"])
+                for stage, hist in self._stages.items()
+            }
+        lines: List[str] = []
+        for name, values in counters.items():
+            rows = [(name, dict(labels), value) for labels, value in sorted(values.items())]
+            lines += family(name, "counter", COUNTERS.get(name, name), rows)
+        samples: List[Sample] = []
+        for stage, (counts, total, count) in stages.items():
+            cumulative = 0
+            for bound, hits in zip((*self.buckets, float("inf")), counts, strict=True):
+                cumulative += hits
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                bucket = {"stage": stage, "le": le}
+                samples.append((f"{STAGE_HISTOGRAM}_bucket", bucket, cumulative))
+            samples.append((f"{STAGE_HISTOGRAM}_sum", {"stage": stage}, round(total, 6)))
+            samples.append((f"{STAGE_HISTOGRAM}_count", {"stage": stage}, count))
+        lines += family(STAGE_HISTOGRAM, "histogram", "Ingest pipeline stage latency.", samples)
+        for block in extra:
+            lines += block
+        return "\n".join(lines) + "\n"
+
+
+_METRICS = Metrics()
+
+
+def metrics() -> Metrics:
+    """Process-wide registry shared by the routes, the middleware and the ingest pipeline."""
+    return _METRICS
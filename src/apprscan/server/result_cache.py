@@ -0,0 +1,136 @@
+"""TTL index of finished company packages by place_id / canonical domain, with key coalescing."""
+
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from pathlib import Path
+from typing import AsyncIterator, Dict, Iterable, Iterator, Tuple
+
+DEFAULT_RESULT_CACHE_PATH = Path("out/service/results.sqlite")
+DEFAULT_RESULT_TTL_S = 24 * 3600
+HOLD_POLL_S = 0.05
+
+
+def place_key(place_id: str) -> str:
+    return f"place:{place_id}"
+
+
+def domain_key(domain: str) -> str:
+    return f"domain:{domain}"
+
+
+def _ensure_db(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS results (
+            key TEXT PRIMARY KEY,
+            run_id TEXT NOT NULL,
+            created_at REAL NOT NULL
+        )
+        """
+    )
+
+
+class ResultCache:
+    """Maps cache keys to the run_id whose package answers them, for `ttl_s` seconds.
+
+    `hold(key)` serialises work per key: a second ingest of the same place/domain waits for
+    the first one and then finds its result here instead of repeating Places + scan + LLM.
+    ttl_s <= 0 disables reuse (holding still coalesces).
+    """
+
+    def __init__(self, path: Path = DEFAULT_RESULT_CACHE_PATH, ttl_s: float = DEFAULT_RESULT_TTL_S):
+        self.path = Path(path)
+        self.ttl_s = ttl_s
+        self._locks: Dict[str, Tuple[threading.Lock, int]] = {}
+        self._locks_guard = threading.Lock()
+        self._counts = {"hits": 0, "misses": 0}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._db() as conn:
+            _ensure_db(conn)
+
+    @contextmanager
+    def _db(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def lookup(self, key: str) -> Tuple[str, float] | None:
+        """(run_id, created_at) of a fresh entry, else None."""
+        if self.ttl_s <= 0:
+            return None
+        with self._db() as conn:
+            row = conn.execute(
+                "SELECT run_id, created_at FROM results WHERE key = ?", (key,)
+            ).fetchone()
+        hit = row is not None and time.time() - row[1] <= self.ttl_s
+        with self._locks_guard:
+            self._counts["hits" if hit else "misses"] += 1
+        if not hit:
+            return None
+        return str(row[0]), float(row[1])
+
+    def stats(self) -> Dict[str, float]:
+        """Lookups answered from the cache since start (reuse disabled: none are counted)."""
+        with self._locks_guard:
+            hits, misses = self._counts["hits"], self._counts["misses"]
+        total = hits + misses
+        ratio = round(hits / total, 3) if total else 0.0
+        return {"hits": hits, "misses": misses, "hit_ratio": ratio}
+
+    def store(self, keys: Iterable[str], run_id: str, created_at: float | None = None) -> None:
+        if self.ttl_s <= 0:
+            return
+        created_at = time.time() if created_at is None else created_at
+        with self._db() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO results(key, run_id, created_at) VALUES (?, ?, ?)",
+                [(key, run_id, created_at) for key in keys if key],
+            )
+
+    def forget(self, key: str) -> None:
+        with self._db() as conn:
+            conn.execute("DELETE FROM results WHERE key = ?", (key,))
+
+    def _join(self, key: str) -> threading.Lock:
+        with self._locks_guard:
+            lock, users = self._locks.get(key, (threading.Lock(), 0))
+            self._locks[key] = (lock, users + 1)
+        return lock
+
+    def _leave(self, key: str) -> None:
+        with self._locks_guard:
+            lock, users = self._locks[key]
+            if users <= 1:
+                del self._locks[key]
+            else:
+                self._locks[key] = (lock, users - 1)
+
+    @contextmanager
+    def hold(self, key: str) -> Iterator[None]:
+        lock = self._join(key)
+        try:
+            with lock:
+                yield
+        finally:
+            self._leave(key)
+
+    @asynccontextmanager
+    async def ahold(self, key: str) -> AsyncIterator[None]:
+        """hold() for coroutines: same per-key locks, waited for without blocking the loop."""
+        lock = self._join(key)
+        try:
+            while not lock.acquire(blocking=False):
+                await asyncio.sleep(HOLD_POLL_S)
+            try:
+                yield
+            finally:
+                lock.release()
+        finally:
+            self._leave(key)
@@ -2,22 +2,47 @@
 
 from __future__ import annotations
 
+import asyncio
+import json
 import time
-from typing import List
+from typing import Any, AsyncIterator, Dict, List, Tuple
 
-from fastapi import APIRouter, BackgroundTasks, Header, HTTPException, Request
+from fastapi import APIRouter, Header, HTTPException, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel, Field
 
-from .service import new_run_id, process_maps_ingest, read_company_package
-
+from ..ollama_client import pool_snapshots
+from .events import TERMINAL_STAGES, event_log
+from .job_queue import QueueFull
+from .metrics import family, metrics
+from .run_index import DEFAULT_PAGE_SIZE, run_index
+from .service import (
+    aprocess_maps_ingest,
+    batch_context,
+    default_places_cache,
+    default_result_cache,
+    new_run_id,
+    process_maps_ingest,
+    provenance,
+    read_company_package,
+    runs_root,
+)
 
 router = APIRouter()
+EVENT_POLL_S = 0.2
+EVENT_KEEPALIVE_S = 15.0
+MAX_LONG_POLL_S = 60.0
 
 
 class MapsIngestRequest(BaseModel):
     maps_url: str = Field(..., min_length=8)
     note: str | None = ""
     tags: List[str] | None = Field(default_factory=list)
+    force: bool = False
+
+
+class MapsBatchRequest(BaseModel):
+    items: List[MapsIngestRequest] = Field(..., min_length=1)
 
 
 def _require_token(request: Request, x_apprscan_token: str | None = Header(default=None)) -> None:
@@ -38,35 +63,339 @@ def _rate_limit(request: Request, token: str) -> None:
     hits = store.get(token, [])
     hits = [ts for ts in hits if now - ts <= window]
     if len(hits) >= limit:
+        metrics().inc("apprscan_rate_limited_total")
         raise HTTPException(status_code=429, detail="Rate limit exceeded.")
     hits.append(now)
     store[token] = hits
 
 
+def _job_kwargs(payload: Dict[str, Any]) -> Dict[str, Any]:
+    payload = dict(payload)
+    batch_id = payload.pop("batch_id", "")
+    if batch_id:
+        payload["context"] = batch_context(batch_id)
+    return payload
+
+
+def run_ingest_job(run_id: str, payload: Dict[str, Any]) -> Any:
+    """Job queue handler; looks up process_maps_ingest at call time."""
+    kwargs = _job_kwargs(payload)
+    events = event_log()
+    events.emit(run_id, "started")
+    try:
+        result = process_maps_ingest(run_id=run_id, **kwargs)
+    except Exception as exc:
+        events.emit(run_id, "failed", error=f"{type(exc).__name__}:{exc}")
+        raise
+    events.emit(run_id, "done", status=(result or {}).get("status") or "")
+    return result
+
+
+async def arun_ingest_job(run_id: str, payload: Dict[str, Any], client: Any) -> Any:
+    """Async job queue handler (APPRSCAN_ASYNC_SCAN); `client` is the loop's shared client."""
+    kwargs = _job_kwargs(payload)
+    events = event_log()
+    events.emit(run_id, "started")
+    try:
+        result = await aprocess_maps_ingest(client=client, run_id=run_id, **kwargs)
+    except Exception as exc:
+        events.emit(run_id, "failed", error=f"{type(exc).__name__}:{exc}")
+        raise
+    events.emit(run_id, "done", status=(result or {}).get("status") or "")
+    return result
+
+
 @router.post("/ingest/maps")
 def ingest_maps(
     payload: MapsIngestRequest,
-    background_tasks: BackgroundTasks,
     request: Request,
     x_apprscan_token: str | None = Header(default=None),
 ):
     _require_token(request, x_apprscan_token)
     _rate_limit(request, x_apprscan_token or "")
     run_id = new_run_id()
-    background_tasks.add_task(
-        process_maps_ingest,
-        maps_url=payload.maps_url,
-        note=payload.note or "",
-        tags=payload.tags or [],
-        run_id=run_id,
+    # Emitted before enqueueing: a worker may claim the job (and emit "started") right away.
+    event_log().emit(run_id, "queued")
+    try:
+        job = request.app.state.job_queue.enqueue(
+            run_id,
+            {
+                "maps_url": payload.maps_url,
+                "note": payload.note or "",
+                "tags": payload.tags or [],
+                "force": payload.force,
+            },
+        )
+    except QueueFull as exc:
+        event_log().discard(run_id)
+        metrics().inc("apprscan_queue_rejections_total")
+        raise HTTPException(status_code=503, detail="Job queue is full, retry later.") from exc
+    return {"status": "queued", "run_id": run_id, "queue_position": job.get("queue_position")}
+
+
+@router.post("/ingest/maps/batch")
+def ingest_maps_batch(
+    payload: MapsBatchRequest,
+    request: Request,
+    x_apprscan_token: str | None = Header(default=None),
+):
+    _require_token(request, x_apprscan_token)
+    max_items = int(getattr(request.app.state, "batch_max_items", 100))
+    if len(payload.items) > max_items:
+        raise HTTPException(status_code=413, detail=f"Batch too large (max {max_items} items).")
+    # One rate-limit hit per batch: the limiter guards request overhead, the queue guards load.
+    _rate_limit(request, x_apprscan_token or "")
+    batch_id = f"batch_{new_run_id()}"
+    items = [
+        (
+            new_run_id(),
+            {
+                "maps_url": item.maps_url,
+                "note": item.note or "",
+                "tags": item.tags or [],
+                "force": item.force,
+                "batch_id": batch_id,
+            },
+        )
+        for item in payload.items
+    ]
+    for run_id, _ in items:
+        event_log().emit(run_id, "queued", batch_id=batch_id)
+    try:
+        request.app.state.job_queue.enqueue_batch(batch_id, items)
+    except QueueFull as exc:
+        for run_id, _ in items:
+            event_log().discard(run_id)
+        metrics().inc("apprscan_queue_rejections_total")
+        raise HTTPException(status_code=503, detail="Job queue is full, retry later.") from exc
+    return {
+        "status": "queued",
+        "batch_id": batch_id,
+        "items": [{"maps_url": job["maps_url"], "run_id": run_id} for run_id, job in items],
+    }
+
+
+@router.get("/batch/{batch_id}")
+def get_batch(batch_id: str, request: Request, x_apprscan_token: str | None = Header(default=None)):
+    _require_token(request, x_apprscan_token)
+    status = request.app.state.job_queue.batch_status(batch_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Unknown batch_id.")
+    return status
+
+
+@router.get("/stats")
+def get_stats(request: Request, x_apprscan_token: str | None = Header(default=None)):
+    _require_token(request, x_apprscan_token)
+    queue = request.app.state.job_queue
+    stats = {
+        "uptime_s": round(time.time() - request.app.state.start_ts, 1),
+        "jobs": queue.counts(),
+        "scan_mode": "async" if queue.async_handler is not None else "threads",
+        "git_sha": provenance().git_sha,
+        "places_cache": default_places_cache().stats(),
+    }
+    if queue.loop_error:
+        stats["loop_error"] = queue.loop_error
+    return stats
+
+
+@router.post("/config/reload")
+def reload_config(request: Request, x_apprscan_token: str | None = Header(default=None)):
+    """Re-resolve the git sha and re-read .env (otherwise only an .env mtime change does)."""
+    _require_token(request, x_apprscan_token)
+    snapshot = provenance(reload=True)
+    config = snapshot.scan_config
+    return {
+        "git_sha": snapshot.git_sha,
+        "ollama_host": config.ollama_host,
+        "ollama_model": config.ollama_model,
+        "use_llm": config.use_llm,
+    }
+
+
+def _scrape_families(request: Request) -> List[List[str]]:
+    """Metrics read at scrape time from their owners: queue, caches and Ollama pools."""
+    counts = request.app.state.job_queue.counts()
+    caches = {"result": default_result_cache().stats(), **default_places_cache().stats()}
+    caches.pop("places_calls_saved", None)
+    hosts: Dict[str, Dict[str, float]] = {}
+    for snap in pool_snapshots():
+        host = hosts.setdefault(snap["host"], {"calls": 0, "errors": 0, "open": 0})
+        host["calls"] += snap["calls"]
+        host["errors"] += snap["errors"]
+        host["open"] = max(host["open"], int(snap["open"]))
+    return [
+        family(
+            "apprscan_uptime_seconds",
+            "gauge",
+            "Seconds since the service started.",
+            [("apprscan_uptime_seconds", {}, round(time.time() - request.app.state.start_ts, 1))],
+        ),
+        family(
+            "apprscan_queue_depth",
+            "gauge",
+            "Ingest jobs waiting for a worker.",
+            [("apprscan_queue_depth", {}, counts.get("queued", 0))],
+        ),
+        family(
+            "apprscan_jobs",
+            "gauge",
+            "Ingest jobs in the queue database by state.",
+            [("apprscan_jobs", {"state": state}, n) for state, n in counts.items()],
+        ),
+        family(
+            "apprscan_cache_lookups_total",
+            "counter",
+            "Cache lookups by cache and result (hit/miss).",
+            [
+                ("apprscan_cache_lookups_total", {"cache": name, "result": result}, stats[key])
+                for name, stats in caches.items()
+                for result, key in (("hit", "hits"), ("miss", "misses"))
+            ],
+        ),
+        family(
+            "apprscan_cache_hit_ratio",
+            "gauge",
+            "Share of cache lookups answered from the cache.",
+            [
+                ("apprscan_cache_hit_ratio", {"cache": name}, stats["hit_ratio"])
+                for name, stats in caches.items()
+            ],
+        ),
+        family(
+            "apprscan_ollama_calls_total",
+            "counter",
+            "Successful Ollama chat calls by host.",
+            [("apprscan_ollama_calls_total", {"host": h}, v["calls"]) for h, v in hosts.items()],
+        ),
+        family(
+            "apprscan_ollama_errors_total",
+            "counter",
+            "Failed Ollama chat calls (HTTP or transport errors) by host.",
+            [("apprscan_ollama_errors_total", {"host": h}, v["errors"]) for h, v in hosts.items()],
+        ),
+        family(
+            "apprscan_ollama_breaker_open",
+            "gauge",
+            "1 while the host's circuit breaker is open.",
+            [("apprscan_ollama_breaker_open", {"host": h}, v["open"]) for h, v in hosts.items()],
+        ),
+    ]
+
+
+@router.get("/metrics")
+def get_metrics(
+    request: Request,
+    x_apprscan_token: str | None = Header(default=None),
+    authorization: str | None = Header(default=None),
+):
+    """Prometheus text format; scrapers may send the token as `Authorization: Bearer <token>`."""
+    if not x_apprscan_token and authorization and authorization.lower().startswith("bearer "):
+        x_apprscan_token = authorization[len("bearer ") :].strip()
+    _require_token(request, x_apprscan_token)
+    return PlainTextResponse(
+        metrics().render(_scrape_families(request)), media_type="text/plain; version=0.0.4"
+    )
+
+
+def _run_events(request: Request, run_id: str, after: int) -> Tuple[List[Dict[str, Any]], bool]:
+    """(new events, finished); runs this process has no events for fall back to disk state."""
+    # finished is read first: once true, the following since() already holds the terminal event.
+    finished = event_log().finished(run_id)
+    events = event_log().since(run_id, after)
+    if events is not None:
+        return events, finished
+    package = read_company_package(run_id)
+    if package:
+        return [{"seq": after + 1, "stage": "done", "status": package.get("status") or ""}], True
+    job = request.app.state.job_queue.status(run_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown run_id.")
+    if job["state"] == "failed":
+        return [{"seq": after + 1, "stage": "failed", "error": job["error"]}], True
+    return [], False
+
+
+def _sse(event: Dict[str, Any]) -> str:
+    data = json.dumps(event, ensure_ascii=False)
+    return f"id: {event['seq']}\nevent: {event['stage']}\ndata: {data}\n\n"
+
+
+@router.get("/events/{run_id}")
+async def get_events(
+    run_id: str,
+    request: Request,
+    after: int = 0,
+    poll: bool = False,
+    wait_s: float = 25.0,
+    x_apprscan_token: str | None = Header(default=None),
+    last_event_id: str | None = Header(default=None),
+):
+    """Stage events of one run as server-sent events, or one long-poll batch with ?poll=true."""
+    _require_token(request, x_apprscan_token)
+    if last_event_id and last_event_id.isdigit():
+        after = max(after, int(last_event_id))
+    # The disk/SQLite fallback in _run_events blocks, so it stays off the event loop.
+    events, finished = await asyncio.to_thread(_run_events, request, run_id, after)
+
+    if poll:
+        deadline = time.monotonic() + max(0.0, min(wait_s, MAX_LONG_POLL_S))
+        while not events and not finished and time.monotonic() < deadline:
+            await asyncio.sleep(EVENT_POLL_S)
+            events, finished = await asyncio.to_thread(_run_events, request, run_id, after)
+        return {"run_id": run_id, "events": events, "finished": finished}
+
+    async def stream() -> AsyncIterator[str]:
+        last_seq, last_sent = after, time.monotonic()
+        pending, done = events, finished
+        while True:
+            for event in pending:
+                last_seq = max(last_seq, int(event["seq"]))
+                yield _sse(event)
+                last_sent = time.monotonic()
+            if done or any(event["stage"] in TERMINAL_STAGES for event in pending):
+                return
+            if await request.is_disconnected():
+                return
+            if time.monotonic() - last_sent >= EVENT_KEEPALIVE_S:
+                yield ": keepalive\n\n"
+                last_sent = time.monotonic()
+            await asyncio.sleep(EVENT_POLL_S)
+            pending, done = await asyncio.to_thread(_run_events, request, run_id, last_seq)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/runs")
+def list_runs(
+    request: Request,
+    limit: int = DEFAULT_PAGE_SIZE,
+    before: str = "",
+    status: str = "",
+    domain: str = "",
+    x_apprscan_token: str | None = Header(default=None),
+):
+    """Newest runs first from the run index; `next` is the `before` value of the next page."""
+    _require_token(request, x_apprscan_token)
+    return run_index(runs_root()).page(
+        limit=limit, before=before, status=status, domain=domain
     )
-    return {"status": "queued", "run_id": run_id}
 
 
 @router.get("/result/{run_id}")
 def get_result(run_id: str, request: Request, x_apprscan_token: str | None = Header(default=None)):
     _require_token(request, x_apprscan_token)
     package = read_company_package(run_id)
-    if not package:
-        raise HTTPException(status_code=202, detail="Result not ready.")
-    return package
+    if package:
+        return package
+    job = request.app.state.job_queue.status(run_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown run_id.")
+    if job["state"] == "failed":
+        return JSONResponse({"detail": "Job failed.", "job": job}, status_code=500)
+    return JSONResponse({"detail": "Result not ready.", "job": job}, status_code=202)
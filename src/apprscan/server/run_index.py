@@ -0,0 +1,193 @@
+"""SQLite index of company package runs under out/runs (lookup, listing and retention)."""
+
+from __future__ import annotations
+
+import json
+import shutil
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+INDEX_FILENAME = "index.sqlite"
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def _ensure_db(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS runs (
+            run_id TEXT PRIMARY KEY,
+            status TEXT NOT NULL,
+            degraded_reason TEXT NOT NULL DEFAULT '',
+            domain TEXT NOT NULL DEFAULT '',
+            place_id TEXT NOT NULL DEFAULT '',
+            reused_from TEXT NOT NULL DEFAULT '',
+            created_at TEXT NOT NULL,
+            created_ts REAL NOT NULL,
+            json_path TEXT NOT NULL,
+            md_path TEXT NOT NULL
+        )
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS runs_created ON runs(created_ts, run_id)")
+    conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+
+def _created_ts(created_at: str, fallback: float) -> float:
+    try:
+        return datetime.fromisoformat(created_at.replace("Z", "+00:00")).timestamp()
+    except (AttributeError, ValueError):
+        return fallback
+
+
+class RunIndex:
+    """One row per run directory; the packages themselves stay as files next to the index.
+
+    Runs written before the index existed are picked up by `backfill()` (once per index);
+    until then callers fall back to checking the directory.
+    """
+
+    def __init__(self, out_root: Path):
+        self.out_root = Path(out_root)
+        self.path = self.out_root / INDEX_FILENAME
+        self.out_root.mkdir(parents=True, exist_ok=True)
+        with self._db() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            _ensure_db(conn)
+
+    @contextmanager
+    def _db(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def record(self, run_id: str, package: Dict[str, Any], json_path: Path, md_path: Path) -> None:
+        source = package.get("source") or {}
+        reused = package.get("reused_from") or {}
+        created_at = str(package.get("created_at") or "")
+        with self._db() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO runs(run_id, status, degraded_reason, domain, place_id, "
+                "reused_from, created_at, created_ts, json_path, md_path) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    run_id,
+                    str(package.get("status") or ""),
+                    str(package.get("degraded_reason") or ""),
+                    str(source.get("canonical_domain") or ""),
+                    str(source.get("place_id") or ""),
+                    str(reused.get("run_id") or ""),
+                    created_at,
+                    _created_ts(created_at, time.time()),
+                    str(Path(json_path).resolve()),
+                    str(Path(md_path).resolve()),
+                ),
+            )
+
+    def get(self, run_id: str) -> Dict[str, Any] | None:
+        with self._db() as conn:
+            row = conn.execute("SELECT * FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        return dict(row) if row is not None else None
+
+    def page(
+        self,
+        *,
+        limit: int = DEFAULT_PAGE_SIZE,
+        before: str = "",
+        status: str = "",
+        domain: str = "",
+    ) -> Dict[str, Any]:
+        """Newest first; pass the returned `next` as `before` for the following page."""
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        where: List[str] = []
+        params: List[Any] = []
+        if before:
+            anchor = self.get(before)
+            if anchor is not None:
+                where.append("(created_ts < ? OR (created_ts = ? AND run_id < ?))")
+                params += [anchor["created_ts"], anchor["created_ts"], before]
+        if status:
+            where.append("status = ?")
+            params.append(status)
+        if domain:
+            where.append("domain = ?")
+            params.append(domain)
+        sql = "SELECT * FROM runs"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY created_ts DESC, run_id DESC LIMIT ?"
+        with self._db() as conn:
+            rows = [dict(row) for row in conn.execute(sql, [*params, limit + 1]).fetchall()]
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        return {"runs": rows, "next": rows[-1]["run_id"] if has_more else None}
+
+    def count(self) -> int:
+        with self._db() as conn:
+            return int(conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0])
+
+    @property
+    def backfilled(self) -> bool:
+        with self._db() as conn:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'backfilled'").fetchone()
+        return row is not None
+
+    def backfill(self) -> int:
+        """Index run directories written before the index existed; returns how many."""
+        if self.backfilled:
+            return 0
+        added = 0
+        for child in self.out_root.iterdir():
+            json_path = child / "company_package.json"
+            if not child.is_dir() or not json_path.exists() or self.get(child.name) is not None:
+                continue
+            try:
+                package = json.loads(json_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                package = {"status": "error"}
+            if not package.get("created_at"):
+                package["created_at"] = datetime.fromtimestamp(child.stat().st_mtime).isoformat()
+            self.record(child.name, package, json_path, child / "company_package.md")
+            added += 1
+        with self._db() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO meta(key, value) VALUES ('backfilled', ?)",
+                (str(time.time()),),
+            )
+        return added
+
+    def purge(self, max_age_days: int) -> int:
+        """Delete run directories (and rows) older than the retention window."""
+        cutoff = time.time() - max_age_days * 86400
+        with self._db() as conn:
+            run_ids = [
+                row[0]
+                for row in conn.execute("SELECT run_id FROM runs WHERE created_ts < ?", (cutoff,))
+            ]
+        for run_id in run_ids:
+            shutil.rmtree(self.out_root / run_id, ignore_errors=True)
+        with self._db() as conn:
+            conn.executemany("DELETE FROM runs WHERE run_id = ?", [(run_id,) for run_id in run_ids])
+        return len(run_ids)
+
+
+_INDEXES: Dict[Path, RunIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def run_index(out_root: Path) -> RunIndex:
+    """Process-wide index per runs directory (resolved, so a later chdir does not confuse it)."""
+    key = Path(out_root).resolve()
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(key)
+        if index is None or not index.path.parent.exists():
+            index = _INDEXES[key] = RunIndex(key)
+        return index
@@ -2,38 +2,66 @@
 
 from __future__ import annotations
 
+import copy
+import functools
 import json
 import os
 import re
 import secrets
-from dataclasses import dataclass
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 from urllib.parse import parse_qs, unquote, urlparse
 
 import requests
-import shutil
 
 from .. import __version__
-from ..hiring_scan import PROMPT_VERSION, _load_env_file, _repo_root, scan_domain, _resolve_git_sha
-from ..places_api import fetch_place_details, get_api_key
-
+from ..domain_groups import canonical_domain
+from ..hiring_scan import (
+    PROMPT_VERSION,
+    DomainScanResult,
+    _load_env_file,
+    _repo_root,
+    _resolve_git_sha,
+    ascan_domain,
+    scan_domain,
+)
+from ..http_pool import async_transport_errors, pooled_session
+from ..jobs.ats import ATS_HOSTS, is_ats_url  # noqa: F401  (ATS_HOSTS re-exported)
+from ..jobs.robots import RobotsChecker
+from ..ollama_client import DEFAULT_KEEP_ALIVE, DEFAULT_NUM_PREDICT, join_model_tiers, parse_hosts
+from ..places_api import afetch_place_details, fetch_place_details
+from ..places_cache import DEFAULT_PLACES_CACHE_PATH, DEFAULT_PLACES_TTL_S, PlacesCache
+from .events import event_log
+from .metrics import metrics
+from .result_cache import (
+    DEFAULT_RESULT_CACHE_PATH,
+    DEFAULT_RESULT_TTL_S,
+    ResultCache,
+    domain_key,
+    place_key,
+)
+from .run_index import run_index
 
 SCHEMA_VERSION = "0.1"
+DEFAULT_RUNS_ROOT = Path("out") / "runs"
 ALLOWED_HOSTS = {"www.google.com", "google.com", "maps.google.com", "maps.app.goo.gl", "goo.gl"}
-ATS_HOSTS = {
-    "greenhouse.io",
-    "lever.co",
-    "workable.com",
-    "smartrecruiters.com",
-    "recruitee.com",
-    "teamtailor.com",
-    "jobylon.com",
-    "talentadore.com",
-    "sympa.com",
-    "jazzhr.com",
-}
+PASTE_WEBSITE = "Paste official website URL to proceed."
+# Batch contexts are kept for the most recent batches only; a late item just builds a fresh one.
+MAX_BATCH_CONTEXTS = 8
+# Process environment keys that override the repo .env in load_scan_config().
+SCAN_ENV_KEYS = (
+    "OLLAMA_HOST",
+    "OLLAMA_URL",
+    "OLLAMA_MODEL",
+    "MODEL_NAME",
+    "OLLAMA_OPTIONS",
+    "OLLAMA_KEEP_ALIVE",
+)
 
 
 @dataclass
@@ -48,6 +76,90 @@ class ScanConfig:
     sleep_s: float
     deterministic: bool
     prompt_version: str
+    ollama_keep_alive: str = DEFAULT_KEEP_ALIVE
+
+
+@dataclass
+class BatchContext:
+    """State shared by the items of one ingest batch (they run concurrently on the job workers)."""
+
+    session: requests.Session = field(default_factory=pooled_session)
+    robots: RobotsChecker = field(default_factory=lambda: RobotsChecker(user_agent="apprscan-scan"))
+    rate_limit_state: dict[str, float] = field(default_factory=dict)
+    websites: dict[str, str] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def website_for(self, place_id: str) -> str:
+        """Places lookup once per place_id per batch (failures are not cached)."""
+        with self._lock:
+            if place_id in self.websites:
+                return self.websites[place_id]
+        website = resolve_website(place_id)
+        with self._lock:
+            self.websites[place_id] = website
+        return website
+
+    async def awebsite_for(self, client: Any, place_id: str) -> str:
+        with self._lock:
+            if place_id in self.websites:
+                return self.websites[place_id]
+        website = await aresolve_website(client, place_id)
+        with self._lock:
+            self.websites[place_id] = website
+        return website
+
+
+_BATCH_CONTEXTS: "OrderedDict[str, BatchContext]" = OrderedDict()
+_BATCH_CONTEXTS_LOCK = threading.Lock()
+
+
+def batch_context(batch_id: str) -> BatchContext:
+    with _BATCH_CONTEXTS_LOCK:
+        context = _BATCH_CONTEXTS.get(batch_id)
+        if context is None:
+            context = _BATCH_CONTEXTS[batch_id] = BatchContext()
+            while len(_BATCH_CONTEXTS) > MAX_BATCH_CONTEXTS:
+                _BATCH_CONTEXTS.popitem(last=False)
+        else:
+            _BATCH_CONTEXTS.move_to_end(batch_id)
+        return context
+
+
+_RESULT_CACHE: ResultCache | None = None
+_RESULT_CACHE_LOCK = threading.Lock()
+
+
+def default_result_cache() -> ResultCache:
+    """Process-wide cache from APPRSCAN_RESULT_CACHE_DB / APPRSCAN_RESULT_TTL_S (0: no reuse)."""
+    global _RESULT_CACHE
+    with _RESULT_CACHE_LOCK:
+        if _RESULT_CACHE is None:
+            _RESULT_CACHE = ResultCache(
+                Path(os.getenv("APPRSCAN_RESULT_CACHE_DB", str(DEFAULT_RESULT_CACHE_PATH))),
+                ttl_s=float(os.getenv("APPRSCAN_RESULT_TTL_S", str(DEFAULT_RESULT_TTL_S))),
+            )
+        return _RESULT_CACHE
+
+
+_PLACES_CACHE: PlacesCache | None = None
+_PLACES_CACHE_LOCK = threading.Lock()
+
+
+def default_places_cache() -> PlacesCache:
+    """Process-wide Places/short-link cache (APPRSCAN_PLACES_CACHE_DB, APPRSCAN_PLACES_TTL_S)."""
+    global _PLACES_CACHE
+    with _PLACES_CACHE_LOCK:
+        if _PLACES_CACHE is None:
+            _PLACES_CACHE = PlacesCache(
+                Path(os.getenv("APPRSCAN_PLACES_CACHE_DB", str(DEFAULT_PLACES_CACHE_PATH))),
+                ttl_s=float(os.getenv("APPRSCAN_PLACES_TTL_S", str(DEFAULT_PLACES_TTL_S))),
+            )
+        return _PLACES_CACHE
+
+
+def _progress(run_id: str) -> Any:
+    """emit(stage, **data) for this run's /events stream."""
+    return functools.partial(event_log().emit, run_id)
 
 
 def _now_iso() -> str:
@@ -65,35 +177,30 @@ def _repo_env_file() -> Path | None:
     return env_file if env_file.exists() else None
 
 
+def runs_root() -> Path:
+    """Company package directory: APPRSCAN_RUNS_DIR, default out/runs."""
+    return Path(os.getenv("APPRSCAN_RUNS_DIR", str(DEFAULT_RUNS_ROOT)))
+
+
 def purge_runs(out_root: Path | None = None, max_age_days: int = 30) -> int:
-    out_root = out_root or Path("out") / "runs"
-    if not out_root.exists():
-        return 0
-    cutoff = datetime.now(timezone.utc).timestamp() - max_age_days * 86400
-    purged = 0
-    for child in out_root.iterdir():
-        if not child.is_dir():
-            continue
-        stat = child.stat()
-        if stat.st_mtime < cutoff:
-            shutil.rmtree(child, ignore_errors=True)
-            purged += 1
-    return purged
+    """Drop runs older than the retention window, via the run index (no directory walk)."""
+    index = run_index(out_root or runs_root())
+    index.backfill()
+    return index.purge(max_age_days)
 
 
 def load_scan_config(env_file: Path | None = None) -> ScanConfig:
     env_file = env_file or _repo_env_file()
     env = _load_env_file(env_file)
     merged = dict(env)
-    for key in ("OLLAMA_HOST", "OLLAMA_URL", "OLLAMA_MODEL", "MODEL_NAME", "OLLAMA_OPTIONS"):
+    for key in SCAN_ENV_KEYS:
         if key in os.environ:
             merged[key] = os.environ[key]
 
     host = merged.get("OLLAMA_URL") or merged.get("OLLAMA_HOST") or "http://127.0.0.1:11434"
-    if "ollama:11434" in host:
-        host = "http://127.0.0.1:11434"
+    host = ",".join(parse_hosts(host))
     model = merged.get("OLLAMA_MODEL") or merged.get("MODEL_NAME") or ""
-    options: dict[str, Any] = {"temperature": 0.2, "num_predict": 400}
+    options: dict[str, Any] = {"temperature": 0.2, "num_predict": DEFAULT_NUM_PREDICT}
     if merged.get("OLLAMA_OPTIONS"):
         try:
             options.update(json.loads(merged["OLLAMA_OPTIONS"]))
@@ -112,25 +219,93 @@ def load_scan_config(env_file: Path | None = None) -> ScanConfig:
         sleep_s=0.5,
         deterministic=False,
         prompt_version=PROMPT_VERSION,
+        ollama_keep_alive=merged.get("OLLAMA_KEEP_ALIVE") or DEFAULT_KEEP_ALIVE,
     )
 
 
-def _expand_maps_url(maps_url: str) -> str:
+@dataclass(frozen=True)
+class Provenance:
+    """git sha and scan config stamped on packages, plus the inputs they were resolved from."""
+
+    git_sha: str
+    scan_config: ScanConfig
+    key: tuple[Any, ...]
+
+
+_PROVENANCE: Provenance | None = None
+_PROVENANCE_LOCK = threading.Lock()
+
+
+def _provenance_key() -> tuple[Any, ...]:
+    env_file = _repo_env_file()
+    try:
+        mtime = env_file.stat().st_mtime_ns if env_file else None
+    except OSError:
+        mtime = None
+    return (str(env_file or ""), mtime, tuple(os.environ.get(key) for key in SCAN_ENV_KEYS))
+
+
+def provenance(reload: bool = False) -> Provenance:
+    """Process-wide snapshot, so packages skip `git rev-parse` and the .env parse.
+
+    Rebuilt on `reload=True` (service startup, POST /config/reload) or when the .env file's
+    mtime or an OLLAMA_* override changes; checking those costs a stat, not a subprocess.
+    """
+    global _PROVENANCE
+    key = _provenance_key()
+    with _PROVENANCE_LOCK:
+        if reload or _PROVENANCE is None or _PROVENANCE.key != key:
+            _PROVENANCE = Provenance(
+                git_sha=_resolve_git_sha(_repo_root()), scan_config=load_scan_config(), key=key
+            )
+        return _PROVENANCE
+
+
+def _expand_maps_url(maps_url: str, cache: PlacesCache | None = None) -> str:
     parsed = urlparse(maps_url)
     if parsed.netloc not in {"maps.app.goo.gl", "goo.gl"}:
         return maps_url
+    cache = cache or default_places_cache()
+    cached = cache.get_expansion(maps_url)
+    if cached is not None:
+        return cached
     try:
         resp = requests.get(maps_url, allow_redirects=True, timeout=10)
-        return str(resp.url)
     except requests.RequestException:
         return maps_url
+    expanded = str(resp.url)
+    if resp.status_code < 400 and expanded != maps_url:
+        cache.put_expansion(maps_url, expanded)
+    return expanded
+
+
+async def _aexpand_maps_url(client: Any, maps_url: str, cache: PlacesCache | None = None) -> str:
+    """_expand_maps_url over an async client (same short-link cache)."""
+    parsed = urlparse(maps_url)
+    if parsed.netloc not in {"maps.app.goo.gl", "goo.gl"}:
+        return maps_url
+    cache = cache or default_places_cache()
+    cached = cache.get_expansion(maps_url)
+    if cached is not None:
+        return cached
+    try:
+        resp = await client.get(maps_url, follow_redirects=True, timeout=10)
+    except async_transport_errors():
+        return maps_url
+    expanded = str(resp.url)
+    if resp.status_code < 400 and expanded != maps_url:
+        cache.put_expansion(maps_url, expanded)
+    return expanded
 
 
 def resolve_place_id(maps_url: str) -> str | None:
     url = maps_url.strip()
     if not url:
         return None
-    expanded = _expand_maps_url(url)
+    return _place_id_from(_expand_maps_url(url))
+
+
+def _place_id_from(expanded: str) -> str | None:
     parsed = urlparse(expanded)
     if parsed.netloc not in ALLOWED_HOSTS:
         return None
@@ -144,15 +319,28 @@ def resolve_place_id(maps_url: str) -> str | None:
     return None
 
 
-def _maps_host_allowed(maps_url: str) -> bool:
-    expanded = _expand_maps_url(maps_url)
-    parsed = urlparse(expanded)
-    return parsed.netloc in ALLOWED_HOSTS
+def resolve_website(
+    place_id: str, api_key: str | None = None, cache: PlacesCache | None = None
+) -> str:
+    details = fetch_place_details(
+        place_id,
+        api_key=api_key,
+        field_mask="id,websiteUri",
+        cache=cache or default_places_cache(),
+    )
+    return str(details.get("website") or "").strip()
 
 
-def resolve_website(place_id: str, api_key: str | None = None) -> str:
-    key = api_key or get_api_key()
-    details = fetch_place_details(place_id, api_key=key, field_mask="id,websiteUri")
+async def aresolve_website(
+    client: Any, place_id: str, api_key: str | None = None, cache: PlacesCache | None = None
+) -> str:
+    details = await afetch_place_details(
+        client,
+        place_id,
+        api_key=api_key,
+        field_mask="id,websiteUri",
+        cache=cache or default_places_cache(),
+    )
     return str(details.get("website") or "").strip()
 
 
@@ -174,13 +362,7 @@ def _is_first_party(url: str, domain: str) -> bool:
 
 
 def _is_ats_host(url: str) -> bool:
-    if not url:
-        return False
-    parsed = urlparse(url if "://" in url else f"https://{url}")
-    host = parsed.netloc.lower()
-    if not host:
-        return False
-    return any(host == ats or host.endswith(f".{ats}") for ats in ATS_HOSTS)
+    return is_ats_url(url)
 
 
 def _build_evidence(snippets: list[str], urls: list[str]) -> list[dict[str, str]]:
@@ -344,6 +526,12 @@ def render_company_markdown(package: dict[str, Any]) -> str:
     source = package.get("source", {})
     if source.get("website_source"):
         lines.append(f"- website_source: {source.get('website_source')}")
+    reused = package.get("reused_from") or {}
+    if reused.get("run_id"):
+        lines.append(
+            f"- reused_from: {reused.get('run_id')} "
+            f"({reused.get('key')}, {reused.get('age_s')} s old)"
+        )
     lines.append("")
     return "\n".join(lines)
 
@@ -369,6 +557,7 @@ def build_company_package(
     degraded_reason: str = "none",
     cookie_wall: dict[str, Any] | None = None,
     next_action: str = "",
+    probes_saved: int = 0,
 ) -> dict[str, Any]:
     signal = str(scan_result.get("signal") or scan_result.get("hiring_signal") or "unclear").lower()
     status_map = {"yes": "yes", "no": "no", "unclear": "uncertain"}
@@ -393,7 +582,7 @@ def build_company_package(
         "run_id": run_id,
         "created_at": _now_iso(),
         "tool_version": __version__,
-        "git_sha": _resolve_git_sha(_repo_root()),
+        "git_sha": provenance().git_sha,
         "source": {
             "source_ref": maps_url,
             "place_id": place_id or "",
@@ -430,13 +619,15 @@ def build_company_package(
         "safety": {
             "robots_respected": "unknown",
             "pages_fetched": pages_fetched,
+            "probes_saved": probes_saved,
             "skipped_reasons": skipped_reasons,
             "errors": safe_errors,
             "checked_urls": checked_urls,
             "cookie_wall": cookie_wall,
             "llm_used": scan_config.use_llm,
             "prompt_version": scan_config.prompt_version,
-            "ollama_model": scan_config.ollama_model,
+            "ollama_model": join_model_tiers(scan_config.ollama_model),
+            "ollama_tier": str(scan_result.get("ollama_tier") or ""),
             "ollama_temperature": scan_config.ollama_temperature,
             "deterministic": scan_config.deterministic,
         },
@@ -446,216 +637,365 @@ def build_company_package(
 
 
 def write_company_package(run_id: str, package: dict[str, Any], out_root: Path | None = None) -> Path:
-    out_root = out_root or Path("out") / "runs"
+    out_root = out_root or runs_root()
     out_dir = out_root / run_id
-    out_dir.mkdir(parents=True, exist_ok=True)
-    out_path = out_dir / "company_package.json"
-    out_path.write_text(json.dumps(package, indent=2, ensure_ascii=False), encoding="utf-8")
-    md_path = out_dir / "company_package.md"
-    md_path.write_text(render_company_markdown(package), encoding="utf-8")
+    with metrics().timed("package_write"):
+        out_dir.mkdir(parents=True, exist_ok=True)
+        out_path = out_dir / "company_package.json"
+        out_path.write_text(json.dumps(package, indent=2, ensure_ascii=False), encoding="utf-8")
+        md_path = out_dir / "company_package.md"
+        md_path.write_text(render_company_markdown(package), encoding="utf-8")
+        run_index(out_root).record(run_id, package, out_path, md_path)
     return out_path
 
 
 def read_company_package(run_id: str, out_root: Path | None = None) -> dict[str, Any] | None:
-    out_root = out_root or Path("out") / "runs"
-    path = out_root / run_id / "company_package.json"
+    out_root = out_root or runs_root()
+    index = run_index(out_root)
+    entry = index.get(run_id)
+    if entry is not None:
+        path = Path(entry["json_path"])
+    elif index.backfilled:
+        return None
+    else:
+        path = out_root / run_id / "company_package.json"
     if not path.exists():
         return None
     return json.loads(path.read_text(encoding="utf-8"))
 
 
-def process_maps_ingest(
+def restamp_package(
+    package: dict[str, Any],
     *,
+    run_id: str,
     maps_url: str,
-    note: str = "",
-    tags: list[str] | None = None,
-    run_id: str | None = None,
+    place_id: str,
+    note: str,
+    tags: list[str],
+    reused_from: dict[str, Any],
 ) -> dict[str, Any]:
-    run_id = run_id or new_run_id()
-    tags = tags or []
-    next_action = ""
-    if not _maps_host_allowed(maps_url):
-        package = {
-            "status": "error",
-            "degraded_reason": "none",
-            "schema_version": SCHEMA_VERSION,
-            "run_id": run_id,
-            "created_at": _now_iso(),
-            "tool_version": __version__,
-            "git_sha": _resolve_git_sha(_repo_root()),
-            "source": {
-                "source_ref": maps_url,
-                "place_id": "",
-                "canonical_domain": "",
-                "website_source": "unknown",
-                "resolver_notes": "Invalid Maps URL host.",
-            },
-            "hiring": {"status": "uncertain", "confidence": 0.0, "signals": [], "evidence": []},
-            "industry": {"labels": [], "confidence": 0.0, "evidence": []},
-            "roles": {"detected": [], "fit": {"score": 0, "green_flags": [], "red_flags": [], "evidence": []}},
-            "links": {"maps_url": maps_url, "website_url": "", "careers_urls": [], "ats_urls": [], "contact_url": ""},
-            "next_action": "",
-            "safety": {
-                "robots_respected": "unknown",
-                "pages_fetched": 0,
-            "skipped_reasons": [],
-            "errors": ["invalid_maps_url"],
-            "checked_urls": [],
-            "cookie_wall": _default_cookie_wall(),
-            "llm_used": False,
-            "prompt_version": "",
-            "ollama_model": "",
-                "ollama_temperature": 0.0,
-                "deterministic": False,
-            },
-            "notes": {"note": note or "", "tags": tags or []},
-            "error": {"code": "invalid_maps_url", "message": "Maps URL host is not supported."},
-        }
-        write_company_package(run_id, package)
-        return {"run_id": run_id, "status": "error"}
+    """Copy of a finished package under a new run_id, with this request's source and notes."""
+    package = copy.deepcopy(package)
+    package["run_id"] = run_id
+    package["created_at"] = _now_iso()
+    package.setdefault("source", {}).update({"source_ref": maps_url, "place_id": place_id})
+    package.setdefault("links", {})["maps_url"] = maps_url
+    package["notes"] = {"note": note or "", "tags": tags or []}
+    package["reused_from"] = reused_from
+    return package
 
-    place_id = resolve_place_id(maps_url)
-    if not place_id:
-        next_action = "Paste official website URL to proceed."
-        package = {
-            "status": "degraded",
-            "degraded_reason": "place_id_not_found",
-            "schema_version": SCHEMA_VERSION,
-            "run_id": run_id,
-            "created_at": _now_iso(),
-            "tool_version": __version__,
-            "git_sha": _resolve_git_sha(_repo_root()),
-            "source": {
-                "source_ref": maps_url,
-                "place_id": "",
-                "canonical_domain": "",
-                "website_source": "unknown",
-                "resolver_notes": "Could not resolve place_id from Maps URL.",
-            },
-            "hiring": {"status": "uncertain", "confidence": 0.0, "signals": [], "evidence": []},
-            "industry": {"labels": [], "confidence": 0.0, "evidence": []},
-            "roles": {"detected": [], "fit": {"score": 0, "green_flags": [], "red_flags": [], "evidence": []}},
-            "links": {"maps_url": maps_url, "website_url": "", "careers_urls": [], "ats_urls": [], "contact_url": ""},
-            "next_action": next_action,
-            "safety": {
-                "robots_respected": "unknown",
-                "pages_fetched": 0,
+
+def _reuse_result(
+    cache: ResultCache,
+    key: str,
+    *,
+    run_id: str,
+    maps_url: str,
+    place_id: str,
+    note: str,
+    tags: list[str],
+    also_keys: list[str] | None = None,
+) -> dict[str, Any] | None:
+    hit = cache.lookup(key)
+    if hit is None:
+        return None
+    source_run_id, created_at = hit
+    cached = read_company_package(source_run_id)
+    if not cached:
+        # Purged by retention: fall through to a fresh scan.
+        cache.forget(key)
+        return None
+    package = restamp_package(
+        cached,
+        run_id=run_id,
+        maps_url=maps_url,
+        place_id=place_id,
+        note=note,
+        tags=tags,
+        reused_from={
+            "run_id": source_run_id,
+            "key": key,
+            "age_s": round(time.time() - created_at, 1),
+        },
+    )
+    write_company_package(run_id, package)
+    if also_keys:
+        cache.store(also_keys, source_run_id, created_at)
+    return {"run_id": run_id, "status": package.get("status") or "ok", "reused_from": source_run_id}
+
+
+def _write_stopped(
+    *,
+    run_id: str,
+    maps_url: str,
+    note: str,
+    tags: list[str],
+    status: str,
+    resolver_notes: str,
+    code: str,
+    message: str,
+    degraded_reason: str = "none",
+    place_id: str = "",
+    website_source: str = "unknown",
+    error: str = "",
+    next_action: str = "",
+) -> dict[str, Any]:
+    """Write the package of an ingest that stopped before scanning (bad URL, no website...)."""
+    package = {
+        "status": status,
+        "degraded_reason": degraded_reason,
+        "schema_version": SCHEMA_VERSION,
+        "run_id": run_id,
+        "created_at": _now_iso(),
+        "tool_version": __version__,
+        "git_sha": provenance().git_sha,
+        "source": {
+            "source_ref": maps_url,
+            "place_id": place_id,
+            "canonical_domain": "",
+            "website_source": website_source,
+            "resolver_notes": resolver_notes,
+        },
+        "hiring": {"status": "uncertain", "confidence": 0.0, "signals": [], "evidence": []},
+        "industry": {"labels": [], "confidence": 0.0, "evidence": []},
+        "roles": {
+            "detected": [],
+            "fit": {"score": 0, "green_flags": [], "red_flags": [], "evidence": []},
+        },
+        "links": {
+            "maps_url": maps_url,
+            "website_url": "",
+            "careers_urls": [],
+            "ats_urls": [],
+            "contact_url": "",
+        },
+        "next_action": next_action,
+        "safety": {
+            "robots_respected": "unknown",
+            "pages_fetched": 0,
+            "probes_saved": 0,
             "skipped_reasons": [],
-            "errors": ["place_id_not_found"],
+            "errors": [error or code],
             "checked_urls": [],
             "cookie_wall": _default_cookie_wall(),
             "llm_used": False,
             "prompt_version": "",
             "ollama_model": "",
-                "ollama_temperature": 0.0,
-                "deterministic": False,
-            },
-            "notes": {"note": note or "", "tags": tags or []},
-            "error": {"code": "place_id_not_found", "message": "Could not resolve place_id from Maps URL."},
-        }
-        write_company_package(run_id, package)
-        return {"run_id": run_id, "status": "degraded"}
+            "ollama_tier": "",
+            "ollama_temperature": 0.0,
+            "deterministic": False,
+        },
+        "notes": {"note": note or "", "tags": tags or []},
+        "error": {"code": code, "message": message},
+    }
+    write_company_package(run_id, package)
+    return {"run_id": run_id, "status": status}
 
+
+def process_maps_ingest(
+    *,
+    maps_url: str,
+    note: str = "",
+    tags: list[str] | None = None,
+    run_id: str | None = None,
+    context: BatchContext | None = None,
+    force: bool = False,
+    cache: ResultCache | None = None,
+) -> dict[str, Any]:
+    """Maps URL -> place_id -> website -> scan -> company package.
+
+    A fresh package for the same place_id or canonical domain is reused (re-stamped with this
+    run_id) unless force=True; concurrent ingests of one key wait for the first instead of
+    repeating Places lookups and the scan.
+    """
+    run_id = run_id or new_run_id()
+    tags = tags or []
+    emit = _progress(run_id)
+    # Expand a short link once; host check and place_id parsing both work on the result.
+    with metrics().timed("maps_expand"):
+        expanded_url = _expand_maps_url(maps_url)
+    emit("maps_expanded", short_link=expanded_url != maps_url)
+    if urlparse(expanded_url).netloc not in ALLOWED_HOSTS:
+        return _write_stopped(
+            run_id=run_id,
+            maps_url=maps_url,
+            note=note,
+            tags=tags,
+            status="error",
+            resolver_notes="Invalid Maps URL host.",
+            code="invalid_maps_url",
+            message="Maps URL host is not supported.",
+        )
+
+    place_id = _place_id_from(expanded_url)
+    emit("place_resolved", place_id=place_id or "")
+    if not place_id:
+        return _write_stopped(
+            run_id=run_id,
+            maps_url=maps_url,
+            note=note,
+            tags=tags,
+            status="degraded",
+            degraded_reason="place_id_not_found",
+            resolver_notes="Could not resolve place_id from Maps URL.",
+            code="place_id_not_found",
+            message="Could not resolve place_id from Maps URL.",
+            next_action=PASTE_WEBSITE,
+        )
+
+    cache = cache or default_result_cache()
+    with cache.hold(place_key(place_id)):
+        if not force:
+            reused = _reuse_result(
+                cache,
+                place_key(place_id),
+                run_id=run_id,
+                maps_url=maps_url,
+                place_id=place_id,
+                note=note,
+                tags=tags,
+            )
+            if reused is not None:
+                emit("reused", reused_from=reused["reused_from"])
+                return reused
+        return _ingest_place(
+            maps_url=maps_url,
+            place_id=place_id,
+            note=note,
+            tags=tags,
+            run_id=run_id,
+            context=context,
+            cache=cache,
+            force=force,
+        )
+
+
+def _ingest_place(
+    *,
+    maps_url: str,
+    place_id: str,
+    note: str,
+    tags: list[str],
+    run_id: str,
+    context: BatchContext | None,
+    cache: ResultCache,
+    force: bool,
+) -> dict[str, Any]:
+    emit = _progress(run_id)
     try:
-        website_url = resolve_website(place_id)
+        with metrics().timed("place_lookup"):
+            website_url = context.website_for(place_id) if context else resolve_website(place_id)
     except Exception as exc:
-        package = {
-            "status": "error",
-            "degraded_reason": "none",
-            "schema_version": SCHEMA_VERSION,
-            "run_id": run_id,
-            "created_at": _now_iso(),
-            "tool_version": __version__,
-            "git_sha": _resolve_git_sha(_repo_root()),
-            "source": {
-                "source_ref": maps_url,
-                "place_id": place_id,
-                "canonical_domain": "",
-                "website_source": "places",
-                "resolver_notes": "Places lookup failed.",
-            },
-            "hiring": {"status": "uncertain", "confidence": 0.0, "signals": [], "evidence": []},
-            "industry": {"labels": [], "confidence": 0.0, "evidence": []},
-            "roles": {"detected": [], "fit": {"score": 0, "green_flags": [], "red_flags": [], "evidence": []}},
-            "links": {"maps_url": maps_url, "website_url": "", "careers_urls": [], "ats_urls": [], "contact_url": ""},
-            "next_action": "",
-            "safety": {
-                "robots_respected": "unknown",
-                "pages_fetched": 0,
-            "skipped_reasons": [],
-            "errors": [f"places_lookup_failed:{exc}"],
-            "checked_urls": [],
-            "cookie_wall": _default_cookie_wall(),
-            "llm_used": False,
-            "prompt_version": "",
-            "ollama_model": "",
-                "ollama_temperature": 0.0,
-                "deterministic": False,
-            },
-            "notes": {"note": note or "", "tags": tags or []},
-            "error": {"code": "places_lookup_failed", "message": "Places lookup failed."},
-        }
-        write_company_package(run_id, package)
-        return {"run_id": run_id, "status": "error"}
-
+        emit("website_resolved", website_url="", error=str(exc))
+        return _write_stopped(
+            run_id=run_id,
+            maps_url=maps_url,
+            note=note,
+            tags=tags,
+            status="error",
+            place_id=place_id,
+            website_source="places",
+            resolver_notes="Places lookup failed.",
+            code="places_lookup_failed",
+            message="Places lookup failed.",
+            error=f"places_lookup_failed:{exc}",
+        )
+
+    emit("website_resolved", website_url=website_url)
     if not website_url:
-        next_action = "Paste official website URL to proceed."
-        package = {
-            "status": "degraded",
-            "degraded_reason": "website_missing",
-            "schema_version": SCHEMA_VERSION,
-            "run_id": run_id,
-            "created_at": _now_iso(),
-            "tool_version": __version__,
-            "git_sha": _resolve_git_sha(_repo_root()),
-            "source": {
-                "source_ref": maps_url,
-                "place_id": place_id,
-                "canonical_domain": "",
-                "website_source": "places",
-                "resolver_notes": "Places had no websiteUri.",
-            },
-            "hiring": {"status": "uncertain", "confidence": 0.0, "signals": [], "evidence": []},
-            "industry": {"labels": [], "confidence": 0.0, "evidence": []},
-            "roles": {"detected": [], "fit": {"score": 0, "green_flags": [], "red_flags": [], "evidence": []}},
-            "links": {"maps_url": maps_url, "website_url": "", "careers_urls": [], "ats_urls": [], "contact_url": ""},
-            "next_action": next_action,
-            "safety": {
-                "robots_respected": "unknown",
-                "pages_fetched": 0,
-            "skipped_reasons": [],
-            "errors": ["website_missing"],
-            "checked_urls": [],
-            "cookie_wall": _default_cookie_wall(),
-            "llm_used": False,
-            "prompt_version": "",
-            "ollama_model": "",
-                "ollama_temperature": 0.0,
-                "deterministic": False,
-            },
-            "notes": {"note": note or "", "tags": tags or []},
-            "error": {"code": "website_missing", "message": "Place has no websiteUri."},
-        }
-        write_company_package(run_id, package)
-        return {"run_id": run_id, "status": "degraded"}
+        return _write_stopped(
+            run_id=run_id,
+            maps_url=maps_url,
+            note=note,
+            tags=tags,
+            status="degraded",
+            degraded_reason="website_missing",
+            place_id=place_id,
+            website_source="places",
+            resolver_notes="Places had no websiteUri.",
+            code="website_missing",
+            message="Place has no websiteUri.",
+            next_action=PASTE_WEBSITE,
+        )
 
     domain = _clean_domain(website_url)
-    scan_config = load_scan_config()
-    scan_outcome = scan_domain(
-        domain=domain,
-        name=domain,
-        website_url=website_url,
-        max_urls=scan_config.max_urls,
-        sleep_s=scan_config.sleep_s,
-        robots_mode=scan_config.robots_mode,
-        robots_allowlist=None,
-        session=requests.Session(),
-        rate_limit_state={},
-        ollama_host=scan_config.ollama_host,
-        ollama_model=scan_config.ollama_model,
-        ollama_options=scan_config.ollama_options,
-        use_llm=scan_config.use_llm,
-    )
+    key = domain_key(canonical_domain(domain))
+    with cache.hold(key):
+        if not force:
+            reused = _reuse_result(
+                cache,
+                key,
+                run_id=run_id,
+                maps_url=maps_url,
+                place_id=place_id,
+                note=note,
+                tags=tags,
+                also_keys=[place_key(place_id)],
+            )
+            if reused is not None:
+                emit("reused", reused_from=reused["reused_from"])
+                return reused
+        scan_config = provenance().scan_config
+        emit("scan_started", domain=domain, max_urls=scan_config.max_urls)
+        scan_outcome = scan_domain(
+            session=context.session if context else requests.Session(),
+            rate_limit_state=context.rate_limit_state if context else {},
+            **_scan_kwargs(domain, website_url, scan_config, context, emit),
+        )
+        return _write_scanned(
+            run_id=run_id,
+            maps_url=maps_url,
+            place_id=place_id,
+            website_url=website_url,
+            domain=domain,
+            note=note,
+            tags=tags,
+            scan_config=scan_config,
+            scan_outcome=scan_outcome,
+            cache=cache,
+        )
+
+
+def _scan_kwargs(
+    domain: str,
+    website_url: str,
+    scan_config: ScanConfig,
+    context: BatchContext | None,
+    emit: Any,
+) -> dict[str, Any]:
+    """scan_domain / ascan_domain arguments for one ingest (without the HTTP client)."""
+    return {
+        "domain": domain,
+        "name": domain,
+        "website_url": website_url,
+        "max_urls": scan_config.max_urls,
+        "sleep_s": scan_config.sleep_s,
+        "robots_mode": scan_config.robots_mode,
+        "robots_allowlist": None,
+        "ollama_host": scan_config.ollama_host,
+        "ollama_model": scan_config.ollama_model,
+        "ollama_options": scan_config.ollama_options,
+        "use_llm": scan_config.use_llm,
+        "ollama_keep_alive": scan_config.ollama_keep_alive,
+        "robots": context.robots if context else None,
+        "on_event": emit,
+        "on_timing": metrics().observe,
+    }
+
+
+def _write_scanned(
+    *,
+    run_id: str,
+    maps_url: str,
+    place_id: str,
+    website_url: str,
+    domain: str,
+    note: str,
+    tags: list[str],
+    scan_config: ScanConfig,
+    scan_outcome: DomainScanResult,
+    cache: ResultCache,
+) -> dict[str, Any]:
     pipeline_status = "ok"
     degraded_reason = "none"
     next_action = ""
@@ -678,6 +1018,7 @@ def process_maps_ingest(
         errors=scan_outcome.errors,
         skipped_reasons=scan_outcome.skipped_reasons,
         pages_fetched=scan_outcome.pages_fetched,
+        probes_saved=scan_outcome.probes_saved,
         note=note,
         tags=tags,
         pipeline_status=pipeline_status,
@@ -686,4 +1027,172 @@ def process_maps_ingest(
         next_action=next_action,
     )
     write_company_package(run_id, package)
+    if pipeline_status == "ok":
+        cache.store([place_key(place_id), domain_key(canonical_domain(domain))], run_id)
     return {"run_id": run_id, "status": pipeline_status}
+
+
+async def aprocess_maps_ingest(
+    *,
+    client: Any,
+    maps_url: str,
+    note: str = "",
+    tags: list[str] | None = None,
+    run_id: str | None = None,
+    context: BatchContext | None = None,
+    force: bool = False,
+    cache: ResultCache | None = None,
+) -> dict[str, Any]:
+    """process_maps_ingest over an async client (httpx.AsyncClient); writes the same package.
+
+    Short-link expansion, Places lookup, robots.txt, page fetches and Ollama calls are awaited,
+    so one event loop can carry many ingests; the SQLite caches and package files stay sync.
+    """
+    run_id = run_id or new_run_id()
+    tags = tags or []
+    emit = _progress(run_id)
+    with metrics().timed("maps_expand"):
+        expanded_url = await _aexpand_maps_url(client, maps_url)
+    emit("maps_expanded", short_link=expanded_url != maps_url)
+    if urlparse(expanded_url).netloc not in ALLOWED_HOSTS:
+        return _write_stopped(
+            run_id=run_id,
+            maps_url=maps_url,
+            note=note,
+            tags=tags,
+            status="error",
+            resolver_notes="Invalid Maps URL host.",
+            code="invalid_maps_url",
+            message="Maps URL host is not supported.",
+        )
+
+    place_id = _place_id_from(expanded_url)
+    emit("place_resolved", place_id=place_id or "")
+    if not place_id:
+        return _write_stopped(
+            run_id=run_id,
+            maps_url=maps_url,
+            note=note,
+            tags=tags,
+            status="degraded",
+            degraded_reason="place_id_not_found",
+            resolver_notes="Could not resolve place_id from Maps URL.",
+            code="place_id_not_found",
+            message="Could not resolve place_id from Maps URL.",
+            next_action=PASTE_WEBSITE,
+        )
+
+    cache = cache or default_result_cache()
+    async with cache.ahold(place_key(place_id)):
+        if not force:
+            reused = _reuse_result(
+                cache,
+                place_key(place_id),
+                run_id=run_id,
+                maps_url=maps_url,
+                place_id=place_id,
+                note=note,
+                tags=tags,
+            )
+            if reused is not None:
+                emit("reused", reused_from=reused["reused_from"])
+                return reused
+        return await _aingest_place(
+            client,
+            maps_url=maps_url,
+            place_id=place_id,
+            note=note,
+            tags=tags,
+            run_id=run_id,
+            context=context,
+            cache=cache,
+            force=force,
+        )
+
+
+async def _aingest_place(
+    client: Any,
+    *,
+    maps_url: str,
+    place_id: str,
+    note: str,
+    tags: list[str],
+    run_id: str,
+    context: BatchContext | None,
+    cache: ResultCache,
+    force: bool,
+) -> dict[str, Any]:
+    emit = _progress(run_id)
+    try:
+        with metrics().timed("place_lookup"):
+            if context:
+                website_url = await context.awebsite_for(client, place_id)
+            else:
+                website_url = await aresolve_website(client, place_id)
+    except Exception as exc:
+        emit("website_resolved", website_url="", error=str(exc))
+        return _write_stopped(
+            run_id=run_id,
+            maps_url=maps_url,
+            note=note,
+            tags=tags,
+            status="error",
+            place_id=place_id,
+            website_source="places",
+            resolver_notes="Places lookup failed.",
+            code="places_lookup_failed",
+            message="Places lookup failed.",
+            error=f"places_lookup_failed:{exc}",
+        )
+
+    emit("website_resolved", website_url=website_url)
+    if not website_url:
+        return _write_stopped(
+            run_id=run_id,
+            maps_url=maps_url,
+            note=note,
+            tags=tags,
+            status="degraded",
+            degraded_reason="website_missing",
+            place_id=place_id,
+            website_source="places",
+            resolver_notes="Places had no websiteUri.",
+            code="website_missing",
+            message="Place has no websiteUri.",
+            next_action=PASTE_WEBSITE,
+        )
+
+    domain = _clean_domain(website_url)
+    key = domain_key(canonical_domain(domain))
+    async with cache.ahold(key):
+        if not force:
+            reused = _reuse_result(
+                cache,
+                key,
+                run_id=run_id,
+                maps_url=maps_url,
+                place_id=place_id,
+                note=note,
+                tags=tags,
+                also_keys=[place_key(place_id)],
+            )
+            if reused is not None:
+                emit("reused", reused_from=reused["reused_from"])
+                return reused
+        scan_config = provenance().scan_config
+        emit("scan_started", domain=domain, max_urls=scan_config.max_urls)
+        scan_outcome = await ascan_domain(
+            client=client, **_scan_kwargs(domain, website_url, scan_config, context, emit)
+        )
+        return _write_scanned(
+            run_id=run_id,
+            maps_url=maps_url,
+            place_id=place_id,
+            website_url=website_url,
+            domain=domain,
+            note=note,
+            tags=tags,
+            scan_config=scan_config,
+            scan_outcome=scan_outcome,
+            cache=cache,
+        )
@@ -0,0 +1,218 @@
+"""Hashed n-gram logistic regression (pure NumPy) used between the heuristics and the LLM.
+
+Features are word unigrams/bigrams and in-word character trigrams, hashed (crc32) into a
+fixed-size vector and L2-normalised. The model scores P(hiring = yes); pages it is confident
+about are resolved locally and only the band in between goes to Ollama.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from bs4 import BeautifulSoup
+
+N_FEATURES = 2**16
+DEFAULT_YES_THRESHOLD = 0.8
+DEFAULT_NO_THRESHOLD = 0.2
+DEFAULT_MODEL_PATH = Path("out/hiring_classifier.npz")
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+@dataclass
+class Example:
+    text: str
+    label: str  # "yes" | "no"
+    source: str
+
+
+def html_to_text(html: str) -> str:
+    soup = BeautifulSoup(html, "html.parser")
+    for tag in soup(["script", "style", "noscript"]):
+        tag.decompose()
+    return " ".join(soup.stripped_strings)
+
+
+def featurize(text: str, n_features: int = N_FEATURES) -> Tuple[np.ndarray, np.ndarray]:
+    tokens = _TOKEN_RE.findall(text.lower())
+    feats = [f"w:{t}" for t in tokens]
+    feats += [f"b:{a} {b}" for a, b in zip(tokens, tokens[1:], strict=False)]
+    for tok in tokens:
+        padded = f"<{tok}>"
+        feats += [f"c:{padded[i : i + 3]}" for i in range(len(padded) - 2)]
+    if not feats:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float64)
+    hashed = np.fromiter(
+        (zlib.crc32(f.encode("utf-8")) % n_features for f in feats), dtype=np.int64
+    )
+    idx, counts = np.unique(hashed, return_counts=True)
+    vals = counts.astype(np.float64)
+    return idx, vals / np.linalg.norm(vals)
+
+
+def _stack(
+    rows: Sequence[Tuple[np.ndarray, np.ndarray]],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    lengths = np.array([len(r[0]) for r in rows], dtype=np.int64)
+    indices = np.concatenate([r[0] for r in rows]) if rows else np.zeros(0, dtype=np.int64)
+    values = np.concatenate([r[1] for r in rows]) if rows else np.zeros(0)
+    row_of = np.repeat(np.arange(len(rows)), lengths)
+    return indices, values, row_of
+
+
+class HiringClassifier:
+    def __init__(
+        self,
+        weights: np.ndarray | None = None,
+        bias: float = 0.0,
+        *,
+        yes_threshold: float = DEFAULT_YES_THRESHOLD,
+        no_threshold: float = DEFAULT_NO_THRESHOLD,
+        meta: Dict[str, Any] | None = None,
+    ):
+        self.weights = weights if weights is not None else np.zeros(N_FEATURES)
+        self.bias = float(bias)
+        self.yes_threshold = yes_threshold
+        self.no_threshold = no_threshold
+        self.meta = meta or {}
+
+    @property
+    def n_features(self) -> int:
+        return int(self.weights.shape[0])
+
+    def predict_proba(self, text: str) -> float:
+        idx, vals = featurize(text, self.n_features)
+        z = float(self.weights[idx] @ vals) + self.bias
+        return float(1.0 / (1.0 + np.exp(-z)))
+
+    def classify(self, text: str) -> Dict[str, Any]:
+        """Same shape as hiring_scan.evaluate_html: signal/confidence/evidence."""
+        p_yes = self.predict_proba(text)
+        if p_yes >= self.yes_threshold:
+            return {
+                "signal": "yes",
+                "confidence": round(p_yes, 3),
+                "evidence": f"classifier:p_yes={p_yes:.2f}",
+            }
+        if p_yes <= self.no_threshold:
+            return {
+                "signal": "no",
+                "confidence": round(1 - p_yes, 3),
+                "evidence": f"classifier:p_yes={p_yes:.2f}",
+            }
+        return {"signal": "unclear", "confidence": 0.0, "evidence": f"classifier:p_yes={p_yes:.2f}"}
+
+    def fit(
+        self, examples: Sequence[Example], *, epochs: int = 300, lr: float = 2.0, l2: float = 1e-3
+    ) -> "HiringClassifier":
+        """Full-batch gradient descent on the logistic loss (sparse rows via np.add.at)."""
+        rows = [featurize(ex.text, self.n_features) for ex in examples]
+        y = np.array([1.0 if ex.label == "yes" else 0.0 for ex in examples])
+        indices, values, row_of = _stack(rows)
+        n = max(1, len(examples))
+        # Balance classes so a skewed verdict history does not swamp the fixtures.
+        pos = max(1.0, y.sum())
+        neg = max(1.0, n - y.sum())
+        sample_w = np.where(y == 1.0, n / (2 * pos), n / (2 * neg))
+        w = np.zeros(self.n_features)
+        b = 0.0
+        for _ in range(epochs):
+            z = np.bincount(row_of, weights=w[indices] * values, minlength=n) + b
+            p = 1.0 / (1.0 + np.exp(-z))
+            err = (p - y) * sample_w / n
+            grad = np.zeros(self.n_features)
+            np.add.at(grad, indices, values * err[row_of])
+            w -= lr * (grad + l2 * w)
+            b -= lr * float(err.sum())
+        self.weights, self.bias = w, b
+        labels = pd.Series([ex.label for ex in examples]).value_counts().to_dict()
+        sources = pd.Series([ex.source for ex in examples]).value_counts().to_dict()
+        self.meta = {
+            "examples": n,
+            "labels": labels,
+            "sources": sources,
+            "epochs": epochs,
+            "l2": l2,
+        }
+        return self
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        nz = np.flatnonzero(self.weights)
+        with path.open("wb") as fh:
+            np.savez_compressed(
+                fh,
+                n_features=np.array(self.n_features),
+                index=nz,
+                weight=self.weights[nz],
+                bias=np.array(self.bias),
+                thresholds=np.array([self.yes_threshold, self.no_threshold]),
+                meta=np.array(json.dumps(self.meta, ensure_ascii=False)),
+            )
+
+    @classmethod
+    def load(cls, path: Path) -> "HiringClassifier":
+        with np.load(path, allow_pickle=False) as data:
+            weights = np.zeros(int(data["n_features"]))
+            weights[data["index"]] = data["weight"]
+            yes_t, no_t = (float(v) for v in data["thresholds"])
+            return cls(
+                weights,
+                float(data["bias"]),
+                yes_threshold=yes_t,
+                no_threshold=no_t,
+                meta=json.loads(str(data["meta"])),
+            )
+
+
+def load_fixture_examples(fixtures_dir: Path) -> List[Example]:
+    """labels.json HTML fixtures + golden.jsonl texts; "unclear" items are not training targets."""
+    examples: List[Example] = []
+    labels_path = fixtures_dir / "labels.json"
+    if labels_path.exists():
+        for item in json.loads(labels_path.read_text(encoding="utf-8")):
+            label = str(item.get("label") or "").lower()
+            html_path = fixtures_dir / str(item.get("file") or "")
+            if label in {"yes", "no"} and html_path.is_file():
+                examples.append(
+                    Example(html_to_text(html_path.read_text(encoding="utf-8")), label, "fixture")
+                )
+    golden_path = fixtures_dir / "golden.jsonl"
+    if golden_path.exists():
+        for line in golden_path.read_text(encoding="utf-8").splitlines():
+            if not line.strip():
+                continue
+            payload = json.loads(line)
+            label = str(payload.get("label") or "").lower()
+            if label in {"yes", "no"}:
+                examples.append(Example(str(payload.get("text") or ""), label, "golden"))
+    return examples
+
+
+def load_verdict_examples(paths: Iterable[Path]) -> List[Example]:
+    """Past scan outputs from LLM-enabled runs: yes/no rows, text = evidence + evidence snippets."""
+    examples: List[Example] = []
+    for path in paths:
+        df = (
+            pd.read_json(path, lines=True) if path.suffix.lower() == ".jsonl" else pd.read_csv(path)
+        )
+        for row in df.fillna("").to_dict(orient="records"):
+            label = str(row.get("signal") or "").lower()
+            if label not in {"yes", "no"} or str(row.get("llm_used")).lower() not in {"true", "1"}:
+                continue
+            snippets = row.get("evidence_snippets") or []
+            if isinstance(snippets, str):
+                try:
+                    snippets = json.loads(snippets) if snippets.startswith("[") else [snippets]
+                except json.JSONDecodeError:
+                    snippets = [snippets]
+            text = " ".join([str(row.get("evidence") or "")] + [str(s) for s in snippets]).strip()
+            if text:
+                examples.append(Example(text, label, "llm_verdict"))
+    return examples
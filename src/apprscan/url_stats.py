@@ -0,0 +1,105 @@
+"""Per-path and per-domain careers-URL hit statistics learned from earlier runs."""
+
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping
+from urllib.parse import urlparse
+
+import pandas as pd
+
+from .http_pool import host_key
+
+
+def path_key(url: str) -> str:
+    return urlparse(url).path.rstrip("/").lower() or "/"
+
+
+class UrlHitStats:
+    """Counts tries/hits per URL path and remembers the last URL that hit per domain.
+
+    Candidates are ordered by the smoothed hit rate (hits + 1) / (tries + 2), so unseen
+    paths start at 0.5 and paths that keep missing sink; a domain's known-good URL goes first.
+    """
+
+    def __init__(self) -> None:
+        self.tries: Dict[str, int] = {}
+        self.hits: Dict[str, int] = {}
+        self.known_good: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def hit_rate(self, path: str) -> float:
+        return (self.hits.get(path, 0) + 1) / (self.tries.get(path, 0) + 2)
+
+    def record(self, url: str, hit: bool) -> None:
+        path = path_key(url)
+        domain = host_key(url)
+        with self._lock:
+            self.tries[path] = self.tries.get(path, 0) + 1
+            if hit:
+                self.hits[path] = self.hits.get(path, 0) + 1
+                self.known_good[domain] = url
+            elif self.known_good.get(domain, "").rstrip("/") == url.rstrip("/"):
+                del self.known_good[domain]
+
+    def record_probes(self, probed: Iterable[str], hit_url: str = "") -> None:
+        """One scan's candidate URLs as probed (before redirects); `hit_url` found hiring."""
+        for url in dict.fromkeys(probed):
+            self.record(url, bool(hit_url) and url == hit_url)
+
+    def record_scan_row(self, row: Mapping[str, object]) -> None:
+        """Bootstrap from a scan output row; only post-redirect URLs are available there."""
+        signal_url = str(row.get("signal_url") or "")
+        hit = str(row.get("signal") or "").lower() == "yes" and bool(signal_url)
+        checked = [u for u in str(row.get("checked_urls") or "").split(";") if u]
+        for url in dict.fromkeys(checked):
+            if not (hit and url.rstrip("/") == signal_url.rstrip("/")):
+                self.record(url, False)
+        if hit:
+            self.record(signal_url, True)
+
+    def order(self, domain: str, candidates: Iterable[str]) -> List[str]:
+        ordered = sorted(
+            enumerate(candidates), key=lambda item: (-self.hit_rate(path_key(item[1])), item[0])
+        )
+        urls = [url for _, url in ordered]
+        good = self.known_good.get(host_key(domain))
+        if good:
+            urls = [good] + [u for u in urls if u.rstrip("/") != good.rstrip("/")]
+        return urls
+
+    @classmethod
+    def load(cls, path: Path | None) -> "UrlHitStats":
+        stats = cls()
+        if path is None or not path.exists():
+            return stats
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return stats
+        stats.tries = {str(k): int(v) for k, v in (data.get("tries") or {}).items()}
+        stats.hits = {str(k): int(v) for k, v in (data.get("hits") or {}).items()}
+        stats.known_good = {str(k): str(v) for k, v in (data.get("known_good") or {}).items()}
+        return stats
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            data = {"tries": self.tries, "hits": self.hits, "known_good": self.known_good}
+            payload = json.dumps(data, ensure_ascii=False, indent=2, sort_keys=True)
+            path.write_text(payload, encoding="utf-8")
+
+    @classmethod
+    def from_scan_outputs(cls, paths: Iterable[Path]) -> "UrlHitStats":
+        """Bootstrap from earlier `apprscan scan` outputs (CSV or JSONL)."""
+        stats = cls()
+        for path in paths:
+            if path.suffix.lower() == ".jsonl":
+                df = pd.read_json(path, lines=True)
+            else:
+                df = pd.read_csv(path)
+            for row in df.fillna("").to_dict(orient="records"):
+                stats.record_scan_row(row)
+        return stats
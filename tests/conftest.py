@@ -0,0 +1,16 @@
+import pytest
+
+from apprscan.server import service
+
+
+@pytest.fixture(autouse=True)
+def _isolated_service_stores(monkeypatch, tmp_path):
+    """Keep the companion service's stores (job queue, result and Places caches, run
+    packages) out of the checkout: every test gets its own under tmp_path."""
+    stores = tmp_path / "service_stores"
+    monkeypatch.setenv("APPRSCAN_QUEUE_DB", str(stores / "jobs.sqlite"))
+    monkeypatch.setenv("APPRSCAN_RESULT_CACHE_DB", str(stores / "results.sqlite"))
+    monkeypatch.setenv("APPRSCAN_PLACES_CACHE_DB", str(stores / "places.sqlite"))
+    monkeypatch.setenv("APPRSCAN_RUNS_DIR", str(stores / "runs"))
+    monkeypatch.setattr(service, "_RESULT_CACHE", None)
+    monkeypatch.setattr(service, "_PLACES_CACHE", None)
@@ -0,0 +1,202 @@
+import asyncio
+import json
+import time
+
+import requests
+import responses
+
+from apprscan import hiring_scan
+from apprscan.jobs.robots import RobotsChecker
+from apprscan.places_api import DETAILS_URL
+from apprscan.places_cache import PlacesCache
+from apprscan.server import service
+from apprscan.server.job_queue import JobQueue
+from apprscan.server.result_cache import ResultCache
+
+CAREERS = f"https://acme.fi{hiring_scan.COMMON_PATHS[0]}"
+MAPS_URL = "https://www.google.com/maps/place/Acme/data=!4m2!3m1!1sChIJacme"
+
+
+class FakeAsyncClient:
+    """Async client over a requests session, so the same `responses` mocks serve both paths."""
+
+    def __init__(self):
+        self.session = requests.Session()
+
+    async def get(self, url, headers=None, timeout=None, follow_redirects=False):
+        return self.session.get(
+            url, headers=headers, timeout=timeout, allow_redirects=follow_redirects
+        )
+
+    async def post(self, url, json=None, timeout=None):
+        return self.session.post(url, json=json, timeout=timeout)
+
+
+def _ollama(request):
+    body = json.loads(request.body)
+    hiring = "Apply now" in body["messages"][-1]["content"]
+    snippets = ["Open positions: sales assistant", "Apply now"] if hiring else ["Not hiring", "-"]
+    verdict = {
+        "hiring_signal": "yes" if hiring else "no",
+        "confidence": 0.4 if body["model"] == "small" else 0.9,
+        "evidence": snippets[0],
+        "evidence_snippets": snippets,
+        "evidence_urls": [CAREERS],
+    }
+    return 200, {}, json.dumps({"message": {"content": json.dumps(verdict)}})
+
+
+def _mock_site():
+    responses.add(responses.GET, "https://acme.fi/robots.txt", body="User-agent: *\nAllow: /\n")
+    responses.add(responses.GET, "https://acme.fi", body="<title>Acme</title><p>Tervetuloa</p>")
+    responses.add(
+        responses.GET,
+        CAREERS,
+        body="<title>Ura</title><p>Open positions: sales assistant. Apply now!</p>",
+        headers={"Content-Type": "text/html; charset=utf-8"},
+    )
+    responses.add_callback(responses.POST, "http://ollama/api/chat", callback=_ollama)
+
+
+def _scan_kwargs():
+    return {
+        "domain": "acme.fi",
+        "name": "Acme",
+        "website_url": "https://acme.fi",
+        "max_urls": 2,
+        "sleep_s": 0.0,
+        "robots_mode": "strict",
+        "robots_allowlist": None,
+        "ollama_host": "http://ollama",
+        "ollama_model": "small,large",
+        "ollama_options": {},
+        "use_llm": True,
+        "robots": RobotsChecker(user_agent="apprscan-scan", session=requests.Session()),
+    }
+
+
+def _comparable(result):
+    data = dict(result.__dict__)
+    data.pop("llm_latency_ms")
+    data["llm_tiers"] = [
+        {key: value for key, value in tier.items() if "latenc" not in key}
+        for tier in data["llm_tiers"]
+    ]
+    return data
+
+
+@responses.activate
+def test_ascan_domain_matches_scan_domain(monkeypatch):
+    monkeypatch.setattr(hiring_scan, "SCAN_REQ_PER_SECOND", 1000.0)
+    _mock_site()
+    sync_events, async_events, timings = [], [], []
+    sync = hiring_scan.scan_domain(
+        session=requests.Session(),
+        rate_limit_state={},
+        on_event=lambda stage, **data: sync_events.append(stage),
+        on_timing=lambda stage, seconds: timings.append(stage),
+        **_scan_kwargs(),
+    )
+    calls = len(responses.calls)
+    result = asyncio.run(
+        hiring_scan.ascan_domain(
+            client=FakeAsyncClient(),
+            on_event=lambda stage, **data: async_events.append(stage),
+            **_scan_kwargs(),
+        )
+    )
+    assert len(responses.calls) == 2 * calls
+    assert _comparable(result) == _comparable(sync)
+    assert result.selected["hiring_signal"] == "yes" and result.llm_escalations == 2
+    assert async_events == sync_events
+    assert sorted(set(timings)) == ["fetch", "heuristic", "llm", "robots"]
+    assert timings.count("fetch") == timings.count("heuristic") == 2
+
+
+@responses.activate
+def test_aprocess_maps_ingest_writes_the_same_package(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(hiring_scan, "SCAN_REQ_PER_SECOND", 1000.0)
+    monkeypatch.setenv("GOOGLE_MAPS_API_KEY", "k")
+    monkeypatch.setenv("OLLAMA_URL", "http://ollama")
+    monkeypatch.setenv("OLLAMA_MODEL", "small,large")
+    places = PlacesCache(tmp_path / "places.sqlite", ttl_s=0)
+    monkeypatch.setattr(service, "default_places_cache", lambda: places)
+    responses.add(responses.GET, f"{DETAILS_URL}ChIJacme", json={"websiteUri": "https://acme.fi"})
+    _mock_site()
+
+    def context():
+        ctx = service.BatchContext()
+        ctx.robots = RobotsChecker(user_agent="apprscan-scan", session=requests.Session())
+        return ctx
+
+    cache = ResultCache(tmp_path / "results.sqlite", ttl_s=0)
+    service.process_maps_ingest(maps_url=MAPS_URL, run_id="sync", context=context(), cache=cache)
+    asyncio.run(
+        service.aprocess_maps_ingest(
+            client=FakeAsyncClient(),
+            maps_url=MAPS_URL,
+            run_id="async",
+            context=context(),
+            cache=cache,
+        )
+    )
+    sync, result = service.read_company_package("sync"), service.read_company_package("async")
+    for package in (sync, result):
+        package.pop("run_id")
+        package.pop("created_at")
+    assert result == sync
+    assert result["safety"]["pages_fetched"] == 2 and result["safety"]["llm_used"]
+    assert result["safety"]["ollama_model"] == "small,large"
+    assert result["safety"]["ollama_tier"] in {"small", "large"}
+
+
+@responses.activate
+def test_aprocess_maps_ingest_stops_early_like_the_sync_path(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("GOOGLE_MAPS_API_KEY", "k")
+    monkeypatch.setattr(service, "default_places_cache", lambda: PlacesCache(tmp_path / "p.db"))
+    responses.add(responses.GET, f"{DETAILS_URL}ChIJacme", json={"id": "ChIJacme"})
+    client = FakeAsyncClient()
+    cache = ResultCache(tmp_path / "results.sqlite", ttl_s=0)
+    for url, run_id in (("https://evil.example/maps", "bad"), (MAPS_URL, "nosite")):
+        service.process_maps_ingest(maps_url=url, run_id=f"{run_id}_sync", cache=cache)
+        asyncio.run(
+            service.aprocess_maps_ingest(client=client, maps_url=url, run_id=run_id, cache=cache)
+        )
+        sync = service.read_company_package(f"{run_id}_sync")
+        result = service.read_company_package(run_id)
+        for package in (sync, result):
+            package.pop("run_id")
+            package.pop("created_at")
+        assert result == sync
+    assert result["degraded_reason"] == "website_missing"
+
+
+def test_async_workers_share_one_loop_and_resource(tmp_path):
+    seen = []
+
+    async def handler(run_id, payload, resource):
+        await asyncio.sleep(0.01)
+        seen.append((run_id, resource))
+
+    class Resource:
+        async def __aenter__(self):
+            return "client"
+
+        async def __aexit__(self, *exc):
+            return False
+
+    queue = JobQueue(
+        tmp_path / "jobs.sqlite", async_handler=handler, async_context=Resource, concurrency=8
+    )
+    for n in range(20):
+        queue.enqueue(f"r{n}", {})
+    queue.start()
+    queue.enqueue("late", {})
+    deadline = time.time() + 10
+    while queue.counts()["done"] < 21 and time.time() < deadline:
+        time.sleep(0.02)
+    queue.stop()
+    assert queue.counts()["done"] == 21 and not queue.loop_error
+    assert {resource for _, resource in seen} == {"client"}
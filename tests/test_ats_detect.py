@@ -0,0 +1,42 @@
+from apprscan.jobs.ats import detect_ats, detect_ats_links, extract_links, is_ats_url
+from apprscan.server import service
+
+
+def test_detect_prefers_link_with_slug():
+    html = """
+    <script src="https://assets.teamtailor-cdn.com/widget.js"></script>
+    <a href="/about">About</a>
+    <a href="https://boards.greenhouse.io/embed/job_board?for=acme">Jobs</a>
+    """
+    detected = detect_ats("https://acme.fi", html)
+    assert detected == {
+        "kind": "greenhouse",
+        "slug": "acme",
+        "board_url": "https://boards.greenhouse.io/acme",
+    }
+
+
+def test_detect_page_url_itself():
+    detected = detect_ats("https://jobs.lever.co/acme/123", "<html></html>")
+    assert detected["kind"] == "lever"
+    assert detected["slug"] == "acme"
+
+
+def test_no_false_positive_on_lookalike_hosts():
+    html = '<a href="https://clever.com/jobs">Clever</a><a href="https://notrecruitee.com">x</a>'
+    assert detect_ats("https://acme.fi", html) is None
+
+
+def test_extract_links_once_and_deduplicated():
+    html = (
+        '<a href="https://acme.recruitee.com/">A</a>'
+        '<a href="https://acme.recruitee.com/">B</a><a href="/x">C</a>'
+    )
+    assert extract_links(html) == ["https://acme.recruitee.com/"]
+    assert detect_ats_links(extract_links(html))["slug"] == "acme"
+
+
+def test_service_uses_shared_host_table():
+    assert is_ats_url("https://acme.jobylon.com/jobs")
+    assert service._is_ats_host("https://apply.workable.com/acme")
+    assert not service._is_ats_host("https://example.com/careers")
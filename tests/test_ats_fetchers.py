@@ -0,0 +1,89 @@
+from pathlib import Path
+
+import responses
+
+from apprscan.jobs.ats import detect_ats, fetch_ats_jobs
+
+FIXTURES = Path("tests/fixtures/ats")
+COMPANY = {"business_id": "123", "name": "Acme Oy", "domain": "acme.fi"}
+
+
+def test_detect_new_providers_from_homepage_links():
+    html = '<a href="https://acme.teamtailor.com/jobs">Ura</a>'
+    assert detect_ats("https://acme.fi", html) == {
+        "kind": "teamtailor",
+        "slug": "acme",
+        "board_url": "https://acme.teamtailor.com/jobs",
+    }
+    html = '<a href="https://apply.workable.com/acme-oy/">Careers</a>'
+    assert detect_ats("https://acme.fi", html)["slug"] == "acme-oy"
+    html = '<a href="https://jobs.smartrecruiters.com/AcmeOy">Jobs</a>'
+    assert detect_ats("https://acme.fi", html)["slug"] == "AcmeOy"
+    html = '<a href="https://emp.jobylon.com/companies/acme">Jobs</a>'
+    assert detect_ats("https://acme.fi", html) == {
+        "kind": "jobylon",
+        "slug": None,
+        "board_url": "https://emp.jobylon.com/companies/acme",
+    }
+
+
+@responses.activate
+def test_fetch_teamtailor_rss():
+    responses.add(
+        responses.GET,
+        "https://acme.teamtailor.com/jobs.rss",
+        body=(FIXTURES / "teamtailor_jobs.rss").read_text(encoding="utf-8"),
+        content_type="application/rss+xml",
+    )
+    jobs, reason = fetch_ats_jobs({"kind": "teamtailor", "slug": "acme"}, COMPANY, "ts")
+    assert reason is None
+    assert [j.job_title for j in jobs] == ["Junior Data Analyst", "Oppisopimus: IT-tuki"]
+    assert jobs[0].location_text == "Lahti"
+    assert jobs[0].job_url.endswith("/jobs/1234-junior-data-analyst")
+    assert "oppisopimus" in jobs[1].tags
+    assert len(responses.calls) == 1
+
+
+@responses.activate
+def test_fetch_workable_widget():
+    responses.add(
+        responses.GET,
+        "https://apply.workable.com/api/v1/widget/accounts/acme-oy",
+        body=(FIXTURES / "workable_widget.json").read_text(encoding="utf-8"),
+        content_type="application/json",
+    )
+    jobs, reason = fetch_ats_jobs({"kind": "workable", "slug": "acme-oy"}, COMPANY, "ts")
+    assert reason is None
+    assert len(jobs) == 1
+    assert jobs[0].source == "workable"
+    assert jobs[0].location_text == "Helsinki, Finland"
+    assert jobs[0].employment_type == "Full-time"
+
+
+@responses.activate
+def test_fetch_smartrecruiters_postings():
+    responses.add(
+        responses.GET,
+        "https://api.smartrecruiters.com/v1/companies/AcmeOy/postings",
+        body=(FIXTURES / "smartrecruiters_postings.json").read_text(encoding="utf-8"),
+        content_type="application/json",
+    )
+    jobs, reason = fetch_ats_jobs({"kind": "smartrecruiters", "slug": "AcmeOy"}, COMPANY, "ts")
+    assert reason is None
+    assert [j.job_url for j in jobs] == [
+        "https://jobs.smartrecruiters.com/AcmeOy/744000001234567",
+        "https://jobs.smartrecruiters.com/AcmeOy/744000001234568",
+    ]
+    assert "salesforce" in jobs[1].tags
+
+
+def test_detect_only_provider_reason():
+    jobs, reason = fetch_ats_jobs({"kind": "jazzhr", "slug": None}, COMPANY, "ts")
+    assert jobs == []
+    assert reason == "jazzhr_not_implemented"
+
+
+def test_fetch_ats_jobs_reports_missing_kind_and_slug():
+    assert fetch_ats_jobs({}, COMPANY, "ts") == ([], "ats_not_detected")
+    assert fetch_ats_jobs({"kind": None, "slug": "acme"}, COMPANY, "ts") == ([], "ats_not_detected")
+    assert fetch_ats_jobs({"kind": "lever"}, COMPANY, "ts") == ([], "ats_missing_slug")
@@ -0,0 +1,89 @@
+from apprscan.jobs import pipeline
+from apprscan.jobs.frontier import CrawlFrontier, normalize_url
+from apprscan.jobs.sitemap import SitemapEntry, SitemapResult
+
+
+def test_normalize_url_ignores_scheme_slash_and_tracking():
+    assert normalize_url("http://www.Example.com/careers/") == normalize_url("https://example.com/careers")
+    tracked = "https://example.com/jobs?utm_source=x&b=2&a=1"
+    assert normalize_url(tracked) == "example.com/jobs?a=1&b=2"
+    assert normalize_url("https://example.com/jobs?job=1") != normalize_url("https://example.com/jobs?job=2")
+
+
+def test_frontier_orders_careers_before_sitemap_noise():
+    frontier = CrawlFrontier(max_pages=10)
+    frontier.add("https://example.com/blog/2020/post", depth=1, source="sitemap")
+    frontier.add("https://example.com/about", anchor="About us", depth=1)
+    frontier.add("https://example.com/careers", depth=0, source="common_path")
+    frontier.add("https://example.com/news/we-are-hiring", anchor="Open positions", depth=1)
+    assert not frontier.add("http://www.example.com/careers/")
+    order = []
+    while (item := frontier.pop()) is not None:
+        order.append(item[0])
+    assert order[0] == "https://example.com/careers"
+    assert order[-1] == "https://example.com/blog/2020/post"
+
+
+def test_frontier_time_budget(monkeypatch):
+    clock = {"now": 100.0}
+    monkeypatch.setattr("apprscan.jobs.frontier.time.monotonic", lambda: clock["now"])
+    frontier = CrawlFrontier(max_pages=10, max_seconds=5)
+    assert frontier.budget_exhausted(0) is None
+    clock["now"] += 6
+    assert frontier.budget_exhausted(0) == "time"
+    assert CrawlFrontier(max_pages=2).budget_exhausted(2) == "pages"
+
+
+class _Resp:
+    def __init__(self, url, html):
+        self.status = 200
+        self.final_url = url
+        self.html = html
+        self.headers = {}
+
+
+class _AllowAll:
+    def can_fetch_detail(self, url):
+        return True, None
+
+    def sitemaps(self, domain):
+        return []
+
+
+def test_crawl_domain_reaches_careers_listing_first(monkeypatch):
+    sitemap = SitemapResult(
+        entries=[SitemapEntry(f"https://example.com/news/job-fair-{i}") for i in range(50)],
+        sitemaps_fetched=1,
+    )
+    pages = {
+        "https://example.com": "<html><a href='/about'>About</a></html>",
+        "https://example.com/careers": (
+            '<script type="application/ld+json">'
+            '{"@type": "JobPosting", "title": "Trainee"}</script>'
+        ),
+    }
+    fetched = []
+
+    def fake_fetch(session, url, **kwargs):
+        fetched.append(url)
+        if url in pages:
+            return _Resp(url, pages[url]), None
+        return None, "http_404"
+
+    monkeypatch.setattr(pipeline, "RobotsChecker", lambda: _AllowAll())
+    monkeypatch.setattr(pipeline, "fetch_url", fake_fetch)
+    monkeypatch.setattr(pipeline, "read_sitemaps", lambda *a, **k: sitemap)
+    company = {"business_id": "1", "name": "Test", "domain": "example.com"}
+    jobs, stats = pipeline.crawl_domain(
+        company,
+        "example.com",
+        max_pages=3,
+        req_per_second=1.0,
+        rate_limit_state={},
+        debug_html_dir=None,
+        session=None,
+        crawl_ts="ts",
+    )
+    assert [j.job_title for j in jobs] == ["Trainee"]
+    assert fetched[1] == "https://example.com/careers"
+    assert stats.to_dict()["budget_exhausted"] == "pages"
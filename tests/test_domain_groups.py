@@ -0,0 +1,125 @@
+import re
+
+import pandas as pd
+import responses
+
+from apprscan import hiring_scan
+from apprscan.domain_groups import canonical_domain, group_by_domain, load_redirects
+from apprscan.jobs import pipeline
+from apprscan.jobs.sitemap import SitemapResult
+
+JSONLD = (
+    '<script type="application/ld+json">'
+    '{"@type": "JobPosting", "title": "Varastotyontekija", "url": "/careers/varasto"}'
+    "</script>"
+)
+
+
+def test_canonical_domain_strips_scheme_www_and_follows_redirects(tmp_path):
+    validated = tmp_path / "domains_validated.csv"
+    pd.DataFrame(
+        [
+            {"business_id": "1", "domain": "acme-lahti.fi", "status": "redirect", "redirected_to": "https://www.acme.fi/"},
+            {"business_id": "2", "domain": "acme.fi", "status": "ok", "redirected_to": None},
+        ]
+    ).to_csv(validated, index=False)
+    redirects = load_redirects(validated)
+    assert redirects == {"acme-lahti.fi": "acme.fi"}
+    assert canonical_domain("https://WWW.Acme.fi/ura") == "acme.fi"
+    assert canonical_domain("acme-lahti.fi", redirects) == "acme.fi"
+    assert canonical_domain("a.fi", {"a.fi": "b.fi", "b.fi": "a.fi"}) == "b.fi"
+    assert group_by_domain([("1", "www.acme.fi"), ("2", "http://acme.fi"), ("3", "beta.fi")]) == {
+        "acme.fi": ["1", "2"],
+        "beta.fi": ["3"],
+    }
+
+
+def test_run_scan_scans_shared_domain_once(tmp_path, monkeypatch):
+    master = tmp_path / "master.csv"
+    rows = [
+        ("1", "Acme Lahti", 0.5, "https://www.acme.fi"),
+        ("2", "Acme Hollola", 0.8, "acme.fi"),
+        ("3", "Beta", 0.9, "beta.fi"),
+    ]
+    pd.DataFrame(
+        [
+            {
+                "business_id": bid,
+                "name": name,
+                "nearest_station": "Lahti",
+                "distance_km": km,
+                "website.url": url,
+            }
+            for bid, name, km, url in rows
+        ]
+    ).to_csv(master, index=False)
+    calls = []
+
+    def fake_scan_domain(**kwargs):
+        calls.append(kwargs["domain"])
+        return hiring_scan.DomainScanResult(
+            selected={"hiring_signal": "no", "url_checked": ""},
+            checked_urls=[f"https://{kwargs['domain']}/careers"],
+            errors=[],
+            skipped_reasons=[],
+            pages_fetched=1,
+            results_found=True,
+            cookie_wall={},
+        )
+
+    monkeypatch.setattr(hiring_scan, "scan_domain", fake_scan_domain)
+    out = tmp_path / "scan.csv"
+    args = hiring_scan.build_parser().parse_args(
+        [
+            "--master",
+            str(master),
+            "--domains",
+            str(tmp_path / "none.csv"),
+            "--out",
+            str(out),
+            "--no-llm",
+            "--url-stats",
+            "",
+        ]
+    )
+    assert hiring_scan.run_scan(hiring_scan.build_config(args)) == 0
+    assert calls == ["www.acme.fi", "beta.fi"]
+    df = pd.read_csv(out, dtype=str).fillna("")
+    assert list(df["shared_scan_of"]) == ["", "1", ""]
+    assert df.loc[1, "checked_urls"] == "https://www.acme.fi/careers"
+
+
+class _AllowAll:
+    def can_fetch_detail(self, url):
+        return True, None
+
+    def sitemaps(self, domain):
+        return []
+
+
+def test_crawl_pipeline_fans_out_jobs_to_branches(monkeypatch):
+    monkeypatch.setattr(pipeline, "RobotsChecker", lambda: _AllowAll())
+    monkeypatch.setattr(pipeline, "read_sitemaps", lambda *a, **k: SitemapResult())
+    companies = pd.DataFrame(
+        [
+            {"business_id": "1", "name": "Acme Lahti", "domain": "acme.fi"},
+            {"business_id": "2", "name": "Acme Hollola", "domain": "www.acme.fi"},
+        ]
+    )
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as rsps:
+        rsps.add(rsps.GET, "https://acme.fi/", body='<a href="/careers">Ura</a>')
+        rsps.add(rsps.GET, "https://acme.fi/careers", body=JSONLD)
+        # Other seeds 404 instead of raising (fetch_url retries connection errors with backoff).
+        rsps.add(rsps.GET, re.compile(r"https://acme\.fi/.+"), status=404)
+        jobs_df, stats_df, _ = pipeline.crawl_jobs_pipeline(
+            companies, {}, max_pages_per_domain=3, req_per_second=1000.0
+        )
+        fetched_bases = [
+            c.request.url for c in rsps.calls if c.request.url.rstrip("/").endswith("acme.fi")
+        ]
+
+    assert len(fetched_bases) == 1
+    assert sorted(jobs_df["company_business_id"]) == ["1", "2"]
+    assert list(jobs_df.sort_values("company_business_id")["shared_scan_of"]) == ["", "1"]
+    shared = stats_df[stats_df["shared_scan_of"] == "1"].iloc[0]
+    assert (shared["domain"], shared["pages_fetched"], shared["status"]) == ("www.acme.fi", 0, "ok")
@@ -1,9 +1,14 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import pandas as pd
+import responses
 from requests import Response
 
 import apprscan.domains_discovery as dd
+from apprscan.http_pool import HostLimiter
 
 
 class DummyResp(Response):
@@ -61,3 +66,59 @@ def test_suggest_domains_dataframe(monkeypatch):
     out = dd.suggest_domains(df, max_companies=1)
     assert "suggested_base_url" in out.columns
     assert len(out) == 1
+
+
+@responses.activate
+def test_validate_domains_head_first_and_streams_csv(tmp_path):
+    responses.add(responses.HEAD, "https://gone.example/", status=404)
+    responses.add(responses.HEAD, "https://nohead.example/", status=405)
+    responses.add(responses.GET, "https://nohead.example/", body="<p>Hello</p>")
+    responses.add(responses.HEAD, "https://cookie.example/", status=200, content_type="text/html")
+    responses.add(responses.GET, "https://cookie.example/", body="<p>Accept cookies / consent</p>")
+    responses.add(
+        responses.HEAD, "https://pdf.example/", status=200, content_type="application/pdf"
+    )
+    df = pd.DataFrame(
+        {
+            "business_id": ["1", "2", "3", "4", "5"],
+            "name": ["A", "B", "C", "D", "E"],
+            "domain": ["gone.example", "nohead.example", "cookie.example", "", "pdf.example"],
+        }
+    )
+    out_path = tmp_path / "domains_validated.csv"
+    out = dd.validate_domains(df, max_workers=4, out_path=out_path)
+    assert list(out["status"]) == ["http_404", "ok", "consent_gate", "no_domain", "ok"]
+    gets = [c.request.url for c in responses.calls if c.request.method == "GET"]
+    assert not any("gone" in url or "pdf" in url for url in gets)
+    streamed = pd.read_csv(out_path, dtype=str)
+    assert sorted(streamed["business_id"]) == ["1", "2", "3", "4", "5"]
+
+
+@responses.activate
+def test_validate_head_only_skips_the_consent_get():
+    responses.add(responses.HEAD, "https://ok.example/", status=200, content_type="text/html")
+    out = dd.validate_domains(
+        pd.DataFrame({"business_id": ["1"], "name": ["A"], "domain": ["ok.example"]}),
+        check_consent=False,
+    )
+    assert out.loc[0, "status"] == "ok"
+    assert [c.request.method for c in responses.calls] == ["HEAD"]
+
+
+def test_host_limiter_caps_concurrency_per_host():
+    limiter = HostLimiter(per_host=2)
+    active = {"now": 0, "max": 0}
+    lock = threading.Lock()
+
+    def work(_):
+        with limiter.slot("https://www.example.com/x"):
+            with lock:
+                active["now"] += 1
+                active["max"] = max(active["max"], active["now"])
+            time.sleep(0.02)
+            with lock:
+                active["now"] -= 1
+
+    with ThreadPoolExecutor(max_workers=6) as ex:
+        list(ex.map(work, range(6)))
+    assert active["max"] == 2
@@ -0,0 +1,80 @@
+import threading
+
+import apprscan.domains_discovery as dd
+from apprscan import hiring_scan
+from apprscan.http_pool import speculative_probe
+
+
+class _Res:
+    def __init__(self, url, html):
+        self.status = 200
+        self.final_url = url
+        self.html = html
+        self.headers = {}
+
+
+def test_speculative_probe_handles_in_order_and_cancels_rest():
+    fetched = []
+    lock = threading.Lock()
+
+    def fetch(url):
+        with lock:
+            fetched.append(url)
+        return url.endswith("/2")
+
+    handled = []
+
+    def handle(url, hit):
+        handled.append(url)
+        return hit
+
+    urls = [f"https://acme.fi/{i}" for i in range(10)]
+    saved = speculative_probe(urls, fetch, handle, max_parallel=2)
+    assert handled == urls[:3]
+    assert saved >= len(urls) - 3 - 2
+    assert len(fetched) + saved == len(urls)
+
+
+def test_scan_domain_stops_after_decisive_ats_hit(monkeypatch):
+    fetched = []
+
+    def fake_fetch(session, url, **kwargs):
+        fetched.append(url)
+        if url.endswith("/careers"):
+            return _Res(url, '<a href="https://jobs.lever.co/acme">Open positions</a>'), None
+        return _Res(url, "<p>Welcome</p>"), None
+
+    monkeypatch.setattr(hiring_scan, "fetch_url", fake_fetch)
+    result = hiring_scan.scan_domain(
+        domain="acme.fi",
+        name="Acme",
+        website_url=None,
+        max_urls=7,
+        sleep_s=0.0,
+        robots_mode="off",
+        robots_allowlist=None,
+        session=None,
+        rate_limit_state=None,
+        ollama_host="",
+        ollama_model="",
+        ollama_options={},
+        use_llm=False,
+        probe_parallelism=1,
+    )
+    assert result.selected["hiring_signal"] == "yes"
+    assert result.checked_urls == ["https://acme.fi/careers"]
+    assert result.probes_saved >= 5
+    assert len(fetched) + result.probes_saved == 7
+
+
+def test_suggest_for_company_reports_saved_probes(monkeypatch):
+    def fake_fetch(url, timeout=10.0):
+        if url == "https://example.com/careers":
+            return "<h1>Open positions</h1>"
+        return "" if url == "https://example.com" else None
+
+    monkeypatch.setattr(dd, "_fetch", fake_fetch)
+    sug = dd.suggest_for_company("1", "Test", "example.com")
+    assert sug.suggested_base_url == "https://example.com/careers"
+    assert sug.probes_saved >= len(dd.COMMON_PATHS) - 1 - dd.LIMITER.per_host
+    assert "probes_saved" in sug.to_dict()
@@ -0,0 +1,107 @@
+import time
+
+from apprscan.server.job_queue import MAX_ATTEMPTS, JobQueue, QueueFull
+
+
+def test_fifo_positions_states_and_timing(tmp_path):
+    ran = []
+    queue = JobQueue(
+        tmp_path / "jobs.sqlite", lambda run_id, payload: ran.append((run_id, payload["n"]))
+    )
+    for n in range(3):
+        queue.enqueue(f"r{n}", {"n": n})
+    assert [queue.status(f"r{n}")["queue_position"] for n in range(3)] == [0, 1, 2]
+
+    assert queue.run_once()
+    done = queue.status("r0")
+    assert done["state"] == "done" and done["queue_position"] is None
+    assert done["run_s"] >= 0 and done["wait_s"] >= 0
+    assert queue.status("r2")["queue_position"] == 1
+    assert ran == [("r0", 0)]
+    assert queue.counts() == {"queued": 2, "running": 0, "done": 1, "failed": 0}
+
+
+def test_failed_job_is_recorded_and_worker_survives(tmp_path):
+    def handler(run_id, payload):
+        if payload["boom"]:
+            raise ValueError("bad url")
+
+    queue = JobQueue(tmp_path / "jobs.sqlite", handler)
+    queue.enqueue("bad", {"boom": True})
+    queue.enqueue("good", {"boom": False})
+    while queue.run_once():
+        pass
+    assert queue.status("bad")["state"] == "failed"
+    assert queue.status("bad")["error"] == "ValueError:bad url"
+    assert queue.status("good")["state"] == "done"
+
+
+def test_running_jobs_are_recovered_after_restart(tmp_path):
+    path = tmp_path / "jobs.sqlite"
+    first = JobQueue(path)
+    first.enqueue("r1", {})
+    assert first.claim()["run_id"] == "r1"
+
+    ran = []
+    second = JobQueue(path, lambda run_id, payload: ran.append(run_id))
+    assert second.recover() == 0  # first is still heartbeating: its job is left alone
+    first.stop()  # shutdown mid-job
+    assert second.recover() == 1
+    assert second.status("r1")["state"] == "queued"
+    second.run_once()
+    assert ran == ["r1"]
+    assert second.status("r1")["attempts"] == 2
+
+
+def test_jobs_of_a_crashed_owner_are_recovered_once_its_heartbeat_lapses(tmp_path):
+    path = tmp_path / "jobs.sqlite"
+    crashed = JobQueue(path, heartbeat_s=0.01)
+    crashed.enqueue("r1", {})
+    crashed.claim()
+    time.sleep(0.1)  # no stop(), no heartbeats
+    assert JobQueue(path).recover() == 1
+
+
+def test_recover_fails_jobs_that_keep_dying(tmp_path):
+    path = tmp_path / "jobs.sqlite"
+    JobQueue(path).enqueue("crashy", {})
+    for attempt in range(MAX_ATTEMPTS):
+        worker = JobQueue(path)
+        assert worker.claim()["run_id"] == "crashy"
+        worker.stop()
+        assert JobQueue(path).recover() == (1 if attempt < MAX_ATTEMPTS - 1 else 0)
+    status = JobQueue(path).status("crashy")
+    assert (status["state"], status["error"], status["attempts"]) == ("failed", "abandoned", 3)
+
+
+def test_worker_pool_drains_burst_with_bounded_concurrency(tmp_path):
+    active = []
+    peak = []
+
+    def handler(run_id, payload):
+        active.append(run_id)
+        peak.append(len(active))
+        time.sleep(0.01)
+        active.remove(run_id)
+
+    queue = JobQueue(tmp_path / "jobs.sqlite", handler, workers=3, max_queued=100)
+    for n in range(30):
+        queue.enqueue(f"r{n}", {})
+    queue.start()
+    deadline = time.time() + 10
+    while queue.counts()["done"] < 30 and time.time() < deadline:
+        time.sleep(0.02)
+    queue.stop()
+    assert queue.counts()["done"] == 30
+    assert max(peak) <= 3
+
+
+def test_full_queue_rejects(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.sqlite", max_queued=1)
+    queue.enqueue("r1", {})
+    try:
+        queue.enqueue("r2", {})
+    except QueueFull:
+        pass
+    else:
+        raise AssertionError("expected QueueFull")
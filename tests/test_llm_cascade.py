@@ -0,0 +1,132 @@
+import json
+
+from apprscan import hiring_scan
+from apprscan.ollama_client import OllamaCallStats, join_model_tiers, parse_model_tiers
+from apprscan.output_contract import validate_hiring_signal_rows
+
+
+def _reply(signal, confidence):
+    return json.dumps(
+        {
+            "hiring_signal": signal,
+            "confidence": confidence,
+            "evidence": "x",
+            "evidence_snippets": ["Avoimet työpaikat", "Hae nyt"],
+            "evidence_urls": ["https://acme.fi/ura"],
+        }
+    )
+
+
+def _run(monkeypatch, answers):
+    asked = []
+
+    def fake_chat(host, model, system, user, options, **kwargs):
+        asked.append(model)
+        return answers[model]
+
+    monkeypatch.setattr(hiring_scan, "_ollama_chat", fake_chat)
+    tier_stats = {"small": OllamaCallStats(), "large": OllamaCallStats()}
+    cascade = {"llm_escalations": 0, "llm_tier_agreements": 0}
+    verdict = hiring_scan._evaluate_cascade(
+        "https://acme.fi/ura",
+        "Ura",
+        "Avoimet työpaikat",
+        company_name="Acme",
+        host="http://ollama",
+        tiers=["small", "large"],
+        options={},
+        escalate_below=0.6,
+        usage={},
+        keep_alive=None,
+        retries=0,
+        tier_stats=tier_stats,
+        cascade=cascade,
+    )
+    return verdict, asked, cascade, tier_stats
+
+
+def test_confident_small_tier_is_not_escalated(monkeypatch):
+    answers = {"small": _reply("yes", 0.9), "large": _reply("no", 0.9)}
+    verdict, asked, cascade, _ = _run(monkeypatch, answers)
+    assert asked == ["small"]
+    assert verdict["ollama_tier"] == "small"
+    assert cascade == {"llm_escalations": 0, "llm_tier_agreements": 0}
+
+
+def test_unclear_answer_escalates_and_tracks_agreement(monkeypatch):
+    answers = {"small": _reply("unclear", 0.3), "large": _reply("yes", 0.8)}
+    verdict, asked, cascade, stats = _run(monkeypatch, answers)
+    assert asked == ["small", "large"]
+    assert (verdict["hiring_signal"], verdict["ollama_tier"]) == ("yes", "large")
+    assert cascade == {"llm_escalations": 1, "llm_tier_agreements": 0}
+    assert stats["small"].calls == stats["large"].calls == 1
+
+    _, _, cascade, _ = _run(monkeypatch, {"small": _reply("yes", 0.4), "large": _reply("yes", 0.9)})
+    assert cascade == {"llm_escalations": 1, "llm_tier_agreements": 1}
+
+
+def test_failed_large_tier_keeps_small_verdict(monkeypatch):
+    verdict, _, _, _ = _run(monkeypatch, {"small": _reply("unclear", 0.2), "large": "not json"})
+    assert verdict["ollama_tier"] == "small"
+
+
+def test_model_tiers_parse_and_contract_accepts_tier_string():
+    tiers = parse_model_tiers(" qwen2.5:1.5b, llama3.1:8b ,qwen2.5:1.5b")
+    assert tiers == ["qwen2.5:1.5b", "llama3.1:8b"]
+    assert join_model_tiers(" qwen2.5:1.5b, llama3.1:8b ") == "qwen2.5:1.5b,llama3.1:8b"
+    provenance = ("run_id", "tool_version", "git_sha", "crawl_ts", "station", "business_id")
+    row = {col: "" for col in provenance}
+    row.update(
+        {
+            "max_distance_km": 1.0,
+            "name": "Acme",
+            "domain": "acme.fi",
+            "signal": "yes",
+            "confidence": 0.8,
+            "evidence": "x",
+            "evidence_snippets": "[]",
+            "evidence_urls": "[]",
+            "signal_url": "",
+            "checked_urls": "",
+            "next_url_hint": "",
+            "errors": "",
+            "skipped_reason": "",
+            "ollama_model": "qwen2.5:1.5b,llama3.1:8b",
+            "ollama_temperature": 0.2,
+            "prompt_version": "deadbeef",
+            "llm_used": True,
+            "output_format": "csv",
+        }
+    )
+    assert validate_hiring_signal_rows([row]) == []
+
+
+def test_scan_domain_reports_fetch_and_llm_progress(monkeypatch):
+    class _Res:
+        status = 200
+        headers = {}
+        final_url = "https://acme.fi/ura"
+        html = "<h1>Ura</h1><p>Tervetuloa töihin.</p>"
+
+    monkeypatch.setattr(hiring_scan, "fetch_url", lambda session, url, **kw: (_Res(), None))
+    monkeypatch.setattr(hiring_scan, "_ollama_chat", lambda *args, **kwargs: _reply("no", 0.9))
+    events = []
+    result = hiring_scan.scan_domain(
+        domain="acme.fi",
+        name="Acme",
+        website_url="https://acme.fi/ura",
+        max_urls=1,
+        sleep_s=0.0,
+        robots_mode="off",
+        robots_allowlist=None,
+        session=None,
+        rate_limit_state=None,
+        ollama_host="http://ollama",
+        ollama_model="small",
+        ollama_options={},
+        use_llm=True,
+        on_event=lambda stage, **data: events.append((stage, data)),
+    )
+    assert [stage for stage, _ in events] == ["url_fetched", "llm_started", "llm_finished"]
+    assert events[0][1]["ok"] is True and events[0][1]["ms"] >= 0
+    assert events[2][1]["signal"] == result.selected["hiring_signal"]
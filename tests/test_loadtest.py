@@ -0,0 +1,42 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+from apprscan.server.loadtest import is_hiring, percentile
+
+
+def test_percentile_is_nearest_rank_and_ratios_spread_evenly():
+    values = [float(n) for n in range(1, 101)]
+    assert (percentile(values, 50), percentile(values, 95), percentile(values, 99)) == (
+        50.0,
+        95.0,
+        99.0,
+    )
+    assert percentile([], 50) is None
+    assert [is_hiring(n, 0.5) for n in range(4)] == [False, True, False, True]
+    assert sum(is_hiring(n, 0.25) for n in range(100)) == 25
+
+
+def test_load_test_runs_offline_and_writes_a_report(tmp_path):
+    pytest.importorskip("fastapi")
+    pytest.importorskip("uvicorn")
+    report_path = tmp_path / "report.json"
+    args = ["--ingests", "6", "--concurrency", "3", "--places", "3", "--scan-rate", "1000"]
+    args += ["--site-latency-ms", "0", "--places-latency-ms", "0", "--llm-latency-ms", "0"]
+    args += ["--workdir", str(tmp_path / "work"), "--out", str(report_path)]
+    done = subprocess.run(
+        [sys.executable, "-m", "apprscan.server.loadtest", *args],
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert done.returncode == 0, done.stdout + done.stderr
+    report = json.loads(report_path.read_text(encoding="utf-8"))
+    assert report["ingests"]["completed"] == 6 and report["ingests"]["reused"] >= 1
+    assert report["ingests"]["statuses"] == {"ok": 6}
+    endpoint = report["endpoints"]["POST /ingest/maps"]
+    assert endpoint["count"] == 6 and endpoint["error_rate"] == 0.0
+    assert endpoint["p50_ms"] <= endpoint["p95_ms"] <= endpoint["p99_ms"]
+    assert report["service_stats"]["jobs"]["done"] == 6
@@ -0,0 +1,26 @@
+from apprscan.ollama_client import OllamaPool
+from apprscan.server.metrics import Metrics
+
+
+def test_histogram_buckets_are_cumulative_and_inclusive():
+    registry = Metrics(buckets=(0.1, 1.0))
+    for seconds in (0.05, 0.1, 0.5, 3.0):
+        registry.observe("fetch", seconds)
+    registry.inc("apprscan_http_requests_total", method="GET", route="/stats", status=200)
+    text = registry.render()
+    assert 'apprscan_stage_duration_seconds_bucket{le="0.1",stage="fetch"} 2' in text
+    assert 'apprscan_stage_duration_seconds_bucket{le="1.0",stage="fetch"} 3' in text
+    assert 'apprscan_stage_duration_seconds_bucket{le="+Inf",stage="fetch"} 4' in text
+    assert 'apprscan_stage_duration_seconds_sum{stage="fetch"} 3.65' in text
+    assert 'apprscan_stage_duration_seconds_count{stage="robots"} 0' in text
+    assert 'apprscan_http_requests_total{method="GET",route="/stats",status="200"} 1' in text
+
+
+def test_ollama_errors_are_counted_across_breaker_resets():
+    pool = OllamaPool(["http://a"])
+    state = pool.hosts["http://a"]
+    pool.record(state, None)
+    pool.record(state, 0.1)
+    pool.record(state, None)
+    snap = pool.snapshot()[0]
+    assert (snap["errors"], snap["failures"], snap["calls"]) == (2, 1, 1)
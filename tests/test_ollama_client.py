@@ -0,0 +1,137 @@
+import pytest
+import responses
+
+from apprscan.ollama_client import (
+    HIRING_SIGNAL_SCHEMA,
+    OllamaCallStats,
+    OllamaPool,
+    chat,
+    chat_verdict,
+    parse_hosts,
+)
+
+GOOD = (
+    '{"hiring_signal": "Yes", "confidence": 1.4, "evidence": "x", '
+    '"evidence_snippets": [], "evidence_urls": []}'
+)
+
+
+@responses.activate
+def test_chat_sends_schema_format_and_keep_alive():
+    responses.add(responses.POST, "http://ollama:1/api/chat", json={"message": {"content": GOOD}})
+    chat(
+        "http://ollama:1/",
+        "m",
+        "sys",
+        "user",
+        {"num_predict": 256},
+        format=HIRING_SIGNAL_SCHEMA,
+        keep_alive="10m",
+    )
+    body = responses.calls[0].request.body
+    assert b'"keep_alive": "10m"' in body
+    assert b'"enum": ["yes", "no", "unclear"]' in body
+
+
+def test_chat_verdict_retries_malformed_reply_and_counts():
+    replies = iter(["Sure! here you go", GOOD])
+    seen_options = []
+
+    def fake_chat(host, model, system, user, options, **kwargs):
+        seen_options.append(dict(options))
+        assert kwargs["format"] is HIRING_SIGNAL_SCHEMA
+        return next(replies)
+
+    stats = OllamaCallStats()
+    verdict = chat_verdict(fake_chat, "h", "m", "s", "u", {"temperature": 0.2}, stats=stats)
+    assert (verdict["hiring_signal"], verdict["confidence"]) == ("yes", 1.0)
+    assert [o["temperature"] for o in seen_options] == [0.2, 0.0]
+    summary = stats.to_dict()
+    assert (summary["calls"], summary["retries"], summary["parse_failures"]) == (2, 1, 1)
+
+
+def test_chat_verdict_gives_up_after_retries():
+    stats = OllamaCallStats()
+    with pytest.raises(RuntimeError, match="ollama_parse_failed"):
+        chat_verdict(
+            lambda *a, **k: '{"hiring_signal": "maybe"}',
+            "h",
+            "m",
+            "s",
+            "u",
+            {},
+            retries=1,
+            stats=stats,
+        )
+    assert stats.parse_failures == 2
+
+
+def _fake_hosts(monkeypatch, behaviour):
+    from apprscan import ollama_client
+
+    used = []
+
+    def fake_chat(host, model, system, user, options, **kwargs):
+        used.append(host)
+        return behaviour(host)
+
+    monkeypatch.setattr(ollama_client, "chat", fake_chat)
+    return used
+
+
+def test_pool_spreads_concurrent_calls_across_hosts(monkeypatch):
+    import threading
+    import time
+
+    def slow(host):
+        time.sleep(0.05)
+        return GOOD
+
+    used = _fake_hosts(monkeypatch, slow)
+    pool = OllamaPool(["http://a", "http://b"])
+    threads = [threading.Thread(target=pool.chat, args=("m", "s", "u", {})) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(set(used)) == ["http://a", "http://b"]
+    assert abs(used.count("http://a") - used.count("http://b")) <= 2
+
+
+def test_pool_prefers_faster_host_when_idle():
+    pool = OllamaPool(["http://slow", "http://fast"])
+    pool.record(pool.hosts["http://slow"], 2.0)
+    pool.record(pool.hosts["http://fast"], 0.2)
+    with pool.acquire() as state:
+        assert state.host == "http://fast"
+
+
+def test_pool_fails_over_and_opens_breaker(monkeypatch):
+    from apprscan import ollama_client
+
+    def flaky(host):
+        if host == "http://down":
+            raise RuntimeError("ollama_http_500")
+        return GOOD
+
+    used = _fake_hosts(monkeypatch, flaky)
+    checks = []
+    pool = OllamaPool(
+        ["http://down", "http://up"], health_fn=lambda h: (checks.append(h) or (False, []))
+    )
+    for _ in range(6):
+        assert pool.chat("m", "s", "u", {}) == GOOD
+    assert used.count("http://down") == ollama_client.BREAKER_FAILURES
+    snap = {s["host"]: s for s in pool.snapshot()}
+    assert snap["http://down"]["open"] and not snap["http://up"]["open"]
+
+    # After the cooldown the host must pass /api/tags before it gets traffic again.
+    pool.hosts["http://down"].open_until = 0.0
+    pool.hosts["http://up"].ewma_s = 100.0
+    assert pool.chat("m", "s", "u", {}) == GOOD
+    assert checks == ["http://down"]
+    assert used.count("http://down") == ollama_client.BREAKER_FAILURES
+
+
+def test_parse_hosts_normalises_docker_name():
+    assert parse_hosts("http://ollama:11434, http://gpu2:11434/,") == ["http://127.0.0.1:11434", "http://gpu2:11434"]
@@ -0,0 +1,56 @@
+import re
+
+import pandas as pd
+import responses
+
+from apprscan.jobs.archive import PageArchive, replay_session
+from apprscan.jobs.pipeline import crawl_jobs_pipeline
+
+JSONLD = (
+    '<script type="application/ld+json">'
+    '{"@type": "JobPosting", "title": "IT-tuki oppisopimus", "url": "/careers/it-tuki"}'
+    "</script>"
+)
+
+
+def test_archive_dedups_bodies_and_replays(tmp_path):
+    archive = PageArchive(tmp_path)
+    archive.record("GET", "https://acme.fi/a", 200, {"Content-Type": "text/html"}, b"<p>same</p>")
+    archive.record("GET", "https://acme.fi/b", 200, {"Content-Encoding": "gzip"}, b"<p>same</p>")
+    reopened = PageArchive(tmp_path)
+    a, b = reopened.lookup("GET", "https://acme.fi/a"), reopened.lookup("GET", "https://acme.fi/b")
+    assert a.offset == b.offset and a.sha256 == b.sha256
+    assert "Content-Encoding" not in b.headers
+
+    session = replay_session(reopened)
+    resp = session.get("https://acme.fi/a")
+    assert (resp.status_code, resp.text) == (200, "<p>same</p>")
+    assert session.get("https://acme.fi/missing").status_code == 404
+
+
+def _crawl(**kwargs):
+    companies = pd.DataFrame([{"business_id": "1", "name": "Acme Oy", "domain": "acme.fi"}])
+    jobs_df, stats_df, _ = crawl_jobs_pipeline(
+        companies, {}, max_pages_per_domain=5, req_per_second=1000.0, **kwargs
+    )
+    return jobs_df, stats_df
+
+
+def test_crawl_replay_matches_live_without_network(tmp_path):
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as live:
+        live.add(live.GET, "https://acme.fi/robots.txt", body="User-agent: *\nAllow: /\n")
+        live.add(live.GET, "https://acme.fi/", body='<a href="/careers">Ura</a>')
+        live.add(live.GET, "https://acme.fi/careers", body=JSONLD)
+        live.add(live.GET, re.compile(r"https://acme\.fi/.*"), status=404)
+        live_jobs, _ = _crawl(archive_dir=tmp_path / "archive")
+
+    assert list(live_jobs["job_title"]) == ["IT-tuki oppisopimus"]
+    assert (tmp_path / "archive" / "index.jsonl").exists()
+
+    # No routes registered: any real HTTP request would raise ConnectionError.
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as offline:
+        replay_jobs, replay_stats = _crawl(replay_dir=tmp_path / "archive")
+        assert len(offline.calls) == 0
+
+    assert list(replay_jobs["job_url"]) == list(live_jobs["job_url"])
+    assert replay_stats.loc[0, "status"] == "ok"
@@ -0,0 +1,47 @@
+import importlib.util
+
+import pytest
+
+from apprscan.jobs.discovery import discover_links_with_text
+from apprscan.jobs.extract.generic_html import discover_job_links
+from apprscan.jobs.parsing import PageParser, analyze_listing, resolve_backend
+
+COMPANY = {"business_id": "1", "name": "Acme", "domain": "acme.fi"}
+LISTING = """
+<html><body>
+<a href="/careers/trainee">Apply now</a>
+<a href="/rekry">Rekry</a>
+<a href="/about">About</a>
+</body></html>
+"""
+JSONLD = '<script type="application/ld+json">{"@type": "JobPosting", "title": "Trainee"}</script>'
+
+
+def test_analyze_listing_matches_individual_helpers():
+    page = analyze_listing(LISTING, "https://acme.fi", COMPANY, "ts")
+    assert page.jsonld_jobs == []
+    assert page.links == discover_links_with_text(LISTING, "https://acme.fi")
+    assert page.job_links == discover_job_links(LISTING, "https://acme.fi")
+    assert page.cpu_seconds >= 0
+
+
+def test_page_parser_process_pool_matches_inline():
+    with PageParser() as inline, PageParser(workers=1) as pooled:
+        a = inline.listing(JSONLD, "https://acme.fi/jobs", COMPANY, "ts")
+        b = pooled.listing(JSONLD, "https://acme.fi/jobs", COMPANY, "ts")
+        detail = pooled.detail("<h1>Support Engineer</h1><p>Helpdesk</p>")
+    titles = [j.job_title for j in a.jsonld_jobs]
+    assert titles == [j.job_title for j in b.jsonld_jobs] == ["Trainee"]
+    assert (detail.consent, detail.title) == (False, "Support Engineer")
+    assert pooled.pages_parsed == 2
+    assert "pages/s per core" in pooled.summary()
+
+
+def test_resolve_backend_rejects_unknown_or_missing():
+    with pytest.raises(ValueError):
+        resolve_backend("html5lib")
+    if importlib.util.find_spec("lxml") is None:
+        with pytest.raises(ValueError, match="lxml"):
+            resolve_backend("lxml")
+    else:
+        assert resolve_backend("lxml") == "lxml"
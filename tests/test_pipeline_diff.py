@@ -21,3 +21,20 @@ def test_apply_diff_with_fingerprint(tmp_path):
     jobs2.loc[0, "job_url"] = "https://example.com/jobs/renamed"
     jobs_with_diff2, new_jobs2 = apply_diff(jobs2, known)
     assert len(new_jobs2) == 0
+
+
+def test_apply_diff_keeps_fanned_out_branch_rows(tmp_path):
+    jobs = pd.DataFrame(
+        {
+            "company_business_id": ["1", "2", "1"],
+            "job_title": ["Dev", "Dev", "Dev"],
+            "location_text": ["Lahti", "Lahti", "Lahti"],
+            "posted_date": ["2024-01-01"] * 3,
+            "company_domain": ["acme.fi", "www.acme.fi", "acme.fi"],
+            "job_url": ["https://acme.fi/jobs/1"] * 3,
+            "shared_scan_of": ["", "1", ""],
+        }
+    )
+    jobs_with_diff, new_jobs = apply_diff(jobs, tmp_path / "known.parquet")
+    assert sorted(jobs_with_diff["company_business_id"]) == ["1", "2"]
+    assert len(new_jobs) == 2
@@ -0,0 +1,75 @@
+import responses
+
+from apprscan.places_api import DETAILS_URL, fetch_place_details
+from apprscan.places_cache import PlacesCache
+from apprscan.server import service
+
+SHORT = "https://maps.app.goo.gl/abc123"
+LONG = "https://www.google.com/maps/place/Acme/data=!4m2!3m1!1sChIJacme"
+
+
+@responses.activate
+def test_place_details_are_fetched_once_and_wider_masks_serve_narrower(tmp_path):
+    responses.add(
+        responses.GET,
+        f"{DETAILS_URL}p1",
+        json={"id": "p1", "displayName": {"text": "Acme"}, "websiteUri": "https://acme.fi"},
+    )
+    cache = PlacesCache(tmp_path / "places.sqlite")
+    first = fetch_place_details("p1", api_key="k", cache=cache)
+    again = fetch_place_details("p1", cache=cache)
+    narrow = fetch_place_details("p1", field_mask="id,websiteUri", cache=cache)
+    assert len(responses.calls) == 1
+    assert first == again == narrow
+    assert first["website"] == "https://acme.fi"
+
+    shared = PlacesCache(tmp_path / "places.sqlite")
+    assert service.resolve_website("p1", cache=shared) == "https://acme.fi"
+    assert len(responses.calls) == 1
+    assert cache.stats()["places_calls_saved"] == 2
+    assert shared.stats()["place_details"] == {"hits": 1, "misses": 0, "hit_ratio": 1.0}
+
+
+@responses.activate
+def test_failed_or_expired_lookups_are_not_reused(tmp_path):
+    responses.add(responses.GET, f"{DETAILS_URL}p1", status=500)
+    responses.add(responses.GET, f"{DETAILS_URL}p1", json={"id": "p1", "websiteUri": "https://a.fi"})
+    cache = PlacesCache(tmp_path / "places.sqlite", ttl_s=0)
+    try:
+        fetch_place_details("p1", api_key="k", cache=cache)
+    except RuntimeError:
+        pass
+    assert fetch_place_details("p1", api_key="k", cache=cache)["website"] == "https://a.fi"
+    assert fetch_place_details("p1", api_key="k", cache=cache)["website"] == "https://a.fi"
+    assert len(responses.calls) == 3
+    assert cache.stats()["places_calls_saved"] == 0
+
+
+@responses.activate
+def test_short_link_is_expanded_once_per_ingest_and_cached(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    responses.add(responses.GET, SHORT, status=302, headers={"Location": LONG})
+    responses.add(responses.GET, LONG, body="maps")
+    cache = PlacesCache(tmp_path / "places.sqlite")
+    monkeypatch.setattr(service, "default_places_cache", lambda: cache)
+    monkeypatch.setattr(service, "resolve_website", lambda place_id: "")
+
+    service.process_maps_ingest(maps_url=SHORT, run_id="r1")
+    package = service.read_company_package("r1")
+    assert package["source"]["place_id"] == "ChIJacme"
+    assert len(responses.calls) == 2  # redirect + target, once
+
+    service.process_maps_ingest(maps_url=SHORT, run_id="r2")
+    assert len(responses.calls) == 2
+    assert cache.stats()["short_links"] == {"hits": 1, "misses": 1, "hit_ratio": 0.5}
+
+
+def test_purge_deletes_expired_rows(tmp_path):
+    cache = PlacesCache(tmp_path / "places.sqlite", ttl_s=3600)
+    cache.put_expansion(SHORT, LONG)
+    cache.put_details("p1", "id", {"id": "p1"})
+    with cache._db() as conn:
+        conn.execute("UPDATE place_details SET created_at = created_at - 7200")
+    assert cache.purge() == 1
+    assert cache.get_expansion(SHORT) == LONG
+    assert PlacesCache(tmp_path / "places.sqlite", ttl_s=0).purge() == 1
@@ -0,0 +1,72 @@
+from apprscan import hiring_scan
+from apprscan.prompt_context import build_prompt_context, estimate_tokens, extract_blocks
+
+NAV = "".join(f'<li><a href="/p{i}">Tuotteet ja palvelut osio {i}</a></li>' for i in range(60))
+HTML = (
+    "<html><head><title>Acme Oy</title><script>var x = 1;</script></head><body>"
+    f"<nav><ul>{NAV}</ul></nav>"
+    "<p>We use cookies. Accept all cookies to continue.</p>"
+    "<h2>Avoimet työpaikat</h2>"
+    "<p>Haemme nyt oppisopimuksella IT-tukihenkilöä. Hae tähän mennessä, rekrytointi käynnissä.</p>"
+    "<footer><p>Acme Oy, Lahti</p></footer>"
+    "</body></html>"
+)
+
+
+def test_blocks_skip_nested_duplicates_and_scripts():
+    title, blocks = extract_blocks(
+        "<title>T</title><p>Hae <a href='/ura'>uralle</a></p><script>x</script>"
+    )
+    assert title == "T"
+    assert [(b.tag, b.text) for b in blocks] == [("p", "Hae uralle")]
+
+
+def test_context_keeps_hiring_blocks_under_budget_in_page_order():
+    _, ctx = build_prompt_context(
+        HTML,
+        keywords=hiring_scan.CONTEXT_KEYWORDS,
+        penalty_keywords=hiring_scan.COOKIE_WALL_KEYWORDS,
+        budget_tokens=40,
+    )
+    assert ctx.tokens <= 40
+    assert ctx.tokens == estimate_tokens(ctx.text)
+    assert ctx.blocks_used < ctx.blocks_total
+    lines = ctx.text.splitlines()
+    assert "Avoimet työpaikat" in lines
+    body_line = next(i for i, line in enumerate(lines) if "oppisopimuksella" in line)
+    assert lines.index("Avoimet työpaikat") < body_line
+    assert "cookies" not in ctx.text
+
+
+def test_evaluate_page_reports_prompt_usage(monkeypatch):
+    sent = {}
+
+    def fake_chat(host, model, system, user, options, **kwargs):
+        sent["user"] = user
+        return '{"hiring_signal": "unclear", "confidence": 0.1}'
+
+    monkeypatch.setattr(hiring_scan, "_ollama_chat", fake_chat)
+    usage = {}
+    hiring_scan._evaluate_page(
+        "https://acme.fi/ura",
+        "Acme",
+        "Avoimet työpaikat",
+        company_name="Acme Oy",
+        host="http://ollama",
+        model="m",
+        options={},
+        usage=usage,
+    )
+    hiring_scan._evaluate_page(
+        "https://acme.fi",
+        "Acme",
+        "",
+        company_name="Acme Oy",
+        host="",
+        model="m",
+        options={},
+        usage=usage,
+    )
+    assert usage["llm_calls"] == 2
+    assert usage["prompt_chars"] > 2 * len(hiring_scan.PROMPT_SYSTEM)
+    assert usage["prompt_tokens"] >= usage["prompt_chars"] // 4
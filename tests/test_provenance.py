@@ -0,0 +1,28 @@
+import os
+
+from apprscan.server import service
+
+
+def test_provenance_is_resolved_once_and_refreshed_on_env_changes(monkeypatch, tmp_path):
+    env_file = tmp_path / ".env"
+    env_file.write_text("OLLAMA_MODEL=small\n", encoding="utf-8")
+    calls = []
+    monkeypatch.setattr(service, "_repo_env_file", lambda: env_file)
+    monkeypatch.setattr(service, "_resolve_git_sha", lambda root: calls.append(root) or "abc1234")
+    monkeypatch.delenv("OLLAMA_MODEL", raising=False)
+    monkeypatch.delenv("MODEL_NAME", raising=False)
+    monkeypatch.setattr(service, "_PROVENANCE", None)
+
+    first = service.provenance()
+    assert service.provenance() is first and len(calls) == 1
+    assert first.git_sha == "abc1234" and first.scan_config.ollama_model == "small"
+
+    env_file.write_text("OLLAMA_MODEL=large\n", encoding="utf-8")
+    stat = env_file.stat()
+    os.utime(env_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert service.provenance().scan_config.ollama_model == "large" and len(calls) == 2
+
+    monkeypatch.setenv("OLLAMA_MODEL", "override")
+    assert service.provenance().scan_config.ollama_model == "override" and len(calls) == 3
+    current = service.provenance()
+    assert service.provenance(reload=True) is not current and len(calls) == 4
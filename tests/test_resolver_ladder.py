@@ -11,6 +11,7 @@ class DummyScanOutcome:
         self.errors = []
         self.skipped_reasons = []
         self.pages_fetched = 1
+        self.probes_saved = 0
         self.results_found = bool(selected)
         self.cookie_wall = {
             "detected": False,
@@ -37,7 +38,7 @@ def _capture_package(monkeypatch):
 
 def test_places_resolver_ok(monkeypatch):
     captured = _capture_package(monkeypatch)
-    monkeypatch.setattr(service, "resolve_place_id", lambda _: "place_123")
+    monkeypatch.setattr(service, "_place_id_from", lambda _: "place_123")
     monkeypatch.setattr(service, "resolve_website", lambda _: "https://example.com")
     monkeypatch.setattr(
         service,
@@ -68,7 +69,7 @@ def test_places_resolver_ok(monkeypatch):
 
 def test_missing_website_degraded(monkeypatch):
     captured = _capture_package(monkeypatch)
-    monkeypatch.setattr(service, "resolve_place_id", lambda _: "place_123")
+    monkeypatch.setattr(service, "_place_id_from", lambda _: "place_123")
     monkeypatch.setattr(service, "resolve_website", lambda _: "")
     result = service.process_maps_ingest(maps_url="https://www.google.com/maps")
     assert result["status"] == "degraded"
@@ -87,3 +88,19 @@ def test_invalid_maps_url_error(monkeypatch):
     assert package["status"] == "error"
     assert package["degraded_reason"] == "none"
     assert "invalid_maps_url" in package.get("error", {}).get("code", "")
+
+
+def test_failed_short_link_is_fetched_once(monkeypatch):
+    captured = _capture_package(monkeypatch)
+    calls = []
+
+    def _fail(url, **kwargs):
+        calls.append(url)
+        raise service.requests.ConnectionError("offline")
+
+    monkeypatch.setattr(service.requests, "get", _fail)
+    result = service.process_maps_ingest(maps_url="https://maps.app.goo.gl/abc")
+    assert result["status"] == "degraded"
+    assert captured["package"]["degraded_reason"] == "place_id_not_found"
+    assert captured["package"]["safety"]["probes_saved"] == 0
+    assert calls == ["https://maps.app.goo.gl/abc"]
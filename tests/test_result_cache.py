@@ -0,0 +1,89 @@
+import threading
+import time
+
+from apprscan.server import service
+from apprscan.server.result_cache import ResultCache
+
+SELECTED = {
+    "signal": "yes",
+    "confidence": 0.8,
+    "evidence": "job_signal_keywords",
+    "evidence_snippets": ["open positions", "apply now"],
+    "evidence_urls": ["https://acme.fi/careers", "https://acme.fi/jobs"],
+}
+
+
+class _Outcome:
+    selected = SELECTED
+    checked_urls: list = []
+    errors: list = []
+    skipped_reasons: list = []
+    pages_fetched = 1
+    probes_saved = 0
+    results_found = True
+    cookie_wall = {"detected": False}
+
+
+def _setup(monkeypatch, tmp_path, places, delay=0.0):
+    monkeypatch.chdir(tmp_path)
+    scans = []
+    lookups = []
+
+    def fake_scan(**kwargs):
+        scans.append(kwargs["domain"])
+        time.sleep(delay)
+        return _Outcome()
+
+    monkeypatch.setattr(service, "_place_id_from", lambda url: url.rsplit("/", 1)[-1])
+    monkeypatch.setattr(service, "resolve_website", lambda pid: lookups.append(pid) or places[pid])
+    monkeypatch.setattr(service, "scan_domain", fake_scan)
+    return ResultCache(tmp_path / "results.sqlite", ttl_s=3600), scans, lookups
+
+
+def test_same_place_and_same_domain_reuse_the_package(monkeypatch, tmp_path):
+    cache, scans, lookups = _setup(monkeypatch, tmp_path, {"p1": "https://www.acme.fi", "p2": "https://acme.fi/"})
+    first = service.process_maps_ingest(maps_url="https://www.google.com/maps/p1", cache=cache)
+    again = service.process_maps_ingest(
+        maps_url="https://www.google.com/maps/p1", note="again", cache=cache
+    )
+    other = service.process_maps_ingest(maps_url="https://www.google.com/maps/p2", cache=cache)
+    assert scans == ["www.acme.fi"]
+    assert lookups == ["p1", "p2"]
+    assert again["reused_from"] == other["reused_from"] == first["run_id"]
+
+    package = service.read_company_package(again["run_id"])
+    assert package["run_id"] == again["run_id"] != first["run_id"]
+    assert package["notes"]["note"] == "again"
+    assert package["reused_from"]["key"] == "place:p1"
+    assert service.read_company_package(other["run_id"])["source"]["place_id"] == "p2"
+
+    service.process_maps_ingest(maps_url="https://www.google.com/maps/p1", force=True, cache=cache)
+    assert len(scans) == 2
+
+
+def test_expired_entries_are_not_reused(monkeypatch, tmp_path):
+    cache, scans, _ = _setup(monkeypatch, tmp_path, {"p1": "https://acme.fi"})
+    cache.ttl_s = 0.01
+    service.process_maps_ingest(maps_url="https://www.google.com/maps/p1", cache=cache)
+    time.sleep(0.05)
+    service.process_maps_ingest(maps_url="https://www.google.com/maps/p1", cache=cache)
+    assert len(scans) == 2
+
+
+def test_concurrent_ingests_of_one_place_coalesce(monkeypatch, tmp_path):
+    cache, scans, lookups = _setup(monkeypatch, tmp_path, {"p1": "https://acme.fi"}, delay=0.1)
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(
+                service.process_maps_ingest(maps_url="https://www.google.com/maps/p1", cache=cache)
+            )
+        )
+        for _ in range(4)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert scans == ["acme.fi"] and lookups == ["p1"]
+    assert sum(1 for r in results if r.get("reused_from")) == 3
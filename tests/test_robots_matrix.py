@@ -3,6 +3,7 @@ import pandas as pd
 from apprscan.jobs import pipeline
 from apprscan.jobs.constants import ROBOTS_DISALLOW_ALL, ROBOTS_DISALLOW_URL
 from apprscan.jobs.model import JobPosting
+from apprscan.jobs.sitemap import SitemapResult
 from apprscan.jobs.storage import jobs_to_dataframe
 
 
@@ -17,6 +18,9 @@ class FakeRobotsChecker:
                 return val
         return True, None
 
+    def sitemaps(self, domain: str):
+        return []
+
 
 def _fake_fetch_url(reason=None):
     def _inner(session, url, **kwargs):
@@ -40,8 +44,10 @@ def _run_crawl_with_robots(rules, fetch_reason=None):
     fake_checker = FakeRobotsChecker(rules)
     orig_checker = pipeline.RobotsChecker
     orig_fetch = pipeline.fetch_url
+    orig_sitemaps = pipeline.read_sitemaps
     pipeline.RobotsChecker = lambda: fake_checker  # type: ignore
     pipeline.fetch_url = _fake_fetch_url(fetch_reason)  # type: ignore
+    pipeline.read_sitemaps = lambda *a, **k: SitemapResult()  # type: ignore
 
     try:
         jobs, stats = pipeline.crawl_domain(
@@ -60,6 +66,7 @@ def _run_crawl_with_robots(rules, fetch_reason=None):
     finally:
         pipeline.RobotsChecker = orig_checker
         pipeline.fetch_url = orig_fetch
+        pipeline.read_sitemaps = orig_sitemaps
     return jobs_df, stats_df
 
 
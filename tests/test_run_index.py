@@ -0,0 +1,59 @@
+import json
+import time
+
+from apprscan.server import service
+from apprscan.server.run_index import RunIndex
+
+
+def _package(run_id, created_at, status="ok", domain="acme.fi"):
+    return {
+        "run_id": run_id,
+        "status": status,
+        "degraded_reason": "none",
+        "created_at": created_at,
+        "source": {"canonical_domain": domain, "place_id": "p1"},
+    }
+
+
+def test_write_indexes_and_read_uses_the_index(tmp_path):
+    root = tmp_path / "runs"
+    service.write_company_package("r1", _package("r1", "2026-01-01T00:00:00Z"), out_root=root)
+    entry = RunIndex(root).get("r1")
+    assert (entry["status"], entry["domain"]) == ("ok", "acme.fi")
+    assert entry["json_path"].endswith("company_package.json")
+    assert service.read_company_package("r1", out_root=root)["run_id"] == "r1"
+    assert service.read_company_package("nope", out_root=root) is None
+
+
+def test_page_is_newest_first_with_cursor_and_filters(tmp_path):
+    index = RunIndex(tmp_path)
+    for i in range(5):
+        status = "degraded" if i == 2 else "ok"
+        index.record(
+            f"r{i}", _package(f"r{i}", f"2026-01-0{i + 1}T00:00:00Z", status), tmp_path, tmp_path
+        )
+    first = index.page(limit=2)
+    assert [run["run_id"] for run in first["runs"]] == ["r4", "r3"]
+    second = index.page(limit=2, before=first["next"])
+    assert [run["run_id"] for run in second["runs"]] == ["r2", "r1"]
+    last = index.page(limit=2, before=second["next"])
+    assert [run["run_id"] for run in last["runs"]] == ["r0"] and last["next"] is None
+    assert [run["run_id"] for run in index.page(status="degraded")["runs"]] == ["r2"]
+
+
+def test_backfill_picks_up_legacy_runs_and_purge_removes_old_ones(tmp_path):
+    old_dir = tmp_path / "legacy_old"
+    old_dir.mkdir()
+    (old_dir / "company_package.json").write_text(
+        json.dumps(_package("legacy_old", "2020-01-01T00:00:00Z")), encoding="utf-8"
+    )
+    index = RunIndex(tmp_path)
+    assert not index.backfilled
+    assert service.read_company_package("legacy_old", out_root=tmp_path)["run_id"] == "legacy_old"
+
+    now = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+    service.write_company_package("fresh", _package("fresh", now), out_root=tmp_path)
+    assert service.purge_runs(tmp_path, max_age_days=30) == 1
+    assert index.backfilled and index.count() == 1
+    assert not old_dir.exists() and (tmp_path / "fresh").exists()
+    assert index.backfill() == 0
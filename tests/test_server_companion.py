@@ -1,4 +1,5 @@
 import json
+import time
 from pathlib import Path
 
 import pytest
@@ -64,9 +65,9 @@ def _schema_required(schema: dict) -> set[str]:
     return required
 
 
-def test_ingest_requires_token(monkeypatch):
+def test_ingest_requires_token(monkeypatch, tmp_path):
     monkeypatch.setattr("apprscan.server.routes.process_maps_ingest", lambda **kwargs: None)
-    app = create_app(token="test-token")
+    app = create_app(token="test-token", queue_path=tmp_path / "jobs.sqlite")
     client = TestClient(app)
     resp = client.post("/ingest/maps", json={"maps_url": "https://www.google.com/maps"})
     assert resp.status_code == 401
@@ -78,9 +79,9 @@ def test_ingest_requires_token(monkeypatch):
     assert resp.status_code == 401
 
 
-def test_ingest_result_flow(monkeypatch):
+def test_ingest_result_flow(monkeypatch, tmp_path):
     monkeypatch.setattr("apprscan.server.routes.process_maps_ingest", lambda **kwargs: None)
-    app = create_app(token="test-token")
+    app = create_app(token="test-token", queue_path=tmp_path / "jobs.sqlite")
     client = TestClient(app)
     resp = client.post(
         "/ingest/maps",
@@ -95,7 +96,7 @@ def test_ingest_result_flow(monkeypatch):
 
     package = _minimal_package(run_id)
     service.write_company_package(run_id, package)
-    md_path = Path("out") / "runs" / run_id / "company_package.md"
+    md_path = service.runs_root() / run_id / "company_package.md"
     assert md_path.exists()
 
     done = client.get(f"/result/{run_id}", headers={"X-APPRSCAN-TOKEN": "test-token"})
@@ -108,9 +109,9 @@ def test_ingest_result_flow(monkeypatch):
     assert _schema_required(schema).issubset(payload.keys())
 
 
-def test_rate_limit(monkeypatch):
+def test_rate_limit(monkeypatch, tmp_path):
     monkeypatch.setattr("apprscan.server.routes.process_maps_ingest", lambda **kwargs: None)
-    app = create_app(token="test-token")
+    app = create_app(token="test-token", queue_path=tmp_path / "jobs.sqlite")
     app.state.rate_limit_max = 1
     client = TestClient(app)
     first = client.post(
@@ -125,3 +126,166 @@ def test_rate_limit(monkeypatch):
         headers={"X-APPRSCAN-TOKEN": "test-token"},
     )
     assert second.status_code == 429
+
+
+def test_queue_runs_ingest_and_reports_status(monkeypatch, tmp_path):
+    def fake_ingest(*, run_id, maps_url, **kwargs):
+        if "fail" in maps_url:
+            raise RuntimeError("boom")
+        service.write_company_package(run_id, _minimal_package(run_id))
+
+    monkeypatch.setattr("apprscan.server.routes.process_maps_ingest", fake_ingest)
+    app = create_app(token="test-token", queue_path=tmp_path / "jobs.sqlite")
+    headers = {"X-APPRSCAN-TOKEN": "test-token"}
+    with TestClient(app) as client:
+        maps = "https://www.google.com/maps"
+        ok = client.post("/ingest/maps", json={"maps_url": maps}, headers=headers)
+        bad = client.post("/ingest/maps", json={"maps_url": f"{maps}/fail"}, headers=headers)
+        assert ok.json()["queue_position"] is not None
+        for _ in range(200):
+            counts = app.state.job_queue.counts()
+            if counts["queued"] + counts["running"] == 0:
+                break
+            time.sleep(0.02)
+        assert client.get(f"/result/{ok.json()['run_id']}", headers=headers).status_code == 200
+        failed = client.get(f"/result/{bad.json()['run_id']}", headers=headers)
+        assert failed.status_code == 500
+        assert failed.json()["job"]["state"] == "failed"
+        assert client.get("/result/nope", headers=headers).status_code == 404
+
+
+def test_batch_ingest_shares_context_and_reports_progress(monkeypatch, tmp_path):
+    contexts = []
+
+    def fake_ingest(*, run_id, maps_url, context=None, **kwargs):
+        contexts.append(context)
+        service.write_company_package(run_id, _minimal_package(run_id))
+
+    monkeypatch.setattr("apprscan.server.routes.process_maps_ingest", fake_ingest)
+    app = create_app(token="test-token", queue_path=tmp_path / "jobs.sqlite")
+    app.state.rate_limit_max = 1
+    headers = {"X-APPRSCAN-TOKEN": "test-token"}
+    items = [
+        {"maps_url": f"https://www.google.com/maps/place/{i}", "tags": ["batch"]} for i in range(20)
+    ]
+    with TestClient(app) as client:
+        resp = client.post("/ingest/maps/batch", json={"items": items}, headers=headers)
+        assert resp.status_code == 200
+        body = resp.json()
+        assert len({item["run_id"] for item in body["items"]}) == 20
+        for _ in range(200):
+            status = client.get(f"/batch/{body['batch_id']}", headers=headers).json()
+            if status["complete"]:
+                break
+            time.sleep(0.02)
+        assert status["counts"]["done"] == 20 and status["progress"] == 1.0
+        assert len({id(ctx) for ctx in contexts}) == 1 and contexts[0] is not None
+        assert client.get("/batch/nope", headers=headers).status_code == 404
+        too_big = client.post("/ingest/maps/batch", json={"items": items * 6}, headers=headers)
+        assert too_big.status_code == 413
+
+
+def test_batch_context_looks_up_each_place_once(monkeypatch):
+    calls = []
+    monkeypatch.setattr(service, "resolve_website", lambda place_id: calls.append(place_id) or "https://acme.fi")
+    context = service.BatchContext()
+    assert context.website_for("p1") == context.website_for("p1") == "https://acme.fi"
+    assert calls == ["p1"]
+
+
+def test_events_stream_stage_transitions(monkeypatch, tmp_path):
+    def fake_ingest(*, run_id, maps_url, **kwargs):
+        emit = service._progress(run_id)
+        emit("place_resolved", place_id="p1")
+        emit("url_fetched", url="https://acme.fi/ura", ok=True, ms=12.0)
+        service.write_company_package(run_id, _minimal_package(run_id))
+        return {"run_id": run_id, "status": "ok"}
+
+    monkeypatch.setattr("apprscan.server.routes.process_maps_ingest", fake_ingest)
+    app = create_app(token="test-token", queue_path=tmp_path / "jobs.sqlite")
+    headers = {"X-APPRSCAN-TOKEN": "test-token"}
+    with TestClient(app) as client:
+        run_id = client.post(
+            "/ingest/maps", json={"maps_url": "https://www.google.com/maps"}, headers=headers
+        ).json()["run_id"]
+        with client.stream("GET", f"/events/{run_id}", headers=headers) as resp:
+            assert resp.headers["content-type"].startswith("text/event-stream")
+            body = "".join(resp.iter_text())
+        lines = body.splitlines()
+        stages = [line[len("event: ") :] for line in lines if line.startswith("event: ")]
+        assert stages == ["queued", "started", "place_resolved", "url_fetched", "done"]
+        data = [json.loads(line[6:]) for line in lines if line.startswith("data: ")]
+        assert data[-1]["status"] == "ok"
+        assert all(b["t_ms"] >= a["t_ms"] for a, b in zip(data, data[1:], strict=False))
+
+        poll = client.get(f"/events/{run_id}?poll=true&after=3", headers=headers).json()
+        assert [e["stage"] for e in poll["events"]] == ["url_fetched", "done"]
+        assert poll["finished"] is True
+        assert client.get("/events/nope?poll=true", headers=headers).status_code == 404
+
+
+def test_runs_listing_is_paginated(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    for i in range(3):
+        package = _minimal_package(f"run_{i}")
+        package["created_at"] = f"2026-01-0{i + 1}T00:00:00Z"
+        service.write_company_package(f"run_{i}", package)
+    app = create_app(token="test-token", queue_path=tmp_path / "jobs.sqlite")
+    headers = {"X-APPRSCAN-TOKEN": "test-token"}
+    client = TestClient(app)
+    first = client.get("/runs?limit=2", headers=headers).json()
+    assert [run["run_id"] for run in first["runs"]] == ["run_2", "run_1"]
+    rest = client.get(f"/runs?limit=2&before={first['next']}", headers=headers).json()
+    assert [run["run_id"] for run in rest["runs"]] == ["run_0"]
+    assert rest["next"] is None
+    assert client.get("/runs").status_code == 401
+
+
+def test_metrics_endpoint_reports_requests_stages_and_caches(monkeypatch, tmp_path):
+    from apprscan.places_cache import PlacesCache
+    from apprscan.server import routes
+    from apprscan.server.metrics import metrics
+    from apprscan.server.result_cache import ResultCache
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(routes, "default_result_cache", lambda: ResultCache(tmp_path / "r.db"))
+    monkeypatch.setattr(routes, "default_places_cache", lambda: PlacesCache(tmp_path / "p.db"))
+    monkeypatch.setattr(
+        "apprscan.server.routes.process_maps_ingest",
+        lambda *, run_id, **kwargs: service.write_company_package(run_id, _minimal_package(run_id)),
+    )
+    limited = metrics().counter("apprscan_rate_limited_total")
+    writes = metrics()._stages["package_write"]["count"]
+    app = create_app(token="test-token", queue_path=tmp_path / "jobs.sqlite")
+    app.state.rate_limit_max = 1
+    headers = {"X-APPRSCAN-TOKEN": "test-token"}
+    with TestClient(app) as client:
+        for _ in range(2):
+            body = {"maps_url": "https://www.google.com/maps"}
+            client.post("/ingest/maps", json=body, headers=headers)
+        deadline = time.time() + 5
+        while app.state.job_queue.counts()["done"] < 1 and time.time() < deadline:
+            time.sleep(0.02)
+        assert client.get("/metrics").status_code == 401
+        resp = client.get("/metrics", headers={"Authorization": "Bearer test-token"})
+    assert resp.status_code == 200 and resp.headers["content-type"].startswith("text/plain")
+    text = resp.text
+    assert 'route="/ingest/maps",status="429"' in text
+    assert metrics().counter("apprscan_rate_limited_total") == limited + 1
+    assert metrics()._stages["package_write"]["count"] == writes + 1
+    assert 'apprscan_stage_duration_seconds_bucket{le="+Inf",stage="llm"}' in text
+    assert "apprscan_queue_depth 0" in text
+    assert 'apprscan_cache_hit_ratio{cache="place_details"} 0' in text
+
+
+def test_config_reload_reresolves_the_provenance(monkeypatch, tmp_path):
+    shas = iter(["aaa1111", "bbb2222", "ccc3333"])
+    monkeypatch.setattr(service, "_resolve_git_sha", lambda root: next(shas))
+    monkeypatch.setattr(service, "_PROVENANCE", None)
+    app = create_app(token="test-token", queue_path=tmp_path / "jobs.sqlite")
+    headers = {"X-APPRSCAN-TOKEN": "test-token"}
+    with TestClient(app) as client:
+        assert service.provenance().git_sha == "aaa1111"
+        assert client.post("/config/reload").status_code == 401
+        assert client.post("/config/reload", headers=headers).json()["git_sha"] == "bbb2222"
+        assert service.provenance().git_sha == "bbb2222"
@@ -0,0 +1,160 @@
+import gzip
+import io
+import tracemalloc
+from urllib.robotparser import RobotFileParser
+
+import requests
+import responses
+
+from apprscan.jobs import pipeline
+from apprscan.jobs.discovery import parse_sitemap
+from apprscan.jobs.robots import RobotsChecker
+from apprscan.jobs.sitemap import SitemapEntry, SitemapResult, iter_sitemap_entries, read_sitemaps
+
+NS = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+
+
+def _urlset(urls):
+    body = "".join(f"<url><loc>{loc}</loc><lastmod>{mod}</lastmod></url>" for loc, mod in urls)
+    return f'<?xml version="1.0" encoding="UTF-8"?><urlset {NS}>{body}</urlset>'
+
+
+def test_parse_sitemap_keeps_keyword_urls():
+    xml = _urlset(
+        [("https://acme.fi/careers/dev", "2026-01-01"), ("https://acme.fi/about", "2026-01-01")]
+    )
+    assert parse_sitemap(xml, "https://acme.fi") == ["https://acme.fi/careers/dev"]
+    assert parse_sitemap("<urlset><url><loc>https://acme.fi/jobs", "https://acme.fi") == []
+
+
+@responses.activate
+def test_read_sitemaps_follows_gzip_index_jobs_child_first():
+    index = (
+        f'<sitemapindex {NS}>'
+        "<sitemap><loc>https://acme.fi/sitemap-posts.xml</loc></sitemap>"
+        "<sitemap><loc>https://acme.fi/sitemap-jobs.xml.gz</loc></sitemap>"
+        "</sitemapindex>"
+    )
+    jobs = _urlset(
+        [("https://acme.fi/jobs/trainee", "2026-02-01"), ("https://acme.fi/contact", "2026-02-01")]
+    )
+    responses.add(responses.GET, "https://acme.fi/sitemap.xml", body=index)
+    responses.add(
+        responses.GET, "https://acme.fi/sitemap-jobs.xml.gz", body=gzip.compress(jobs.encode())
+    )
+    responses.add(responses.GET, "https://acme.fi/sitemap-posts.xml", status=404)
+
+    result = read_sitemaps(
+        requests.Session(), ["https://acme.fi/sitemap.xml"], keywords=["job"], max_sitemaps=2
+    )
+    assert [(e.loc, e.lastmod) for e in result.entries] == [
+        ("https://acme.fi/jobs/trainee", "2026-02-01")
+    ]
+    assert result.sitemaps_fetched == 2
+    assert [c.request.url for c in responses.calls][-1] == "https://acme.fi/sitemap-jobs.xml.gz"
+
+
+def test_robots_sitemap_lines():
+    parser = RobotFileParser()
+    parser.parse(["User-agent: *", "Allow: /", "Sitemap: https://acme.fi/sitemap_index.xml"])
+    checker = RobotsChecker()
+    checker.cache["acme.fi"] = parser
+    assert checker.sitemaps("acme.fi") == ["https://acme.fi/sitemap_index.xml"]
+
+
+def test_iter_sitemap_entries_ignores_image_extension_locs():
+    xml = (
+        f'<urlset {NS} xmlns:image="http://www.google.com/schemas/sitemap-image/1.1">'
+        "<url><loc>https://acme.fi/careers/</loc><lastmod>2026-01-01</lastmod>"
+        "<image:image><image:loc>https://acme.fi/uploads/team.jpg</image:loc></image:image>"
+        "</url>"
+        "<url><loc>https://acme.fi/jobs/dev</loc></url>"
+        "</urlset>"
+    )
+    entries = list(iter_sitemap_entries(io.BytesIO(xml.encode())))
+    assert [(e.loc, e.lastmod) for e in entries] == [
+        ("https://acme.fi/careers/", "2026-01-01"),
+        ("https://acme.fi/jobs/dev", None),
+    ]
+
+
+def test_iter_sitemap_entries_memory_stays_flat():
+    rows = "".join(
+        f"<url><loc>https://acme.fi/news/article-{i:06d}</loc><lastmod>2026-01-01</lastmod></url>"
+        for i in range(100_000)
+    )
+    data = gzip.compress(f"<urlset {NS}>{rows}</urlset>".encode())
+    tracemalloc.start()
+    count = sum(1 for _ in iter_sitemap_entries(io.BytesIO(data)))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert count == 100_000
+    assert peak < 2_000_000
+
+
+class _Resp:
+    status = 200
+    headers = {}
+
+    def __init__(self, url):
+        self.final_url = url
+        self.html = "<html></html>"
+
+
+class _AllowAll:
+    def can_fetch_detail(self, url):
+        return True, None
+
+    def sitemaps(self, domain):
+        return []
+
+
+def test_crawl_domain_skips_unchanged_sitemap_urls(monkeypatch):
+    sitemap = SitemapResult(
+        entries=[
+            SitemapEntry("https://acme.fi/jobs/old", "2026-01-01"),
+            SitemapEntry("https://acme.fi/jobs/new", "2026-03-01"),
+        ],
+        sitemaps_fetched=1,
+    )
+    fetched = []
+
+    def fake_fetch(session, url, **kwargs):
+        fetched.append(url)
+        return _Resp(url), None
+
+    monkeypatch.setattr(pipeline, "RobotsChecker", lambda: _AllowAll())
+    monkeypatch.setattr(pipeline, "fetch_url", fake_fetch)
+    monkeypatch.setattr(pipeline, "discover_paths", lambda domain: [])
+    monkeypatch.setattr(pipeline, "read_sitemaps", lambda *a, **k: sitemap)
+    old_job = {"job_title": "Asentaja", "job_url": "https://acme.fi/jobs/old", "crawl_ts": "prev"}
+    seen = {
+        "acme.fi/jobs/old": {"lastmod": "2026-01-01", "jobs": [old_job]},
+        "acme.fi/jobs/new": {"lastmod": "2026-02-01", "jobs": []},
+    }
+    jobs, stats = pipeline.crawl_domain(
+        {"business_id": "1", "name": "Acme", "domain": "acme.fi"},
+        "acme.fi",
+        max_pages=10,
+        req_per_second=1.0,
+        rate_limit_state={},
+        debug_html_dir=None,
+        session=None,
+        crawl_ts="ts",
+        sitemap_seen=seen,
+    )
+    assert "https://acme.fi/jobs/old" not in fetched
+    assert "https://acme.fi/jobs/new" in fetched
+    assert stats.sitemap_unchanged == 1
+    assert seen["acme.fi/jobs/new"] == {"lastmod": "2026-03-01", "jobs": []}
+    # The unchanged page's posting is carried into this run instead of dropping out of the diff.
+    assert [(j.job_url, j.company_business_id, j.crawl_ts) for j in jobs] == [
+        ("https://acme.fi/jobs/old", "1", "ts")
+    ]
+
+
+def test_sitemap_state_drops_entries_without_remembered_jobs(tmp_path):
+    path = tmp_path / "sitemap_state.json"
+    state = {"acme.fi/a": {"lastmod": "2026-01-01", "jobs": []}}
+    pipeline.save_sitemap_state(path, {**state, "acme.fi/legacy": "2026-01-01"})
+    assert pipeline.load_sitemap_state(path) == state
@@ -0,0 +1,114 @@
+from pathlib import Path
+
+import pandas as pd
+
+from apprscan import hiring_scan
+from apprscan.text_classifier import (
+    HiringClassifier,
+    featurize,
+    load_fixture_examples,
+    load_verdict_examples,
+)
+
+FIXTURES = Path(__file__).parent / "fixtures" / "hiring_signal"
+
+
+def _trained():
+    return HiringClassifier().fit(load_fixture_examples(FIXTURES))
+
+
+def test_featurize_is_stable_and_normalised():
+    idx, vals = featurize("Avoimet työpaikat, avoimet työpaikat")
+    again, _ = featurize("avoimet TYÖPAIKAT avoimet työpaikat")
+    assert list(idx) == list(again)
+    assert abs(float((vals**2).sum()) - 1.0) < 1e-9
+
+
+def test_fit_separates_fixtures_and_roundtrips(tmp_path):
+    model = _trained()
+    examples = load_fixture_examples(FIXTURES)
+    assert {ex.label for ex in examples} == {"yes", "no"}
+    assert all(model.classify(ex.text)["signal"] == ex.label for ex in examples)
+
+    model.save(tmp_path / "clf.npz")
+    loaded = HiringClassifier.load(tmp_path / "clf.npz")
+    assert (
+        abs(loaded.predict_proba(examples[0].text) - model.predict_proba(examples[0].text)) < 1e-9
+    )
+    assert loaded.meta["examples"] == len(examples)
+
+
+def test_verdict_examples_use_llm_rows_only(tmp_path):
+    path = tmp_path / "scan.csv"
+    pd.DataFrame(
+        [
+            {
+                "signal": "yes",
+                "llm_used": True,
+                "evidence": "careers",
+                "evidence_snippets": '["Haemme nyt"]',
+            },
+            {"signal": "unclear", "llm_used": True, "evidence": "", "evidence_snippets": "[]"},
+            {"signal": "no", "llm_used": False, "evidence": "about", "evidence_snippets": "[]"},
+        ]
+    ).to_csv(path, index=False)
+    examples = load_verdict_examples([path])
+    assert [(ex.label, ex.text) for ex in examples] == [("yes", "careers Haemme nyt")]
+
+
+class _SaysNo:
+    def classify(self, text):
+        return {"signal": "no", "confidence": 0.95, "evidence": "classifier:p_yes=0.05"}
+
+
+def _scan_page(monkeypatch, html, llm_calls):
+    class _Res:
+        status = 200
+        headers = {}
+        final_url = "https://acme.fi/about"
+
+    _Res.html = html
+    monkeypatch.setattr(hiring_scan, "fetch_url", lambda session, url, **kw: (_Res(), None))
+
+    def fake_llm(*args, **kwargs):
+        llm_calls.append(1)
+        return '{"hiring_signal": "unclear", "confidence": 0.1}'
+
+    monkeypatch.setattr(hiring_scan, "_ollama_chat", fake_llm)
+    return hiring_scan.scan_domain(
+        domain="acme.fi",
+        name="Acme",
+        website_url=None,
+        max_urls=1,
+        sleep_s=0.0,
+        robots_mode="off",
+        robots_allowlist=None,
+        session=None,
+        rate_limit_state=None,
+        ollama_host="http://ollama",
+        ollama_model="m",
+        ollama_options={},
+        use_llm=True,
+        classifier=_SaysNo(),
+    )
+
+
+def test_classifier_resolves_pages_whose_text_backs_the_label(monkeypatch):
+    llm_calls = []
+    html = (
+        "<p>Sorry, we are not recruiting right now; thanks for your interest in our small "
+        "family bakery here in Tampere, founded in 1952.</p><p>The team is complete for this "
+        "season and there are no vacancies, nor summer trainee spots, at the moment.</p>"
+    )
+    result = _scan_page(monkeypatch, html, llm_calls)
+    assert result.selected["hiring_signal"] == "no"
+    assert result.selected["evidence"].startswith("classifier:")
+    assert not any("lassifier" in s for s in result.selected["evidence_snippets"])
+    assert (result.classifier_resolved, llm_calls) == (1, [])
+
+
+def test_classifier_label_without_page_evidence_falls_through_to_llm(monkeypatch):
+    llm_calls = []
+    html = "<p>We are a local company offering services.</p>"
+    result = _scan_page(monkeypatch, html, llm_calls)
+    assert result.classifier_resolved == 0 and llm_calls
@@ -0,0 +1,159 @@
+import pandas as pd
+
+from apprscan import hiring_scan
+from apprscan.url_stats import UrlHitStats
+
+
+def _row(checked, signal="no", signal_url=""):
+    return {"checked_urls": ";".join(checked), "signal": signal, "signal_url": signal_url}
+
+
+def test_order_prefers_observed_hits_and_known_good_url():
+    stats = UrlHitStats()
+    for domain in ("a.fi", "b.fi", "c.fi"):
+        stats.record_scan_row(
+            _row([f"https://{domain}/careers", f"https://{domain}/rekry"], "yes", f"https://{domain}/rekry")
+        )
+    stats.record_scan_row(_row(["https://d.fi/tyopaikat"], "yes", "https://d.fi/tyopaikat/avoimet"))
+
+    candidates = ["https://x.fi/careers", "https://x.fi", "https://x.fi/rekry"]
+    # /rekry 3/3 beats unseen "/" (prior 0.5), which beats /careers 0/3.
+    assert stats.order("x.fi", candidates) == ["https://x.fi/rekry", "https://x.fi", "https://x.fi/careers"]
+    assert stats.order("www.d.fi", ["https://d.fi/careers"])[0] == "https://d.fi/tyopaikat/avoimet"
+
+
+def test_known_good_url_is_forgotten_after_a_miss():
+    stats = UrlHitStats()
+    stats.record("https://acme.fi/ura", True)
+    stats.record("https://acme.fi/ura", False)
+    assert "acme.fi" not in stats.known_good
+
+
+def test_save_load_and_bootstrap_from_scan_output(tmp_path):
+    scan_out = tmp_path / "hiring_signal.csv"
+    pd.DataFrame(
+        [
+            _row(["https://a.fi/careers", "https://a.fi/jobs"], "yes", "https://a.fi/jobs"),
+            _row(["https://b.fi/careers"]),
+        ]
+    ).to_csv(scan_out, index=False)
+    stats = UrlHitStats.from_scan_outputs([scan_out])
+    assert stats.tries == {"/careers": 2, "/jobs": 1}
+    assert stats.hits == {"/jobs": 1}
+
+    stats.save(tmp_path / "url_stats.json")
+    loaded = UrlHitStats.load(tmp_path / "url_stats.json")
+    assert loaded.known_good == {"a.fi": "https://a.fi/jobs"}
+    assert UrlHitStats.load(tmp_path / "missing.json").tries == {}
+
+
+def test_scan_domain_uses_learned_order_under_small_max_urls(monkeypatch):
+    fetched = []
+
+    class _Res:
+        status = 200
+        headers = {}
+
+        def __init__(self, url):
+            self.final_url = url
+            self.html = "<p>Tervetuloa</p>"
+
+    def fake_fetch(session, url, **kwargs):
+        fetched.append(url)
+        return _Res(url), None
+
+    monkeypatch.setattr(hiring_scan, "fetch_url", fake_fetch)
+    stats = UrlHitStats()
+    stats.record("https://other.fi/tyopaikat", True)
+    hiring_scan.scan_domain(
+        domain="acme.fi",
+        name="Acme",
+        website_url=None,
+        max_urls=1,
+        sleep_s=0.0,
+        robots_mode="off",
+        robots_allowlist=None,
+        session=None,
+        rate_limit_state=None,
+        ollama_host="",
+        ollama_model="",
+        ollama_options={},
+        use_llm=False,
+        url_stats=stats,
+    )
+    assert fetched == ["https://acme.fi/tyopaikat"]
+
+
+def test_crawl_domain_records_missing_seed_paths_as_misses(monkeypatch):
+    from apprscan.jobs import pipeline
+    from apprscan.jobs.sitemap import SitemapResult
+
+    class _Res:
+        def __init__(self, url):
+            self.final_url = url
+            self.html = "<html></html>"
+
+    class _Robots:
+        def can_fetch_detail(self, url):
+            blocked = url.endswith("/rekry")
+            return not blocked, "Disallow: /rekry" if blocked else None
+
+        def sitemaps(self, domain):
+            return []
+
+    def fake_fetch(session, url, **kwargs):
+        return (None, "http_404") if url.endswith("/careers") else (_Res(url), None)
+
+    monkeypatch.setattr(pipeline, "fetch_url", fake_fetch)
+    monkeypatch.setattr(
+        pipeline, "discover_paths", lambda d: [f"https://{d}/careers", f"https://{d}/rekry"]
+    )
+    monkeypatch.setattr(pipeline, "read_sitemaps", lambda *a, **k: SitemapResult(entries=[]))
+    stats = UrlHitStats()
+    pipeline.crawl_domain(
+        {"business_id": "1", "name": "Acme", "domain": "acme.fi"},
+        "acme.fi",
+        max_pages=10,
+        req_per_second=1.0,
+        rate_limit_state={},
+        debug_html_dir=None,
+        session=None,
+        crawl_ts="ts",
+        robots=_Robots(),
+        url_stats=stats,
+    )
+    assert stats.tries == {"/careers": 1, "/rekry": 1} and stats.hits == {}
+
+
+def test_redirected_hit_is_credited_to_the_probed_candidate(monkeypatch):
+    class _Res:
+        status = 200
+        headers = {}
+        html = '<script type="application/ld+json">{"@type": "JobPosting"}</script>'
+
+        def __init__(self, url):
+            self.final_url = url.replace("/tyopaikat", "/en/careers/")
+
+    monkeypatch.setattr(hiring_scan, "fetch_url", lambda session, url, **kw: (_Res(url), None))
+    stats = UrlHitStats()
+    stats.record("https://other.fi/tyopaikat", True)
+    result = hiring_scan.scan_domain(
+        domain="acme.fi",
+        name="Acme",
+        website_url=None,
+        max_urls=1,
+        sleep_s=0.0,
+        robots_mode="off",
+        robots_allowlist=None,
+        session=None,
+        rate_limit_state=None,
+        ollama_host="",
+        ollama_model="",
+        ollama_options={},
+        use_llm=False,
+        url_stats=stats,
+    )
+    assert result.checked_urls == ["https://acme.fi/en/careers/"]
+    assert result.probed_urls == [result.signal_probe] == ["https://acme.fi/tyopaikat"]
+    stats.record_probes(result.probed_urls, result.signal_probe)
+    assert stats.hits == {"/tyopaikat": 2} and "/en/careers" not in stats.tries
@@ -0,0 +1,9 @@
+#!/usr/bin/env python
+"""Wrapper for apprscan.server.loadtest."""
+
+from __future__ import annotations
+
+from apprscan.server.loadtest import main
+
+if __name__ == "__main__":
+    raise SystemExit(main())